@@ -0,0 +1,385 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+@summary: Benchmark of the inventory retrieval of VsphereConnection.
+
+It generates a synthetic in-process vSphere inventory of the given sizes,
+runs the retrieval methods of VsphereConnection and the from_summary()
+converters against it and reports the wall clock times and the round trips
+(property accesses and method calls of managed objects) per operation.
+
+With --soap the inventory is served by the loopback vCenter simulator
+(see vcsim.py) and VsphereConnection connects to it with SmartConnect(), so
+every round trip is a real SOAP request over HTTP.
+
+@author: Frank Brehm
+@contact: frank@brehm-online.com
+@copyright: © 2022 - 2026 by Frank Brehm, Berlin
+"""
+from __future__ import absolute_import, print_function
+
+# Standard modules
+import argparse
+import gc
+import json
+import logging
+import re
+import sys
+import time
+from pathlib import Path
+
+BENCH_DIR = Path(__file__).resolve().parent
+SRC_DIR = BENCH_DIR.parent / "src"
+sys.path.insert(0, str(SRC_DIR))
+sys.path.insert(0, str(BENCH_DIR))
+
+# Third party modules
+from pyVmomi import vim  # noqa: E402
+
+# Own modules
+from fb_vmware.cluster import VsphereCluster  # noqa: E402
+from fb_vmware.config import VSPhereConfigInfo  # noqa: E402
+from fb_vmware.connect import VsphereConnection  # noqa: E402
+from fb_vmware.datastore import VsphereDatastore  # noqa: E402
+from fb_vmware.dvs import VsphereDvPortGroup  # noqa: E402
+from fb_vmware.host import VsphereHost  # noqa: E402
+from fb_vmware.vm import VsphereVm  # noqa: E402
+
+from inventory import SyntheticInventory  # noqa: E402
+from vcsim import VcenterSimulator  # noqa: E402
+
+__version__ = "0.2.0"
+
+DEFAULT_SIZES = (1000,)
+DEFAULT_SEARCHES = 1000
+SEARCH_SIZES_GB = (20, 100, 500)
+
+OPERATIONS = (
+    "get_vm_list",
+    "get_hosts",
+    "get_datastores",
+    "get_networks",
+    "search_space",
+    "from_summary",
+)
+
+
+# =============================================================================
+def parse_latency(value):
+    """Parse a latency definition NAME=MILLISECONDS."""
+    if "=" not in value:
+        raise argparse.ArgumentTypeError("Invalid latency definition {!r}.".format(value))
+    (name, ms) = value.split("=", 1)
+    try:
+        return (name.strip(), float(ms) / 1000.0)
+    except ValueError:
+        raise argparse.ArgumentTypeError("Invalid latency definition {!r}.".format(value))
+
+
+# =============================================================================
+class InventoryBenchmark(object):
+    """Runs the benchmarks against one synthetic inventory."""
+
+    # -------------------------------------------------------------------------
+    def __init__(self, inventory, searches=DEFAULT_SEARCHES, top=0, simulator=None):
+        """Initialize an InventoryBenchmark object."""
+        self.inventory = inventory
+        self.searches = searches
+        self.top = top
+        self.simulator = simulator
+        self.results = []
+
+        if simulator:
+            connect_info = VSPhereConfigInfo(
+                host=simulator.host,
+                port=simulator.port,
+                use_https=simulator.use_https,
+                user=simulator.user,
+                password=simulator.password,
+                appname="bench-inventory",
+                initialized=True,
+            )
+        else:
+            connect_info = VSPhereConfigInfo(
+                host="vcenter.bench.example.com",
+                user="bench",
+                password="bench",
+                appname="bench-inventory",
+                initialized=True,
+            )
+        self.conn = VsphereConnection(
+            connect_info,
+            name="bench",
+            appname="bench-inventory",
+            auto_close=False,
+            initialized=True,
+        )
+        if simulator:
+            self.conn.connect()
+        else:
+            self.conn.service_instance = inventory.service_instance
+
+    # -------------------------------------------------------------------------
+    def close(self):
+        """Disconnect from the simulator."""
+        if self.simulator:
+            self.conn.disconnect()
+
+    # -------------------------------------------------------------------------
+    def entities(self, mo_type):
+        """Return all managed objects of the given type bound to the connection."""
+        entities = self.inventory.entities[mo_type]
+        if not self.simulator:
+            return entities
+        stub = self.conn.service_instance._stub
+        return [mo_type(mo._moId, stub) for mo in entities]
+
+    # -------------------------------------------------------------------------
+    def measure(self, name, func, objects=None):
+        """Execute the given function and record its time and round trips."""
+        self.inventory.reset_counters()
+        gc.collect()
+        start = time.perf_counter()
+        result = func()
+        duration = time.perf_counter() - start
+
+        if objects is None:
+            try:
+                objects = len(result)
+            except TypeError:
+                objects = 0
+
+        round_trips = self.inventory.round_trips
+        res = {
+            "operation": name,
+            "vms": self.inventory.num_vms,
+            "seconds": duration,
+            "objects": objects,
+            "round_trips": round_trips,
+            "round_trips_per_object": (round_trips / objects) if objects else None,
+        }
+        if self.top:
+            res["top_accesses"] = [
+                ["{t}.{p}".format(t=key[0], p=key[1]), count]
+                for (key, count) in self.inventory.stub.calls.most_common(self.top)
+            ]
+        self.results.append(res)
+        return result
+
+    # -------------------------------------------------------------------------
+    def run(self, operations=OPERATIONS):
+        """Execute all given operations."""
+        conn = self.conn
+
+        if "get_vm_list" in operations:
+            re_all = re.compile(r".*")
+            self.measure("get_vm_list", lambda: conn.get_vm_list(re_all))
+            self.measure(
+                "get_vm_list(name_only)", lambda: conn.get_vm_list(re_all, name_only=True)
+            )
+
+        if "get_hosts" in operations:
+            self.measure("get_hosts", lambda: (conn.get_hosts(), conn.hosts)[1])
+
+        if "get_datastores" in operations or "search_space" in operations:
+            self.measure(
+                "get_datastores(detailled)",
+                lambda: (conn.get_datastores(detailled=True), conn.datastores)[1],
+            )
+
+        if "get_networks" in operations:
+            self.measure(
+                "get_networks",
+                lambda: (conn.get_networks(), list(conn.networks) + list(conn.dv_portgroups))[1],
+            )
+
+        if "search_space" in operations:
+            self.measure("search_space", self.search_space, objects=self.searches)
+
+        if "from_summary" in operations:
+            self.run_converters()
+
+        return self.results
+
+    # -------------------------------------------------------------------------
+    def search_space(self):
+        """Search space for a number of disks of different sizes."""
+        found = 0
+        for i in range(self.searches):
+            needed_gb = SEARCH_SIZES_GB[i % len(SEARCH_SIZES_GB)]
+            if self.conn.datastores.search_space(needed_gb, reserve_space=False):
+                found += 1
+        return found
+
+    # -------------------------------------------------------------------------
+    def run_converters(self):
+        """Measure the from_summary() converters with all objects of their type."""
+        entities = self.entities
+        common = {"appname": "bench-inventory", "vsphere": "bench"}
+
+        self.measure(
+            "VsphereVm.from_summary",
+            lambda: [
+                VsphereVm.from_summary(vm, "/", **common)
+                for vm in entities(vim.VirtualMachine)
+            ],
+        )
+        self.measure(
+            "VsphereHost.from_summary",
+            lambda: [VsphereHost.from_summary(h, **common) for h in entities(vim.HostSystem)],
+        )
+        self.measure(
+            "VsphereCluster.from_summary",
+            lambda: [
+                VsphereCluster.from_summary(c, **common)
+                for c in entities(vim.ClusterComputeResource)
+            ],
+        )
+        self.measure(
+            "VsphereDatastore.from_summary",
+            lambda: [
+                VsphereDatastore.from_summary(ds, **common) for ds in entities(vim.Datastore)
+            ],
+        )
+        self.measure(
+            "VsphereDvPortGroup.from_summary",
+            lambda: [
+                VsphereDvPortGroup.from_summary(pg, **common)
+                for pg in entities(vim.dvs.DistributedVirtualPortgroup)
+            ],
+        )
+
+
+# =============================================================================
+def print_results(results):
+    """Print the results as a table."""
+    template = "{:>7} {:<34} {:>10} {:>8} {:>12} {:>9}"
+    print(template.format("VMs", "Operation", "Time [s]", "Objects", "Round trips", "RT/obj"))
+    for res in results:
+        per_obj = "-"
+        if res["round_trips_per_object"] is not None:
+            per_obj = "{:0.1f}".format(res["round_trips_per_object"])
+        print(
+            template.format(
+                res["vms"],
+                res["operation"],
+                "{:0.3f}".format(res["seconds"]),
+                res["objects"],
+                res["round_trips"],
+                per_obj,
+            )
+        )
+        for (access, count) in res.get("top_accesses", []):
+            print("{:>7}   {:<54} {:>12}".format("", access, count))
+
+
+# =============================================================================
+def main():
+    """Entrypoint of the inventory benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0][10:])
+    parser.add_argument(
+        "-n",
+        "--vms",
+        type=int,
+        nargs="+",
+        default=list(DEFAULT_SIZES),
+        help="Numbers of VMs of the generated inventories (default: %(default)s).",
+    )
+    parser.add_argument(
+        "-d", "--datacenters", type=int, default=1, help="Number of datacenters (default: 1)."
+    )
+    parser.add_argument(
+        "-l",
+        "--latency-ms",
+        type=float,
+        default=0.0,
+        help="Latency of every round trip in milliseconds (default: 0).",
+    )
+    parser.add_argument(
+        "-L",
+        "--attr-latency",
+        type=parse_latency,
+        action="append",
+        default=[],
+        metavar="NAME=MS",
+        help="Latency of round trips to the given property or method in milliseconds.",
+    )
+    parser.add_argument(
+        "-o",
+        "--ops",
+        nargs="+",
+        choices=OPERATIONS,
+        default=list(OPERATIONS),
+        help="The operations to benchmark (default: all).",
+    )
+    parser.add_argument(
+        "-s",
+        "--searches",
+        type=int,
+        default=DEFAULT_SEARCHES,
+        help="Number of searches for space (default: %(default)s).",
+    )
+    parser.add_argument(
+        "-t",
+        "--top",
+        type=int,
+        default=0,
+        help="Show the most frequent property accesses per operation.",
+    )
+    parser.add_argument(
+        "-S",
+        "--soap",
+        action="store_true",
+        help="Serve the inventory by the vCenter simulator and connect via SOAP over HTTP.",
+    )
+    parser.add_argument("-j", "--json", help="Write the results as JSON into this file.")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING)
+
+    results = []
+    for vms in args.vms:
+        start = time.perf_counter()
+        inventory = SyntheticInventory(
+            vms=vms,
+            datacenters=args.datacenters,
+            latency=dict(args.attr_latency),
+            default_latency=args.latency_ms / 1000.0,
+        )
+        print(
+            "Generated inventory with {n} VMs in {s:0.2f} seconds.".format(
+                n=vms, s=time.perf_counter() - start
+            ),
+            file=sys.stderr,
+        )
+        simulator = None
+        if args.soap:
+            simulator = VcenterSimulator(inventory)
+            simulator.start()
+        try:
+            bench = InventoryBenchmark(
+                inventory, searches=args.searches, top=args.top, simulator=simulator
+            )
+            results += bench.run(args.ops)
+            bench.close()
+        finally:
+            if simulator:
+                simulator.stop()
+
+    print_results(results)
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as fh:
+            json.dump(results, fh, indent=4, sort_keys=True)
+
+    return 0
+
+
+# =============================================================================
+if __name__ == "__main__":
+
+    sys.exit(main())
+
+# =============================================================================
+
+# vim: tabstop=4 expandtab shiftwidth=4 softtabstop=4 list
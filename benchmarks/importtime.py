@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+@summary: Benchmark of the import times of all entry points of fb_vmware.
+
+It imports the module of every console script defined in pyproject.toml in a
+fresh Python interpreter with '-X importtime' and reports the cumulative import
+time of the module and whether heavy third party modules were imported.
+
+@author: Frank Brehm
+@contact: frank@brehm-online.com
+@copyright: © 2022 - 2026 by Frank Brehm, Berlin
+"""
+from __future__ import absolute_import, print_function
+
+# Standard modules
+import argparse
+import json
+import os
+import re
+import subprocess
+import sys
+from pathlib import Path
+
+__version__ = "0.1.0"
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+SRC_DIR = BASE_DIR / "src"
+PYPROJECT = BASE_DIR / "pyproject.toml"
+
+HEAVY_MODULES = ("pyVmomi", "requests", "rich", "babel")
+
+RE_SCRIPT = re.compile(r'^\s*([\w.-]+)\s*=\s*"([\w.]+):(\w+)"\s*$')
+RE_IMPORTTIME = re.compile(r"^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)\s*$")
+
+
+# =============================================================================
+def get_entry_points():
+    """Return the console scripts from pyproject.toml as a dict name -> module."""
+    entry_points = {}
+    in_section = False
+    with PYPROJECT.open(encoding="utf-8") as fh:
+        for line in fh:
+            stripped = line.strip()
+            if stripped.startswith("["):
+                in_section = stripped == "[project.scripts]"
+                continue
+            if not in_section:
+                continue
+            match = RE_SCRIPT.match(line)
+            if match:
+                entry_points[match.group(1)] = match.group(2)
+    return entry_points
+
+
+# =============================================================================
+def measure(module):
+    """
+    Import the given module in a fresh interpreter and return the results.
+
+    The result is a tuple of the cumulative import time of the module in
+    microseconds and the list of heavy modules imported on the way.
+    """
+    env = dict(os.environ)
+    env["PYTHONPATH"] = str(SRC_DIR) + os.pathsep + env.get("PYTHONPATH", "")
+    cmd = [sys.executable, "-X", "importtime", "-c", "import " + module]
+    proc = subprocess.run(cmd, env=env, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
+    if proc.returncode:
+        raise RuntimeError("Could not import {m!r}:\n{e}".format(m=module, e=proc.stderr))
+
+    total = None
+    heavy = set()
+    for line in proc.stderr.splitlines():
+        match = RE_IMPORTTIME.match(line)
+        if not match:
+            continue
+        name = match.group(4)
+        if name == module and not match.group(3).strip(" "):
+            total = int(match.group(2))
+        top_name = name.split(".")[0]
+        if top_name in HEAVY_MODULES:
+            heavy.add(top_name)
+
+    return (total, sorted(heavy))
+
+
+# =============================================================================
+def main():
+    """Entrypoint of the import time benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0][10:])
+    parser.add_argument(
+        "-r", "--repeat", type=int, default=5, help="Number of measurements per entry point."
+    )
+    parser.add_argument(
+        "-m",
+        "--max-ms",
+        type=float,
+        help="Exit with an error, if an entry point needs longer than this to import.",
+    )
+    parser.add_argument("-j", "--json", help="Write the results as JSON into this file.")
+    args = parser.parse_args()
+
+    results = {}
+    failed = False
+
+    modules = {"fb_vmware": "fb_vmware"}
+    modules.update(get_entry_points())
+
+    print("{:<34} {:<42} {:>10}  {}".format("Entry point", "Module", "Time [ms]", "Heavy"))
+    for name, module in modules.items():
+        times = []
+        heavy = []
+        for _i in range(max(args.repeat, 1)):
+            (total, heavy) = measure(module)
+            times.append(total)
+        best_ms = min(times) / 1000.0
+        results[name] = {"module": module, "import_ms": best_ms, "heavy_modules": heavy}
+        print(
+            "{:<34} {:<42} {:>10.1f}  {}".format(name, module, best_ms, ", ".join(heavy) or "-")
+        )
+        if args.max_ms is not None and best_ms > args.max_ms:
+            failed = True
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as fh:
+            json.dump(results, fh, indent=4, sort_keys=True)
+
+    return 1 if failed else 0
+
+
+# =============================================================================
+if __name__ == "__main__":
+
+    sys.exit(main())
+
+# =============================================================================
+
+# vim: tabstop=4 expandtab shiftwidth=4 softtabstop=4 list
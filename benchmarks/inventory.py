@@ -0,0 +1,862 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+@summary: A synthetic in-process vSphere inventory for benchmarks.
+
+The inventory consists of real pyVmomi managed objects, which are bound to a
+fake stub adapter instead of a SOAP connection. Every access to a property of
+a managed object and every call of a managed method is answered by the stub
+from the generated inventory, it is counted as one round trip and may be
+delayed by an injectable latency per property or method name.
+
+So VsphereConnection may traverse the inventory as usual by setting its
+attribute service_instance to the service instance of the inventory. Bulk
+retrievals by RetrievePropertiesEx() are answered in one page.
+
+@author: Frank Brehm
+@contact: frank@brehm-online.com
+@copyright: © 2022 - 2026 by Frank Brehm, Berlin
+"""
+from __future__ import absolute_import, print_function
+
+# Standard modules
+import datetime
+import threading
+import time
+import uuid
+from collections import Counter, defaultdict
+
+# Third party modules
+from pyVmomi import vim, vmodl
+
+__version__ = "0.3.1"
+
+GIB = 1024 * 1024 * 1024
+MIB = 1024 * 1024
+
+DEFAULT_VMS = 1000
+VMS_PER_HOST = 40
+HOSTS_PER_CLUSTER = 16
+VMS_PER_DATASTORE = 50
+DATASTORES_PER_POD = 8
+VMS_PER_NETWORK = 200
+VMS_PER_FOLDER = 100
+FOLDERS_PER_TOP_FOLDER = 10
+
+STORAGE_TYPES = ("ssd", "sas", "sata")
+
+
+# =============================================================================
+class FakeVimStub(object):
+    """
+    A stub adapter answering all requests of managed objects from an inventory.
+
+    The latency may be given as a dict with property or method names as keys and
+    the delay in seconds as values. The delay for all other names is default_latency.
+    """
+
+    version = "vim.version.version1"
+
+    # -------------------------------------------------------------------------
+    def __init__(self, latency=None, default_latency=0.0):
+        """Initialize a FakeVimStub object."""
+        self.objects = {}
+        self.methods = {}
+        self.latency = dict(latency or {})
+        self.default_latency = float(default_latency)
+        self.lock = threading.Lock()
+        self.round_trips = 0
+        self.calls = Counter()
+
+    # -------------------------------------------------------------------------
+    def __repr__(self):
+        """Typecasting into a string for reproduction."""
+        return "<{c}(objects={o}, round_trips={r})>".format(
+            c=self.__class__.__name__, o=len(self.objects), r=self.round_trips
+        )
+
+    # -------------------------------------------------------------------------
+    def _count(self, mo, name):
+
+        with self.lock:
+            self.round_trips += 1
+            self.calls[(mo.__class__.__name__, name)] += 1
+
+        delay = self.latency.get(name, self.default_latency)
+        if delay > 0:
+            time.sleep(delay)
+
+    # -------------------------------------------------------------------------
+    def reset_counters(self):
+        """Reset the round trip counters."""
+        with self.lock:
+            self.round_trips = 0
+            self.calls = Counter()
+
+    # -------------------------------------------------------------------------
+    def InvokeAccessor(self, mo, info):  # noqa: N802
+        """Return the value of the property of the managed object given by info."""
+        self._count(mo, info.name)
+
+        props = self.objects.get(mo._moId, {})
+        if info.name in props:
+            return props[info.name]
+        if info.type.__name__.endswith("[]"):
+            return info.type()
+        return None
+
+    # -------------------------------------------------------------------------
+    def InvokeMethod(self, mo, info, args):  # noqa: N802
+        """Execute the managed method given by info."""
+        self._count(mo, info.name)
+
+        handler = self.methods.get(info.name)
+        if handler is None:
+            raise vmodl.fault.MethodNotFound(receiver=mo, method=info.name)
+        return handler(mo, *args)
+
+
+# =============================================================================
+class SyntheticInventory(object):
+    """
+    A generated vSphere inventory for benchmarks.
+
+    It consists of datacenters, folders, clusters, hosts, datastores, datastore
+    clusters, networks and virtual machines with devices. The numbers of all
+    other objects are derived from the number of VMs.
+    """
+
+    # -------------------------------------------------------------------------
+    def __init__(
+        self,
+        vms=DEFAULT_VMS,
+        datacenters=1,
+        latency=None,
+        default_latency=0.0,
+        seed_name="bench",
+    ):
+        """Initialize a SyntheticInventory object and generate all objects."""
+        self.num_vms = max(int(vms), 1)
+        self.num_datacenters = max(int(datacenters), 1)
+        self.seed_name = seed_name
+        self.stub = FakeVimStub(latency=latency, default_latency=default_latency)
+
+        self._next_id = {}
+        self.counts = Counter()
+        self.entities = defaultdict(list)
+        self.vm_names = []
+        self.host_names = []
+        self.datastore_names = []
+
+        self.stub.methods["RetrieveContent"] = self._retrieve_content
+        self.stub.methods["RetrieveServiceContent"] = self._retrieve_content
+        self.stub.methods["CreateContainerView"] = self._create_container_view
+        self.stub.methods["Destroy"] = self._destroy_view
+        self.stub.methods["DestroyView"] = self._destroy_view
+        self.stub.methods["RetrievePropertiesEx"] = self._retrieve_properties_ex
+        self.stub.methods["Logout"] = self._logout
+
+        self.service_instance = vim.ServiceInstance("ServiceInstance", self.stub)
+        self.root_folder = self._new_mo(vim.Folder, "group-d", name="Datacenters")
+        self.view_manager = self._new_mo(vim.view.ViewManager, None, "ViewManager")
+        self.session_manager = self._new_mo(vim.SessionManager, None, "SessionManager")
+        self.property_collector = self._new_mo(
+            vmodl.query.PropertyCollector, None, "propertyCollector"
+        )
+        self.search_index = self._new_mo(vim.SearchIndex, None, "SearchIndex")
+
+        self.about = vim.AboutInfo(
+            name="VMware vCenter Server",
+            fullName="VMware vCenter Server 8.0.2 build-22617221 (synthetic)",
+            vendor="VMware, Inc.",
+            version="8.0.2",
+            build="22617221",
+            localeVersion="INTL",
+            localeBuild="000",
+            osType="linux-x64",
+            productLineId="vpx",
+            apiType="VirtualCenter",
+            apiVersion="8.0.2.0",
+            instanceUuid=str(uuid.uuid5(uuid.NAMESPACE_DNS, seed_name)),
+            licenseProductName="VMware VirtualCenter Server",
+            licenseProductVersion="8.0",
+        )
+        self.content = vim.ServiceInstanceContent(
+            rootFolder=self.root_folder,
+            propertyCollector=self.property_collector,
+            viewManager=self.view_manager,
+            about=self.about,
+            sessionManager=self.session_manager,
+            searchIndex=self.search_index,
+        )
+        self._set_props(self.service_instance, content=self.content)
+
+        datacenters = []
+        for dc_nr in range(self.num_datacenters):
+            datacenters.append(self._generate_datacenter(dc_nr))
+        self._set_props(self.root_folder, childEntity=datacenters)
+
+    # -------------------------------------------------------------------------
+    def __repr__(self):
+        """Typecasting into a string for reproduction."""
+        return "<{c}(vms={v!r}, datacenters={d!r})>".format(
+            c=self.__class__.__name__, v=self.num_vms, d=self.num_datacenters
+        )
+
+    # -------------------------------------------------------------------------
+    @property
+    def round_trips(self):
+        """Return the number of round trips since the last reset of the counters."""
+        return self.stub.round_trips
+
+    # -------------------------------------------------------------------------
+    def reset_counters(self):
+        """Reset the round trip counters of the stub."""
+        self.stub.reset_counters()
+
+    # -------------------------------------------------------------------------
+    def _new_mo(self, mo_type, prefix, mo_id=None, **props):
+
+        if mo_id is None:
+            nr = self._next_id.get(prefix, 0) + 1
+            self._next_id[prefix] = nr
+            mo_id = "{p}{n}".format(p=prefix, n=nr)
+        mo = mo_type(mo_id, self.stub)
+        self.stub.objects[mo_id] = {}
+        self.counts[mo_type.__name__] += 1
+        self.entities[mo_type].append(mo)
+        if props:
+            self._set_props(mo, **props)
+        return mo
+
+    # -------------------------------------------------------------------------
+    def _set_props(self, mo, **props):
+
+        self.stub.objects.setdefault(mo._moId, {}).update(props)
+
+    # -------------------------------------------------------------------------
+    def _get_prop(self, mo, name):
+
+        return self.stub.objects[mo._moId].get(name)
+
+    # -------------------------------------------------------------------------
+    def _new_folder(self, name, parent, child_type):
+
+        return self._new_mo(
+            vim.Folder,
+            "group-" + child_type,
+            name=name,
+            parent=parent,
+            childType=[child_type],
+            childEntity=[],
+            overallStatus="green",
+            configStatus="green",
+        )
+
+    # -------------------------------------------------------------------------
+    def _add_child(self, folder, child):
+
+        self.stub.objects[folder._moId]["childEntity"].append(child)
+
+    # -------------------------------------------------------------------------
+    def _retrieve_content(self, mo):
+
+        return self.content
+
+    # -------------------------------------------------------------------------
+    def _create_container_view(self, mo, container, types, recursive):
+
+        result = []
+        self._collect(container, tuple(types or ()), recursive, result, top=True)
+        return self._new_mo(vim.view.ContainerView, "session[bench]view-", view=result)
+
+    # -------------------------------------------------------------------------
+    def _collect(self, entity, types, recursive, result, top=False):
+
+        if not top and (not types or isinstance(entity, types)):
+            result.append(entity)
+        if not top and not recursive:
+            return
+
+        props = self.stub.objects.get(entity._moId, {})
+        children = []
+        for prop in ("childEntity", "hostFolder", "vmFolder", "datastoreFolder", "networkFolder"):
+            value = props.get(prop)
+            if value is None:
+                continue
+            if isinstance(value, list):
+                children.extend(value)
+            else:
+                children.append(value)
+        if isinstance(entity, vim.ComputeResource):
+            children.extend(props.get("host", []))
+        if isinstance(entity, (vim.ComputeResource, vim.ResourcePool)):
+            pools = props.get("resourcePool")
+            if isinstance(pools, list):
+                children.extend(pools)
+            elif pools is not None:
+                children.append(pools)
+
+        for child in children:
+            if top or recursive:
+                self._collect(child, types, recursive, result)
+
+    # -------------------------------------------------------------------------
+    def _destroy_view(self, mo):
+
+        self.stub.objects.pop(mo._moId, None)
+
+    # -------------------------------------------------------------------------
+    def _property_value(self, mo, path):
+
+        value = mo
+        for name in path.split("."):
+            if value is None:
+                return None
+            prop_type = value._GetPropertyInfo(name).type
+            if hasattr(value, "_moId"):
+                value = self._get_prop(value, name)
+            else:
+                value = getattr(value, name, None)
+            # Lists of the synthetic inventory are not typed vmodl arrays
+            if isinstance(value, list) and not isinstance(value, prop_type):
+                value = prop_type(value)
+        return value
+
+    # -------------------------------------------------------------------------
+    def _retrieve_properties_ex(self, mo, spec_set, options):
+
+        # All objects in one page, counted as one round trip
+        pc = vmodl.query.PropertyCollector
+        contents = []
+        for filter_spec in spec_set or []:
+            for obj_spec in filter_spec.objectSet:
+                objects = [obj_spec.obj]
+                if isinstance(obj_spec.obj, vim.view.ContainerView):
+                    objects = self._get_prop(obj_spec.obj, "view") or []
+                for obj in objects:
+                    prop_set = []
+                    for prop_spec in filter_spec.propSet:
+                        if not isinstance(obj, prop_spec.type):
+                            continue
+                        for path in prop_spec.pathSet:
+                            value = self._property_value(obj, path)
+                            if value is not None:
+                                prop_set.append(vmodl.DynamicProperty(name=path, val=value))
+                    if prop_set:
+                        contents.append(pc.ObjectContent(obj=obj, propSet=prop_set))
+        if not contents:
+            return None
+        return pc.RetrieveResult(objects=contents)
+
+    # -------------------------------------------------------------------------
+    def _logout(self, mo):
+
+        return None
+
+    # -------------------------------------------------------------------------
+    def _generate_datacenter(self, dc_nr):
+
+        dc_name = "{s}-dc{n:02d}".format(s=self.seed_name, n=dc_nr + 1)
+        dc = self._new_mo(vim.Datacenter, "datacenter-")
+
+        host_folder = self._new_folder("host", dc, "ComputeResource")
+        vm_folder = self._new_folder("vm", dc, "VirtualMachine")
+        ds_folder = self._new_folder("datastore", dc, "Datastore")
+        net_folder = self._new_folder("network", dc, "Network")
+
+        self._set_props(
+            dc,
+            name=dc_name,
+            parent=self.root_folder,
+            overallStatus="green",
+            configStatus="green",
+            hostFolder=host_folder,
+            vmFolder=vm_folder,
+            datastoreFolder=ds_folder,
+            networkFolder=net_folder,
+            configuration=vim.Datacenter.ConfigInfo(
+                defaultHardwareVersionKey="vmx-19", maximumHardwareVersionKey="vmx-21"
+            ),
+        )
+
+        first_vm = self.num_vms * dc_nr // self.num_datacenters
+        last_vm = self.num_vms * (dc_nr + 1) // self.num_datacenters
+        num_vms = max(last_vm - first_vm, 1)
+
+        num_hosts = max(num_vms // VMS_PER_HOST, 2)
+        num_clusters = max(num_hosts // HOSTS_PER_CLUSTER, 1)
+        num_datastores = max(num_vms // VMS_PER_DATASTORE, 4)
+        num_networks = max(num_vms // VMS_PER_NETWORK, 2)
+
+        networks = self._generate_networks(dc_name, dc_nr, net_folder, num_networks)
+        datastores = self._generate_datastores(dc_name, ds_folder, num_datastores)
+        clusters = self._generate_clusters(
+            dc_name, host_folder, num_clusters, num_hosts, networks, datastores
+        )
+        self._generate_vms(dc_name, vm_folder, num_vms, clusters, networks, datastores)
+
+        return dc
+
+    # -------------------------------------------------------------------------
+    def _generate_networks(self, dc_name, dc_nr, net_folder, num_networks):
+
+        dvs = self._new_mo(vim.dvs.VmwareDistributedVirtualSwitch, "dvs-")
+        dvs_uuid = str(uuid.uuid5(uuid.NAMESPACE_DNS, dc_name + "-dvs")).replace("-", " ")
+        dvs_name = dc_name + "-dvs"
+        self._set_props(
+            dvs,
+            name=dvs_name,
+            parent=net_folder,
+            uuid=dvs_uuid,
+            overallStatus="green",
+            configStatus="green",
+            summary=vim.DistributedVirtualSwitch.Summary(
+                name=dvs_name, uuid=dvs_uuid, numPorts=num_networks * 256, numHosts=0
+            ),
+            config=vim.dvs.VmwareDistributedVirtualSwitch.ConfigInfo(
+                name=dvs_name,
+                uuid=dvs_uuid,
+                createTime=datetime.datetime(2024, 1, 1, tzinfo=datetime.timezone.utc),
+                description="Synthetic distributed switch",
+                maxPorts=num_networks * 1024,
+                numPorts=num_networks * 256,
+                numStandalonePorts=0,
+                defaultProxySwitchMaxNumPorts=512,
+                networkResourceManagementEnabled=True,
+                contact=vim.DistributedVirtualSwitch.ContactInfo(name="bench", contact="bench"),
+                productInfo=vim.dvs.ProductSpec(
+                    name="DVS", vendor="VMware, Inc.", version="8.0.0"
+                ),
+            ),
+        )
+        self._add_child(net_folder, dvs)
+
+        vmw_dvs = vim.dvs.VmwareDistributedVirtualSwitch
+        networks = []
+        for net_nr in range(num_networks):
+            address = "10.{d}.{h}.0".format(d=dc_nr + 16, h=net_nr % 256)
+            if net_nr >= 256:
+                address = "10.{d}.{h}.0".format(d=dc_nr + 128 + net_nr // 256, h=net_nr % 256)
+            net_name = "{dc}-pg {a}_24".format(dc=dc_name, a=address)
+            pg_key = "dvportgroup-{dc}-{n}".format(dc=dc_nr + 1, n=net_nr + 1)
+            portgroup = self._new_mo(vim.dvs.DistributedVirtualPortgroup, "dvportgroup-")
+            port_keys = [str(net_nr * 256 + i) for i in range(8)]
+            self._set_props(
+                portgroup,
+                name=net_name,
+                parent=net_folder,
+                key=pg_key,
+                portKeys=port_keys,
+                overallStatus="green",
+                configStatus="green",
+                summary=vim.Network.Summary(network=portgroup, name=net_name, accessible=True),
+                config=vim.dvs.DistributedVirtualPortgroup.ConfigInfo(
+                    key=pg_key,
+                    name=net_name,
+                    numPorts=len(port_keys),
+                    type="earlyBinding",
+                    autoExpand=True,
+                    description="Synthetic port group",
+                    distributedVirtualSwitch=dvs,
+                    defaultPortConfig=vmw_dvs.VmwarePortConfigPolicy(
+                        vlan=vmw_dvs.VlanIdSpec(vlanId=100 + net_nr % 3900, inherited=False)
+                    ),
+                ),
+            )
+            self._add_child(net_folder, portgroup)
+            networks.append((portgroup, net_name, pg_key, dvs_uuid))
+
+        vm_net = self._new_mo(vim.Network, "network-")
+        vm_net_name = "{dc}-VM Network 192.168.{n}.0_24".format(dc=dc_name, n=dc_nr % 256)
+        self._set_props(
+            vm_net,
+            name=vm_net_name,
+            parent=net_folder,
+            overallStatus="green",
+            configStatus="green",
+            summary=vim.Network.Summary(network=vm_net, name=vm_net_name, accessible=True),
+        )
+        self._add_child(net_folder, vm_net)
+
+        return networks
+
+    # -------------------------------------------------------------------------
+    def _generate_datastores(self, dc_name, ds_folder, num_datastores):
+
+        datastores = []
+        pods = {}
+        for ds_nr in range(num_datastores):
+            stype = STORAGE_TYPES[ds_nr % len(STORAGE_TYPES)]
+            pod_nr = ds_nr // (DATASTORES_PER_POD * len(STORAGE_TYPES))
+            ds_name = "{dc}-{t}-{n:04d}".format(dc=dc_name, t=stype, n=ds_nr + 1)
+            capacity = (2048 + (ds_nr % 7) * 512) * GIB
+            free_space = capacity * (10 + (ds_nr * 37) % 80) // 100
+
+            ds = self._new_mo(vim.Datastore, "datastore-")
+            ds_url = "ds:///vmfs/volumes/{}/".format(uuid.uuid5(uuid.NAMESPACE_DNS, ds_name))
+            self._set_props(
+                ds,
+                name=ds_name,
+                overallStatus="green",
+                configStatus="green",
+                host=[],
+                summary=vim.Datastore.Summary(
+                    datastore=ds,
+                    name=ds_name,
+                    url=ds_url,
+                    capacity=capacity,
+                    freeSpace=free_space,
+                    uncommitted=0,
+                    accessible=True,
+                    multipleHostAccess=True,
+                    type="VMFS",
+                    maintenanceMode="normal",
+                ),
+            )
+
+            pod_key = (stype, pod_nr)
+            if ds_nr % 5 == 4:
+                parent = ds_folder
+                self._add_child(ds_folder, ds)
+            else:
+                if pod_key not in pods:
+                    pod_name = "{dc}-{t}-pod{n:02d}".format(dc=dc_name, t=stype, n=pod_nr + 1)
+                    pod = self._new_mo(
+                        vim.StoragePod,
+                        "group-p",
+                        name=pod_name,
+                        parent=ds_folder,
+                        childEntity=[],
+                        overallStatus="green",
+                        configStatus="green",
+                    )
+                    self._add_child(ds_folder, pod)
+                    pods[pod_key] = [pod, pod_name, 0, 0]
+                parent = pods[pod_key][0]
+                pods[pod_key][2] += capacity
+                pods[pod_key][3] += free_space
+                self._add_child(parent, ds)
+
+            self._set_props(ds, parent=parent)
+            datastores.append((ds, ds_name))
+            self.datastore_names.append(ds_name)
+
+        for (pod, pod_name, capacity, free_space) in pods.values():
+            self._set_props(
+                pod,
+                summary=vim.StoragePod.Summary(
+                    name=pod_name, capacity=capacity, freeSpace=free_space
+                ),
+            )
+
+        return datastores
+
+    # -------------------------------------------------------------------------
+    def _generate_clusters(
+        self, dc_name, host_folder, num_clusters, num_hosts, networks, datastores
+    ):
+
+        clusters = []
+        for cl_nr in range(num_clusters):
+            cl_name = "{dc}-cl{n:02d}".format(dc=dc_name, n=cl_nr + 1)
+            cluster = self._new_mo(vim.ClusterComputeResource, "domain-c")
+            rpool = self._new_mo(vim.ResourcePool, "resgroup-")
+            self._set_props(
+                rpool,
+                name="Resources",
+                parent=cluster,
+                owner=cluster,
+                summary=vim.ResourcePool.Summary(name="Resources"),
+            )
+            cl_hosts = []
+            first = num_hosts * cl_nr // num_clusters
+            last = num_hosts * (cl_nr + 1) // num_clusters
+            for host_nr in range(first, last):
+                cl_hosts.append(self._generate_host(dc_name, cluster, host_nr, networks))
+
+            cl_datastores = [ds for (ds, ds_name) in datastores]
+            for ds in cl_datastores:
+                mounts = self._get_prop(ds, "host")
+                for host in cl_hosts:
+                    mounts.append(
+                        vim.Datastore.HostMount(
+                            key=host,
+                            mountInfo=vim.host.MountInfo(
+                                path="/vmfs/volumes/" + ds._moId,
+                                accessMode="readWrite",
+                                mounted=True,
+                                accessible=True,
+                            ),
+                        )
+                    )
+
+            num_cores = len(cl_hosts) * 64
+            memory = len(cl_hosts) * 1024 * GIB
+            self._set_props(
+                cluster,
+                name=cl_name,
+                parent=host_folder,
+                overallStatus="green",
+                configStatus="green",
+                resourcePool=rpool,
+                host=cl_hosts,
+                network=[net[0] for net in networks],
+                datastore=cl_datastores,
+                summary=vim.ClusterComputeResource.Summary(
+                    numCpuCores=num_cores,
+                    numCpuThreads=num_cores * 2,
+                    numEffectiveHosts=len(cl_hosts),
+                    numHosts=len(cl_hosts),
+                    effectiveMemory=memory // MIB,
+                    totalMemory=memory,
+                    totalCpu=num_cores * 2400,
+                    effectiveCpu=num_cores * 2400,
+                ),
+            )
+            self._add_child(host_folder, cluster)
+            clusters.append((cluster, rpool, cl_hosts))
+
+        return clusters
+
+    # -------------------------------------------------------------------------
+    def _generate_host(self, dc_name, cluster, host_nr, networks):
+
+        host_name = "esx{n:04d}.{dc}.example.com".format(n=host_nr + 1, dc=dc_name)
+        host = self._new_mo(vim.HostSystem, "host-")
+        portgroups = []
+        for vlan in (0, 10):
+            portgroups.append(
+                vim.host.PortGroup(
+                    key="key-vim.host.PortGroup-VLAN{}".format(vlan),
+                    spec=vim.host.PortGroup.Specification(
+                        name="VLAN {}".format(vlan),
+                        vlanId=vlan,
+                        vswitchName="vSwitch0",
+                        policy=vim.host.NetworkPolicy(),
+                    ),
+                )
+            )
+        host_uuid = str(uuid.uuid5(uuid.NAMESPACE_DNS, host_name))
+        self._set_props(
+            host,
+            name=host_name,
+            parent=cluster,
+            overallStatus="green",
+            configStatus="green",
+            summary=vim.host.Summary(
+                host=host,
+                managementServerIp="10.0.0.1",
+                rebootRequired=False,
+                config=vim.host.Summary.ConfigSummary(name=host_name, port=443),
+            ),
+            hardware=vim.host.HardwareInfo(
+                memorySize=1024 * GIB,
+                biosInfo=vim.host.BIOSInfo(
+                    biosVersion="2.19.1",
+                    releaseDate=datetime.datetime(2023, 6, 1, tzinfo=datetime.timezone.utc),
+                    vendor="Synthetic",
+                ),
+                cpuInfo=vim.host.CpuInfo(
+                    numCpuPackages=2, numCpuCores=64, numCpuThreads=128, hz=2400000000
+                ),
+                systemInfo=vim.host.SystemInfo(
+                    vendor="Synthetic", model="Bench Server", uuid=host_uuid
+                ),
+            ),
+            runtime=vim.host.RuntimeInfo(
+                connectionState="connected",
+                powerState="poweredOn",
+                standbyMode="none",
+                inMaintenanceMode=False,
+                inQuarantineMode=False,
+                bootTime=datetime.datetime(2025, 1, 1, tzinfo=datetime.timezone.utc),
+            ),
+            config=vim.host.ConfigInfo(
+                host=host,
+                product=vim.AboutInfo(
+                    name="VMware ESXi",
+                    fullName="VMware ESXi 8.0.2 build-22380479",
+                    vendor="VMware, Inc.",
+                    version="8.0.2",
+                    build="22380479",
+                    osType="vmnix-x86",
+                    apiType="HostAgent",
+                    apiVersion="8.0.2.0",
+                    licenseProductName="VMware ESX Server",
+                    licenseProductVersion="8.0",
+                ),
+                network=vim.host.NetworkInfo(
+                    ipV6Enabled=False, atBootIpV6Enabled=False, portgroup=portgroups
+                ),
+            ),
+        )
+        self.host_names.append(host_name)
+        return host
+
+    # -------------------------------------------------------------------------
+    def _generate_vms(self, dc_name, vm_folder, num_vms, clusters, networks, datastores):
+
+        num_folders = max((num_vms + VMS_PER_FOLDER - 1) // VMS_PER_FOLDER, 1)
+        top_folder = None
+        folder = None
+
+        for vm_nr in range(num_vms):
+            if vm_nr % VMS_PER_FOLDER == 0:
+                folder_nr = vm_nr // VMS_PER_FOLDER
+                if folder_nr % FOLDERS_PER_TOP_FOLDER == 0:
+                    top_name = "app{n:03d}".format(n=folder_nr // FOLDERS_PER_TOP_FOLDER + 1)
+                    top_folder = self._new_folder(top_name, vm_folder, "VirtualMachine")
+                    self._add_child(vm_folder, top_folder)
+                if num_folders > 1:
+                    folder_name = "sub{n:04d}".format(n=folder_nr + 1)
+                    folder = self._new_folder(folder_name, top_folder, "VirtualMachine")
+                    self._add_child(top_folder, folder)
+                else:
+                    folder = top_folder
+
+            (cluster, rpool, cl_hosts) = clusters[vm_nr % len(clusters)]
+            host = cl_hosts[vm_nr % len(cl_hosts)]
+            network = networks[vm_nr % len(networks)]
+            (ds, ds_name) = datastores[vm_nr % len(datastores)]
+            vm = self._generate_vm(dc_name, vm_nr, folder, rpool, host, network, ds, ds_name)
+            self._add_child(folder, vm)
+
+    # -------------------------------------------------------------------------
+    def _generate_vm(self, dc_name, vm_nr, folder, rpool, host, network, ds, ds_name):
+
+        vm_name = "{dc}-vm{n:06d}".format(dc=dc_name, n=vm_nr + 1)
+        vm = self._new_mo(vim.VirtualMachine, "vm-")
+        vm_uuid = str(uuid.uuid5(uuid.NAMESPACE_DNS, vm_name))
+        (portgroup, net_name, pg_key, dvs_uuid) = network
+        vmx_path = "[{ds}] {vm}/{vm}.vmx".format(ds=ds_name, vm=vm_name)
+        is_template = vm_nr % 50 == 49
+
+        ctrl = vim.vm.device.ParaVirtualSCSIController(
+            key=1000,
+            busNumber=0,
+            device=[2000, 2001],
+            hotAddRemove=True,
+            sharedBus="noSharing",
+            scsiCtlrUnitNumber=7,
+            deviceInfo=vim.Description(
+                label="SCSI controller 0", summary="VMware paravirtual SCSI"
+            ),
+        )
+        devices = [ctrl]
+        for disk_nr, size_gb in enumerate((32, 100)):
+            devices.append(
+                vim.vm.device.VirtualDisk(
+                    key=2000 + disk_nr,
+                    unitNumber=disk_nr,
+                    controllerKey=1000,
+                    capacityInBytes=size_gb * GIB,
+                    capacityInKB=size_gb * 1024 * 1024,
+                    deviceInfo=vim.Description(
+                        label="Hard disk {}".format(disk_nr + 1),
+                        summary="{:,} KB".format(size_gb * 1024 * 1024),
+                    ),
+                    backing=vim.vm.device.VirtualDisk.FlatVer2BackingInfo(
+                        fileName="[{ds}] {vm}/{vm}_{n}.vmdk".format(
+                            ds=ds_name, vm=vm_name, n=disk_nr
+                        ),
+                        diskMode="persistent",
+                        thinProvisioned=True,
+                        datastore=ds,
+                    ),
+                )
+            )
+        devices.append(
+            vim.vm.device.VirtualVmxnet3(
+                key=4000,
+                unitNumber=7,
+                controllerKey=100,
+                addressType="assigned",
+                macAddress="00:50:56:{a:02x}:{b:02x}:{c:02x}".format(
+                    a=(vm_nr >> 16) & 0x3F, b=(vm_nr >> 8) & 0xFF, c=vm_nr & 0xFF
+                ),
+                wakeOnLanEnabled=True,
+                externalId="",
+                deviceInfo=vim.Description(label="Network adapter 1", summary=net_name),
+                connectable=vim.vm.device.VirtualDevice.ConnectInfo(
+                    connected=True,
+                    status="ok",
+                    startConnected=True,
+                    allowGuestControl=True,
+                ),
+                backing=vim.vm.device.VirtualEthernetCard.DistributedVirtualPortBackingInfo(
+                    port=vim.dvs.PortConnection(
+                        switchUuid=dvs_uuid, portgroupKey=pg_key, portKey=str(vm_nr % 8)
+                    )
+                ),
+            )
+        )
+
+        power_state = "poweredOn"
+        tools_state = "guestToolsRunning"
+        guest_state = "running"
+        if is_template:
+            power_state = "poweredOff"
+            tools_state = "guestToolsNotRunning"
+            guest_state = "notRunning"
+        self._set_props(
+            vm,
+            name=vm_name,
+            parent=folder,
+            resourcePool=None if is_template else rpool,
+            overallStatus="green",
+            configStatus="green",
+            summary=vim.vm.Summary(
+                vm=vm,
+                config=vim.vm.Summary.ConfigSummary(
+                    name=vm_name,
+                    template=is_template,
+                    vmPathName=vmx_path,
+                    memorySizeMB=4096,
+                    numCpu=2,
+                    numEthernetCards=1,
+                    numVirtualDisks=2,
+                    uuid=vm_uuid,
+                    instanceUuid=vm_uuid,
+                    guestId="debian12_64Guest",
+                    guestFullName="Debian GNU/Linux 12 (64-bit)",
+                ),
+                runtime=vim.vm.RuntimeInfo(host=host, powerState=power_state),
+            ),
+            runtime=vim.vm.RuntimeInfo(
+                host=host, powerState=power_state, connectionState="connected"
+            ),
+            config=vim.vm.ConfigInfo(
+                name=vm_name,
+                version="vmx-19",
+                uuid=vm_uuid,
+                instanceUuid=vm_uuid,
+                template=is_template,
+                guestId="debian12_64Guest",
+                hardware=vim.vm.VirtualHardware(numCPU=2, memoryMB=4096, device=devices),
+            ),
+            guest=vim.vm.GuestInfo(
+                toolsVersion="12352",
+                toolsInstallType="guestToolsTypeOpenVMTools",
+                toolsRunningStatus=tools_state,
+                toolsVersionStatus2="guestToolsUnmanaged",
+                guestState=guest_state,
+            ),
+            datastore=[ds],
+            network=[portgroup],
+        )
+        self.vm_names.append(vm_name)
+        return vm
+
+
+# =============================================================================
+if __name__ == "__main__":
+
+    inventory = SyntheticInventory()
+    print(repr(inventory))
+    for obj_type, count in sorted(inventory.counts.items()):
+        print("{:<40} {:>8}".format(obj_type, count))
+
+# =============================================================================
+
+# vim: tabstop=4 expandtab shiftwidth=4 softtabstop=4 list
@@ -0,0 +1,1282 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+@summary: A loopback vCenter simulator speaking the SOAP dialect of pyVmomi.
+
+It serves a synthetic inventory (see inventory.py) on localhost, so
+VsphereConnection may connect to it with SmartConnect() and can be tested
+and load-tested offline. It implements the subset of the vSphere API used
+by fb_vmware:
+
+* ServiceInstance.RetrieveContent() and the accessor of all properties of
+  managed objects (the pyVmomi 'Fetch' method)
+* SessionManager.Login() and Logout()
+* ViewManager.CreateContainerView() and View.DestroyView()
+* PropertyCollector.RetrieveContents(), RetrievePropertiesEx(),
+  ContinueRetrievePropertiesEx(), CreateFilter(), WaitForUpdates(),
+  WaitForUpdatesEx() and CancelWaitForUpdates()
+* Tasks for CreateVM, PowerOn, PowerOff, Destroy and Reconfigure
+* SearchIndex.FindByInventoryPath(), FindChild(), FindByUuid() and
+  FindByDnsName()
+
+All requests are counted as round trips of the inventory and delayed by its
+latencies, as if they were executed in process.
+
+@author: Frank Brehm
+@contact: frank@brehm-online.com
+@copyright: © 2022 - 2026 by Frank Brehm, Berlin
+"""
+from __future__ import absolute_import, print_function
+
+# Standard modules
+import argparse
+import datetime
+import gzip
+import itertools
+import logging
+import ssl
+import sys
+import threading
+import time
+import uuid
+from http.cookies import SimpleCookie
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from io import StringIO
+from pathlib import Path
+from xml.parsers.expat import ExpatError, ParserCreate
+
+BENCH_DIR = Path(__file__).resolve().parent
+if str(BENCH_DIR) not in sys.path:
+    sys.path.insert(0, str(BENCH_DIR))
+
+# Third party modules
+from pyVmomi import SoapAdapter, VmomiSupport, vim, vmodl  # noqa: E402
+
+# Own modules
+from inventory import SyntheticInventory  # noqa: E402
+
+__version__ = "0.3.1"
+
+LOG = logging.getLogger(__name__)
+
+DEFAULT_USER = "bench"
+DEFAULT_PASSWORD = "bench"
+DEFAULT_PAGE_SIZE = 1000
+# Smaller responses are not worth compressing
+MIN_COMPRESS_SIZE = 1024
+SESSION_COOKIE = "vmware_soap_session"
+
+VIM_VERSION = VmomiSupport.newestVersions.GetName("vim")
+VIM_NS = VmomiSupport.GetWsdlNamespace(VIM_VERSION)
+
+VmodlManagedObject = VmomiSupport.ManagedObject
+
+UNAUTHENTICATED_METHODS = ("RetrieveServiceContent", "Login", "Fetch")
+
+FETCH_INFO = VmomiSupport.Object(
+    name="Fetch",
+    wsdlName="Fetch",
+    params=(VmomiSupport.Object(name="prop", type=str, version=VIM_VERSION, flags=0),),
+    result=object,
+)
+
+
+# =============================================================================
+def utcnow():
+    """Return the current time as a timezone aware datetime object."""
+    return datetime.datetime.now(datetime.timezone.utc)
+
+
+# =============================================================================
+def serialize(val, info, version=VIM_VERSION, ns_map=None):
+    """Serialize the given value with a LenientSoapSerializer."""
+    writer = StringIO()
+    LenientSoapSerializer(writer, version, ns_map).Serialize(val, info)
+    return writer.getvalue()
+
+
+# =============================================================================
+class LenientSoapSerializer(SoapAdapter.SoapSerializer):
+    """
+    A SoapSerializer omitting unset mandatory fields.
+
+    The synthetic inventory fills only the fields evaluated by fb_vmware, the
+    client does not check the presence of mandatory fields.
+    """
+
+    # -------------------------------------------------------------------------
+    def _Serialize(self, val, info, defNS):  # noqa: N802
+
+        if val is None:
+            return
+        if isinstance(val, list) and not len(val) and info.type is not object:
+            return
+        SoapAdapter.SoapSerializer._Serialize(self, val, info, defNS)
+
+
+# =============================================================================
+class SoapRequestParser(SoapAdapter.ExpatDeserializerNSHandlers):
+    """
+    Parser of a SOAP request of a pyVmomi client.
+
+    The managed object '_this' and all parameters are deserialized with the
+    SoapDeserializer of pyVmomi according to the parameter types of the method.
+    """
+
+    # -------------------------------------------------------------------------
+    def __init__(self, version=VIM_VERSION):
+        """Initialize a SoapRequestParser object."""
+        SoapAdapter.ExpatDeserializerNSHandlers.__init__(self)
+        self.version = version
+        self.method = None
+        self.info = None
+        self.this = None
+        self.args = {}
+        self.depth = 0
+        self._param_types = {}
+        self._current = None
+
+    # -------------------------------------------------------------------------
+    def parse(self, data):
+        """Parse the given request and return a tuple (method info, this, args)."""
+        parser = ParserCreate(namespace_separator=SoapAdapter.NS_SEP)
+        parser.buffer_text = True
+        SoapAdapter.SetHandlers(parser, SoapAdapter.GetHandlers(self))
+        self.parser = parser
+        parser.Parse(data, True)
+        self._flush()
+        del self.parser
+        return (self.info, self.this, self.args)
+
+    # -------------------------------------------------------------------------
+    def _flush(self):
+
+        if self._current is None:
+            return
+        (name, deser, is_list) = self._current
+        self._current = None
+        value = deser.GetResult()
+        if name == "_this":
+            self.this = value
+        elif is_list:
+            self.args.setdefault(name, []).append(value)
+        else:
+            self.args[name] = value
+
+    # -------------------------------------------------------------------------
+    def StartElementHandler(self, tag, attr):  # noqa: N802
+        """Handle an opening XML tag."""
+        self._flush()
+        self.depth += 1
+        (ns, name) = tag.split(SoapAdapter.NS_SEP, 1) if SoapAdapter.NS_SEP in tag else ("", tag)
+
+        if self.depth == 3:
+            self.method = name
+            if name == "Fetch":
+                self.info = FETCH_INFO
+            else:
+                self.info = VmomiSupport.GetWsdlMethod(ns or VIM_NS, name).info
+            for param in self.info.params:
+                self._param_types[param.name] = param.type
+            return
+
+        if self.depth != 4:
+            return
+
+        is_list = False
+        if name == "_this":
+            ptype = VmomiSupport.ManagedObject
+        else:
+            ptype = self._param_types.get(name, object)
+            if issubclass(ptype, list):
+                is_list = True
+                ptype = ptype.Item
+
+        deser = SoapAdapter.SoapDeserializer(version=self.version)
+        deser.Deserialize(self.parser, ptype, False, self.nsMap)
+        deser.StartElementHandler(tag, attr)
+        self._current = (name, deser, is_list)
+        # The element is closed inside the deserializer
+        self.depth -= 1
+
+    # -------------------------------------------------------------------------
+    def EndElementHandler(self, tag):  # noqa: N802
+        """Handle a closing XML tag."""
+        self._flush()
+        self.depth -= 1
+
+    # -------------------------------------------------------------------------
+    def CharacterDataHandler(self, data):  # noqa: N802
+        """Ignore text data outside of the parameters."""
+        pass
+
+
+# =============================================================================
+class VcenterSimulator(object):
+    """A vCenter simulator serving a synthetic inventory via SOAP over HTTP."""
+
+    default_page_size = DEFAULT_PAGE_SIZE
+
+    # -------------------------------------------------------------------------
+    def __init__(
+        self,
+        inventory=None,
+        host="127.0.0.1",
+        port=0,
+        user=DEFAULT_USER,
+        password=DEFAULT_PASSWORD,
+        task_delay=0.0,
+        certfile=None,
+        keyfile=None,
+        compression=True,
+    ):
+        """Initialize a VcenterSimulator object."""
+        if inventory is None:
+            inventory = SyntheticInventory()
+        self.inventory = inventory
+        self.objects = inventory.stub.objects
+        self.host = host
+        self.port = port
+        self.user = user
+        self.password = password
+        self.task_delay = float(task_delay)
+        self.certfile = certfile
+        self.keyfile = keyfile
+        self.compression = compression
+
+        self.lock = threading.RLock()
+        self.sessions = {}
+        self.filters = {}
+        self.waits = {}
+        self.retrievals = {}
+        self.tasks = {}
+        self.update_version = 0
+        self.requests = 0
+        self.bytes_in = 0
+        self.bytes_out = 0
+        self.bytes_compressed = 0
+        self._ids = itertools.count(1)
+
+        self.server = None
+        self.thread = None
+
+        self.handlers = {
+            "RetrieveServiceContent": self.retrieve_service_content,
+            "Fetch": self.fetch,
+            "Login": self.login,
+            "Logout": self.logout,
+            "CreateContainerView": self.create_container_view,
+            "DestroyView": self.destroy_view,
+            "RetrieveProperties": self.retrieve_properties,
+            "RetrievePropertiesEx": self.retrieve_properties_ex,
+            "ContinueRetrievePropertiesEx": self.continue_retrieve_properties_ex,
+            "CancelRetrievePropertiesEx": self.cancel_retrieve_properties_ex,
+            "CreateFilter": self.create_filter,
+            "DestroyPropertyFilter": self.destroy_property_filter,
+            "WaitForUpdates": self.wait_for_updates,
+            "WaitForUpdatesEx": self.wait_for_updates_ex,
+            "CancelWaitForUpdates": self.cancel_wait_for_updates,
+            "FindByInventoryPath": self.find_by_inventory_path,
+            "FindChild": self.find_child,
+            "FindByUuid": self.find_by_uuid,
+            "FindByDnsName": self.find_by_dns_name,
+            "CreateVM_Task": self.create_vm_task,
+            "PowerOnVM_Task": self.power_on_vm_task,
+            "PowerOffVM_Task": self.power_off_vm_task,
+            "Destroy_Task": self.destroy_task,
+            "ReconfigVM_Task": self.reconfig_vm_task,
+        }
+
+    # -------------------------------------------------------------------------
+    def __repr__(self):
+        """Typecasting into a string for reproduction."""
+        return "<{c}(inventory={i!r}, host={h!r}, port={p!r})>".format(
+            c=self.__class__.__name__, i=self.inventory, h=self.host, p=self.port
+        )
+
+    # -------------------------------------------------------------------------
+    def __enter__(self):
+        """Start the simulator in a context manager."""
+        self.start()
+        return self
+
+    # -------------------------------------------------------------------------
+    def __exit__(self, exc_type, exc_value, traceback):
+        """Stop the simulator on leaving a context manager."""
+        self.stop()
+
+    # -------------------------------------------------------------------------
+    @property
+    def use_https(self):
+        """Return, whether the simulator is serving HTTPS."""
+        return bool(self.certfile)
+
+    # -------------------------------------------------------------------------
+    @property
+    def url(self):
+        """Return the URL of the SDK endpoint."""
+        proto = "https" if self.use_https else "http"
+        return "{pr}://{h}:{p}/sdk".format(pr=proto, h=self.host, p=self.port)
+
+    # -------------------------------------------------------------------------
+    def start(self):
+        """Start serving in a background thread."""
+        self.server = ThreadingHTTPServer((self.host, self.port), SimulatorRequestHandler)
+        self.server.daemon_threads = True
+        self.server.simulator = self
+        if self.certfile:
+            context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+            context.load_cert_chain(self.certfile, self.keyfile)
+            self.server.socket = context.wrap_socket(self.server.socket, server_side=True)
+        self.port = self.server.server_address[1]
+        self.thread = threading.Thread(
+            target=self.server.serve_forever, name="vcsim", daemon=True
+        )
+        self.thread.start()
+        LOG.info("vCenter simulator listening on {}.".format(self.url))
+
+    # -------------------------------------------------------------------------
+    def stop(self):
+        """Stop serving."""
+        if self.server:
+            self.server.shutdown()
+            self.server.server_close()
+        if self.thread:
+            self.thread.join()
+        self.server = None
+        self.thread = None
+
+    # -------------------------------------------------------------------------
+    def service_versions(self):
+        """Return the content of vimServiceVersions.xml."""
+        versions = []
+        for (name, version_id) in VmomiSupport.versionIdMap.items():
+            if name.startswith("vim.version.") and version_id not in versions:
+                versions.append(version_id)
+        prior = "".join("<version>{}</version>".format(v) for v in versions)
+        return (
+            '<?xml version="1.0" encoding="UTF-8" ?>\n'
+            '<namespaces version="1.0"><namespace><name>{ns}</name>'
+            "<version>{v}</version><priorVersions>{p}</priorVersions>"
+            "</namespace></namespaces>\n"
+        ).format(ns=VIM_NS, v=VmomiSupport.versionIdMap[VIM_VERSION], p=prior)
+
+    # -------------------------------------------------------------------------
+    def handle_soap(self, data, cookie_header=None):
+        """
+        Handle a SOAP request.
+
+        Returns a tuple of the HTTP status, the response body and a new
+        session cookie or None.
+        """
+        self.requests += 1
+        self.bytes_in += len(data)
+        session = self._get_session(cookie_header)
+        context = {"session": session, "cookie": None}
+
+        try:
+            try:
+                (info, this, args) = SoapRequestParser().parse(data)
+            except (ExpatError, KeyError, TypeError, AttributeError) as e:
+                raise vmodl.fault.InvalidRequest(msg="Could not parse request: {}".format(e))
+
+            wsdl_name = info.wsdlName
+            if session is None and wsdl_name not in UNAUTHENTICATED_METHODS:
+                raise vim.fault.NotAuthenticated(object=this, privilegeId="System.View")
+
+            handler = self.handlers.get(wsdl_name)
+            if handler is None:
+                raise vmodl.fault.MethodNotFound(receiver=this, method=wsdl_name)
+
+            count_name = args.get("prop") if wsdl_name == "Fetch" else info.name
+            if this is not None:
+                self.inventory.stub._count(this, count_name)
+
+            params = [args.get(param.name) for param in info.params]
+            result = handler(context, this, *params)
+            (result_type, result) = self._result_type(info, this, args, result)
+            body = self._serialize_response(wsdl_name, result, result_type)
+            status = 200
+        except vmodl.MethodFault as fault:
+            body = self._serialize_fault(fault)
+            status = 500
+        except Exception as e:
+            LOG.exception("Error on handling a request.")
+            body = self._serialize_fault(vmodl.fault.SystemError(msg=str(e), reason=str(e)))
+            status = 500
+
+        self.bytes_out += len(body)
+        return (status, body, context["cookie"])
+
+    # -------------------------------------------------------------------------
+    def _get_session(self, cookie_header):
+
+        if not cookie_header:
+            return None
+        cookie = SimpleCookie()
+        try:
+            cookie.load(cookie_header)
+        except Exception:
+            return None
+        morsel = cookie.get(SESSION_COOKIE)
+        if not morsel:
+            return None
+        return self.sessions.get(morsel.value)
+
+    # -------------------------------------------------------------------------
+    def _result_type(self, info, this, args, result):
+
+        if info is not FETCH_INFO:
+            return (info.result, result)
+        prop_info = self._get_prop_info(this, args.get("prop"))
+        return (prop_info.type, result)
+
+    # -------------------------------------------------------------------------
+    def _serialize_response(self, wsdl_name, result, result_type):
+
+        ns_map = SoapAdapter.SOAP_NSMAP.copy()
+        ns_map[VIM_NS] = ""
+        parts = [
+            SoapAdapter.XML_HEADER,
+            "\n",
+            SoapAdapter.SOAP_ENVELOPE_START,
+            SoapAdapter.SOAP_BODY_START,
+            '<{m}Response xmlns="{ns}">'.format(m=wsdl_name, ns=VIM_NS),
+        ]
+        if result is not None:
+            info = VmomiSupport.Object(
+                name="returnval", type=result_type, version=VIM_VERSION, flags=0
+            )
+            parts.append(serialize(result, info, ns_map=ns_map))
+        parts += [
+            "</{m}Response>".format(m=wsdl_name),
+            SoapAdapter.SOAP_BODY_END,
+            SoapAdapter.SOAP_ENVELOPE_END,
+        ]
+        return "".join(parts).encode("utf-8")
+
+    # -------------------------------------------------------------------------
+    def _serialize_fault(self, fault):
+
+        ns_map = SoapAdapter.SOAP_NSMAP.copy()
+        ns_map[VIM_NS] = ""
+        tag = fault._wsdlName + "Fault"
+        info = VmomiSupport.Object(name=tag, type=fault.__class__, version=VIM_VERSION, flags=0)
+        detail = SoapAdapter.SerializeFaultDetail(fault, info, VIM_VERSION, ns_map)
+        detail = detail.replace("<" + tag, '<{t} xmlns="{ns}"'.format(t=tag, ns=VIM_NS), 1)
+        msg = SoapAdapter.XmlEscape(fault.msg or fault._wsdlName)
+        body = (
+            "{hdr}\n{env}{body}<soapenv:Fault><faultcode>ServerFaultCode</faultcode>"
+            "<faultstring>{msg}</faultstring><detail>{det}</detail></soapenv:Fault>{be}{ee}"
+        ).format(
+            hdr=SoapAdapter.XML_HEADER,
+            env=SoapAdapter.SOAP_ENVELOPE_START,
+            body=SoapAdapter.SOAP_BODY_START,
+            msg=msg,
+            det=detail,
+            be=SoapAdapter.SOAP_BODY_END,
+            ee=SoapAdapter.SOAP_ENVELOPE_END,
+        )
+        return body.encode("utf-8")
+
+    # -------------------------------------------------------------------------
+    def _props(self, mo):
+
+        props = self.objects.get(mo._moId)
+        if props is None:
+            raise vmodl.fault.ManagedObjectNotFound(obj=mo)
+        return props
+
+    # -------------------------------------------------------------------------
+    def _get_prop_info(self, mo, name):
+
+        try:
+            return mo._GetPropertyInfo(name)
+        except AttributeError:
+            raise vmodl.query.InvalidProperty(name=name)
+
+    # -------------------------------------------------------------------------
+    def get_property(self, mo, path):
+        """Return the value of the given property path of the managed object."""
+        parts = path.split(".")
+        prop_info = self._get_prop_info(mo, parts[0])
+        with self.lock:
+            if isinstance(mo, vim.Task):
+                self._update_task(mo)
+            props = self._props(mo)
+            if parts[0] in props:
+                value = props[parts[0]]
+            elif issubclass(prop_info.type, list):
+                value = prop_info.type()
+            else:
+                value = None
+        if isinstance(value, list) and not isinstance(value, prop_info.type):
+            value = prop_info.type(value)
+        for part in parts[1:]:
+            if value is None:
+                break
+            prop_type = value._GetPropertyInfo(part).type
+            value = getattr(value, part, None)
+            # Lists of the synthetic inventory are not typed vmodl arrays
+            if isinstance(value, list) and not isinstance(value, prop_type):
+                value = prop_type(value)
+        return value
+
+    # -------------------------------------------------------------------------
+    def _new_id(self, prefix):
+
+        return "{p}{n}".format(p=prefix, n=next(self._ids))
+
+    # -------------------------------------------------------------------------
+    def retrieve_service_content(self, context, this):
+        """Return the service content."""
+        return self.inventory.content
+
+    # -------------------------------------------------------------------------
+    def fetch(self, context, this, prop):
+        """Return the value of a property of a managed object."""
+        return self.get_property(this, prop)
+
+    # -------------------------------------------------------------------------
+    def login(self, context, this, user_name, password, locale):
+        """Create a new session for the user."""
+        if user_name != self.user or password != self.password:
+            raise vim.fault.InvalidLogin(
+                msg="Cannot complete login due to an incorrect user name or password."
+            )
+        now = utcnow()
+        key = str(uuid.uuid4())
+        session = vim.UserSession(
+            key=key,
+            userName=user_name,
+            fullName=user_name,
+            loginTime=now,
+            lastActiveTime=now,
+            locale=locale or "en",
+            messageLocale=locale or "en",
+            extensionSession=False,
+            ipAddress="127.0.0.1",
+            userAgent="pyvmomi",
+            callCount=0,
+        )
+        with self.lock:
+            self.sessions[key] = session
+        context["cookie"] = '{c}="{k}"; Path=/; HttpOnly; Secure;'.format(c=SESSION_COOKIE, k=key)
+        return session
+
+    # -------------------------------------------------------------------------
+    def logout(self, context, this):
+        """Remove the current session."""
+        session = context["session"]
+        if session is not None:
+            with self.lock:
+                self.sessions.pop(session.key, None)
+        return None
+
+    # -------------------------------------------------------------------------
+    def create_container_view(self, context, this, container, types, recursive):
+        """Create a container view with all objects of the given types."""
+        self._props(container)
+        with self.lock:
+            return self.inventory._create_container_view(this, container, types, recursive)
+
+    # -------------------------------------------------------------------------
+    def destroy_view(self, context, this):
+        """Destroy the given view."""
+        with self.lock:
+            self.objects.pop(this._moId, None)
+        return None
+
+    # -------------------------------------------------------------------------
+    def _named_specs(self, select_set, named):
+
+        for spec in select_set or []:
+            if isinstance(spec, vmodl.query.PropertyCollector.TraversalSpec):
+                if spec.name and spec.name not in named:
+                    named[spec.name] = spec
+                    self._named_specs(spec.selectSet, named)
+                elif not spec.name:
+                    self._named_specs(spec.selectSet, named)
+
+    # -------------------------------------------------------------------------
+    def _traverse(self, obj, select_set, named, seen, result):
+
+        for selection in select_set or []:
+            spec = selection
+            if not isinstance(spec, vmodl.query.PropertyCollector.TraversalSpec):
+                spec = named.get(selection.name)
+            if spec is None or not isinstance(obj, spec.type):
+                continue
+            key = (obj._moId, spec.name or id(spec))
+            if key in seen:
+                continue
+            seen.add(key)
+
+            value = self.get_property(obj, spec.path)
+            if value is None:
+                continue
+            if not isinstance(value, list):
+                value = [value]
+            for child in value:
+                if not isinstance(child, VmodlManagedObject):
+                    continue
+                if not spec.skip and child._moId not in result:
+                    result[child._moId] = child
+                self._traverse(child, spec.selectSet, named, seen, result)
+
+    # -------------------------------------------------------------------------
+    def _collect_objects(self, filter_spec):
+
+        named = {}
+        for obj_spec in filter_spec.objectSet:
+            self._named_specs(obj_spec.selectSet, named)
+
+        result = {}
+        seen = set()
+        for obj_spec in filter_spec.objectSet:
+            obj = obj_spec.obj
+            self._props(obj)
+            if not obj_spec.skip and obj._moId not in result:
+                result[obj._moId] = obj
+            self._traverse(obj, obj_spec.selectSet, named, seen, result)
+        types = tuple(prop_spec.type for prop_spec in filter_spec.propSet)
+        return [obj for obj in result.values() if isinstance(obj, types)]
+
+    # -------------------------------------------------------------------------
+    def _prop_paths(self, obj, prop_set):
+
+        paths = []
+        for prop_spec in prop_set:
+            if not isinstance(obj, prop_spec.type):
+                continue
+            if prop_spec.all:
+                for prop in obj._propList:
+                    if prop.name not in paths:
+                        paths.append(prop.name)
+            for path in prop_spec.pathSet or []:
+                if path not in paths:
+                    paths.append(path)
+        return paths
+
+    # -------------------------------------------------------------------------
+    def _object_content(self, obj, prop_set, values=None):
+
+        content = vmodl.query.PropertyCollector.ObjectContent(obj=obj)
+        for path in self._prop_paths(obj, prop_set):
+            value = self.get_property(obj, path)
+            if values is not None:
+                values[path] = value
+            if value is None:
+                continue
+            content.propSet.append(vmodl.DynamicProperty(name=path, val=value))
+        return content
+
+    # -------------------------------------------------------------------------
+    def _retrieve(self, spec_set):
+
+        contents = []
+        for filter_spec in spec_set or []:
+            for obj in self._collect_objects(filter_spec):
+                contents.append(self._object_content(obj, filter_spec.propSet))
+        return contents
+
+    # -------------------------------------------------------------------------
+    def retrieve_properties(self, context, this, spec_set):
+        """Retrieve the properties of all objects selected by the filter specs."""
+        return self._retrieve(spec_set)
+
+    # -------------------------------------------------------------------------
+    def _page(self, contents, page_size):
+
+        result = vmodl.query.PropertyCollector.RetrieveResult(objects=contents[:page_size])
+        rest = contents[page_size:]
+        if rest:
+            token = self._new_id("token-")
+            with self.lock:
+                self.retrievals[token] = (rest, page_size)
+            result.token = token
+        return result
+
+    # -------------------------------------------------------------------------
+    def retrieve_properties_ex(self, context, this, spec_set, options):
+        """Retrieve the properties page by page."""
+        page_size = self.default_page_size
+        if options is not None and options.maxObjects:
+            page_size = max(int(options.maxObjects), 1)
+        contents = self._retrieve(spec_set)
+        if not contents:
+            return None
+        return self._page(contents, page_size)
+
+    # -------------------------------------------------------------------------
+    def continue_retrieve_properties_ex(self, context, this, token):
+        """Return the next page of a retrieval."""
+        with self.lock:
+            entry = self.retrievals.pop(token, None)
+        if entry is None:
+            raise vmodl.query.InvalidProperty(name="token")
+        (contents, page_size) = entry
+        return self._page(contents, page_size)
+
+    # -------------------------------------------------------------------------
+    def cancel_retrieve_properties_ex(self, context, this, token):
+        """Forget the rest of a retrieval."""
+        with self.lock:
+            self.retrievals.pop(token, None)
+        return None
+
+    # -------------------------------------------------------------------------
+    def create_filter(self, context, this, spec, partial_updates):
+        """Create a property filter for WaitForUpdates()."""
+        pc_filter = vmodl.query.PropertyCollector.Filter(self._new_id("session[vcsim]filter-"))
+        with self.lock:
+            self.objects[pc_filter._moId] = {"spec": spec, "partialUpdates": bool(partial_updates)}
+            self.filters[pc_filter._moId] = (pc_filter, spec, {}, context["session"].key)
+        return pc_filter
+
+    # -------------------------------------------------------------------------
+    def destroy_property_filter(self, context, this):
+        """Destroy the given property filter."""
+        with self.lock:
+            self.filters.pop(this._moId, None)
+            self.objects.pop(this._moId, None)
+        return None
+
+    # -------------------------------------------------------------------------
+    def _fingerprint(self, value):
+
+        if value is None:
+            return None
+        info = VmomiSupport.Object(name="val", type=object, version=VIM_VERSION, flags=0)
+        return serialize(value, info)
+
+    # -------------------------------------------------------------------------
+    def _check_updates(self, session_key):
+
+        filter_updates = []
+        with self.lock:
+            for (pc_filter, spec, last, filter_session) in list(self.filters.values()):
+                # Every session is waiting only for the changes of its own filters
+                if filter_session != session_key:
+                    continue
+                obj_updates = []
+                for obj in self._collect_objects(spec):
+                    values = {}
+                    self._object_content(obj, spec.propSet, values)
+                    old = last.get(obj._moId)
+                    kind = "enter" if old is None else "modify"
+                    changes = []
+                    fingerprints = {}
+                    for (path, value) in values.items():
+                        fingerprints[path] = self._fingerprint(value)
+                        if old is not None and old.get(path) == fingerprints[path]:
+                            continue
+                        if old is None and value is None:
+                            continue
+                        changes.append(
+                            vmodl.query.PropertyCollector.Change(name=path, op="assign", val=value)
+                        )
+                    last[obj._moId] = fingerprints
+                    if changes:
+                        obj_updates.append(
+                            vmodl.query.PropertyCollector.ObjectUpdate(
+                                kind=kind, obj=obj, changeSet=changes
+                            )
+                        )
+                if obj_updates:
+                    filter_updates.append(
+                        vmodl.query.PropertyCollector.FilterUpdate(
+                            filter=pc_filter, objectSet=obj_updates
+                        )
+                    )
+            if not filter_updates:
+                return None
+            self.update_version += 1
+            return vmodl.query.PropertyCollector.UpdateSet(
+                version=str(self.update_version), filterSet=filter_updates
+            )
+
+    # -------------------------------------------------------------------------
+    def _wait(self, context, max_wait=None):
+
+        session_key = context["session"].key
+        canceled = threading.Event()
+        with self.lock:
+            self.waits[session_key] = canceled
+        try:
+            start = time.monotonic()
+            while True:
+                update = self._check_updates(session_key)
+                if update is not None:
+                    return update
+                if max_wait is not None and time.monotonic() - start >= max_wait:
+                    return None
+                if canceled.wait(0.02):
+                    raise vmodl.fault.RequestCanceled()
+        finally:
+            with self.lock:
+                if self.waits.get(session_key) is canceled:
+                    del self.waits[session_key]
+
+    # -------------------------------------------------------------------------
+    def wait_for_updates(self, context, this, version):
+        """Wait for changes of the filtered properties."""
+        return self._wait(context)
+
+    # -------------------------------------------------------------------------
+    def wait_for_updates_ex(self, context, this, version, options):
+        """Wait for changes of the filtered properties at most the given time."""
+        max_wait = None
+        if options is not None and options.maxWaitSeconds is not None:
+            max_wait = options.maxWaitSeconds
+        return self._wait(context, max_wait)
+
+    # -------------------------------------------------------------------------
+    def cancel_wait_for_updates(self, context, this):
+        """Cancel a pending WaitForUpdates() or WaitForUpdatesEx() of the current session."""
+        with self.lock:
+            canceled = self.waits.get(context["session"].key)
+        if canceled is not None:
+            canceled.set()
+        return None
+
+    # -------------------------------------------------------------------------
+    def _children(self, entity):
+
+        props = self.objects.get(entity._moId, {})
+        children = list(props.get("childEntity") or [])
+        for prop in ("vmFolder", "hostFolder", "datastoreFolder", "networkFolder"):
+            if props.get(prop) is not None:
+                children.append(props[prop])
+        if isinstance(entity, vim.ComputeResource):
+            children += list(props.get("host") or [])
+        return children
+
+    # -------------------------------------------------------------------------
+    def _name(self, entity):
+
+        return self.objects.get(entity._moId, {}).get("name")
+
+    # -------------------------------------------------------------------------
+    def find_child(self, context, this, entity, name):
+        """Find a direct child of the given entity by its name."""
+        for child in self._children(entity):
+            if self._name(child) == name:
+                return child
+        return None
+
+    # -------------------------------------------------------------------------
+    def find_by_inventory_path(self, context, this, inventory_path):
+        """Find a managed entity by its inventory path."""
+        entity = self.inventory.root_folder
+        for name in [p for p in inventory_path.split("/") if p]:
+            entity = self.find_child(context, this, entity, name)
+            if entity is None:
+                return None
+        return entity
+
+    # -------------------------------------------------------------------------
+    def _search(self, datacenter, vm_search, matcher):
+
+        mo_type = vim.VirtualMachine if vm_search else vim.HostSystem
+        for mo in self.inventory.entities[mo_type]:
+            props = self.objects.get(mo._moId)
+            if props is None:
+                continue
+            if datacenter is not None and not self._is_below(mo, datacenter):
+                continue
+            if matcher(props):
+                return mo
+        return None
+
+    # -------------------------------------------------------------------------
+    def _is_below(self, mo, ancestor):
+
+        parent = self.objects.get(mo._moId, {}).get("parent")
+        while parent is not None:
+            if parent._moId == ancestor._moId:
+                return True
+            parent = self.objects.get(parent._moId, {}).get("parent")
+        return False
+
+    # -------------------------------------------------------------------------
+    def find_by_uuid(self, context, this, datacenter, vm_uuid, vm_search, instance_uuid):
+        """Find a VM or host by its UUID."""
+
+        def matcher(props):
+            if vm_search:
+                config = props["summary"].config
+                return (config.instanceUuid if instance_uuid else config.uuid) == vm_uuid
+            return props["hardware"].systemInfo.uuid == vm_uuid
+
+        return self._search(datacenter, vm_search, matcher)
+
+    # -------------------------------------------------------------------------
+    def find_by_dns_name(self, context, this, datacenter, dns_name, vm_search):
+        """Find a VM or host by its DNS name, the simulator uses the names of the objects."""
+        return self._search(datacenter, vm_search, lambda props: props.get("name") == dns_name)
+
+    # -------------------------------------------------------------------------
+    def _new_task(self, context, wsdl_name, description_id, entity, action):
+
+        task = vim.Task(self._new_id("task-"))
+        now = utcnow()
+        session = context["session"]
+        info = vim.TaskInfo(
+            key=task._moId,
+            task=task,
+            name=VmomiSupport.GetWsdlMethod(VIM_NS, wsdl_name),
+            descriptionId=description_id,
+            entity=entity,
+            entityName=self._name(entity) if entity is not None else None,
+            state="queued",
+            cancelled=False,
+            cancelable=False,
+            queueTime=now,
+            reason=vim.TaskReasonUser(userName=session.userName if session else ""),
+            eventChainId=0,
+        )
+        with self.lock:
+            self.objects[task._moId] = {"info": info}
+            self.tasks[task._moId] = {"created": time.monotonic(), "action": action}
+            self._update_task(task)
+        return task
+
+    # -------------------------------------------------------------------------
+    def _update_task(self, task):
+
+        entry = self.tasks.get(task._moId)
+        if entry is None or entry["action"] is None:
+            return
+        info = self.objects[task._moId]["info"]
+        if time.monotonic() - entry["created"] < self.task_delay:
+            if info.state == "queued":
+                info.state = "running"
+                info.startTime = utcnow()
+                info.progress = 0
+            return
+
+        action = entry["action"]
+        entry["action"] = None
+        if info.startTime is None:
+            info.startTime = utcnow()
+        try:
+            info.result = action()
+            info.state = "success"
+        except vmodl.MethodFault as fault:
+            info.error = fault
+            info.state = "error"
+        info.progress = 100
+        info.completeTime = utcnow()
+
+    # -------------------------------------------------------------------------
+    def _vm_name_exists(self, name):
+
+        for vm in self.inventory.entities[vim.VirtualMachine]:
+            if self.objects.get(vm._moId, {}).get("name") == name:
+                return vm
+        return None
+
+    # -------------------------------------------------------------------------
+    def create_vm_task(self, context, this, config, pool, host):
+        """Create a new VM in the given folder."""
+        self._props(this)
+
+        def action():
+            existing = self._vm_name_exists(config.name)
+            if existing is not None:
+                raise vim.fault.DuplicateName(name=config.name, object=existing)
+            return self._create_vm(this, config, pool, host)
+
+        return self._new_task(context, "CreateVM_Task", "Folder.createVm", this, action)
+
+    # -------------------------------------------------------------------------
+    def _create_vm(self, folder, config, pool, host):
+
+        vm = vim.VirtualMachine(self._new_id("vm-"), self.inventory.stub)
+        vm_uuid = config.uuid or str(uuid.uuid4())
+        devices = []
+        for change in config.deviceChange or []:
+            if change.operation == "add" and change.device is not None:
+                devices.append(change.device)
+        if host is None and pool is not None:
+            owner = self.objects.get(pool._moId, {}).get("owner")
+            hosts = self.objects.get(owner._moId, {}).get("host") if owner else None
+            if hosts:
+                host = hosts[0]
+        vm_path = config.files.vmPathName if config.files else None
+
+        self.objects[vm._moId] = {
+            "name": config.name,
+            "parent": folder,
+            "resourcePool": pool,
+            "overallStatus": "green",
+            "configStatus": "green",
+            "summary": vim.vm.Summary(
+                vm=vm,
+                config=vim.vm.Summary.ConfigSummary(
+                    name=config.name,
+                    template=False,
+                    vmPathName=vm_path,
+                    memorySizeMB=config.memoryMB,
+                    numCpu=config.numCPUs,
+                    numEthernetCards=len(
+                        [d for d in devices if isinstance(d, vim.vm.device.VirtualEthernetCard)]
+                    ),
+                    numVirtualDisks=len(
+                        [d for d in devices if isinstance(d, vim.vm.device.VirtualDisk)]
+                    ),
+                    uuid=vm_uuid,
+                    instanceUuid=vm_uuid,
+                    guestId=config.guestId,
+                    guestFullName=config.guestId,
+                ),
+                runtime=vim.vm.RuntimeInfo(host=host, powerState="poweredOff"),
+            ),
+            "runtime": vim.vm.RuntimeInfo(
+                host=host, powerState="poweredOff", connectionState="connected"
+            ),
+            "config": vim.vm.ConfigInfo(
+                name=config.name,
+                version=config.version or "vmx-19",
+                uuid=vm_uuid,
+                instanceUuid=vm_uuid,
+                template=False,
+                guestId=config.guestId,
+                hardware=vim.vm.VirtualHardware(
+                    numCPU=config.numCPUs, memoryMB=config.memoryMB, device=devices
+                ),
+            ),
+            "guest": vim.vm.GuestInfo(
+                toolsRunningStatus="guestToolsNotRunning", guestState="notRunning"
+            ),
+        }
+        self.objects[folder._moId].setdefault("childEntity", []).append(vm)
+        self.inventory.entities[vim.VirtualMachine].append(vm)
+        return vm
+
+    # -------------------------------------------------------------------------
+    def _set_power_state(self, vm, state):
+
+        props = self._props(vm)
+        props["runtime"].powerState = state
+        props["summary"].runtime.powerState = state
+        if props.get("guest") is not None:
+            running = state == "poweredOn"
+            props["guest"].toolsRunningStatus = (
+                "guestToolsRunning" if running else "guestToolsNotRunning"
+            )
+            props["guest"].guestState = "running" if running else "notRunning"
+        return None
+
+    # -------------------------------------------------------------------------
+    def power_on_vm_task(self, context, this, host):
+        """Power on the given VM."""
+        self._props(this)
+        return self._new_task(
+            context,
+            "PowerOnVM_Task", "VirtualMachine.powerOn",
+            this,
+            lambda: self._set_power_state(this, "poweredOn"),
+        )
+
+    # -------------------------------------------------------------------------
+    def power_off_vm_task(self, context, this):
+        """Power off the given VM."""
+        self._props(this)
+        return self._new_task(
+            context,
+            "PowerOffVM_Task", "VirtualMachine.powerOff",
+            this,
+            lambda: self._set_power_state(this, "poweredOff"),
+        )
+
+    # -------------------------------------------------------------------------
+    def destroy_task(self, context, this):
+        """Destroy the given managed entity."""
+        self._props(this)
+
+        def action():
+            props = self.objects.pop(this._moId)
+            parent = props.get("parent")
+            if parent is not None:
+                siblings = self.objects.get(parent._moId, {}).get("childEntity")
+                if siblings is not None:
+                    siblings[:] = [c for c in siblings if c._moId != this._moId]
+            entities = self.inventory.entities[this.__class__]
+            entities[:] = [e for e in entities if e._moId != this._moId]
+            return None
+
+        return self._new_task(context, "Destroy_Task", "ManagedEntity.destroy", this, action)
+
+    # -------------------------------------------------------------------------
+    def reconfig_vm_task(self, context, this, spec):
+        """Reconfigure the given VM."""
+        props = self._props(this)
+
+        def action():
+            config = props["config"]
+            summary_config = props["summary"].config
+            if spec.name:
+                props["name"] = spec.name
+                config.name = spec.name
+                summary_config.name = spec.name
+            if spec.memoryMB:
+                config.hardware.memoryMB = spec.memoryMB
+                summary_config.memorySizeMB = spec.memoryMB
+            if spec.numCPUs:
+                config.hardware.numCPU = spec.numCPUs
+                summary_config.numCpu = spec.numCPUs
+            devices = list(config.hardware.device)
+            for change in spec.deviceChange or []:
+                device = change.device
+                if change.operation == "add":
+                    devices.append(device)
+                elif change.operation == "remove":
+                    devices = [d for d in devices if d.key != device.key]
+                elif change.operation == "edit":
+                    devices = [device if d.key == device.key else d for d in devices]
+            config.hardware.device = devices
+            return None
+
+        return self._new_task(
+            context, "ReconfigVM_Task", "VirtualMachine.reconfigure", this, action
+        )
+
+
+# =============================================================================
+class SimulatorRequestHandler(BaseHTTPRequestHandler):
+    """HTTP request handler of the vCenter simulator."""
+
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+    server_version = "vcsim/" + __version__
+
+    # -------------------------------------------------------------------------
+    def log_message(self, format, *args):
+        """Log requests only in debug mode."""
+        LOG.debug("%s - %s", self.address_string(), format % args)
+
+    # -------------------------------------------------------------------------
+    def _send(self, status, body, content_type="text/xml; charset=utf-8", cookie=None):
+
+        simulator = self.server.simulator
+        encoding = None
+        accepted = [
+            e.split(";")[0].strip() for e in self.headers.get("Accept-Encoding", "").split(",")
+        ]
+        if simulator.compression and "gzip" in accepted and len(body) >= MIN_COMPRESS_SIZE:
+            encoding = "gzip"
+            body = gzip.compress(body, compresslevel=6)
+            with simulator.lock:
+                simulator.bytes_compressed += len(body)
+
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        if encoding:
+            self.send_header("Content-Encoding", encoding)
+        self.send_header("Content-Length", str(len(body)))
+        if cookie:
+            self.send_header("Set-Cookie", cookie)
+        self.end_headers()
+        self.wfile.write(body)
+
+    # -------------------------------------------------------------------------
+    def do_GET(self):  # noqa: N802
+        """Serve the description of the supported API versions."""
+        if self.path.rstrip("/") == "/sdk/vimServiceVersions.xml":
+            body = self.server.simulator.service_versions().encode("utf-8")
+            self._send(200, body)
+            return
+        self._send(404, b"Not found", content_type="text/plain")
+
+    # -------------------------------------------------------------------------
+    def do_POST(self):  # noqa: N802
+        """Handle a SOAP request."""
+        length = int(self.headers.get("Content-Length") or 0)
+        data = self.rfile.read(length)
+        if self.path.rstrip("/") != "/sdk":
+            self._send(404, b"Not found", content_type="text/plain")
+            return
+        (status, body, cookie) = self.server.simulator.handle_soap(
+            data, self.headers.get("Cookie")
+        )
+        self._send(status, body, cookie=cookie)
+
+
+# =============================================================================
+def main():
+    """Entrypoint of the vCenter simulator."""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0][10:])
+    parser.add_argument(
+        "-n", "--vms", type=int, default=1000, help="Number of VMs (default: %(default)s)."
+    )
+    parser.add_argument(
+        "-d", "--datacenters", type=int, default=1, help="Number of datacenters (default: 1)."
+    )
+    parser.add_argument("-H", "--host", default="127.0.0.1", help="Address to listen on.")
+    parser.add_argument("-p", "--port", type=int, default=8989, help="Port to listen on.")
+    parser.add_argument("-u", "--user", default=DEFAULT_USER, help="User name for login.")
+    parser.add_argument("-P", "--password", default=DEFAULT_PASSWORD, help="Password for login.")
+    parser.add_argument(
+        "-l",
+        "--latency-ms",
+        type=float,
+        default=0.0,
+        help="Latency of every request in milliseconds (default: 0).",
+    )
+    parser.add_argument(
+        "-t",
+        "--task-delay",
+        type=float,
+        default=0.0,
+        help="Time in seconds until a task is finished (default: 0).",
+    )
+    parser.add_argument(
+        "--no-compression",
+        dest="compression",
+        action="store_false",
+        help="Do not compress responses, even if the client accepts gzip.",
+    )
+    parser.add_argument("--cert", help="Certificate file for HTTPS.")
+    parser.add_argument("--key", help="Private key file for HTTPS.")
+    parser.add_argument("-v", "--verbose", action="store_true", help="Log all requests.")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.DEBUG if args.verbose else logging.INFO)
+
+    inventory = SyntheticInventory(
+        vms=args.vms, datacenters=args.datacenters, default_latency=args.latency_ms / 1000.0
+    )
+    simulator = VcenterSimulator(
+        inventory,
+        host=args.host,
+        port=args.port,
+        user=args.user,
+        password=args.password,
+        task_delay=args.task_delay,
+        certfile=args.cert,
+        keyfile=args.key,
+        compression=args.compression,
+    )
+    simulator.start()
+    print("Serving {i!r} on {u}, press Ctrl-C to stop.".format(i=inventory, u=simulator.url))
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        simulator.stop()
+
+    return 0
+
+
+# =============================================================================
+if __name__ == "__main__":
+
+    sys.exit(main())
+
+# =============================================================================
+
+# vim: tabstop=4 expandtab shiftwidth=4 softtabstop=4 list
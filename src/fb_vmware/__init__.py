@@ -3,6 +3,9 @@
 """
 @summary: The module for a base vSphere handler object.
 
+The public classes and constants of the submodules are imported lazily on first
+access, so importing this package does not pull in pyVmomi, requests and babel.
+
 @author: Frank Brehm
 @contact: frank@brehm-online.com
 @copyright: © 2022 - 2026 by Frank Brehm, Berlin
@@ -11,56 +14,133 @@
 from __future__ import absolute_import
 
 # Standard modules
+import importlib
 import logging
 
-# Own modules
-
-from .about import VsphereAboutInfo
-from .base import BaseVsphereHandler
-from .base import DEFAULT_MAX_SEARCH_DEPTH, DEFAULT_TZ_NAME
-from .cluster import VsphereCluster
-from .config import DEFAULT_CONFIG_DIR, DEFAULT_VSPHERE_PORT
-from .config import DEFAULT_VSPHERE_CLUSTER
-from .config import DEFAULT_VSPHERE_DC, DEFAULT_VSPHERE_USER
-from .config import VmwareConfigError, VmwareConfiguration
-from .connect import DEFAULT_OS_VERSION, DEFAULT_VM_CFG_VERSION
-from .connect import VsphereConnection
-from .controller import VsphereDiskController, VsphereDiskControllerList
-from .datastore import VsphereDatastore, VsphereDatastoreDict
-from .dc import DEFAULT_DS_FOLDER
-from .dc import DEFAULT_HOST_FOLDER
-from .dc import DEFAULT_NETWORK_FOLDER
-from .dc import DEFAULT_VM_FOLDER
-from .dc import VsphereDatacenter
-from .disk import VsphereDisk, VsphereDiskList
-from .ds_cluster import VsphereDsCluster
-from .ds_cluster import VsphereDsClusterDict
-from .dvs import VsphereDVS
-from .dvs import VsphereDvPortGroup
-from .ether import VsphereEthernetcard
-from .ether import VsphereEthernetcardList
-from .host import VsphereHost
-from .host import VsphereHostBiosInfo
-from .host import VsphereHostList
-from .host_port_group import VsphereHostPortgroup
-from .host_port_group import VsphereHostPortgroupList
-from .iface import VsphereVmInterface
-from .network import GeneralNetworksDict
-from .network import VsphereNetwork
-from .network import VsphereNetworkDict
-from .obj import DEFAULT_OBJ_STATUS
-from .obj import VsphereObject
-from .typed_dict import TypedDict
-from .vm import VsphereVm
-from .vm import VsphereVmList
-from .xlate import XLATOR
-
-
-__version__ = "1.9.0"
+__version__ = "1.19.2"
 
 LOG = logging.getLogger(__name__)
 
-_ = XLATOR.gettext
+# Exported names with the submodules defining them
+_LAZY_EXPORTS = {
+    "VsphereAboutInfo": "about",
+    "BaseVsphereHandler": "base",
+    "DEFAULT_MAX_SEARCH_DEPTH": "base",
+    "DEFAULT_TZ_NAME": "base",
+    "CASSETTE_MODES": "cassette",
+    "VsphereCassette": "cassette",
+    "VsphereRecordingStub": "cassette",
+    "VsphereReplayStub": "cassette",
+    "VsphereCluster": "cluster",
+    "DEFAULT_CONFIG_DIR": "config",
+    "DEFAULT_VSPHERE_PORT": "config",
+    "DEFAULT_VSPHERE_CLUSTER": "config",
+    "DEFAULT_VSPHERE_DC": "config",
+    "DEFAULT_VSPHERE_USER": "config",
+    "VmwareConfigError": "config",
+    "VmwareConfiguration": "config",
+    "DEFAULT_OS_VERSION": "connect",
+    "DEFAULT_VM_CFG_VERSION": "connect",
+    "VsphereConnection": "connect",
+    "VsphereDiskController": "controller",
+    "VsphereDiskControllerList": "controller",
+    "VmPropertySet": "convert",
+    "VsphereVmConverter": "convert",
+    "VsphereDatastore": "datastore",
+    "VsphereDatastoreDict": "datastore",
+    "DEFAULT_DS_FOLDER": "dc",
+    "DEFAULT_HOST_FOLDER": "dc",
+    "DEFAULT_NETWORK_FOLDER": "dc",
+    "DEFAULT_VM_FOLDER": "dc",
+    "VsphereDatacenter": "dc",
+    "VsphereDisk": "disk",
+    "VsphereDiskList": "disk",
+    "VsphereDsCluster": "ds_cluster",
+    "VsphereDsClusterDict": "ds_cluster",
+    "VsphereDVS": "dvs",
+    "VsphereDvPortGroup": "dvs",
+    "VsphereEthernetcard": "ether",
+    "VsphereEthernetcardList": "ether",
+    "VsphereHost": "host",
+    "VsphereHostBiosInfo": "host",
+    "VsphereHostList": "host",
+    "VsphereHostPortgroup": "host_port_group",
+    "VsphereHostPortgroupList": "host_port_group",
+    "VsphereVmInterface": "iface",
+    "InventoryRecord": "inventory_client",
+    "VsphereInventoryClient": "inventory_client",
+    "INVENTORY_KINDS": "inventoryd",
+    "VsphereInventory": "inventoryd",
+    "VsphereInventoryService": "inventoryd",
+    "DEFAULT_RESERVATION_TTL": "ledger",
+    "VsphereReservationLedger": "ledger",
+    "NAME_TABLE_PROPERTIES": "name_table",
+    "VsphereNameTable": "name_table",
+    "GeneralNetworksDict": "network",
+    "VsphereNetwork": "network",
+    "VsphereNetworkDict": "network",
+    "DEFAULT_OBJ_STATUS": "obj",
+    "VsphereObject": "obj",
+    "DEFAULT_PLACEMENT_STRATEGY": "placement",
+    "PLACEMENT_STRATEGIES": "placement",
+    "VspherePlacementEngine": "placement",
+    "VsphereStorageCandidate": "placement",
+    "VsphereStorageSearch": "placement",
+    "DataRecord": "propset",
+    "MoRef": "propset",
+    "PropertySetParser": "propset",
+    "StreamingDecoder": "compression",
+    "DEFAULT_POOL_SIZE": "pool",
+    "TlsSessionCache": "pool",
+    "VsphereConnectionPool": "pool",
+    "DEFAULT_RESULT_TTL": "singleflight",
+    "SingleFlight": "singleflight",
+    "SNAPSHOT_KINDS": "snapshot",
+    "VsphereInventorySnapshot": "snapshot",
+    "DEFAULT_LATENCY_BUCKETS": "stats",
+    "LatencyHistogram": "stats",
+    "VsphereCallStats": "stats",
+    "VsphereInstrumentedStub": "stats",
+    "VsphereSoapStats": "stats",
+    "InventoryWalker": "traverse",
+    "WalkItem": "traverse",
+    "TypedDict": "typed_dict",
+    "VsphereVm": "vm",
+    "VsphereVmList": "vm",
+    "XLATOR": "xlate",
+    "_": "xlate",
+}
+
+__all__ = sorted(name for name in _LAZY_EXPORTS.keys() if not name.startswith("_"))
+
+
+# =============================================================================
+def __getattr__(name):
+    """Import the submodule defining the given name on the first access of it."""
+    if name.startswith("__"):
+        raise AttributeError("module {!r} has no attribute {!r}".format(__name__, name))
+
+    if name in _LAZY_EXPORTS:
+        module = importlib.import_module("." + _LAZY_EXPORTS[name], __name__)
+        value = getattr(module, name)
+    else:
+        try:
+            value = importlib.import_module("." + name, __name__)
+        except ModuleNotFoundError as e:
+            # Only a missing submodule itself means a missing attribute, missing
+            # dependencies of an existing submodule are raised as they are.
+            if e.name != __name__ + "." + name:
+                raise
+            raise AttributeError("module {!r} has no attribute {!r}".format(__name__, name))
+
+    globals()[name] = value
+    return value
+
+
+# =============================================================================
+def __dir__():
+    """Return the names of the module including all lazy exported names."""
+    return sorted(set(globals().keys()) | set(__all__))
 
 
 # =============================================================================
@@ -22,9 +22,10 @@ from fb_tools.xlate import format_list
 from pyVmomi import vim
 
 # Own modules
+from .propset import vmodl_isinstance
 from .xlate import XLATOR
 
-__version__ = "1.0.1"
+__version__ = "1.1.0"
 LOG = logging.getLogger(__name__)
 
 _ = XLATOR.gettext
@@ -298,7 +299,7 @@ class VsphereAboutInfo(FbBaseObject):
                 raise AssertionError(msg)
 
         else:
-            if not isinstance(data, vim.AboutInfo):
+            if not vmodl_isinstance(data, vim.AboutInfo):
                 msg = _(
                     "Parameter {t!r} must be a {e} object, a {v} object was given " "instead."
                 ).format(t="data", e="vim.AboutInfo", v=data.__class__.__qualname__)
@@ -25,34 +25,28 @@ from fb_tools.multi_config import DEFAULT_ENCODING
 
 import pytz
 
-from rich.console import Console
-from rich.prompt import InvalidResponse, Prompt, PromptBase, PromptType
-
 # Own modules
 from .. import __version__ as GLOBAL_VERSION
 from ..config import VmwareConfiguration
-from ..connect import VsphereConnection
-from ..ds_cluster import VsphereDsCluster
 from ..errors import VSphereExpectedError
 from ..xlate import DOMAIN
 from ..xlate import LOCALE_DIR
 from ..xlate import XLATOR
 from ..xlate import __base_dir__ as __xlate_base_dir__
 from ..xlate import __lib_dir__ as __xlate_lib_dir__
-from ..xlate import __mo_file__ as __xlate_mo_file__
 from ..xlate import __module_dir__ as __xlate_module_dir__
+from ..xlate import get_mo_file
 
-__version__ = "1.7.2"
+__version__ = "1.14.0"
 LOG = logging.getLogger(__name__)
 TZ = pytz.timezone("Europe/Berlin")
 
 _ = XLATOR.gettext
 ngettext = XLATOR.ngettext
 
-Prompt.validate_error_message = "[prompt.invalid]" + _("Please enter a valid value")
-Prompt.illegal_choice_message = "[prompt.invalid.choice]" + _(
-    "Please select one of the available options"
-)
+DEFAULT_STATS_MAX_CALLS = 30
+DEFAULT_PROFILE_TOP = 20
+PROFILE_MODES = ("cpu", "alloc")
 
 
 # =============================================================================
@@ -62,44 +56,6 @@ class VmwareAppError(FbAppError):
     pass
 
 
-# =============================================================================
-class PositiveIntPrompt(PromptBase[int]):
-    """A prompt that returns an positive integer greater than zero.
-
-    Example:
-        >>> burrito_count = PositiveIntPrompt.ask("How many burritos do you want to order")
-
-    """
-
-    response_type = int
-    validate_error_message = "[prompt.invalid]" + _(
-        "Please enter a valid positive integer number greater than zero."
-    )
-
-    # -------------------------------------------------------------------------
-    def process_response(self, value: str) -> PromptType:
-        """Process response from user, convert to prompt type.
-
-        Args:
-            value (str): String typed by user.
-
-        Raises:
-            InvalidResponse: If ``value`` is invalid.
-
-        Returns:
-            PromptType: The value to be returned from ask method.
-        """
-        value = value.strip()
-        try:
-            return_value: PromptType = self.response_type(value)
-            if return_value <= 0:
-                raise InvalidResponse(self.validate_error_message)
-        except ValueError:
-            raise InvalidResponse(self.validate_error_message)
-
-        return return_value
-
-
 # =============================================================================
 class BaseVmwareApplication(FbConfigApplication):
     """Base class for all VMware/vSphere application classes."""
@@ -111,6 +67,7 @@ class BaseVmwareApplication(FbConfigApplication):
     }
 
     default_all_vspheres = True
+    use_inventoryd = False
 
     # -------------------------------------------------------------------------
     def __init__(
@@ -137,6 +94,11 @@ class BaseVmwareApplication(FbConfigApplication):
         self.req_vspheres = None
         self.do_vspheres = []
         self.rich_console = None
+        self.collect_stats = False
+        self._stats_printed = False
+        self.profiler = None
+        self.cassette = None
+        self.inventory_client = None
 
         if base_dir is None:
             base_dir = pathlib.Path(os.getcwd()).resolve()
@@ -185,7 +147,7 @@ class BaseVmwareApplication(FbConfigApplication):
             "__base_dir__": __xlate_base_dir__,
             "LOCALE_DIR": LOCALE_DIR,
             "DOMAIN": DOMAIN,
-            "__mo_file__": __xlate_mo_file__,
+            "__mo_file__": get_mo_file(),
         }
 
         return res
@@ -209,6 +171,8 @@ class BaseVmwareApplication(FbConfigApplication):
         if self.verbose > 2:
             LOG.debug(_("{what} of {app} ...").format(what="post_init()", app=self.appname))
 
+        from rich.console import Console
+
         args_color = getattr(self.args, "color", "auto")
         if args_color == "auto":
             self.rich_console = Console()
@@ -249,6 +213,22 @@ class BaseVmwareApplication(FbConfigApplication):
             if not all_found:
                 self.exit(1)
 
+        self.collect_stats = bool(getattr(self.args, "stats", False))
+
+        profile_mode = getattr(self.args, "profile", None)
+        if profile_mode:
+            from .profiling import VmwareAppProfiler
+
+            self.profiler = VmwareAppProfiler(
+                profile_mode,
+                directory=self.args.profile_dir,
+                top=self.args.profile_top,
+                name=self.appname,
+            )
+
+        self.init_cassette()
+        self.init_inventory_client()
+
         if self.req_vspheres:
             self.do_vspheres = copy.copy(self.req_vspheres)
         elif self.default_all_vspheres:
@@ -259,6 +239,11 @@ class BaseVmwareApplication(FbConfigApplication):
     def init_arg_parser(self):
         """Initiate the argument parser."""
         self.add_vsphere_argument()
+        self.add_stats_argument()
+        self.add_profile_arguments()
+        self.add_cassette_arguments()
+        if self.use_inventoryd:
+            self.add_inventoryd_argument()
         super(BaseVmwareApplication, self).init_arg_parser()
 
     # -------------------------------------------------------------------------
@@ -274,12 +259,189 @@ class BaseVmwareApplication(FbConfigApplication):
             help=_("The vSphere names from configuration, in which the VMs should be searched."),
         )
 
+    # -------------------------------------------------------------------------
+    def add_stats_argument(self):
+        """Add a commandline option for printing statistics about the SOAP requests."""
+        self.arg_parser.add_argument(
+            "--stats",
+            dest="stats",
+            action="store_true",
+            help=_(
+                "Print statistics about the SOAP requests to the vSphere instances "
+                "at exit of the application."
+            ),
+        )
+
+    # -------------------------------------------------------------------------
+    def add_profile_arguments(self):
+        """Add commandline options for profiling the application."""
+        profile_options = self.arg_parser.add_argument_group(_("Profiling options"))
+
+        profile_options.add_argument(
+            "--profile",
+            dest="profile",
+            choices=PROFILE_MODES,
+            help=_(
+                "Run the main routine under cProfile ('cpu') or tracemalloc ('alloc') and "
+                "print the hot spots at exit."
+            ),
+        )
+
+        profile_options.add_argument(
+            "--profile-dir",
+            metavar=_("DIRECTORY"),
+            dest="profile_dir",
+            type=pathlib.Path,
+            help=_(
+                "The directory for the written pstats or snapshot files. "
+                "Default: the current directory."
+            ),
+        )
+
+        profile_options.add_argument(
+            "--profile-top",
+            metavar="N",
+            dest="profile_top",
+            type=int,
+            default=DEFAULT_PROFILE_TOP,
+            help=_("The number of printed hot spots. Default: %(default)s."),
+        )
+
+    # -------------------------------------------------------------------------
+    def add_cassette_arguments(self):
+        """Add commandline options for recording and replaying the SOAP requests."""
+        cassette_options = self.arg_parser.add_argument_group(_("Record and replay options"))
+        cassette_group = cassette_options.add_mutually_exclusive_group()
+
+        cassette_group.add_argument(
+            "--record",
+            metavar=_("CASSETTE"),
+            dest="record_cassette",
+            type=pathlib.Path,
+            help=_(
+                "Record all SOAP requests to the vSphere instances with their responses "
+                "and latencies into the given gzip compressed cassette file."
+            ),
+        )
+
+        cassette_group.add_argument(
+            "--replay",
+            metavar=_("CASSETTE"),
+            dest="replay_cassette",
+            type=pathlib.Path,
+            help=_(
+                "Serve the SOAP requests from the given recorded cassette file "
+                "instead of connecting to the vSphere instances."
+            ),
+        )
+
+        cassette_options.add_argument(
+            "--replay-latency",
+            metavar=_("FACTOR"),
+            dest="replay_latency",
+            type=float,
+            default=0.0,
+            help=_(
+                "The factor for the recorded latencies on replaying a cassette, "
+                "1 means the original latencies. Default: %(default)s."
+            ),
+        )
+
+    # -------------------------------------------------------------------------
+    def init_cassette(self):
+        """Open the cassette for recording or replaying the SOAP requests, if requested."""
+        record = getattr(self.args, "record_cassette", None)
+        replay = getattr(self.args, "replay_cassette", None)
+        if not record and not replay:
+            return
+
+        from ..cassette import VsphereCassette
+        from ..errors import VSphereCassetteError
+
+        try:
+            if record:
+                self.cassette = VsphereCassette(record, mode="record")
+            else:
+                self.cassette = VsphereCassette(
+                    replay, mode="replay", latency_factor=self.args.replay_latency
+                )
+        except VSphereCassetteError as e:
+            LOG.error(str(e))
+            self.exit(3)
+
+    # -------------------------------------------------------------------------
+    def add_inventoryd_argument(self):
+        """Add a commandline option for querying the inventory daemon instead of the vSpheres."""
+        from ..inventory_client import INVENTORYD_ENV
+
+        self.arg_parser.add_argument(
+            "--inventoryd",
+            metavar=_("ADDRESS"),
+            dest="inventoryd",
+            nargs="?",
+            const="",
+            help=_(
+                "Query the inventory daemon fb-vmware-inventoryd instead of the vSphere "
+                "instances. ADDRESS is the path of its Unix socket or an URL like "
+                "'http://localhost:8730', default is the content of the environment "
+                "variable {} or the default socket."
+            ).format(INVENTORYD_ENV),
+        )
+
+    # -------------------------------------------------------------------------
+    def init_inventory_client(self):
+        """Create the client of the inventory daemon, if requested and it is answering."""
+        address = getattr(self.args, "inventoryd", None)
+        if address is None:
+            return
+        if self.cassette is not None:
+            LOG.warning(_("Not using the inventory daemon on recording or replaying."))
+            return
+
+        from ..errors import VSphereInventoryError
+        from ..inventory_client import VsphereInventoryClient
+
+        try:
+            client = VsphereInventoryClient(address or None)
+        except VSphereInventoryError as e:
+            LOG.error(str(e))
+            self.exit(3)
+
+        if not client.ping():
+            msg = _(
+                "The inventory daemon on {!r} is not answering, querying the vSphere "
+                "instances directly."
+            ).format(client.address)
+            LOG.warning(msg)
+            return
+
+        LOG.debug(_("Using the inventory daemon on {!r}.").format(client.address))
+        self.inventory_client = client
+
     # -------------------------------------------------------------------------
     def perform_arg_parser(self):
         """Evaluate the command line parameters. Maybe overridden."""
         if self.verbose > 2:
             LOG.debug(_("Got command line arguments:") + "\n" + pp(self.args))
 
+    # -------------------------------------------------------------------------
+    def run(self):
+        """Execute the main actions of the application, maybe under a profiler."""
+        if self.profiler is None:
+            return super(BaseVmwareApplication, self).run()
+
+        main_routine = self._run
+
+        def profiled_run():
+            with self.profiler:
+                return main_routine()
+
+        self._run = profiled_run
+        try:
+            return super(BaseVmwareApplication, self).run()
+        finally:
+            del self._run
+
     # -------------------------------------------------------------------------
     def pre_run(self):
         """Execute some actions before the main routine."""
@@ -290,6 +452,9 @@ class BaseVmwareApplication(FbConfigApplication):
     # -------------------------------------------------------------------------
     def select_storage_type(self, storage_type=None):
         """Select a storage type for a virtual disk to create."""
+        from ..ds_cluster import VsphereDsCluster
+        from .prompt import Prompt
+
         types = {}
         type_list = []
         for st_type in VsphereDsCluster.valid_storage_types:
@@ -329,6 +494,8 @@ class BaseVmwareApplication(FbConfigApplication):
     # -------------------------------------------------------------------------
     def select_vsphere(self):
         """Select exact one of the configured vSpheres."""
+        from .prompt import Prompt
+
         if self.do_vspheres and len(self.do_vspheres) == 1:
             return self.do_vspheres[0]
 
@@ -356,6 +523,8 @@ class BaseVmwareApplication(FbConfigApplication):
     # -------------------------------------------------------------------------
     def select_datacenter(self, vs_name, dc_name=None):
         """Select a virtual datacenter from given vSphere."""
+        from .prompt import Prompt
+
         if not vs_name:
             raise VmwareAppError(_("No vSphere name given."))
         if vs_name not in self.vsphere:
@@ -407,6 +576,8 @@ class BaseVmwareApplication(FbConfigApplication):
     # -------------------------------------------------------------------------
     def select_computing_cluster(self, vs_name, dc_name, cluster_name=None):
         """Select a cluster computing resource or computing resource in a datacenter."""
+        from .prompt import Prompt
+
         if not vs_name:
             raise VmwareAppError(_("No vSphere name given."))
         if vs_name not in self.vsphere:
@@ -479,6 +650,8 @@ class BaseVmwareApplication(FbConfigApplication):
     # -------------------------------------------------------------------------
     def prompt_for_disk_size(self):
         """Ask for the size of a virtual disk in GiByte."""
+        from .prompt import PositiveIntPrompt
+
         disk_size_gb = PositiveIntPrompt.ask(_("Get the size of the virtual disk in GiByte"))
         return disk_size_gb
 
@@ -498,6 +671,8 @@ class BaseVmwareApplication(FbConfigApplication):
     # -------------------------------------------------------------------------
     def init_vsphere_handler(self, vsphere_name):
         """Initialize the given vSphere handler."""
+        from ..connect import VsphereConnection
+
         if self.verbose > 2:
             LOG.debug(_("Initializing handler for vSphere {!r} ...").format(vsphere_name))
 
@@ -512,6 +687,8 @@ class BaseVmwareApplication(FbConfigApplication):
             verbose=self.verbose,
             base_dir=self.base_dir,
             terminal_has_colors=self.terminal_has_colors,
+            collect_stats=self.collect_stats,
+            cassette=self.cassette,
             initialized=False,
         )
 
@@ -523,7 +700,10 @@ class BaseVmwareApplication(FbConfigApplication):
             msg += "\n" + str(vsphere_data)
             LOG.error(msg)
 
-        vsphere._check_credentials()
+        if self.inventory_client is not None:
+            return
+        if self.cassette is None or self.cassette.mode != "replay":
+            vsphere._check_credentials()
 
     # -------------------------------------------------------------------------
     def cleaning_up(self):
@@ -531,12 +711,103 @@ class BaseVmwareApplication(FbConfigApplication):
         if self.verbose > 1:
             LOG.debug(_("Cleaning up ..."))
 
+        if self.collect_stats and not self._stats_printed:
+            self._stats_printed = True
+            self.print_soap_stats()
+
         for vsphere_name in self.do_vspheres:
             if vsphere_name in self.vsphere:
                 LOG.debug(_("Closing vSphere object {!r} ...").format(vsphere_name))
                 self.vsphere[vsphere_name].disconnect()
                 del self.vsphere[vsphere_name]
 
+        if self.cassette is not None:
+            self.cassette.close()
+
+    # -------------------------------------------------------------------------
+    def print_soap_stats(self, max_calls=DEFAULT_STATS_MAX_CALLS):
+        """Print out on STDERR the statistics about the SOAP requests of all vSphere handlers."""
+        from rich import box
+        from rich.console import Console
+        from rich.table import Table
+
+        console = Console(stderr=True)
+
+        for vsphere_name in self.do_vspheres:
+            vsphere = self.vsphere.get(vsphere_name)
+            if vsphere is None or vsphere.soap_stats is None:
+                continue
+            stats = vsphere.soap_stats
+
+            title = _("SOAP requests to vSphere {!r}").format(vsphere_name)
+            caption = _(
+                "{r} requests, {f} faults, {s} bytes sent, {b} bytes received in {t:0.3f} seconds."
+            ).format(
+                r=stats.requests,
+                f=stats.faults,
+                s=stats.bytes_sent,
+                b=stats.bytes_received,
+                t=sum(e.latency.total for e in stats.calls()),
+            )
+            if stats.compressed_responses:
+                caption += " " + _(
+                    "{c} compressed responses, {d} bytes decoded, compression ratio {q:0.1f}."
+                ).format(
+                    c=stats.compressed_responses,
+                    d=stats.bytes_decoded,
+                    q=stats.compression_ratio,
+                )
+
+            table = Table(
+                title=title,
+                title_style="bold cyan",
+                caption=caption,
+                caption_justify="left",
+                box=box.ROUNDED,
+            )
+            table.add_column(header=_("Operation"))
+            table.add_column(header=_("Call"), overflow="fold")
+            table.add_column(header=_("Requests"), justify="right")
+            table.add_column(header=_("Total [s]"), justify="right")
+            table.add_column(header=_("Mean [ms]"), justify="right")
+            table.add_column(header=_("P95 [ms]"), justify="right")
+            table.add_column(header=_("Max [ms]"), justify="right")
+            table.add_column(header=_("Bytes received"), justify="right")
+
+            for entry in stats.calls()[:max_calls]:
+                latency = entry.latency
+                table.add_row(
+                    entry.operation,
+                    entry.call,
+                    str(entry.requests),
+                    "{:0.3f}".format(latency.total),
+                    "{:0.1f}".format(latency.mean * 1000),
+                    "{:0.1f}".format(latency.percentile(95) * 1000),
+                    "{:0.1f}".format(latency.max * 1000),
+                    str(entry.bytes_received),
+                )
+
+            console.print(table)
+
+            pool = vsphere.pool_stats()
+            if pool is not None:
+                console.print(
+                    _(
+                        "HTTP connection pool: size {s}, {c} connections created, {r} reused, "
+                        "{d} discarded, at most {p} in use at once, {i} idle, "
+                        "{t} TLS handshakes, {tr} of them resumed."
+                    ).format(
+                        s=pool["pool_size"],
+                        c=pool["created"],
+                        r=pool["reused"],
+                        d=pool["discarded"],
+                        p=pool["peak_in_use"],
+                        i=pool["idle"],
+                        t=pool["tls_handshakes"],
+                        tr=pool["tls_resumed"],
+                    )
+                )
+
     # -------------------------------------------------------------------------
     @classmethod
     def get_random_spinner_name(cls):
@@ -546,6 +817,16 @@ class BaseVmwareApplication(FbConfigApplication):
         return randomizer.choice(list(fb_tools.spinner.CycleList.keys()))
 
 
+# =============================================================================
+def __getattr__(name):
+    """Import the rich based prompt classes on the first access of them."""
+    if name == "PositiveIntPrompt":
+        from .prompt import PositiveIntPrompt
+
+        return PositiveIntPrompt
+    raise AttributeError("module {!r} has no attribute {!r}".format(__name__, name))
+
+
 # =============================================================================
 if __name__ == "__main__":
 
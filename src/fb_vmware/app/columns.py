@@ -0,0 +1,132 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+@summary: A module for the selectable output columns of the listing applications.
+
+Every column declares the vSphere property paths, which are needed to fill it,
+so only the properties of the selected columns are retrieved from vSphere.
+
+@author: Frank Brehm
+@contact: frank@brehm-online.com
+@copyright: © 2022 - 2026 by Frank Brehm, Berlin
+"""
+from __future__ import absolute_import, print_function
+
+# Standard modules
+import argparse
+import collections
+import logging
+import re
+
+# Third party modules
+from fb_tools.xlate import format_list
+
+# Own modules
+from ..xlate import XLATOR
+
+__version__ = "0.1.0"
+LOG = logging.getLogger(__name__)
+
+_ = XLATOR.gettext
+
+RE_COLUMN_SEP = re.compile(r"[,\s]+")
+
+ListColumn = collections.namedtuple(
+    "ListColumn", ["key", "header", "paths", "justify"], defaults=((), "left")
+)
+ListColumn.__doc__ = "An output column with the property paths needed to fill it."
+
+
+# =============================================================================
+class ColumnsOptionAction(argparse.Action):
+    """An argparse action for a comma or space separated list of output columns."""
+
+    # -------------------------------------------------------------------------
+    def __init__(self, option_strings, columns, *args, **kwargs):
+        """Initialise a ColumnsOptionAction object."""
+        self._avail = tuple(col.key for col in columns)
+
+        super(ColumnsOptionAction, self).__init__(*args, option_strings=option_strings, **kwargs)
+
+    # -------------------------------------------------------------------------
+    def __call__(self, parser, namespace, values, option_string=None):
+        """Parse the given column names."""
+        if isinstance(values, str):
+            values = [values]
+
+        keys = []
+        for value in values:
+            for key in RE_COLUMN_SEP.split(value):
+                if not key:
+                    continue
+                if key not in self._avail:
+                    msg = _("Invalid column {c!r}, available columns are: {a}.").format(
+                        c=key, a=format_list(self._avail, do_repr=True)
+                    )
+                    raise argparse.ArgumentError(self, msg)
+                if key not in keys:
+                    keys.append(key)
+
+        if not keys:
+            raise argparse.ArgumentError(self, _("No columns given."))
+
+        setattr(namespace, self.dest, keys)
+
+
+# =============================================================================
+def add_columns_option(group, columns, default):
+    """Add the commandline option for selecting the output columns to the given group."""
+    group.add_argument(
+        "-o",
+        "--columns",
+        metavar=_("COLUMN"),
+        nargs="+",
+        dest="columns",
+        action=ColumnsOptionAction,
+        columns=columns,
+        help=_(
+            "The columns of the output, comma or space separated. Only the properties "
+            "needed for these columns are retrieved from vSphere. Available columns "
+            "are: {avail}. The default columns are: {default}."
+        ).format(
+            avail=format_list([col.key for col in columns], do_repr=True),
+            default=format_list(default, do_repr=True),
+        ),
+    )
+
+
+# =============================================================================
+def column_paths(columns, keys):
+    """
+    Return the property paths needed for the columns with the given keys.
+
+    @return: the unique property paths in the order of the columns
+    @rtype: tuple of str
+    """
+    by_key = {col.key: col for col in columns}
+    paths = {}
+    for key in keys:
+        col = by_key.get(key)
+        if col is not None:
+            paths.update(dict.fromkeys(col.paths))
+    return tuple(paths)
+
+
+# =============================================================================
+def row_sort_key(keys):
+    """Return a function for sorting rows (dicts) by the given keys, None first."""
+
+    def sort_key(row):
+        return tuple((row.get(key) is not None, row.get(key)) for key in keys)
+
+    return sort_key
+
+
+# =============================================================================
+if __name__ == "__main__":
+
+    pass
+
+# =============================================================================
+
+# vim: tabstop=4 expandtab shiftwidth=4 softtabstop=4 list
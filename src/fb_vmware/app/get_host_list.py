@@ -15,7 +15,6 @@ import logging
 import pathlib
 import re
 import sys
-from operator import itemgetter
 
 # Third party modules
 from babel.numbers import format_decimal
@@ -25,18 +24,17 @@ from fb_tools.common import pp
 from fb_tools.spinner import Spinner
 from fb_tools.xlate import format_list
 
-from rich import box
-from rich.table import Table
-from rich.text import Text
-
 # Own modules
 from . import BaseVmwareApplication, VmwareAppError
+from .columns import ListColumn
+from .columns import add_columns_option
+from .columns import column_paths
+from .columns import row_sort_key
 from .. import __version__ as GLOBAL_VERSION
 from ..errors import VSphereExpectedError
-from ..host import VsphereHost
 from ..xlate import XLATOR
 
-__version__ = "1.5.7"
+__version__ = "1.7.0"
 LOG = logging.getLogger(__name__)
 
 _ = XLATOR.gettext
@@ -55,8 +53,32 @@ class GetHostsListApplication(BaseVmwareApplication):
     """Class for the application object."""
 
     default_host_pattern = r".*"
-    avail_sort_keys = ("name", "vsphere", "cluster", "vendor", "model", "os_version")
+    avail_columns = (
+        "name",
+        "vsphere",
+        "dc",
+        "cluster",
+        "vendor",
+        "model",
+        "os_name",
+        "os_version",
+        "cpus",
+        "memory_gb",
+        "power_state",
+        "connection_state",
+        "standby",
+        "maintenance",
+    )
+    default_columns = list(avail_columns)
+    avail_sort_keys = avail_columns
     default_sort_keys = ["name", "vsphere"]
+    online_paths = (
+        "runtime.connectionState",
+        "runtime.inMaintenanceMode",
+        "runtime.powerState",
+        "runtime.inQuarantineMode",
+    )
+    use_inventoryd = True
 
     # -------------------------------------------------------------------------
     def __init__(
@@ -77,6 +99,7 @@ class GetHostsListApplication(BaseVmwareApplication):
 
         self._host_pattern = self.default_host_pattern
         self.sort_keys = self.default_sort_keys
+        self.columns = self.default_columns
 
         self.hosts = []
 
@@ -97,6 +120,32 @@ class GetHostsListApplication(BaseVmwareApplication):
         """Return the regex search pattern for filtering the host list."""
         return self._host_pattern
 
+    # -------------------------------------------------------------------------
+    @classmethod
+    def get_columns(cls):
+        """Return the available output columns with the property paths needed by them."""
+        return (
+            ListColumn("name", _("Host"), ("name",)),
+            ListColumn("vsphere", _("vSphere")),
+            ListColumn("dc", _("Data Center"), ("parent",)),
+            ListColumn("cluster", _("Cluster"), ("parent",)),
+            ListColumn("vendor", _("Vendor"), ("hardware.systemInfo.vendor",)),
+            ListColumn("model", _("Model"), ("hardware.systemInfo.model",)),
+            ListColumn("os_name", _("OS Name"), ("config.product.name",)),
+            ListColumn("os_version", _("OS Version"), ("config.product.version",)),
+            ListColumn(
+                "cpus",
+                _("CPU cores/threads"),
+                ("hardware.cpuInfo.numCpuCores", "hardware.cpuInfo.numCpuThreads"),
+                "right",
+            ),
+            ListColumn("memory_gb", _("Memory in GiB"), ("hardware.memorySize",), "right"),
+            ListColumn("power_state", _("Power State"), ("runtime.powerState",)),
+            ListColumn("connection_state", _("Connect state"), ("runtime.connectionState",)),
+            ListColumn("standby", _("StandBy state"), ("runtime.standbyMode",), "center"),
+            ListColumn("maintenance", _("Maintenance"), ("runtime.inMaintenanceMode",), "center"),
+        )
+
     # -------------------------------------------------------------------------
     def as_dict(self, short=True):
         """
@@ -111,6 +160,7 @@ class GetHostsListApplication(BaseVmwareApplication):
         res = super(GetHostsListApplication, self).as_dict(short=short)
         res["host_pattern"] = self.host_pattern
         res["default_host_pattern"] = self.default_host_pattern
+        res["columns"] = self.columns
 
         return res
 
@@ -152,6 +202,8 @@ class GetHostsListApplication(BaseVmwareApplication):
 
         output_options = self.arg_parser.add_argument_group(_("Output options"))
 
+        add_columns_option(output_options, self.get_columns(), self.default_columns)
+
         output_options.add_argument(
             "-S",
             "--sort",
@@ -189,6 +241,17 @@ class GetHostsListApplication(BaseVmwareApplication):
         if self.args.sort_keys:
             self.sort_keys = self.args.sort_keys
 
+        if self.args.columns:
+            self.columns = self.args.columns
+
+    # -------------------------------------------------------------------------
+    def get_property_paths(self):
+        """Return the property paths of the hosts needed for the columns, sorting and filters."""
+        paths = list(column_paths(self.get_columns(), list(self.columns) + list(self.sort_keys)))
+        if self.args.online or self.args.offline:
+            paths += self.online_paths
+        return tuple(dict.fromkeys(paths))
+
     # -------------------------------------------------------------------------
     def _run(self):
 
@@ -272,11 +335,13 @@ class GetHostsListApplication(BaseVmwareApplication):
         summary["model"] = host.model
         summary["maintenance"] = host.maintenance
         summary["online"] = host.online
-        summary["no_portgroups"] = str(len(host.portgroups))
         summary["power_state"] = host.power_state
         summary["standby"] = host.standby
-        summary["os_name"] = host.product.name
-        summary["os_version"] = host.product.os_version
+        summary["os_name"] = None
+        summary["os_version"] = None
+        if host.product:
+            summary["os_name"] = host.product.name
+            summary["os_version"] = host.product.os_version
         summary["quarantaine"] = host.quarantaine
 
         return summary
@@ -284,7 +349,10 @@ class GetHostsListApplication(BaseVmwareApplication):
     # -------------------------------------------------------------------------
     def print_hosts(self, hosts):
         """Print on STDOUT all information about all hosts in a human readable format."""
-        hosts.sort(key=itemgetter(*self.sort_keys))
+        from rich import box
+        from rich.table import Table
+
+        hosts.sort(key=row_sort_key(self.sort_keys))
 
         show_header = True
         table_title = _("All physical hosts") + "\n"
@@ -318,98 +386,134 @@ class GetHostsListApplication(BaseVmwareApplication):
             show_footer=False,
         )
 
-        table.add_column(header=_("Host"))
-        table.add_column(header=_("vSphere"))
-        table.add_column(header=_("Data Center"))
-        table.add_column(header=_("Cluster"))
-        table.add_column(header=_("Vendor"))
-        table.add_column(header=_("Model"))
-        table.add_column(header=_("OS Name"))
-        table.add_column(header=_("OS Version"))
-        table.add_column(header=_("CPU cores/threads"), justify="right")
-        table.add_column(header=_("Memory in GiB"), justify="right")
-        table.add_column(header=_("Power State"))
-        table.add_column(header=_("Connect state"))
-        table.add_column(header=_("StandBy state"), justify="center")
-        table.add_column(header=_("Maintenance"), justify="center")
+        columns = {col.key: col for col in self.get_columns()}
+        for key in self.columns:
+            table.add_column(header=columns[key].header, justify=columns[key].justify)
 
         for host in hosts:
             row = []
+            for key in self.columns:
+                row.append(self._format_cell(host, key))
+            table.add_row(*row)
+
+        self.rich_console.print(table)
 
-            row.append(host["name"])
-            row.append(host["vsphere"])
-            row.append(host["dc"])
-            row.append(host["cluster"])
-            row.append(host["vendor"])
-            row.append(host["model"])
-            row.append(host["os_name"])
-            row.append(host["os_version"])
-            row.append(host["cpus"])
-            row.append(format_decimal(host["memory_gb"], format="#,##0"))
-
-            power_state = host["power_state"]
-            if power_state in VsphereHost.power_state_label:
-                power_state = VsphereHost.power_state_label[power_state]
-            p_state = Text(power_state)
-            if host["power_state"].lower() == "poweredon":
+        if not self.quiet:
+            print()
+
+    # -------------------------------------------------------------------------
+    def _format_cell(self, host, key):
+
+        from rich.text import Text
+
+        from ..host import VsphereHost
+
+        value = host[key]
+
+        if key == "memory_gb":
+            if value is None:
+                return None
+            return format_decimal(value, format="#,##0")
+
+        if key == "power_state":
+            power_state = value or "unknown"
+            label = VsphereHost.power_state_label.get(power_state, power_state)
+            p_state = Text(label)
+            if power_state.lower() == "poweredon":
                 p_state.stylize("bold green")
-            elif host["power_state"].lower() == "poweredoff":
+            elif power_state.lower() == "poweredoff":
                 p_state.stylize("bold red")
-            elif host["power_state"].lower() == "standby":
+            elif power_state.lower() == "standby":
                 p_state.stylize("bold blue")
             else:
                 p_state.stylize("bold magenta")
-            row.append(p_state)
+            return p_state
 
-            connection_state = host["connection_state"]
-            if connection_state in VsphereHost.connect_state_label:
-                connection_state = VsphereHost.connect_state_label[connection_state]
-            c_state = Text(connection_state)
-            if host["connection_state"].lower() == "connected":
+        if key == "connection_state":
+            connection_state = value or "~"
+            label = VsphereHost.connect_state_label.get(connection_state, connection_state)
+            c_state = Text(label)
+            if connection_state.lower() == "connected":
                 c_state.stylize("bold green")
-            elif host["connection_state"].lower() == "disconnected":
+            elif connection_state.lower() == "disconnected":
                 c_state.stylize("bold red")
             else:
                 c_state.stylize("bold magenta")
-            row.append(c_state)
+            return c_state
 
-            standby = host["standby"]
+        if key == "standby":
+            standby = value
             if standby == "none":
                 standby = "~"
             if standby in VsphereHost.standby_mode_label:
                 standby = VsphereHost.standby_mode_label[standby]
-            row.append(standby)
-
-            m_state = Text(_("No"), style="bold green")
-            if host["maintenance"]:
-                m_state = Text(_("Yes"), style="bold yellow")
-            row.append(m_state)
-
-            table.add_row(*row)
+            return standby
 
-        self.rich_console.print(table)
+        if key == "maintenance":
+            if value:
+                return Text(_("Yes"), style="bold yellow")
+            return Text(_("No"), style="bold green")
 
-        if not self.quiet:
-            print()
+        return value
 
     # -------------------------------------------------------------------------
     def get_hosts(self, vsphere_name):
         """Get all host of all physical hosts in a VMware vSphere."""
-        hosts = []
+        from pyVmomi import vim
+
+        from ..host import VsphereHost
+        from ..inventory_client import InventoryRecord
+
+        if self.inventory_client is not None:
+            return self.inventory_client.hosts(vsphere=vsphere_name, pattern=self.host_pattern)
 
         vsphere = self.vsphere[vsphere_name]
-        # vsphere.get_datacenter()
 
         re_name = None
         if self.host_pattern is not None:
             re_name = re.compile(self.host_pattern, re.IGNORECASE)
 
-        vsphere.get_hosts(re_name=re_name, vsphere_name=vsphere_name)
+        paths = self.get_property_paths()
+        name_table = None
+        if "parent" in paths:
+            name_table = vsphere.get_name_table()
+        property_sets = vsphere.get_property_sets(vim.HostSystem, paths, re_name=re_name)
 
-        for host_name in sorted(vsphere.hosts.keys()):
-            host = vsphere.hosts[host_name]
-            hosts.append(host)
+        hosts = []
+        for (moref, props) in property_sets:
+            dc_name = None
+            cluster_name = None
+            if name_table is not None:
+                dc_name = name_table.datacenter_of(props.get("parent"))
+                cluster_name = name_table.name_of(props.get("parent"))
+            memory = props.get("hardware.memorySize")
+            power_state = props.get("runtime.powerState")
+
+            hosts.append(
+                InventoryRecord(
+                    name=props.get("name"),
+                    vsphere=vsphere_name,
+                    dc_name=dc_name,
+                    cluster_name=cluster_name,
+                    vendor=props.get("hardware.systemInfo.vendor"),
+                    model=props.get("hardware.systemInfo.model"),
+                    product={
+                        "name": props.get("config.product.name"),
+                        "os_version": props.get("config.product.version"),
+                    },
+                    cpu_cores=props.get("hardware.cpuInfo.numCpuCores"),
+                    cpu_threads=props.get("hardware.cpuInfo.numCpuThreads"),
+                    memory_gb=(float(memory) / 1024.0 / 1024.0 / 1024.0) if memory else None,
+                    power_state=power_state,
+                    online=VsphereHost.online_by_state(power_state),
+                    connection_state=props.get("runtime.connectionState"),
+                    standby=props.get("runtime.standbyMode"),
+                    maintenance=bool(props.get("runtime.inMaintenanceMode")),
+                    quarantaine=bool(props.get("runtime.inQuarantineMode")),
+                )
+            )
 
+        hosts.sort(key=lambda host: host.name)
         return hosts
 
 
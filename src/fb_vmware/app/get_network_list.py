@@ -20,19 +20,16 @@ from operator import itemgetter
 from fb_tools.common import pp
 from fb_tools.spinner import Spinner
 
-from rich import box
-from rich.table import Table
-from rich.text import Text
-
 # Own modules
 from . import BaseVmwareApplication, VmwareAppError
+from .columns import ListColumn
+from .columns import add_columns_option
+from .columns import column_paths
 from .. import __version__ as GLOBAL_VERSION
 from ..errors import VSphereExpectedError
-from ..network import GeneralNetworksDict
-from ..network import VsphereNetwork
 from ..xlate import XLATOR
 
-__version__ = "1.8.4"
+__version__ = "1.9.0"
 LOG = logging.getLogger(__name__)
 
 _ = XLATOR.gettext
@@ -50,6 +47,34 @@ class GetVmNetworkAppError(VmwareAppError):
 class GetNetworkListApp(BaseVmwareApplication):
     """Class for the application object."""
 
+    dvs_columns = (
+        "name",
+        "vsphere",
+        "dc",
+        "create_time",
+        "hosts",
+        "ports",
+        "standalone_ports",
+        "ratio_reservation",
+        "contact",
+        "description",
+    )
+    dvpg_columns = (
+        "name",
+        "vsphere",
+        "dc",
+        "dvs",
+        "vlan_id",
+        "network",
+        "accessible",
+        "type",
+        "ports",
+        "uplink",
+        "description",
+    )
+    net_columns = ("name", "vsphere", "dc", "network", "accessible")
+    sort_keys = ["vsphere", "name"]
+
     # -------------------------------------------------------------------------
     def __init__(
         self,
@@ -67,8 +92,10 @@ class GetNetworkListApp(BaseVmwareApplication):
         """Initialize a GetNetworkListApp object."""
         desc = _("Tries to get a list of all networks in VMware vSphere and print it out.")
 
-        self.all_dvpgs = GeneralNetworksDict()
-        self.all_networks = GeneralNetworksDict()
+        self.all_dvs = []
+        self.all_dvpgs = []
+        self.all_networks = []
+        self.columns = None
 
         super(GetNetworkListApp, self).__init__(
             appname=appname,
@@ -81,6 +108,70 @@ class GetNetworkListApp(BaseVmwareApplication):
 
         self.initialized = True
 
+    # -------------------------------------------------------------------------
+    @classmethod
+    def get_dvs_columns(cls):
+        """Return the columns of the Distributed Virtual Switches."""
+        return (
+            ListColumn("name", _("Name"), ("name",)),
+            ListColumn("vsphere", _("vSphere")),
+            ListColumn("dc", _("Data Center"), ("parent",)),
+            ListColumn("create_time", _("Creation time"), ("config.createTime",)),
+            ListColumn("hosts", _("Hosts"), ("summary.numHosts",), "right"),
+            ListColumn("ports", _("Ports"), ("config.numPorts",), "right"),
+            ListColumn(
+                "standalone_ports", _("Standalone Ports"), ("config.numStandalonePorts",), "right"
+            ),
+            ListColumn(
+                "ratio_reservation",
+                _("Ratio reservation"),
+                ("config.pnicCapacityRatioForReservation",),
+                "right",
+            ),
+            ListColumn("contact", _("Contact"), ("config.contact",)),
+            ListColumn("description", _("Description"), ("config.description",)),
+        )
+
+    # -------------------------------------------------------------------------
+    @classmethod
+    def get_dvpg_columns(cls):
+        """Return the columns of the Distributed Virtual Port Groups."""
+        return (
+            ListColumn("name", _("Name"), ("name",)),
+            ListColumn("vsphere", _("vSphere")),
+            ListColumn("dc", _("Data Center"), ("parent",)),
+            ListColumn("dvs", "DV Switch", ("config.distributedVirtualSwitch",)),
+            ListColumn("vlan_id", "VLAN ID", ("config.defaultPortConfig",), "right"),
+            ListColumn("network", _("Network"), ("name",)),
+            ListColumn("accessible", _("Accessible"), ("summary.accessible",), "center"),
+            ListColumn("type", _("Type"), ("config.type",)),
+            ListColumn("ports", _("Ports"), ("config.numPorts",), "right"),
+            ListColumn("uplink", _("Uplink"), ("config.uplink",), "center"),
+            ListColumn("description", _("Description"), ("config.description",)),
+        )
+
+    # -------------------------------------------------------------------------
+    @classmethod
+    def get_net_columns(cls):
+        """Return the columns of the Virtual Networks."""
+        return (
+            ListColumn("name", _("Name"), ("name",)),
+            ListColumn("vsphere", _("vSphere")),
+            ListColumn("dc", _("Data Center"), ("parent",)),
+            ListColumn("network", _("Network"), ("name",)),
+            ListColumn("accessible", _("Accessible"), ("summary.accessible",), "center"),
+        )
+
+    # -------------------------------------------------------------------------
+    @classmethod
+    def get_columns(cls):
+        """Return the columns of all tables, every key only once."""
+        columns = {}
+        for col in cls.get_dvs_columns() + cls.get_dvpg_columns() + cls.get_net_columns():
+            if col.key not in columns:
+                columns[col.key] = col
+        return tuple(columns.values())
+
     # -------------------------------------------------------------------------
     def as_dict(self, short=True):
         """
@@ -93,22 +184,53 @@ class GetNetworkListApp(BaseVmwareApplication):
         @rtype:  dict
         """
         res = super(GetNetworkListApp, self).as_dict(short=short)
+        res["columns"] = self.columns
 
         return res
 
+    # -------------------------------------------------------------------------
+    def init_arg_parser(self):
+        """Public available method to initiate the argument parser."""
+        output_options = self.arg_parser.add_argument_group(_("Output options"))
+
+        columns = self.get_columns()
+        add_columns_option(output_options, columns, [col.key for col in columns])
+
+        super(GetNetworkListApp, self).init_arg_parser()
+
+    # -------------------------------------------------------------------------
+    def perform_arg_parser(self):
+        """Evaluate command line parameters."""
+        super(GetNetworkListApp, self).perform_arg_parser()
+
+        if self.args.columns:
+            self.columns = self.args.columns
+
+    # -------------------------------------------------------------------------
+    def table_columns(self, avail):
+        """
+        Return the selected columns, which are available in a table.
+
+        Without selected columns all columns of the table are returned.
+        """
+        if self.columns is None:
+            return list(avail)
+        return [key for key in self.columns if key in avail]
+
     # -------------------------------------------------------------------------
     def _run(self):
 
         LOG.debug(_("Starting {a!r}, version {v!r} ...").format(a=self.appname, v=self.version))
 
-        VsphereNetwork.warn_unassigned_net = False
-
         ret = 0
         try:
             ret = self.get_all_networks()
-            self.print_virtual_switches()
-            self.print_dv_portgroups()
-            self.print_networks()
+            if self.table_columns(self.dvs_columns):
+                self.print_virtual_switches()
+            if self.table_columns(self.dvpg_columns):
+                self.print_dv_portgroups()
+            if self.table_columns(self.net_columns):
+                self.print_networks()
         finally:
             self.cleaning_up()
 
@@ -116,37 +238,180 @@ class GetNetworkListApp(BaseVmwareApplication):
 
     # -------------------------------------------------------------------------
     def get_networks(self, vsphere_name):
-        """Get all networks in a VMware vSphere."""
-        networks = []
+        """
+        Get the networking objects of a VMware vSphere with the properties of the selected columns.
+
+        @return: the rows of the Distributed Virtual Switches, Distributed Virtual
+                 Port Groups and Virtual Networks
+        @rtype: tuple of list
+        """
+        from pyVmomi import vim
 
         vsphere = self.vsphere[vsphere_name]
+        dvs_keys = self.table_columns(self.dvs_columns)
+        dvpg_keys = self.table_columns(self.dvpg_columns)
+        net_keys = self.table_columns(self.net_columns)
+
+        dvs_rows = []
+        dvpg_rows = []
+        net_rows = []
+
         try:
-            vsphere.get_networks(vsphere_name=vsphere_name)
+            name_table = None
+            if "dc" in dvs_keys + dvpg_keys + net_keys:
+                name_table = vsphere.get_name_table()
+
+            # The names of the switches are needed for the port groups
+            dvs_names = {}
+            if dvs_keys or "dvs" in dvpg_keys:
+                paths = column_paths(self.get_dvs_columns(), dvs_keys)
+                for (moref, props) in vsphere.get_property_sets(
+                    vim.DistributedVirtualSwitch, paths
+                ):
+                    dvs_names[moref] = props.get("name")
+                    if dvs_keys:
+                        dvs_rows.append(self._dvs_row(props, vsphere_name, name_table))
+
+            if dvpg_keys:
+                paths = column_paths(self.get_dvpg_columns(), dvpg_keys)
+                for (moref, props) in vsphere.get_property_sets(
+                    vim.dvs.DistributedVirtualPortgroup, paths
+                ):
+                    dvpg_rows.append(
+                        self._dvpg_row(props, vsphere_name, name_table, dvs_names)
+                    )
+
+            if net_keys:
+                paths = column_paths(self.get_net_columns(), net_keys)
+                for (moref, props) in vsphere.get_property_sets(vim.Network, paths):
+                    # Port groups of switches and opaque networks are also networks
+                    if moref.type != "Network":
+                        continue
+                    net_rows.append(self._net_row(props, vsphere_name, name_table))
 
         except VSphereExpectedError as e:
             LOG.error(str(e))
             self.exit(6)
 
-        for network in vsphere.networks:
-            networks.append(vsphere.networks[network])
+        return (dvs_rows, dvpg_rows, net_rows)
+
+    # -------------------------------------------------------------------------
+    def _dc_name(self, props, name_table):
+
+        dc_name = None
+        if name_table is not None:
+            dc_name = name_table.datacenter_of(props.get("parent"))
+        return dc_name or "~"
+
+    # -------------------------------------------------------------------------
+    def _dvs_row(self, props, vsphere_name, name_table):
+
+        contact = "~"
+        contact_info = props.get("config.contact")
+        if contact_info is not None:
+            contact_name = (contact_info.name or "").strip()
+            contact_text = (contact_info.contact or "").strip()
+            if contact_name and contact_text:
+                contact = "{n} ({i})".format(n=contact_name, i=contact_text)
+            elif contact_name or contact_text:
+                contact = contact_name or contact_text
+
+        create_time = props.get("config.createTime")
+        if create_time is not None:
+            create_time = create_time.isoformat(sep=" ", timespec="seconds")
+
+        ratio = props.get("config.pnicCapacityRatioForReservation")
+
+        return {
+            "vsphere": vsphere_name,
+            "dc": self._dc_name(props, name_table),
+            "name": props.get("name"),
+            "contact": contact,
+            "create_time": create_time,
+            "description": props.get("config.description"),
+            "hosts": self._format_number(props.get("summary.numHosts")),
+            "ports": self._format_number(props.get("config.numPorts")),
+            "standalone_ports": self._format_number(props.get("config.numStandalonePorts")),
+            "ratio_reservation": "~" if ratio is None else "{:d} %".format(ratio),
+        }
+
+    # -------------------------------------------------------------------------
+    def _dvpg_row(self, props, vsphere_name, name_table, dvs_names):
+
+        from ..dvs import VsphereDvPortGroup
+        from ..network import VsphereNetwork
+
+        name = props.get("name")
+        dvs_name = dvs_names.get(props.get("config.distributedVirtualSwitch")) or "~"
+
+        vlan_id = None
+        port_config = props.get("config.defaultPortConfig")
+        if port_config is not None and "vlan" in port_config:
+            vlan_id = VsphereDvPortGroup.vlan_id_of(port_config.vlan)
+
+        network = VsphereNetwork.network_by_name(name, verbose=self.verbose)
+
+        uplink = _("No")
+        if props.get("config.uplink"):
+            uplink = _("Yes")
+
+        return {
+            "vsphere": vsphere_name,
+            "dc": self._dc_name(props, name_table),
+            "name": name,
+            "dvs": dvs_name,
+            "vlan_id": vlan_id or "~",
+            "network": str(network) if network else "~",
+            "accessible": self._format_accessible(props.get("summary.accessible")),
+            "ports": self._format_number(props.get("config.numPorts")),
+            "type": props.get("config.type"),
+            "uplink": uplink,
+            "description": props.get("config.description"),
+        }
+
+    # -------------------------------------------------------------------------
+    def _net_row(self, props, vsphere_name, name_table):
+
+        from ..network import VsphereNetwork
+
+        name = props.get("name")
+        network = VsphereNetwork.network_by_name(name, verbose=self.verbose)
 
-        return networks
+        return {
+            "vsphere": vsphere_name,
+            "dc": self._dc_name(props, name_table),
+            "name": name,
+            "network": str(network) if network else "~",
+            "accessible": self._format_accessible(props.get("summary.accessible")),
+        }
+
+    # -------------------------------------------------------------------------
+    @staticmethod
+    def _format_number(value):
+
+        if value is None:
+            return "~"
+        return "{:,}".format(value)
+
+    # -------------------------------------------------------------------------
+    @staticmethod
+    def _format_accessible(value):
+
+        from rich.text import Text
+
+        if value:
+            return Text(_("Yes"), style="bold green")
+        return Text(_("No"), style="bold red")
 
     # -------------------------------------------------------------------------
     def _get_all_networks(self):
 
         for vsphere_name in self.vsphere:
-            vsphere = self.vsphere[vsphere_name]
             LOG.debug(_("Get all network-like objects from vSphere {!r} ...").format(vsphere_name))
-
-            try:
-                vsphere.get_networks(vsphere_name=vsphere_name)
-            except VSphereExpectedError as e:
-                LOG.error(str(e))
-                self.exit(6)
-
-            self.all_dvpgs[vsphere_name] = vsphere.dv_portgroups
-            self.all_networks[vsphere_name] = vsphere.networks
+            (dvs_rows, dvpg_rows, net_rows) = self.get_networks(vsphere_name)
+            self.all_dvs += dvs_rows
+            self.all_dvpgs += dvpg_rows
+            self.all_networks += net_rows
 
     # -------------------------------------------------------------------------
     def get_all_networks(self):
@@ -166,150 +431,27 @@ class GetNetworkListApp(BaseVmwareApplication):
             sys.stdout.flush()
 
         if self.verbose > 2:
-            dvs = {}
-            for vsphere_name in self.vsphere:
-                dvs[vsphere_name] = {}
-                for uuid in self.vsphere[vsphere_name].dvs.keys():
-                    dvs[vsphere_name][uuid] = self.vsphere[vsphere_name].dvs[uuid].as_dict()
-
-            msg = _("Found Distributed Virtual Switches:") + "\n" + pp(dvs)
-            LOG.debug(msg)
-
-        if self.verbose > 2:
-            networks = {}
-            dv_port_groups = {}
-            if self.verbose > 3:
-                dv_port_groups = self.all_dvpgs.as_dict()
-                networks = self.all_networks.as_dict()
-            else:
-                dv_port_group_lists = self.all_dvpgs.as_lists()
-                networks_lists = self.all_networks.as_lists()
-                for vsphere_name in self.vsphere:
-                    dv_port_groups[vsphere_name] = []
-                    networks[vsphere_name] = []
-                    if len(dv_port_group_lists[vsphere_name]):
-                        dv_port_groups[vsphere_name] = [dv_port_group_lists[vsphere_name][0]]
-                    if len(networks_lists[vsphere_name]):
-                        networks[vsphere_name] = [networks_lists[vsphere_name][0]]
-
-            msg = _("Found Distributed Virtual Portgroups:") + pp(dv_port_groups)
-            LOG.debug(msg)
-            msg = _("Found Virtual Networks:") + pp(networks)
-            LOG.debug(msg)
+            LOG.debug(_("Found Distributed Virtual Switches:") + "\n" + pp(self.all_dvs))
+            dv_port_groups = self.all_dvpgs
+            networks = self.all_networks
+            if self.verbose < 4:
+                dv_port_groups = dv_port_groups[:1]
+                networks = networks[:1]
+            LOG.debug(_("Found Distributed Virtual Portgroups:") + pp(dv_port_groups))
+            LOG.debug(_("Found Virtual Networks:") + pp(networks))
 
         return ret
 
     # -------------------------------------------------------------------------
-    def print_virtual_switches(self):
-        """Print on STDOUT all information about Distributed Virtual Switches."""
-        all_dvs = []
-
-        print()
-        show_header = True
-        title = _("Distributed Virtual Switches")
-        title += "\n" + ("=" * len(title))
-        box_style = box.ROUNDED
-        if self.quiet:
-            show_header = False
-            title = None
-            box_style = None
-
-        # -----------------------------
-        def get_contact(dvs):
-            """Generate and return a contact string for this DVS."""
-            contact_name = None
-            contact_info = None
-            contact = "~"
-            if dvs.contact_name is not None:
-                contact_name = dvs.contact_name.strip()
-            if dvs.contact_info is not None:
-                contact_info = dvs.contact_info.strip()
-            if contact_name:
-                if contact_info:
-                    contact = "{n} ({i})".format(n=contact_name, i=contact_info)
-                else:
-                    contact = contact_name
-            elif contact_info:
-                contact = contact_info
-
-            return contact
+    def _print_table(self, title, columns, rows, empty_msg):
 
-        for vsphere_name in self.vsphere:
-            for uuid in self.vsphere[vsphere_name].dvs.keys():
-                this_dvs = self.vsphere[vsphere_name].dvs[uuid]
-
-                dc_name = "~"
-                if this_dvs.dc_name:
-                    dc_name = this_dvs.dc_name
-
-                dvs = {
-                    "vsphere": vsphere_name,
-                    "dc": dc_name,
-                    "name": this_dvs.name,
-                    "contact": get_contact(this_dvs),
-                    "create_time": this_dvs.create_time.isoformat(sep=" ", timespec="seconds"),
-                    "description": this_dvs.description,
-                    "hosts": "{:,}".format(this_dvs.num_hosts),
-                    "ports": "{:,}".format(this_dvs.num_ports),
-                    "standalone_ports": "{:,}".format(this_dvs.num_standalone_ports),
-                    "ratio_reservation": "{:d} %".format(this_dvs.pnic_cap_ratio_reservation),
-                }
-                all_dvs.append(dvs)
-
-        if not len(all_dvs):
-            c_title = Text(title, style="bold cyan")
-            self.rich_console.print(c_title)
-            print()
-            print(_("No Distributed Virtual Switches found."))
-            return
-
-        table = Table(
-            title=title,
-            title_style="bold cyan",
-            box=box_style,
-            show_header=show_header,
-            show_footer=False,
-        )
-
-        table.add_column(header=_("Name"))
-        table.add_column(header=_("vSphere"))
-        table.add_column(header=_("Data Center"))
-        table.add_column(header=_("Creation time"))
-        table.add_column(header=_("Hosts"), justify="right")
-        table.add_column(header=_("Ports"), justify="right")
-        table.add_column(header=_("Standalone Ports"), justify="right")
-        table.add_column(header=_("Ratio reservation"), justify="right")
-        table.add_column(header=_("Contact"))
-        table.add_column(header=_("Description"))
-
-        sort_keys = ["vsphere", "name"]
-        all_dvs.sort(key=itemgetter(*sort_keys))
-
-        for dvs in all_dvs:
-            table.add_row(
-                dvs["name"],
-                dvs["vsphere"],
-                dvs["dc"],
-                dvs["create_time"],
-                dvs["hosts"],
-                dvs["ports"],
-                dvs["standalone_ports"],
-                dvs["ratio_reservation"],
-                dvs["description"],
-            )
-
-        self.rich_console.print(table)
-
-        if not self.quiet:
-            print()
+        from rich import box
+        from rich.table import Table
+        from rich.text import Text
 
-    # -------------------------------------------------------------------------
-    def print_dv_portgroups(self):
-        """Print on STDOUT all information about Distributed Virtual Port Groups."""
         print()
 
         show_header = True
-        title = _("Distributed Virtual Port Groups")
         title += "\n" + ("=" * len(title))
         box_style = box.ROUNDED
         if self.quiet:
@@ -317,18 +459,15 @@ class GetNetworkListApp(BaseVmwareApplication):
             title = None
             box_style = None
 
-        all_dvpgs = self._perform_dv_portgroups()
-
-        sort_keys = ["vsphere", "name"]
-        all_dvpgs.sort(key=itemgetter(*sort_keys))
-
-        if not len(all_dvpgs):
-            c_title = Text(title, style="bold cyan")
-            self.rich_console.print(c_title)
-            print()
-            print(_("No Distributed Virtual Port Groups found."))
+        if not len(rows):
+            if title:
+                self.rich_console.print(Text(title, style="bold cyan"))
+                print()
+            print(empty_msg)
             return
 
+        rows.sort(key=itemgetter(*self.sort_keys))
+
         table = Table(
             title=title,
             title_style="bold cyan",
@@ -337,32 +476,13 @@ class GetNetworkListApp(BaseVmwareApplication):
             show_footer=False,
         )
 
-        table.add_column(header=_("Name"))
-        table.add_column(header=_("vSphere"))
-        table.add_column(header=_("Data Center"))
-        table.add_column(header="DV Switch")
-        table.add_column(header="VLAN ID", justify="right")
-        table.add_column(header=_("Network"))
-        table.add_column(header=_("Accessible"), justify="center")
-        table.add_column(header=_("Type"))
-        table.add_column(header=_("Ports"), justify="right")
-        table.add_column(header=_("Uplink"), justify="center")
-        table.add_column(header=_("Description"))
-
-        for dvpg in all_dvpgs:
-            table.add_row(
-                dvpg["name"],
-                dvpg["vsphere"],
-                dvpg["dc"],
-                dvpg["dvs"],
-                dvpg["vlan_id"],
-                dvpg["network"],
-                dvpg["accessible"],
-                dvpg["type"],
-                dvpg["num_ports"],
-                dvpg["uplink"],
-                dvpg["description"],
-            )
+        by_key = {col.key: col for col in columns}
+        keys = self.table_columns(by_key.keys())
+        for key in keys:
+            table.add_column(header=by_key[key].header, justify=by_key[key].justify)
+
+        for row in rows:
+            table.add_row(*[row[key] for key in keys])
 
         self.rich_console.print(table)
 
@@ -370,142 +490,35 @@ class GetNetworkListApp(BaseVmwareApplication):
             print()
 
     # -------------------------------------------------------------------------
-    def _perform_dv_portgroups(self):
-
-        all_dvpgs = []
+    def print_virtual_switches(self):
+        """Print on STDOUT all information about Distributed Virtual Switches."""
+        self._print_table(
+            _("Distributed Virtual Switches"),
+            self.get_dvs_columns(),
+            self.all_dvs,
+            _("No Distributed Virtual Switches found."),
+        )
 
-        for vsphere_name in self.vsphere:
-            for name in self.vsphere[vsphere_name].dv_portgroups.keys():
-                this_dvpg = self.vsphere[vsphere_name].dv_portgroups[name]
-                dvs_name = "~"
-                dvs_uuid = this_dvpg.dvs_uuid
-                if dvs_uuid in self.vsphere[vsphere_name].dvs:
-                    dvs_name = self.vsphere[vsphere_name].dvs[dvs_uuid].name
-                network = "~"
-                if this_dvpg.network:
-                    network = str(this_dvpg.network)
-                uplink = _("No")
-                if this_dvpg.uplink:
-                    uplink = _("Yes")
-
-                accessible = "No"
-                if this_dvpg.accessible:
-                    accessible = Text(_("Yes"), style="bold green")
-                else:
-                    accessible = Text(_("No"), style="bold red")
-
-                dc_name = "~"
-                if this_dvpg.dc_name:
-                    dc_name = this_dvpg.dc_name
-
-                vlan_id = "~"
-                if this_dvpg.vlan_id:
-                    vlan_id = this_dvpg.vlan_id
-
-                dvpg = {
-                    "vsphere": vsphere_name,
-                    "dc": dc_name,
-                    "name": name,
-                    "dvs": dvs_name,
-                    "vlan_id": vlan_id,
-                    "network": network,
-                    "accessible": accessible,
-                    "num_ports": "{:,}".format(this_dvpg.num_ports),
-                    "type": this_dvpg.pg_type,
-                    "uplink": uplink,
-                    "description": this_dvpg.description,
-                }
-                all_dvpgs.append(dvpg)
-
-        return all_dvpgs
+    # -------------------------------------------------------------------------
+    def print_dv_portgroups(self):
+        """Print on STDOUT all information about Distributed Virtual Port Groups."""
+        self._print_table(
+            _("Distributed Virtual Port Groups"),
+            self.get_dvpg_columns(),
+            self.all_dvpgs,
+            _("No Distributed Virtual Port Groups found."),
+        )
 
     # -------------------------------------------------------------------------
     def print_networks(self):
         """Print on STDOUT all information about Virtual Networks."""
-        print()
-
-        show_header = True
-        title = _("Virtual Networks")
-        title += "\n" + ("=" * len(title))
-        box_style = box.ROUNDED
-        if self.quiet:
-            show_header = False
-            title = None
-            box_style = None
-
-        all_networks = self._perform_networks()
-
-        if not len(all_networks):
-            c_title = Text(title, style="bold cyan")
-            self.rich_console.print(c_title)
-            print()
-            print(_("No Virtual Networks found."))
-            return
-
-        sort_keys = ["vsphere", "name"]
-        all_networks.sort(key=itemgetter(*sort_keys))
-
-        table = Table(
-            title=title,
-            title_style="bold cyan",
-            box=box_style,
-            show_header=show_header,
-            show_footer=False,
+        self._print_table(
+            _("Virtual Networks"),
+            self.get_net_columns(),
+            self.all_networks,
+            _("No Virtual Networks found."),
         )
 
-        table.add_column(header=_("Name"))
-        table.add_column(header=_("vSphere"))
-        table.add_column(header=_("Data Center"))
-        table.add_column(header=_("Network"))
-        table.add_column(header=_("Accessible"), justify="center")
-
-        for network in all_networks:
-            table.add_row(
-                network["name"],
-                network["vsphere"],
-                network["dc"],
-                network["network"],
-                network["accessible"],
-            )
-
-        self.rich_console.print(table)
-
-        if not self.quiet:
-            print()
-
-    # -------------------------------------------------------------------------
-    def _perform_networks(self):
-
-        all_networks = []
-
-        for vsphere_name in self.vsphere:
-            for name in self.vsphere[vsphere_name].networks.keys():
-                this_network = self.vsphere[vsphere_name].networks[name]
-                network = "~"
-                if this_network.network:
-                    network = str(this_network.network)
-
-                accessible = "No"
-                if this_network.accessible:
-                    accessible = Text(_("Yes"), style="bold green")
-                else:
-                    accessible = Text(_("No"), style="bold red")
-
-                dc_name = "~"
-                if this_network.dc_name:
-                    dc_name = this_network.dc_name
-
-                net = {
-                    "vsphere": vsphere_name,
-                    "dc": dc_name,
-                    "name": name,
-                    "network": network,
-                    "accessible": accessible,
-                }
-                all_networks.append(net)
-
-        return all_networks
-
 
 # =============================================================================
 def main():
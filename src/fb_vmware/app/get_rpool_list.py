@@ -23,17 +23,13 @@ from fb_tools.common import pp
 from fb_tools.spinner import Spinner
 from fb_tools.xlate import format_list
 
-from rich import box
-from rich.table import Table
-from rich.text import Text
-
 # Own modules
 from . import BaseVmwareApplication, VmwareAppError
 from .. import __version__ as GLOBAL_VERSION
 from ..errors import VSphereExpectedError
 from ..xlate import XLATOR
 
-__version__ = "1.1.2"
+__version__ = "1.1.3"
 LOG = logging.getLogger(__name__)
 
 _ = XLATOR.gettext
@@ -198,6 +194,10 @@ class GetResPoolListApplication(BaseVmwareApplication):
     # -------------------------------------------------------------------------
     def print_rpools(self, rpools):
         """Print on STDOUT all information about cluster) computing resources."""
+        from rich import box
+        from rich.table import Table
+        from rich.text import Text
+
         show_header = True
         show_footer = True
         table_title = _("All compute resources and cluster compute resources") + "\n"
@@ -334,6 +334,8 @@ class GetResPoolListApplication(BaseVmwareApplication):
     # -------------------------------------------------------------------------
     def _prepare_number(self, value, may_zero=False, warn_on_value1=False, compare_val=None):
 
+        from rich.text import Text
+
         if value is None:
             return ""
 
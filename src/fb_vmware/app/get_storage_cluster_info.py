@@ -22,8 +22,6 @@ from fb_tools.common import pp
 from fb_tools.spinner import Spinner
 from fb_tools.xlate import format_list
 
-from rich.table import Table
-
 # Own modules
 from . import BaseVmwareApplication
 from . import VmwareAppError
@@ -31,7 +29,7 @@ from .. import __version__ as GLOBAL_VERSION
 from ..errors import VSphereExpectedError
 from ..xlate import XLATOR
 
-__version__ = "1.0.3"
+__version__ = "1.0.4"
 LOG = logging.getLogger(__name__)
 
 _ = XLATOR.gettext
@@ -141,6 +139,8 @@ class GetStorageClusterInfoApp(BaseVmwareApplication):
     # -------------------------------------------------------------------------
     def show_ds_cluster(self, cluster_name):
         """Show a particular datastorecluster on STDOUT."""
+        from rich.table import Table
+
         print()
         msg_tpl = _("Getting data of datastora cluster {} ... ")
         if self.verbose:
@@ -24,19 +24,14 @@ from fb_tools.common import pp
 from fb_tools.spinner import Spinner
 from fb_tools.xlate import format_list
 
-from rich import box
-from rich.table import Table
-from rich.text import Text
-
 # Own modules
 from . import BaseVmwareApplication
 from . import VmwareAppError
 from .. import __version__ as GLOBAL_VERSION
-from ..ds_cluster import VsphereDsClusterDict
 from ..errors import VSphereExpectedError
 from ..xlate import XLATOR
 
-__version__ = "1.5.1"
+__version__ = "1.5.2"
 LOG = logging.getLogger(__name__)
 
 _ = XLATOR.gettext
@@ -198,6 +193,8 @@ class GetStorageClusterListApp(BaseVmwareApplication):
     # -------------------------------------------------------------------------
     def get_all_storage_clusters(self):
         """Collect all storage clusters."""
+        from ..ds_cluster import VsphereDsClusterDict
+
         ret = 0
         all_storage_clusters = {}
 
@@ -299,6 +296,10 @@ class GetStorageClusterListApp(BaseVmwareApplication):
     # -------------------------------------------------------------------------
     def print_clusters(self, clusters):
         """Print on STDOUT all information about all datastore clusters."""
+        from rich import box
+        from rich.table import Table
+        from rich.text import Text
+
         show_footer = False
         if self.print_total and not self.quiet:
             show_footer = True
@@ -14,7 +14,6 @@ import locale
 import logging
 import pathlib
 import sys
-from operator import itemgetter
 
 # Third party modules
 from babel.numbers import format_decimal
@@ -24,19 +23,18 @@ from fb_tools.common import pp
 from fb_tools.spinner import Spinner
 from fb_tools.xlate import format_list
 
-from rich import box
-from rich.table import Table
-from rich.text import Text
-
 # Own modules
 from . import BaseVmwareApplication
 from . import VmwareAppError
+from .columns import ListColumn
+from .columns import add_columns_option
+from .columns import column_paths
 from .. import __version__ as GLOBAL_VERSION
-from ..datastore import VsphereDatastoreDict
 from ..errors import VSphereExpectedError
+from ..errors import VSphereNoDatastoresFoundError
 from ..xlate import XLATOR
 
-__version__ = "1.3.1"
+__version__ = "1.5.0"
 LOG = logging.getLogger(__name__)
 
 _ = XLATOR.gettext
@@ -54,11 +52,25 @@ class GetVmStoragesAppError(VmwareAppError):
 class GetStorageListApp(BaseVmwareApplication):
     """Class for the application object."""
 
+    avail_columns = (
+        "ds_name",
+        "storage_type",
+        "vsphere_name",
+        "dc",
+        "cluster",
+        "hosts",
+        "capacity",
+        "usage",
+        "usage_pc",
+        "free_space",
+    )
+    default_columns = [key for key in avail_columns if key != "hosts"]
+    detail_columns = list(avail_columns)
     avail_sort_keys = (
         "ds_name",
         "vsphere_name",
         "dc",
-        "ecluster",
+        "cluster",
         "capacity",
         "free_space",
         "usage",
@@ -67,6 +79,7 @@ class GetStorageListApp(BaseVmwareApplication):
     default_sort_keys = ["vsphere_name", "dc", "ds_name"]
 
     show_simulate_option = False
+    use_inventoryd = True
 
     # -------------------------------------------------------------------------
     def __init__(
@@ -91,6 +104,7 @@ class GetStorageListApp(BaseVmwareApplication):
         self.totals = None
         self._detailled = False
         self.sort_keys = self.default_sort_keys
+        self.columns = self.default_columns
 
         super(GetStorageListApp, self).__init__(
             appname=appname,
@@ -121,6 +135,24 @@ class GetStorageListApp(BaseVmwareApplication):
         """Print out a more detailled info about the datastores."""
         return self._detailled
 
+    # -------------------------------------------------------------------------
+    @classmethod
+    def get_columns(cls):
+        """Return the available output columns with the property paths needed by them."""
+        space_paths = ("summary.capacity", "summary.freeSpace")
+        return (
+            ListColumn("ds_name", _("Datastore"), ("name",)),
+            ListColumn("storage_type", _("Type"), ("name",), "center"),
+            ListColumn("vsphere_name", _("vSphere")),
+            ListColumn("dc", _("Data Center"), ("parent",)),
+            ListColumn("cluster", _("Cluster"), ("parent",)),
+            ListColumn("hosts", _("Connected Hosts"), ("host",), "right"),
+            ListColumn("capacity", _("Capacity in GB"), ("summary.capacity",), "right"),
+            ListColumn("usage", _("Calculated usage in GB"), space_paths, "right"),
+            ListColumn("usage_pc", _("Usage in percent"), space_paths, "right"),
+            ListColumn("free_space", _("Free space in GB"), ("summary.freeSpace",), "right"),
+        )
+
     # -------------------------------------------------------------------------
     def as_dict(self, short=True):
         """
@@ -136,6 +168,7 @@ class GetStorageListApp(BaseVmwareApplication):
         res["detailled"] = self.detailled
         res["no_local"] = self.no_local
         res["print_total"] = self.print_total
+        res["columns"] = self.columns
 
         return res
 
@@ -171,6 +204,8 @@ class GetStorageListApp(BaseVmwareApplication):
             ),
         )
 
+        add_columns_option(output_options, self.get_columns(), self.default_columns)
+
         output_options.add_argument(
             "-S",
             "--sort",
@@ -205,6 +240,15 @@ class GetStorageListApp(BaseVmwareApplication):
 
         if getattr(self.args, "detailled", False):
             self._detailled = True
+            self.columns = self.detail_columns
+
+        if self.args.columns:
+            self.columns = self.args.columns
+
+    # -------------------------------------------------------------------------
+    def get_property_paths(self):
+        """Return the property paths of the datastores needed for the columns and sorting."""
+        return column_paths(self.get_columns(), list(self.columns) + list(self.sort_keys))
 
     # -------------------------------------------------------------------------
     def _run(self):
@@ -224,21 +268,72 @@ class GetStorageListApp(BaseVmwareApplication):
         """Get all datastore clusters in a VMware vSphere."""
         datastores = []
 
+        if self.inventory_client is not None:
+            try:
+                return self.inventory_client.datastores(
+                    vsphere=vsphere_name, no_local=self.no_local
+                )
+            except VSphereExpectedError as e:
+                LOG.error(str(e))
+                self.exit(6)
+
+        from pyVmomi import vim
+
+        from ..datastore import VsphereDatastore
+        from ..inventory_client import InventoryRecord
+
         vsphere = self.vsphere[vsphere_name]
-        no_local_ds = False
-        if self.no_local:
-            no_local_ds = True
+        paths = self.get_property_paths()
         try:
-            vsphere.get_datastores(no_local_ds=no_local_ds, detailled=self.detailled)
+            name_table = None
+            if "parent" in paths:
+                name_table = vsphere.get_name_table()
+            property_sets = vsphere.get_property_sets(vim.Datastore, paths)
         except VSphereExpectedError as e:
             LOG.error(str(e))
             self.exit(6)
 
-        for datastore in vsphere.datastores:
-            datastores.append(vsphere.datastores[datastore])
+        for (moref, props) in property_sets:
+            ds_name = props.get("name")
+            if self.no_local and vsphere.re_local_ds.match(ds_name):
+                continue
+
+            dc_name = None
+            cluster = None
+            parent = props.get("parent")
+            if name_table is not None:
+                dc_name = name_table.datacenter_of(parent)
+                if parent is not None and parent.type == "StoragePod":
+                    cluster = name_table.name_of(parent)
+
+            capacity = props.get("summary.capacity")
+            free_space = props.get("summary.freeSpace")
+            datastores.append(
+                InventoryRecord(
+                    name=ds_name,
+                    storage_type=VsphereDatastore.storage_type_by_name(ds_name),
+                    dc_name=dc_name,
+                    cluster=cluster,
+                    hosts=props.get("host"),
+                    capacity_gb=self._to_gb(capacity),
+                    free_space_gb=self._to_gb(free_space),
+                )
+            )
+
+        if not datastores:
+            LOG.error(str(VSphereNoDatastoresFoundError()))
+            self.exit(6)
 
         return datastores
 
+    # -------------------------------------------------------------------------
+    @staticmethod
+    def _to_gb(value):
+
+        if value is None:
+            return None
+        return float(value) / 1024.0 / 1024.0 / 1024.0
+
     # -------------------------------------------------------------------------
     def get_all_datastores(self):
         """Collect all datastores."""
@@ -249,10 +344,9 @@ class GetStorageListApp(BaseVmwareApplication):
         def _get_all_datastores():
 
             for vsphere_name in self.vsphere:
-                if vsphere_name not in all_datastores:
-                    all_datastores[vsphere_name] = VsphereDatastoreDict()
-                for datastore in self.get_datastores(vsphere_name):
-                    all_datastores[vsphere_name].append(datastore)
+                all_datastores[vsphere_name] = {
+                    ds.name: ds for ds in self.get_datastores(vsphere_name)
+                }
 
         if self.verbose or self.quiet:
             _get_all_datastores()
@@ -299,7 +393,7 @@ class GetStorageListApp(BaseVmwareApplication):
 
                 datastore["ds_name"] = ds_name
 
-                if hasattr(ds, "hosts"):
+                if getattr(ds, "hosts", None) is not None:
                     datastore["hosts"] = str(len(ds.hosts))
                 else:
                     datastore["hosts"] = "~"
@@ -311,18 +405,25 @@ class GetStorageListApp(BaseVmwareApplication):
                     datastore["cluster"] = ds.cluster
 
                 datastore["capacity"] = ds.capacity_gb
-                datastore["capacity_gb"] = format_decimal(ds.capacity_gb, format="#,##0")
-                total_capacity += ds.capacity_gb
+                datastore["capacity_gb"] = "~"
+                if ds.capacity_gb is not None:
+                    datastore["capacity_gb"] = format_decimal(ds.capacity_gb, format="#,##0")
+                    total_capacity += ds.capacity_gb
 
                 datastore["free_space"] = ds.free_space_gb
-                datastore["free_space_gb"] = format_decimal(ds.free_space_gb, format="#,##0")
-                total_free += ds.free_space_gb
-
-                used = ds.capacity_gb - ds.free_space_gb
+                datastore["free_space_gb"] = "~"
+                if ds.free_space_gb is not None:
+                    datastore["free_space_gb"] = format_decimal(ds.free_space_gb, format="#,##0")
+                    total_free += ds.free_space_gb
+
+                used = None
+                datastore["usage_gb"] = "~"
+                if ds.capacity_gb is not None and ds.free_space_gb is not None:
+                    used = ds.capacity_gb - ds.free_space_gb
+                    datastore["usage_gb"] = format_decimal(used, format="#,##0")
                 datastore["usage"] = used
-                datastore["usage_gb"] = format_decimal(used, format="#,##0")
 
-                if ds.capacity_gb:
+                if ds.capacity_gb and used is not None:
                     usage_pc = used / ds.capacity_gb
                     datastore["usage_pc"] = usage_pc
                     datastore["usage_pc_out"] = format_decimal(usage_pc, format="0.0 %")
@@ -359,6 +460,10 @@ class GetStorageListApp(BaseVmwareApplication):
     # -------------------------------------------------------------------------
     def print_datastores(self, all_datastores):
         """Print on STDOUT all information about all datastore clusters."""
+        from rich import box
+        from rich.table import Table
+        from rich.text import Text
+
         show_footer = False
         if self.print_total and not self.quiet:
             show_footer = True
@@ -375,12 +480,13 @@ class GetStorageListApp(BaseVmwareApplication):
 
         if self.sort_keys:
             LOG.debug("Sorting keys: " + pp(self.sort_keys))
-            self.sort_keys.reverse()
-            for key in self.sort_keys:
+            for key in reversed(self.sort_keys):
                 if key in ("ds_name", "vsphere_name", "dc", "cluster"):
-                    datastore_list.sort(key=itemgetter(key))
+                    datastore_list.sort(key=lambda ds: (ds[key] is not None, ds[key]))
                 else:
-                    datastore_list.sort(key=itemgetter(key), reverse=True)
+                    datastore_list.sort(
+                        key=lambda ds: (ds[key] is not None, ds[key]), reverse=True
+                    )
 
         if self.quiet:
             caption = None
@@ -406,46 +512,41 @@ class GetStorageListApp(BaseVmwareApplication):
             show_footer=show_footer,
         )
 
-        ds_table.add_column(header=_("Datastore"), footer=_("Total"))
-        ds_table.add_column(header=_("Type"), footer="", justify="center")
-        ds_table.add_column(header=_("vSphere"), footer="")
-        ds_table.add_column(header=_("Data Center"), footer="")
-        ds_table.add_column(header=_("Cluster"), footer="")
-        ds_table.add_column(header=_("Connected Hosts"), footer="", justify="right")
-        ds_table.add_column(
-            header=_("Capacity in GB"), footer=self.totals["capacity_gb"], justify="right"
-        )
-        ds_table.add_column(
-            header=_("Calculated usage in GB"), footer=self.totals["usage_gb"], justify="right"
-        )
-        ds_table.add_column(
-            header=_("Usage in percent"), footer=self.totals["usage_pc_out"], justify="right"
-        )
-        ds_table.add_column(
-            header=_("Free space in GB"), footer=self.totals["free_space_gb"], justify="right"
-        )
+        footers = {
+            "ds_name": _("Total"),
+            "capacity": self.totals["capacity_gb"],
+            "usage": self.totals["usage_gb"],
+            "usage_pc": self.totals["usage_pc_out"],
+            "free_space": self.totals["free_space_gb"],
+        }
+        cells = {
+            "capacity": "capacity_gb",
+            "usage": "usage_gb",
+            "free_space": "free_space_gb",
+        }
+        columns = {col.key: col for col in self.get_columns()}
+        for key in self.columns:
+            ds_table.add_column(
+                header=columns[key].header,
+                footer=footers.get(key, ""),
+                justify=columns[key].justify,
+            )
 
         for datastore in datastore_list:
-            used_pc_out = Text(datastore["usage_pc_out"])
-            if datastore["usage_pc"] is None:
-                used_pc_out.stylize("bold magenta")
-            elif datastore["usage_pc"] >= 0.9:
-                used_pc_out.stylize("bold red")
-            elif datastore["usage_pc"] >= 0.8:
-                used_pc_out.stylize("bold yellow")
-
-            ds_table.add_row(
-                datastore["ds_name"],
-                datastore["storage_type"],
-                datastore["vsphere_name"],
-                datastore["dc"],
-                datastore["cluster"],
-                datastore["hosts"],
-                datastore["capacity_gb"],
-                datastore["usage_gb"],
-                used_pc_out,
-                datastore["free_space_gb"],
-            )
+            row = []
+            for key in self.columns:
+                if key == "usage_pc":
+                    used_pc_out = Text(datastore["usage_pc_out"])
+                    if datastore["usage_pc"] is None:
+                        used_pc_out.stylize("bold magenta")
+                    elif datastore["usage_pc"] >= 0.9:
+                        used_pc_out.stylize("bold red")
+                    elif datastore["usage_pc"] >= 0.8:
+                        used_pc_out.stylize("bold yellow")
+                    row.append(used_pc_out)
+                else:
+                    row.append(datastore[cells.get(key, key)])
+            ds_table.add_row(*row)
 
         self.rich_console.print(ds_table)
 
@@ -22,12 +22,10 @@ from fb_tools.spinner import Spinner
 # Own modules
 from . import BaseVmwareApplication, VmwareAppError
 from .. import __version__ as GLOBAL_VERSION
-from ..controller import VsphereDiskController
 from ..errors import VSphereExpectedError
-from ..ether import VsphereEthernetcard
 from ..xlate import XLATOR
 
-__version__ = "1.10.1"
+__version__ = "1.11.0"
 LOG = logging.getLogger(__name__)
 
 _ = XLATOR.gettext
@@ -126,8 +124,14 @@ class GetVmApplication(BaseVmwareApplication):
             LOG.error(str(e))
             self.exit(8)
 
-        for vm_name in sorted(self.vms, key=str.lower):
-            if not self.show_vm(vm_name):
+        vm_names = sorted(self.vms, key=str.lower)
+        count = len(vm_names)
+        msg_tpl = ngettext("Getting data of {} VM ... ", "Getting data of {} VMs ... ", count)
+        vms = self._with_spinner(msg_tpl, count, self._get_vms_data, vm_names)
+
+        for vm_name in vm_names:
+            print()
+            if not self._print_vm(vm_name, vms.get(vm_name)):
                 ret = 1
 
         return ret
@@ -137,19 +141,29 @@ class GetVmApplication(BaseVmwareApplication):
         """Show a particular VM on STDOUT."""
         print()
         msg_tpl = _("Getting data of VM {} ... ")
+        vm = self._with_spinner(msg_tpl, vm_name, self._get_vm_data, vm_name)
+        return self._print_vm(vm_name, vm)
+
+    # -------------------------------------------------------------------------
+    def _with_spinner(self, msg_tpl, subject, func, *args):
+
         if self.verbose:
-            msg = msg_tpl.format(self.colored(vm_name, "CYAN"))
+            msg = msg_tpl.format(self.colored(str(subject), "CYAN"))
             print(msg)
-            vm = self._get_vm_data(vm_name)
-        else:
-            msg_len = len(msg_tpl.format(vm_name))
-            spin_prompt = msg_tpl.format(self.colored(vm_name, "CYAN"))
-            spinner_name = self.get_random_spinner_name()
-            with Spinner(spin_prompt, spinner_name):
-                vm = self._get_vm_data(vm_name)
-            sys.stdout.write(" " * msg_len)
-            sys.stdout.write("\r")
-            sys.stdout.flush()
+            return func(*args)
+
+        msg_len = len(msg_tpl.format(subject))
+        spin_prompt = msg_tpl.format(self.colored(str(subject), "CYAN"))
+        spinner_name = self.get_random_spinner_name()
+        with Spinner(spin_prompt, spinner_name):
+            result = func(*args)
+        sys.stdout.write(" " * msg_len)
+        sys.stdout.write("\r")
+        sys.stdout.flush()
+        return result
+
+    # -------------------------------------------------------------------------
+    def _print_vm(self, vm_name, vm):
 
         print("{}: ".format(vm_name), end="")
         if not vm:
@@ -167,8 +181,11 @@ class GetVmApplication(BaseVmwareApplication):
         dc_name = "~"
         if vm.dc_name:
             dc_name = vm.dc_name
+        cluster_name = "~"
+        if vm.cluster_name:
+            cluster_name = vm.cluster_name
         msg = "    vSphere:  {vs:<10}    DC: {dc:<25}    Cluster: {cl:<20}    Path: {p}".format(
-            vs=vm.vsphere, dc=dc_name, cl=vm.cluster_name, p=vm.path
+            vs=vm.vsphere, dc=dc_name, cl=cluster_name, p=vm.path
         )
         print(msg)
 
@@ -205,6 +222,8 @@ class GetVmApplication(BaseVmwareApplication):
     # -------------------------------------------------------------------------
     def _print_ctrlrs(self, vm):
 
+        from ..controller import VsphereDiskController
+
         ctrl_lbl = _("Controller") + ":"
         len_ctrl_lbl = len(ctrl_lbl)
 
@@ -301,6 +320,8 @@ class GetVmApplication(BaseVmwareApplication):
     # -------------------------------------------------------------------------
     def _print_interfaces(self, vm):
 
+        from ..ether import VsphereEthernetcard
+
         if not vm.interfaces:
             print("    Ethernet:    {}".format(_("None")))
             return
@@ -348,37 +369,47 @@ class GetVmApplication(BaseVmwareApplication):
     # -------------------------------------------------------------------------
     def _get_vm_data(self, vm_name):
 
+        return self._get_vms_data([vm_name])[vm_name]
+
+    # -------------------------------------------------------------------------
+    def _get_vms_data(self, vm_names):
+
         if self.verbose > 1:
-            LOG.debug(_("Pulling full data of VM {!r} ...").format(vm_name))
+            LOG.debug(_("Pulling full data of {} VMs ...").format(len(vm_names)))
 
-        vm = None
+        vms = dict.fromkeys(vm_names)
 
         for vsphere_name in self.vsphere:
+            missing = [vm_name for vm_name in vm_names if vms[vm_name] is None]
+            if not missing:
+                break
+
             vsphere = self.vsphere[vsphere_name]
             LOG.debug(
-                _("Searching for VM {vm} in vSphere {vs} ...").format(
-                    vm=self.colored(vm_name, "CYAN"), vs=self.colored(vsphere_name, "CYAN")
+                _("Searching for {c} VMs in vSphere {vs} ...").format(
+                    c=len(missing), vs=self.colored(vsphere_name, "CYAN")
                 )
             )
-            vm = vsphere.get_vm_direct(vm_name, vsphere_name=vsphere_name, no_error=True)
-            # vm = vsphere.get_vm(vm_name, vsphere_name=vsphere_name, no_error=True)
-            if not vm:
-                continue
-
-            vm.full_custom_data = []
-            if vm.custom_data:
-                for cdata in vm.custom_data:
-                    for custom_key in cdata.keys():
-                        custom_value = cdata[custom_key]
-                        custom_name = vsphere.custom_field_name(custom_key)
-                        if custom_name is None:
-                            custom_name = custom_key
-                        vm.full_custom_data.append({custom_name: custom_value})
-
-            if vm:
-                break
-
-        return vm
+            found = vsphere.get_vms_by_names(missing, vsphere_name=vsphere_name)
+
+            for vm_name in missing:
+                vm = found.get(vm_name)
+                if not vm:
+                    continue
+
+                vm.full_custom_data = []
+                if vm.custom_data:
+                    for cdata in vm.custom_data:
+                        for custom_key in cdata.keys():
+                            custom_value = cdata[custom_key]
+                            custom_name = vsphere.custom_field_name(custom_key)
+                            if custom_name is None:
+                                custom_name = custom_key
+                            vm.full_custom_data.append({custom_name: custom_value})
+
+                vms[vm_name] = vm
+
+        return vms
 
 
 # =============================================================================
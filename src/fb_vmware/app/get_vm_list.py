@@ -26,18 +26,17 @@ from fb_tools.common import to_bool
 from fb_tools.spinner import Spinner
 from fb_tools.xlate import format_list
 
-from rich import box
-from rich.table import Table
-from rich.text import Text
-
 # Own modules
 from . import BaseVmwareApplication, VmwareAppError
+from .columns import ListColumn
+from .columns import add_columns_option
+from .columns import column_paths
+from .columns import row_sort_key
 from .. import __version__ as GLOBAL_VERSION
 from ..errors import VSphereExpectedError
-from ..vm import VsphereVm
 from ..xlate import XLATOR
 
-__version__ = "1.12.2"
+__version__ = "1.14.0"
 LOG = logging.getLogger(__name__)
 
 _ = XLATOR.gettext
@@ -101,18 +100,33 @@ class GetVmListApplication(BaseVmwareApplication):
     """Class for the application objects."""
 
     default_vm_pattern = r".*"
-    avail_sort_keys = (
+    avail_columns = (
         "name",
         "vsphere",
         "dc",
         "cluster",
+        "host",
         "path",
         "type",
         "onl_str",
         "cfg_ver",
         "os",
     )
+    default_columns = ["name", "vsphere", "dc", "path"]
+    detail_columns = [
+        "name",
+        "vsphere",
+        "dc",
+        "cluster",
+        "path",
+        "type",
+        "onl_str",
+        "cfg_ver",
+        "os",
+    ]
+    avail_sort_keys = avail_columns
     default_sort_keys = ["name", "vsphere", "dc"]
+    use_inventoryd = True
 
     # -------------------------------------------------------------------------
     def __init__(
@@ -138,6 +152,7 @@ class GetVmListApplication(BaseVmwareApplication):
         self.count_templates = None
 
         self.sort_keys = self.default_sort_keys
+        self.columns = self.default_columns
 
         self._re_hw = None
         self._re_os = None
@@ -171,6 +186,23 @@ class GetVmListApplication(BaseVmwareApplication):
     def details(self, value):
         self._details = to_bool(value)
 
+    # -------------------------------------------------------------------------
+    @classmethod
+    def get_columns(cls):
+        """Return the available output columns with the property paths needed by them."""
+        return (
+            ListColumn("name", "VM/Template", ("name",)),
+            ListColumn("vsphere", "vSphere"),
+            ListColumn("dc", _("Data Center"), ("parent",)),
+            ListColumn("cluster", _("Cluster"), ("resourcePool",)),
+            ListColumn("host", _("Host"), ("runtime.host",)),
+            ListColumn("path", _("Path"), ("parent",)),
+            ListColumn("type", _("Type"), ("config.template",)),
+            ListColumn("onl_str", _("Online Status"), ("config.template", "runtime.powerState")),
+            ListColumn("cfg_ver", _("Config Version"), ("config.version",)),
+            ListColumn("os", _("Operating System"), ("summary.config.guestId",)),
+        )
+
     # -------------------------------------------------------------------------
     def as_dict(self, short=True):
         """
@@ -184,6 +216,7 @@ class GetVmListApplication(BaseVmwareApplication):
         """
         res = super(GetVmListApplication, self).as_dict(short=short)
         res["details"] = self.details
+        res["columns"] = self.columns
         res["vm_pattern"] = self.vm_pattern
         res["default_vm_pattern"] = self.default_vm_pattern
 
@@ -289,6 +322,8 @@ class GetVmListApplication(BaseVmwareApplication):
             help=_("Detailed output list (quering data needs some time longer)."),
         )
 
+        add_columns_option(output_options, self.get_columns(), self.default_columns)
+
         output_options.add_argument(
             "-S",
             "--sort",
@@ -324,44 +359,52 @@ class GetVmListApplication(BaseVmwareApplication):
                 )
                 LOG.error(msg)
 
-        if not self.details:
-            if (
-                self.args.online
-                or self.args.offline
-                or self.args.hw
-                or self.args.os
-                or self.args.vm_type != "all"
-            ):
-                LOG.info(_("Detailed output is required because of your given options."))
-                self.details = True
+        filtered = bool(
+            self.args.online
+            or self.args.offline
+            or self.args.hw
+            or self.args.os
+            or self.args.vm_type != "all"
+        )
+
+        if self.args.columns:
+            self.columns = self.args.columns
+        elif self.details:
+            self.columns = self.detail_columns
+        elif filtered:
+            LOG.info(_("Detailed output is required because of your given options."))
+            self.columns = self.detail_columns
 
         if self.args.sort_keys:
-            if self.details:
-                self.sort_keys = self.args.sort_keys
-            else:
-                self.sort_keys = []
-                for key in self.args.sort_keys:
-                    if key in ("name", "vsphere", "path"):
-                        self.sort_keys.append(key)
-                    else:
-                        LOG.warn(
-                            _(
-                                "Sorting key {!r} not usable, if not detailed output was given."
-                            ).format(key)
-                        )
-                if not self.sort_keys:
-                    LOG.warn(
-                        _("No usable sorting keys found, using default sorting keys {}.").format(
-                            format_list(self.default_sort_keys, do_repr=True)
-                        )
-                    )
-                    self.sort_keys = self.default_sort_keys
+            self.sort_keys = self.args.sort_keys
+
+        # The filters and all columns besides the location need the details of the VMs
+        if filtered:
+            self.details = True
+        plain_keys = ("name", "vsphere", "dc", "path")
+        for key in list(self.columns) + list(self.sort_keys):
+            if key not in plain_keys:
+                self.details = True
 
         if self.args.hw:
             self._re_hw = re.compile(self.args.hw, re.IGNORECASE)
         if self.args.os:
             self._re_os = re.compile(self.args.os, re.IGNORECASE)
 
+    # -------------------------------------------------------------------------
+    def get_property_paths(self):
+        """Return the property paths of the VMs needed for the columns, sorting and filters."""
+        paths = list(column_paths(self.get_columns(), list(self.columns) + list(self.sort_keys)))
+        if self.args.vm_type != "all":
+            paths.append("config.template")
+        if self.args.online or self.args.offline:
+            paths += ["config.template", "runtime.powerState"]
+        if self.args.hw:
+            paths.append("config.version")
+        if self.args.os:
+            paths.append("summary.config.guestId")
+        return tuple(dict.fromkeys(paths))
+
     # -------------------------------------------------------------------------
     def _run(self):
 
@@ -409,10 +452,14 @@ class GetVmListApplication(BaseVmwareApplication):
     # -------------------------------------------------------------------------
     def print_virtual_machines(self, all_vms):
         """Print out on STDOUT the list of found VMs."""
+        from rich import box
+        from rich.table import Table
+        from rich.text import Text
+
         if self.verbose > 1:
             LOG.debug("Print out VM list: " + pp(all_vms))
 
-        all_vms.sort(key=itemgetter(*self.sort_keys))
+        all_vms.sort(key=row_sort_key(self.sort_keys))
 
         show_header = True
         title = _("Virtual Machines")
@@ -456,69 +503,88 @@ class GetVmListApplication(BaseVmwareApplication):
             show_footer=False,
         )
 
-        table.add_column(header="VM/Template")
-        table.add_column(header="vSphere")
-        table.add_column(header=_("Data Center"))
-        if self.details:
-            table.add_column(header=_("Cluster"))
-        table.add_column(header=_("Path"))
-        if self.details:
-            table.add_column(header=_("Type"))
-            table.add_column(header=_("Online Status"))
-            table.add_column(header=_("Config Version"))
-            table.add_column(header=_("Operating System"))
+        columns = {col.key: col for col in self.get_columns()}
+        for key in self.columns:
+            table.add_column(header=columns[key].header, justify=columns[key].justify)
 
         for vm in all_vms:
-
-            if self.details:
-                online_status = Text(vm["onl_str"], style="bold green")
-                if vm["is_template"]:
-                    online_status = Text(vm["onl_str"], style="bold cyan")
-                elif not vm["is_online"]:
-                    online_status = Text(vm["onl_str"], style="bold red")
-
-                table.add_row(
-                    vm["name"],
-                    vm["vsphere"],
-                    vm["dc"],
-                    vm["cluster"],
-                    vm["path"],
-                    vm["type"],
-                    online_status,
-                    vm["cfg_ver"],
-                    vm["os"],
-                )
-            else:
-                table.add_row(
-                    vm["name"],
-                    vm["vsphere"],
-                    vm["dc"],
-                    vm["path"],
-                )
+            row = []
+            for key in self.columns:
+                if key == "onl_str":
+                    style = "bold green"
+                    if vm["is_template"]:
+                        style = "bold cyan"
+                    elif not vm["is_online"]:
+                        style = "bold red"
+                    row.append(Text(vm["onl_str"], style=style))
+                else:
+                    row.append(vm.get(key))
+            table.add_row(*row)
 
         self.rich_console.print(table)
 
     # -------------------------------------------------------------------------
     def get_vms(self, vsphere_name, re_name=None):
         """Get the filtered list of VMs from vSphere."""
-        vsphere = self.vsphere[vsphere_name]
-        vsphere.get_datacenter()
-
         if re_name is None:
             re_name = re.compile(self.vm_pattern, re.IGNORECASE)
 
-        if self.details:
-            # vm_list = vsphere.get_vms(re_name, vsphere_name=vsphere_name, as_obj=True)
-            vm_list = vsphere.get_vm_list(
-                re_name, vsphere_name=vsphere_name, name_only=False, disconnect=True
-            )
-            vms = self.mangle_vmlist_details(vm_list, vsphere_name)
-        else:
-            # vm_list = vsphere.get_vms(re_name, vsphere_name=vsphere_name, name_only=True)
-            vm_list = vsphere.get_vm_list(
-                re_name, vsphere_name=vsphere_name, name_only=True, disconnect=True
+        if self.inventory_client is not None:
+            records = self.inventory_client.vms(vsphere=vsphere_name, pattern=re_name.pattern)
+            if self.details:
+                return self.mangle_vmlist_details(records, vsphere_name)
+            vm_list = [(vm.name, vm.dc_name, vm.path) for vm in records]
+            return self.mangle_vmlist_no_details(vm_list, vsphere_name)
+
+        from pyVmomi import vim
+
+        vsphere = self.vsphere[vsphere_name]
+        paths = self.get_property_paths()
+        name_table = vsphere.get_name_table()
+        property_sets = vsphere.get_property_sets(
+            vim.VirtualMachine, paths, re_name=re_name, disconnect=True
+        )
+
+        return self.mangle_property_sets(
+            property_sets, name_table, vsphere_name, paths, max_depth=vsphere.max_search_depth
+        )
+
+    # -------------------------------------------------------------------------
+    def mangle_property_sets(self, property_sets, name_table, vsphere_name, paths, max_depth=None):
+        """Prepare the retrieved properties of the found VMs for output."""
+        from ..inventory_client import InventoryRecord
+        from ..vm import VsphereVm
+
+        if self.verbose > 1:
+            LOG.debug(_("Performing the property sets of {} VMs ...").format(len(property_sets)))
+
+        if "config.template" in paths:
+            self.count_templates = self.count_templates or 0
+
+        vms = []
+        for (moref, props) in property_sets:
+            location = name_table.folder_location(props.get("parent"), max_depth)
+            if location is None:
+                continue
+            (dc_name, path) = location
+            template = bool(props.get("config.template"))
+            power_state = props.get("runtime.powerState")
+
+            vm = InventoryRecord(
+                name=props.get("name"),
+                dc_name=dc_name,
+                path=path,
+                cluster_name=name_table.cluster_name_of(props.get("resourcePool")),
+                host=name_table.name_of(props.get("runtime.host")),
+                template=template,
+                online=VsphereVm.online_by_state(power_state, template=template),
+                config_version=props.get("config.version"),
+                guest_id=props.get("summary.config.guestId"),
             )
-            vms = self.mangle_vmlist_no_details(vm_list, vsphere_name)
+
+            cdata = self._mangle_vm_details(vm, vsphere_name)
+            if cdata:
+                vms.append(cdata)
 
         return vms
 
@@ -562,6 +628,9 @@ class GetVmListApplication(BaseVmwareApplication):
     # -------------------------------------------------------------------------
     def mangle_vmlist_details(self, vm_list, vsphere_name):
         """Prepare the detailled data about found VMs for output."""
+        from ..inventory_client import InventoryRecord
+        from ..vm import VsphereVm
+
         if self.verbose > 1:
             LOG.debug(_("Performing detailled VM list ..."))
         vms = []
@@ -571,7 +640,7 @@ class GetVmListApplication(BaseVmwareApplication):
         first = True
         for vm in sorted(vm_list, key=attrgetter("name", "path")):
 
-            if not isinstance(vm, VsphereVm):
+            if not isinstance(vm, (VsphereVm, InventoryRecord)):
                 msg = _("Found a {} object:").format(vm.__class__.__name__)
                 msg += "\n" + pp(vm)
                 LOG.error(msg)
@@ -614,11 +683,11 @@ class GetVmListApplication(BaseVmwareApplication):
                 return None
 
         if self._re_hw:
-            if not self._re_hw.search(vm.config_version):
+            if not vm.config_version or not self._re_hw.search(vm.config_version):
                 return None
 
         if self._re_os:
-            if not self._re_os.search(vm.config_version):
+            if not vm.guest_id or not self._re_os.search(vm.guest_id):
                 return None
 
         dc = "~"
@@ -629,6 +698,7 @@ class GetVmListApplication(BaseVmwareApplication):
             "vsphere": vsphere_name,
             "dc": dc,
             "cluster": vm.cluster_name,
+            "host": getattr(vm, "host", None),
             "name": vm.name,
             "path": vm.path,
             "type": "Virtual Machine",
@@ -658,7 +728,8 @@ class GetVmListApplication(BaseVmwareApplication):
         if vm.template:
             cdata["type"] = "VMware Template"
             cdata["is_template"] = True
-            self.count_templates += 1
+            if self.count_templates is not None:
+                self.count_templates += 1
 
         return cdata
 
@@ -0,0 +1,294 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+@summary: The inventory daemon, serving the inventories of all vSphere instances as JSON.
+
+@author: Frank Brehm
+@contact: frank@brehm-online.com
+@copyright: © 2022 - 2026 by Frank Brehm, Berlin
+"""
+from __future__ import absolute_import, print_function
+
+# Standard modules
+import locale
+import logging
+import pathlib
+import signal
+import sys
+import threading
+
+# Third party modules
+
+# Own modules
+from . import BaseVmwareApplication, VmwareAppError
+from .. import __version__ as GLOBAL_VERSION
+from ..errors import VSphereExpectedError
+from ..inventory_client import DEFAULT_INVENTORYD_PORT
+from ..inventory_client import DEFAULT_RESYNC_INTERVAL
+from ..inventory_client import DEFAULT_WAIT_SECONDS
+from ..inventory_client import default_socket_path
+from ..xlate import XLATOR
+
+__version__ = "0.1.1"
+LOG = logging.getLogger(__name__)
+
+_ = XLATOR.gettext
+ngettext = XLATOR.ngettext
+
+
+# =============================================================================
+class InventoryDaemonAppError(VmwareAppError):
+    """Base exception class for all exceptions in this application."""
+
+    pass
+
+
+# =============================================================================
+class InventoryDaemonApplication(BaseVmwareApplication):
+    """Class for the application object of the inventory daemon."""
+
+    # -------------------------------------------------------------------------
+    def __init__(
+        self,
+        appname=None,
+        verbose=0,
+        version=GLOBAL_VERSION,
+        base_dir=None,
+        initialized=False,
+        usage=None,
+        description=None,
+        argparse_epilog=None,
+        argparse_prefix_chars="-",
+        env_prefix=None,
+    ):
+        """Initialize a InventoryDaemonApplication object."""
+        desc = _(
+            "Keeps sessions to all vSphere instances and their inventories up to date "
+            "in memory and answers JSON queries about them on a Unix socket or "
+            "a HTTP port of the localhost."
+        )
+
+        self.service = None
+        self.socket_path = None
+        self.listen_host = None
+        self.listen_port = None
+        self._shutdown = threading.Event()
+
+        super(InventoryDaemonApplication, self).__init__(
+            appname=appname,
+            verbose=verbose,
+            version=version,
+            base_dir=base_dir,
+            description=desc,
+            initialized=False,
+        )
+
+        self.initialized = True
+
+    # -------------------------------------------------------------------------
+    def as_dict(self, short=True):
+        """
+        Transform the elements of the object into a dict.
+
+        @param short: don't include local properties in resulting dict.
+        @type short: bool
+
+        @return: structure as dict
+        @rtype:  dict
+        """
+        res = super(InventoryDaemonApplication, self).as_dict(short=short)
+        res["socket_path"] = self.socket_path
+        res["listen_host"] = self.listen_host
+        res["listen_port"] = self.listen_port
+
+        return res
+
+    # -------------------------------------------------------------------------
+    def init_arg_parser(self):
+        """Public available method to initiate the argument parser."""
+        daemon_group = self.arg_parser.add_argument_group(_("Daemon options"))
+
+        daemon_group.add_argument(
+            "--socket",
+            metavar=_("PATH"),
+            dest="socket_path",
+            type=pathlib.Path,
+            help=_(
+                "The Unix socket to listen on. Default: {!r}, if no HTTP port was given."
+            ).format(default_socket_path()),
+        )
+
+        daemon_group.add_argument(
+            "--listen",
+            metavar="[HOST:]PORT",
+            dest="listen",
+            nargs="?",
+            const=str(DEFAULT_INVENTORYD_PORT),
+            help=_(
+                "Listen additionally on the given HTTP port of a loopback address. "
+                "Default: 'localhost:{}'."
+            ).format(DEFAULT_INVENTORYD_PORT),
+        )
+
+        daemon_group.add_argument(
+            "--wait-seconds",
+            metavar=_("SECONDS"),
+            dest="wait_seconds",
+            type=int,
+            default=DEFAULT_WAIT_SECONDS,
+            help=_(
+                "The maximum time of waiting for changes in one request to a vSphere. "
+                "Default: %(default)s."
+            ),
+        )
+
+        daemon_group.add_argument(
+            "--resync-interval",
+            metavar=_("SECONDS"),
+            dest="resync_interval",
+            type=int,
+            default=DEFAULT_RESYNC_INTERVAL,
+            help=_(
+                "The interval for a complete reload of the inventories, 0 disables "
+                "the periodic reload. Default: %(default)s."
+            ),
+        )
+
+        super(InventoryDaemonApplication, self).init_arg_parser()
+
+    # -------------------------------------------------------------------------
+    def perform_arg_parser(self):
+        """Evaluate command line parameters."""
+        super(InventoryDaemonApplication, self).perform_arg_parser()
+
+        if self.args.wait_seconds < 1:
+            msg = _("The value for {o!r} must be a positive number, not {v!r}.").format(
+                o="--wait-seconds", v=self.args.wait_seconds
+            )
+            LOG.error(msg)
+            self.exit(1)
+
+        if self.args.resync_interval < 0:
+            msg = _("The value for {o!r} must not be negative, not {v!r}.").format(
+                o="--resync-interval", v=self.args.resync_interval
+            )
+            LOG.error(msg)
+            self.exit(1)
+
+        if self.args.listen:
+            (host, sep, port) = self.args.listen.rpartition(":")
+            if not sep:
+                host = "localhost"
+            host = host.strip("[]") or "localhost"
+            try:
+                self.listen_port = int(port)
+                if self.listen_port < 0 or self.listen_port > 65535:
+                    raise ValueError(port)
+            except ValueError:
+                msg = _("Invalid port in listening address {!r}.").format(self.args.listen)
+                LOG.error(msg)
+                self.exit(1)
+            self.listen_host = host
+
+        if self.args.socket_path:
+            self.socket_path = str(self.args.socket_path)
+        elif not self.listen_host:
+            self.socket_path = default_socket_path()
+
+    # -------------------------------------------------------------------------
+    def _run(self):
+
+        LOG.debug(_("Starting {a!r}, version {v!r} ...").format(a=self.appname, v=self.version))
+
+        ret = 0
+        try:
+            ret = self.serve()
+        except VSphereExpectedError as e:
+            LOG.error(str(e))
+            self.exit(6)
+        except KeyboardInterrupt:
+            LOG.info(_("Interrupted, shutting down."))
+        finally:
+            self.cleaning_up()
+
+        self.exit(ret)
+
+    # -------------------------------------------------------------------------
+    def _on_signal(self, signum, frame):
+
+        LOG.info(_("Got signal {}, shutting down.").format(signal.Signals(signum).name))
+        self._shutdown.set()
+
+    # -------------------------------------------------------------------------
+    def serve(self):
+        """Start the inventories and the servers and serve until a termination signal."""
+        from ..inventoryd import VsphereInventory
+        from ..inventoryd import VsphereInventoryService
+
+        inventories = []
+        for vsphere_name in self.do_vspheres:
+            inventories.append(
+                VsphereInventory(
+                    vsphere_name,
+                    self.vsphere[vsphere_name],
+                    wait_seconds=self.args.wait_seconds,
+                    resync_interval=self.args.resync_interval,
+                )
+            )
+        self.service = VsphereInventoryService(inventories)
+
+        signal.signal(signal.SIGTERM, self._on_signal)
+        signal.signal(signal.SIGHUP, lambda signum, frame: self.service.query("refresh"))
+
+        if self.socket_path:
+            self.service.listen_unix(self.socket_path)
+        if self.listen_host:
+            self.service.listen_http(self.listen_host, self.listen_port)
+        self.service.start()
+
+        while not self._shutdown.wait(1):
+            pass
+
+        return 0
+
+    # -------------------------------------------------------------------------
+    def cleaning_up(self):
+        """Stop the service and close all vSphere connections."""
+        if self.service is not None:
+            self.service.stop()
+            self.service = None
+
+        super(InventoryDaemonApplication, self).cleaning_up()
+
+
+# =============================================================================
+def main():
+    """Entrypoint for fb-vmware-inventoryd."""
+    my_path = pathlib.Path(sys.argv[0])
+    appname = my_path.name
+
+    locale.setlocale(locale.LC_ALL, "")
+
+    app = InventoryDaemonApplication(appname=appname)
+    app.initialized = True
+
+    if app.verbose > 2:
+        print(_("{c}-Object:\n{a}").format(c=app.__class__.__name__, a=app), file=sys.stderr)
+
+    try:
+        app()
+    except KeyboardInterrupt:
+        print("\n" + app.colored(_("User interrupt."), "YELLOW"))
+        sys.exit(5)
+
+    sys.exit(0)
+
+
+# =============================================================================
+if __name__ == "__main__":
+
+    pass
+
+# =============================================================================
+
+# vim: tabstop=4 expandtab shiftwidth=4 softtabstop=4 list
@@ -0,0 +1,347 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+@summary: A module for profiling the VMware/vSphere applications.
+
+@author: Frank Brehm
+@contact: frank@brehm-online.com
+@copyright: © 2022 - 2026 by Frank Brehm, Berlin
+"""
+from __future__ import absolute_import, print_function
+
+# Standard modules
+import datetime
+import logging
+import os
+import pathlib
+import sys
+
+# Third party modules
+from fb_tools.obj import FbGenericBaseObject
+
+# Own modules
+from . import DEFAULT_PROFILE_TOP
+from . import PROFILE_MODES
+from . import VmwareAppError
+from ..xlate import XLATOR
+
+__version__ = "0.1.0"
+LOG = logging.getLogger(__name__)
+
+_ = XLATOR.gettext
+
+DEFAULT_TRACEMALLOC_FRAMES = 25
+
+# Built-in functions, which are waiting for the network
+NETWORK_FUNCTIONS = (
+    "of '_socket.socket' objects",
+    "of '_ssl._SSLSocket' objects",
+    "_socket.getaddrinfo",
+    "_socket.gethostbyname",
+    "select.select",
+    "of 'select.poll' objects",
+    "of 'select.epoll' objects",
+)
+
+CATEGORY_NETWORK = "network"
+CATEGORY_SOAP = "soap"
+CATEGORY_CONSTRUCTION = "construction"
+CATEGORY_AS_DICT = "as_dict"
+CATEGORY_RICH = "rich"
+CATEGORY_FB_VMWARE = "fb_vmware"
+CATEGORY_OTHER = "other"
+
+CATEGORY_LABELS = {
+    CATEGORY_NETWORK: "Network wait",
+    CATEGORY_SOAP: "SOAP (de)serialisation (pyVmomi)",
+    CATEGORY_CONSTRUCTION: "Object construction",
+    CATEGORY_AS_DICT: "as_dict()",
+    CATEGORY_RICH: "Rich rendering",
+    CATEGORY_FB_VMWARE: "Other fb_vmware code",
+    CATEGORY_OTHER: "Other local code",
+}
+
+
+# =============================================================================
+def classify_function(filename, funcname):
+    """Return the category of the given function of a profile."""
+    if filename == "~":
+        for pattern in NETWORK_FUNCTIONS:
+            if pattern in funcname:
+                return CATEGORY_NETWORK
+        if "pyexpat" in funcname:
+            return CATEGORY_SOAP
+        return CATEGORY_OTHER
+
+    path = filename.replace(os.sep, "/")
+    if "/pyVmomi/" in path or "/pyVim/" in path:
+        return CATEGORY_SOAP
+    if "/rich/" in path:
+        return CATEGORY_RICH
+    if "/fb_vmware/" in path:
+        if funcname == "as_dict":
+            return CATEGORY_AS_DICT
+        if funcname in ("__init__", "from_summary") or funcname.startswith("from_"):
+            return CATEGORY_CONSTRUCTION
+        return CATEGORY_FB_VMWARE
+    if funcname == "as_dict":
+        return CATEGORY_AS_DICT
+    return CATEGORY_OTHER
+
+
+# =============================================================================
+def short_path(filename):
+    """Return the given file name relative to the site-packages or the current directory."""
+    path = filename.replace(os.sep, "/")
+    for marker in ("/site-packages/", "/dist-packages/", "/src/"):
+        if marker in path:
+            return path.rsplit(marker, 1)[1]
+    return filename
+
+
+# =============================================================================
+class VmwareAppProfiler(FbGenericBaseObject):
+    """
+    A profiler for the main routine of an application.
+
+    In mode 'cpu' it is using cProfile and writes a pstats file, in mode
+    'alloc' it is using tracemalloc and writes a snapshot file into the given
+    directory. At the end a summary of the hot spots is printed on STDERR.
+    """
+
+    # -------------------------------------------------------------------------
+    def __init__(self, mode, directory=None, top=DEFAULT_PROFILE_TOP, name=None):
+        """Initialize a VmwareAppProfiler object."""
+        if mode not in PROFILE_MODES:
+            msg = _("Invalid profiling mode {m!r}, valid modes are: {v}.").format(
+                m=mode, v=", ".join(PROFILE_MODES)
+            )
+            raise VmwareAppError(msg)
+
+        self.mode = mode
+        self.directory = pathlib.Path(directory or os.getcwd())
+        self.top = int(top)
+        self.name = name or self.get_generic_appname()
+        self.filename = None
+        self.stats = None
+        self.snapshot = None
+        self.peak = None
+        self._profiler = None
+
+    # -------------------------------------------------------------------------
+    def __repr__(self):
+        """Typecasting into a string for reproduction."""
+        return "<{c}(mode={m!r}, directory={d!r}, top={t!r}, name={n!r})>".format(
+            c=self.__class__.__name__,
+            m=self.mode,
+            d=str(self.directory),
+            t=self.top,
+            n=self.name,
+        )
+
+    # -------------------------------------------------------------------------
+    def __enter__(self):
+        """Start profiling in a context manager."""
+        self.start()
+        return self
+
+    # -------------------------------------------------------------------------
+    def __exit__(self, exc_type, exc_value, traceback):
+        """Stop profiling and write the results, also on exiting the application."""
+        self.stop()
+        try:
+            self.write()
+            self.report()
+        except Exception as e:
+            LOG.error(_("Could not save the profile: {}").format(e))
+
+    # -------------------------------------------------------------------------
+    def start(self):
+        """Start profiling."""
+        if self.mode == "cpu":
+            import cProfile
+
+            self._profiler = cProfile.Profile()
+            self._profiler.enable()
+        else:
+            import tracemalloc
+
+            tracemalloc.start(DEFAULT_TRACEMALLOC_FRAMES)
+
+    # -------------------------------------------------------------------------
+    def stop(self):
+        """Stop profiling and keep the collected data."""
+        if self.mode == "cpu":
+            import pstats
+
+            if self._profiler is None:
+                return
+            self._profiler.disable()
+            self.stats = pstats.Stats(self._profiler)
+            self._profiler = None
+        else:
+            import tracemalloc
+
+            if not tracemalloc.is_tracing():
+                return
+            self.peak = tracemalloc.get_traced_memory()[1]
+            self.snapshot = tracemalloc.take_snapshot()
+            tracemalloc.stop()
+
+    # -------------------------------------------------------------------------
+    def write(self):
+        """Write the collected data into a file in the profile directory."""
+        timestamp = datetime.datetime.now().strftime("%Y%m%d-%H%M%S")
+        suffix = ".pstats" if self.mode == "cpu" else ".tracemalloc"
+        filename = "{n}-{t}-{p}{s}".format(n=self.name, t=timestamp, p=os.getpid(), s=suffix)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.filename = self.directory / filename
+
+        if self.mode == "cpu":
+            if self.stats is None:
+                return None
+            self.stats.dump_stats(str(self.filename))
+        else:
+            if self.snapshot is None:
+                return None
+            self.snapshot.dump(str(self.filename))
+
+        LOG.debug(_("Profile written into {!r}.").format(str(self.filename)))
+        return self.filename
+
+    # -------------------------------------------------------------------------
+    def cpu_hot_spots(self):
+        """
+        Evaluate the CPU profile.
+
+        Returns a tuple of a dict with the seconds per category and two lists
+        of tuples (seconds, calls, function, category) of the top functions waiting for
+        the network and consuming local CPU time.
+        """
+        categories = {}
+        network = []
+        local = []
+        for (func, stat) in self.stats.stats.items():
+            (filename, lineno, funcname) = func
+            (cc, nc, tottime, cumtime, callers) = stat
+            category = classify_function(filename, funcname)
+            categories[category] = categories.get(category, 0.0) + tottime
+            if filename == "~":
+                label = funcname
+            else:
+                label = "{f}:{ln}({n})".format(f=short_path(filename), ln=lineno, n=funcname)
+            entry = (tottime, nc, label, category)
+            if category == CATEGORY_NETWORK:
+                network.append(entry)
+            else:
+                local.append(entry)
+
+        network.sort(reverse=True)
+        local.sort(reverse=True)
+        return (categories, network[: self.top], local[: self.top])
+
+    # -------------------------------------------------------------------------
+    def alloc_hot_spots(self):
+        """
+        Evaluate the allocation snapshot.
+
+        Returns a tuple of a dict with the allocated bytes per category and
+        a list of tuples (bytes, count, location) of the top allocating lines.
+        """
+        categories = {}
+        for stat in self.snapshot.statistics("traceback"):
+            category = CATEGORY_OTHER
+            for tb_frame in reversed(stat.traceback):
+                path = tb_frame.filename.replace(os.sep, "/")
+                if "/fb_vmware/" in path or "/pyVmomi/" in path or "/rich/" in path:
+                    category = classify_function(tb_frame.filename, "")
+                    break
+            categories[category] = categories.get(category, 0) + stat.size
+
+        top = []
+        for stat in self.snapshot.statistics("lineno")[: self.top]:
+            frame = stat.traceback[0]
+            location = "{f}:{ln}".format(f=short_path(frame.filename), ln=frame.lineno)
+            top.append((stat.size, stat.count, location))
+        return (categories, top)
+
+    # -------------------------------------------------------------------------
+    def report(self, file=None):
+        """Print a summary of the hot spots."""
+        from rich.console import Console
+        from rich.table import Table
+
+        if file is None:
+            file = sys.stderr
+        console = Console(file=file)
+
+        if self.mode == "cpu":
+            if self.stats is None:
+                return
+            (categories, network, local) = self.cpu_hot_spots()
+            total = sum(categories.values())
+
+            table = Table(title=_("Time per category"), title_style="bold cyan")
+            table.add_column(header=_("Category"))
+            table.add_column(header=_("Seconds"), justify="right")
+            table.add_column(header="%", justify="right")
+            for key in sorted(categories, key=lambda k: -categories[k]):
+                table.add_row(
+                    CATEGORY_LABELS[key],
+                    "{:0.3f}".format(categories[key]),
+                    "{:0.1f}".format(categories[key] * 100 / total if total else 0),
+                )
+            console.print(table)
+
+            for (title, entries) in (
+                (_("Top network wait"), network),
+                (_("Top local CPU time"), local),
+            ):
+                table = Table(title=title, title_style="bold cyan")
+                table.add_column(header=_("Seconds"), justify="right")
+                table.add_column(header=_("Calls"), justify="right")
+                table.add_column(header=_("Category"))
+                table.add_column(header=_("Function"), overflow="fold")
+                for (seconds, calls, label, category) in entries:
+                    table.add_row(
+                        "{:0.3f}".format(seconds), str(calls), CATEGORY_LABELS[category], label
+                    )
+                console.print(table)
+
+        else:
+            if self.snapshot is None:
+                return
+            (categories, top) = self.alloc_hot_spots()
+
+            table = Table(
+                title=_("Allocated memory per category"),
+                title_style="bold cyan",
+                caption=_("Peak of traced memory: {} bytes.").format(self.peak),
+                caption_justify="left",
+            )
+            table.add_column(header=_("Category"))
+            table.add_column(header=_("Bytes"), justify="right")
+            for key in sorted(categories, key=lambda k: -categories[k]):
+                table.add_row(CATEGORY_LABELS[key], str(categories[key]))
+            console.print(table)
+
+            table = Table(title=_("Top allocating lines"), title_style="bold cyan")
+            table.add_column(header=_("Bytes"), justify="right")
+            table.add_column(header=_("Blocks"), justify="right")
+            table.add_column(header=_("Location"), overflow="fold")
+            for (size, count, location) in top:
+                table.add_row(str(size), str(count), location)
+            console.print(table)
+
+        if self.filename:
+            console.print(_("Profile written into {!r}.").format(str(self.filename)))
+
+
+# =============================================================================
+if __name__ == "__main__":
+
+    pass
+
+# =============================================================================
+
+# vim: tabstop=4 expandtab shiftwidth=4 softtabstop=4 list
@@ -0,0 +1,77 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+@summary: The module for rich based prompts of the VMware/vSphere applications.
+
+@author: Frank Brehm
+@contact: frank@brehm-online.com
+@copyright: © 2022 - 2026 by Frank Brehm, Berlin
+"""
+from __future__ import absolute_import, print_function
+
+# Standard modules
+import logging
+
+# Third party modules
+from rich.prompt import InvalidResponse, Prompt, PromptBase, PromptType
+
+# Own modules
+from ..xlate import XLATOR
+
+__version__ = "1.0.0"
+LOG = logging.getLogger(__name__)
+
+_ = XLATOR.gettext
+
+Prompt.validate_error_message = "[prompt.invalid]" + _("Please enter a valid value")
+Prompt.illegal_choice_message = "[prompt.invalid.choice]" + _(
+    "Please select one of the available options"
+)
+
+
+# =============================================================================
+class PositiveIntPrompt(PromptBase[int]):
+    """A prompt that returns an positive integer greater than zero.
+
+    Example:
+        >>> burrito_count = PositiveIntPrompt.ask("How many burritos do you want to order")
+
+    """
+
+    response_type = int
+    validate_error_message = "[prompt.invalid]" + _(
+        "Please enter a valid positive integer number greater than zero."
+    )
+
+    # -------------------------------------------------------------------------
+    def process_response(self, value: str) -> PromptType:
+        """Process response from user, convert to prompt type.
+
+        Args:
+            value (str): String typed by user.
+
+        Raises:
+            InvalidResponse: If ``value`` is invalid.
+
+        Returns:
+            PromptType: The value to be returned from ask method.
+        """
+        value = value.strip()
+        try:
+            return_value: PromptType = self.response_type(value)
+            if return_value <= 0:
+                raise InvalidResponse(self.validate_error_message)
+        except ValueError:
+            raise InvalidResponse(self.validate_error_message)
+
+        return return_value
+
+
+# =============================================================================
+if __name__ == "__main__":
+
+    pass
+
+# =============================================================================
+
+# vim: tabstop=4 expandtab shiftwidth=4 softtabstop=4 list
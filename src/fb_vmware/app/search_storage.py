@@ -14,6 +14,7 @@ import locale
 import logging
 import pathlib
 import sys
+from concurrent.futures import ThreadPoolExecutor
 
 # from fb_tools.argparse_actions import RegexOptionAction
 from fb_tools.common import pp
@@ -28,11 +29,10 @@ from ..datastore import VsphereDatastoreDict
 from ..ds_cluster import VsphereDsCluster
 from ..ds_cluster import VsphereDsClusterDict
 from ..errors import VSphereExpectedError
-from ..errors import VSphereNoDatastoreFoundError
-from ..errors import VSphereNoDsClusterFoundError
+from ..placement import VsphereStorageSearch
 from ..xlate import XLATOR
 
-__version__ = "0.6.3"
+__version__ = "0.7.0"
 LOG = logging.getLogger(__name__)
 
 _ = XLATOR.gettext
@@ -74,6 +74,7 @@ class SearchStorageApp(BaseVmwareApplication):
 
         self.datastores = VsphereDatastoreDict()
         self.ds_clusters = VsphereDsClusterDict()
+        self.storages = {}
 
         self.vsphere_name = None
         self.cur_vsphere = None
@@ -130,8 +131,12 @@ class SearchStorageApp(BaseVmwareApplication):
             "--vs",
             "--vsphere",
             dest="req_vsphere",
+            nargs="+",
+            metavar=_("VSPHERE"),
             help=_(
-                "The vSphere name from configuration, in which the storage should be searched."
+                "The vSphere names from configuration, in which the storage should be searched. "
+                "If multiple vSpheres are given, they are searched concurrently and the best "
+                "storage location of all of them is returned."
             ),
         )
 
@@ -175,9 +180,8 @@ class SearchStorageApp(BaseVmwareApplication):
             self.storage_type = getattr(self.args, "type", None)
 
         if self.args.req_vsphere:
-            vsphere = self.args.req_vsphere
-            self.args.req_vsphere = [vsphere]
-            LOG.info(_("Selected vSphere: {}").format(self.colored(vsphere, "CYAN")))
+            for vsphere in self.args.req_vsphere:
+                LOG.info(_("Selected vSphere: {}").format(self.colored(vsphere, "CYAN")))
 
         if getattr(self.args, "dc", None) is not None and self.args.dc.strip() != "":
             self.dc = self.args.dc.strip()
@@ -196,6 +200,10 @@ class SearchStorageApp(BaseVmwareApplication):
             self.exit(1)
         self.storage_type = storage_type
 
+        if len(self.do_vspheres) > 1:
+            self._pre_run_multiple_vspheres()
+            return
+
         vs_name = self.select_vsphere()
         self.do_vspheres = [vs_name]
 
@@ -231,6 +239,32 @@ class SearchStorageApp(BaseVmwareApplication):
             )
         )
 
+    # -------------------------------------------------------------------------
+    def _pre_run_multiple_vspheres(self):
+
+        super(SearchStorageApp, self).pre_run()
+
+        LOG.info(
+            _(
+                "Searching a storage location in the vSpheres {vs} for a disk of {sz} "
+                "of type {st_type}."
+            ).format(
+                vs=format_list(self.do_vspheres, do_repr=True),
+                sz=self.colored(str(self.disk_size_gb) + " GiByte", "CYAN"),
+                st_type=self.colored(self.storage_type, "CYAN"),
+            )
+        )
+        if self.dc:
+            LOG.info(
+                _("Using only virtual datacenters named {}.").format(self.colored(self.dc, "CYAN"))
+            )
+        if self.cluster:
+            LOG.info(
+                _("The storage location must be connected with the computing resource {}.").format(
+                    self.colored(self.cluster, "CYAN")
+                )
+            )
+
     # -------------------------------------------------------------------------
     def _run(self):
 
@@ -247,13 +281,92 @@ class SearchStorageApp(BaseVmwareApplication):
 
     # -------------------------------------------------------------------------
     def get_storages(self):
-        """Retrieve all datastore clusters and storages in current vSphere and datacenter."""
+        """Retrieve all datastore clusters and datastores in all used vSpheres and datacenters."""
         LOG.info(
             _("Collect all datastore clusters and storages in current vSphere and datacenter.")
         )
 
-        self.get_datastore_clusters()
-        len_ds_clusters = len(self.ds_clusters)
+        if self.verbose or self.quiet:
+            errors = self._retrieve_all_storages()
+        else:
+            spin_prompt = _("Getting all vSphere storage clusters and datastores ...")
+            spinner_name = self.get_random_spinner_name()
+            with Spinner(spin_prompt, spinner_name):
+                errors = self._retrieve_all_storages()
+            sys.stdout.write(" " * len(spin_prompt))
+            sys.stdout.write("\r")
+            sys.stdout.flush()
+
+        if errors:
+            for msg in errors:
+                LOG.error(msg)
+            self.exit(6)
+
+        found_any = False
+        for vs_name in self.do_vspheres:
+            (ds_clusters, datastores) = self.storages[vs_name]
+            if ds_clusters or datastores:
+                found_any = True
+            self._log_found_storages(vs_name, ds_clusters, datastores)
+
+        if self.vsphere_name:
+            (self.ds_clusters, self.datastores) = self.storages[self.vsphere_name]
+
+        if not found_any:
+            msg = _(
+                "Found neither a datastore cluster nor a datastore in vSphere {vs}, "
+                "datacenter {dc}."
+            ).format(
+                vs=self.colored(", ".join(self.do_vspheres), "CYAN"),
+                dc=self.colored(self.dc or "*", "CYAN"),
+            )
+            LOG.error(msg)
+            self.exit(7)
+
+    # -------------------------------------------------------------------------
+    def _retrieve_all_storages(self):
+
+        self.storages = {}
+        errors = []
+
+        if len(self.do_vspheres) == 1:
+            results = [self._retrieve_storages(self.do_vspheres[0])]
+        else:
+            with ThreadPoolExecutor(max_workers=len(self.do_vspheres)) as executor:
+                results = list(executor.map(self._retrieve_storages, self.do_vspheres))
+
+        for vs_name, result in zip(self.do_vspheres, results):
+            if isinstance(result, Exception):
+                errors.append(str(result))
+                continue
+            self.storages[vs_name] = result
+
+        return errors
+
+    # -------------------------------------------------------------------------
+    def _retrieve_storages(self, vs_name):
+
+        vsphere = self.vsphere[vs_name]
+        try:
+            vsphere.get_storages(
+                vsphere_name=vs_name,
+                search_in_dc=self.dc,
+                warn_if_empty=False,
+                detailled=True,
+                no_local_ds=False,
+            )
+        except VSphereExpectedError as e:
+            return e
+
+        return (vsphere.ds_clusters, vsphere.datastores)
+
+    # -------------------------------------------------------------------------
+    def _log_found_storages(self, vs_name, ds_clusters, datastores):
+
+        dc = self.colored(self.dc or "*", "CYAN")
+        vs = self.colored(vs_name, "CYAN")
+
+        len_ds_clusters = len(ds_clusters)
         if len_ds_clusters:
             one = pgettext("found_ds_cluster", "one")
             msg = ngettext(
@@ -264,18 +377,16 @@ class SearchStorageApp(BaseVmwareApplication):
             msg = msg.format(
                 one=self.colored(one, "CYAN"),
                 nr=self.colored(str(len_ds_clusters), "CYAN"),
-                vs=self.colored(self.vsphere_name, "CYAN"),
-                dc=self.colored(self.dc, "CYAN"),
+                vs=vs,
+                dc=dc,
             )
         else:
             msg = _("Did not found a datastore cluster in vSphere {vs}, datacenter {dc}.").format(
-                vs=self.colored(self.vsphere_name, "CYAN"),
-                dc=self.colored(self.dc, "CYAN"),
+                vs=vs, dc=dc
             )
         LOG.info(msg)
 
-        self.get_datastores()
-        len_datastores = len(self.datastores)
+        len_datastores = len(datastores)
         if len_datastores:
             one = pgettext("found_datastore", "one")
             msg = ngettext(
@@ -286,148 +397,56 @@ class SearchStorageApp(BaseVmwareApplication):
             msg = msg.format(
                 one=self.colored(one, "CYAN"),
                 nr=self.colored(str(len_datastores), "CYAN"),
-                vs=self.colored(self.vsphere_name, "CYAN"),
-                dc=self.colored(self.dc, "CYAN"),
+                vs=vs,
+                dc=dc,
             )
         else:
             msg = _("Did not found a datastore in vSphere {vs}, datacenter {dc}.").format(
-                vs=self.colored(self.vsphere_name, "CYAN"),
-                dc=self.colored(self.dc, "CYAN"),
+                vs=vs, dc=dc
             )
         LOG.info(msg)
 
-        if not len_ds_clusters and not len_datastores:
-            msg = _(
-                "Found neither a datastore cluster nor a datastore in vSphere {vs}, "
-                "datacenter {dc}."
-            ).format(
-                vs=self.colored(self.vsphere_name, "CYAN"),
-                dc=self.colored(self.dc, "CYAN"),
-            )
-            LOG.error(msg)
-            self.exit(7)
-
-    # -------------------------------------------------------------------------
-    def get_datastore_clusters(self):
-        """Retrieve all datastore clusters in current vSphere and datacenter."""
-        self.ds_clusters = VsphereDsClusterDict()
-
-        # ----------
-        def _get_datastore_clusters():
-            try:
-                self.cur_vsphere.get_ds_clusters(
-                    vsphere_name=self.vsphere_name,
-                    search_in_dc=self.dc,
-                    warn_if_empty=False,
-                    detailled=True,
-                )
-            except VSphereExpectedError as e:
-                LOG.error(str(e))
-                self.exit(6)
-
-            for cluster_name in self.cur_vsphere.ds_clusters:
-                self.ds_clusters.append(self.cur_vsphere.ds_clusters[cluster_name])
-
-        if self.verbose or self.quiet:
-            _get_datastore_clusters()
-        else:
-            spin_prompt = _("Getting all vSphere storage clusters ...")
-            spinner_name = self.get_random_spinner_name()
-            with Spinner(spin_prompt, spinner_name):
-                _get_datastore_clusters()
-            sys.stdout.write(" " * len(spin_prompt))
-            sys.stdout.write("\r")
-            sys.stdout.flush()
-
         if self.verbose > 2:
-            LOG.debug(_("Found datastore clusters:") + "\n" + pp(self.ds_clusters.as_list()))
-
-    # -------------------------------------------------------------------------
-    def get_datastores(self):
-        """Retrieve  datastores in current vSphere and datacenter."""
-        self.datastores = VsphereDatastoreDict()
-
-        # ----------
-        def _get_datastores():
-            try:
-                self.cur_vsphere.get_datastores(
-                    vsphere_name=self.vsphere_name,
-                    search_in_dc=self.dc,
-                    warn_if_empty=False,
-                    detailled=True,
-                    no_local_ds=False,
-                )
-            except VSphereExpectedError as e:
-                LOG.error(str(e))
-                self.exit(6)
-
-            for ds_name in self.cur_vsphere.datastores:
-                self.datastores.append(self.cur_vsphere.datastores[ds_name])
-
-        if self.verbose or self.quiet:
-            _get_datastores()
-        else:
-            spin_prompt = _("Getting all vSphere datastores ...")
-            spinner_name = self.get_random_spinner_name()
-            with Spinner(spin_prompt, spinner_name):
-                _get_datastores()
-            sys.stdout.write(" " * len(spin_prompt))
-            sys.stdout.write("\r")
-            sys.stdout.flush()
-
-        if self.verbose > 0:
-            LOG.debug(_("Found datastores:") + "\n" + pp(self.datastores.as_list()))
+            LOG.debug(_("Found datastore clusters:") + "\n" + pp(ds_clusters.as_list()))
+            LOG.debug(_("Found datastores:") + "\n" + pp(datastores.as_list()))
 
     # -------------------------------------------------------------------------
     def search_for_space(self):
         """Search in evaluated datastore clusters and datastores for space for a virtual disk."""
-        if self.ds_clusters:
-            LOG.info(_("Searching for space in evaluated datastore clusters."))
-            # LOG.debug(
-            #     f"Datastore cluster must be connected with computing cluster {self.cluster!r}")
-            try:
-                ds_cluster = self.ds_clusters.search_space(
-                    needed_gb=self.disk_size_gb,
-                    storage_type=self.storage_type,
-                    reserve_space=False,
-                    compute_cluster=self.cluster,
-                )
+        LOG.info(_("Searching for space in evaluated datastore clusters and datastores."))
 
-                msg = "\n " + self.colored("*", "GREEN") + " "
-                msg += _("Found usable datastore cluster:") + "\n\n"
-                msg += "   " + self.colored(ds_cluster, "CYAN") + "\n"
-
-                print(msg)
-                self.exit(0)
-            except VSphereNoDsClusterFoundError as e:
-                print()
-                LOG.warn(str(e))
-
-        if self.datastores:
-            LOG.info(_("Searching for space in evaluated datastores."))
-            # LOG.debug(f"Datastore must be connected with computing cluster {self.cluster!r}")
-            try:
-                datastore = self.datastores.search_space(
-                    needed_gb=self.disk_size_gb,
+        candidates = []
+        for vs_name in self.do_vspheres:
+            (ds_clusters, datastores) = self.storages[vs_name]
+            search = VsphereStorageSearch(
+                ds_clusters, datastores, vsphere=vs_name, use_local=True, verbose=self.verbose
+            )
+            candidates.append(
+                search.search(
+                    self.disk_size_gb,
                     storage_type=self.storage_type,
-                    reserve_space=False,
                     compute_cluster=self.cluster,
-                    use_local=True,
                 )
+            )
 
-                msg = "\n " + self.colored("*", "GREEN") + " "
-                msg += _("Found usable datastore:") + "\n\n"
-                msg += "   " + self.colored(datastore, "CYAN") + "\n"
-
-                print(msg)
-                self.exit(0)
-            except VSphereNoDatastoreFoundError as e:
-                print()
-                LOG.warn(str(e))
+        candidate = VsphereStorageSearch.best_candidate(candidates)
+        if candidate is None:
+            print()
+            LOG.warn(_("No datastore cluster or datastore for the given volume."))
+            self.exit(3)
 
-        print()
-        LOG.warn(_("No datastore cluster or datastore for the given volume."))
-        self.exit(3)
+        msg = "\n " + self.colored("*", "GREEN") + " "
+        if candidate.kind == "ds_cluster":
+            msg += _("Found usable datastore cluster:") + "\n\n"
+        else:
+            msg += _("Found usable datastore:") + "\n\n"
+        msg += "   " + self.colored(candidate.name, "CYAN")
+        if len(self.do_vspheres) > 1:
+            msg += " (" + _("vSphere {}").format(self.colored(candidate.vsphere, "CYAN")) + ")"
+        msg += "\n"
+
+        print(msg)
+        self.exit(0)
 
     # -------------------------------------------------------------------------
     def post_run(self):
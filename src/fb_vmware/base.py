@@ -12,7 +12,9 @@ from __future__ import absolute_import
 # Standard modules
 import logging
 import ssl
+import threading
 from abc import ABCMeta, abstractmethod
+from http.client import HTTPConnection
 from socket import gaierror
 
 # Third party modules
@@ -30,15 +32,19 @@ from six import add_metaclass
 
 # Own modules
 from .config import DEFAULT_VSPHERE_CLUSTER
+from .compression import decoding_connection_class
 from .config import VSPhereConfigInfo
 from .errors import BaseVSphereHandlerError
 from .errors import VSphereCannotConnectError
 from .errors import VSphereExpectedError
 from .errors import VSphereUnsufficientCredentials
 from .errors import VSphereVimFault
+from .pool import VsphereConnectionPool
+from .propset import enable_streaming
+from .stats import VsphereSoapStats
 from .xlate import XLATOR
 
-__version__ = "1.2.0"
+__version__ = "1.9.0"
 
 LOG = logging.getLogger(__name__)
 
@@ -58,6 +64,7 @@ class BaseVsphereHandler(HandlingObject):
     """
 
     max_search_depth = DEFAULT_MAX_SEARCH_DEPTH
+    fast_parse = False
 
     # -------------------------------------------------------------------------
     def __init__(
@@ -74,14 +81,23 @@ class BaseVsphereHandler(HandlingObject):
         terminal_has_colors=False,
         initialized=False,
         tz=DEFAULT_TZ_NAME,
+        collect_stats=False,
+        cassette=None,
     ):
         """Initialize a BaseVsphereHandler object."""
         self._cluster = cluster
         self._auto_close = False
         self._tz = pytz.timezone(DEFAULT_TZ_NAME)
+        self._session_lock = threading.RLock()
 
         self.connect_info = None
         self.service_instance = None
+        self.connection_pool = None
+        self.streaming = False
+        self.soap_stats = None
+        if collect_stats:
+            self.soap_stats = VsphereSoapStats()
+        self.cassette = cassette
 
         super(BaseVsphereHandler, self).__init__(
             appname=appname,
@@ -127,6 +143,18 @@ class BaseVsphereHandler(HandlingObject):
     def auto_close(self, value):
         self._auto_close = to_bool(value)
 
+    # -----------------------------------------------------------
+    @property
+    def collect_stats(self):
+        """Return, whether statistics about the SOAP requests are collected."""
+        return getattr(self, "soap_stats", None) is not None
+
+    # -----------------------------------------------------------
+    @property
+    def cassette_vsphere(self):
+        """Return the name of the vSphere used in a cassette."""
+        return "{h}:{p}".format(h=self.connect_info.host, p=self.connect_info.port)
+
     # -----------------------------------------------------------
     @property
     def dc(self):
@@ -171,6 +199,8 @@ class BaseVsphereHandler(HandlingObject):
         fields.append("connect_info={}".format(self.connect_info._repr()))
         fields.append("cluster={!r}".format(self.cluster))
         fields.append("auto_close={!r}".format(self.auto_close))
+        fields.append("collect_stats={!r}".format(self.collect_stats))
+        fields.append("cassette={!r}".format(self.cassette))
         fields.append("simulate={!r}".format(self.simulate))
         fields.append("force={!r}".format(self.force))
 
@@ -195,13 +225,57 @@ class BaseVsphereHandler(HandlingObject):
             res["tz"] = self.tz.zone
         res["cluster"] = self.cluster
         res["auto_close"] = self.auto_close
+        res["collect_stats"] = self.collect_stats
+        res["cassette"] = None
+        if self.cassette:
+            res["cassette"] = str(self.cassette.filename)
         res["max_search_depth"] = self.max_search_depth
 
         return res
 
     # -------------------------------------------------------------------------
     def connect(self):
-        """Connect to the the configured vSphere instance."""
+        """
+        Connect to the the configured vSphere instance.
+
+        If a cassette in mode 'replay' was given, the recorded responses are
+        used instead of connecting to the vSphere. If a cassette in mode 'record'
+        was given, all requests after the login are recorded in it.
+
+        Connecting and disconnecting is serialized, so it is safe to call
+        this method from several threads.
+        """
+        with self._session_lock:
+            self._connect()
+
+    # -------------------------------------------------------------------------
+    def ensure_connected(self):
+        """
+        Connect to the configured vSphere instance, if there is no connection yet.
+
+        Concurrent callers are waiting for the connection of the first one
+        instead of logging in on their own.
+
+        @return: the service instance of the connection
+        @rtype: vim.ServiceInstance
+        """
+        with self._session_lock:
+            if not self.service_instance:
+                self._connect()
+            return self.service_instance
+
+    # -------------------------------------------------------------------------
+    def _connect(self):
+
+        if self.cassette is not None and self.cassette.mode == "replay":
+            self.service_instance = self.cassette.replay(
+                self.cassette_vsphere, host=self.connect_info.host, port=self.connect_info.port
+            )
+            self.streaming = True
+            if self.soap_stats is not None:
+                self.service_instance = self.soap_stats.instrument(self.service_instance, self)
+            return
+
         LOG.debug(_("Connecting to vSphere {!r} ...").format(self.connect_info.full_url))
 
         if not self.connect_info.user:
@@ -224,6 +298,8 @@ class BaseVsphereHandler(HandlingObject):
                     user=self.connect_info.user,
                     pwd=self.connect_info.password,
                     sslContext=ssl_context,
+                    httpConnectionTimeout=self.connect_info.connect_timeout,
+                    connectionPoolTimeout=self.connect_info.keep_alive,
                 )
 
             else:
@@ -234,6 +310,8 @@ class BaseVsphereHandler(HandlingObject):
                     port=self.connect_info.port,
                     user=self.connect_info.user,
                     pwd=self.connect_info.password,
+                    httpConnectionTimeout=self.connect_info.connect_timeout,
+                    connectionPoolTimeout=self.connect_info.keep_alive,
                 )
 
         except (gaierror, vim.fault.VimFault, vim.fault.InvalidLogin) as e:
@@ -242,6 +320,58 @@ class BaseVsphereHandler(HandlingObject):
         if not self.service_instance:
             raise VSphereCannotConnectError(self.connect_info.url)
 
+        stub = self.service_instance._stub
+        self.connection_pool = VsphereConnectionPool.from_connect_info(self.connect_info)
+        self.connection_pool.apply(stub)
+
+        stub._acceptCompressedResponses = self.connect_info.compression
+        if isinstance(stub.scheme, type) and issubclass(stub.scheme, HTTPConnection):
+            stub.scheme = decoding_connection_class(stub.scheme, stats=self.soap_stats)
+        self.streaming = False
+        if self.fast_parse:
+            self.streaming = enable_streaming(stub)
+
+        if self.cassette is not None:
+            self.service_instance = self.cassette.record(
+                self.service_instance, self.cassette_vsphere
+            )
+
+        if self.soap_stats is not None:
+            self.service_instance = self.soap_stats.instrument(self.service_instance, self)
+
+    # -------------------------------------------------------------------------
+    def stats(self, reset=False):
+        """
+        Return the statistics about the SOAP requests to the vSphere as a dict.
+
+        @param reset: reset all counters after returning them.
+        @type reset: bool
+
+        @return: the statistics or None, if they are not collected
+        @rtype: dict or None
+        """
+        if self.soap_stats is None:
+            return None
+        res = self.soap_stats.summary()
+        res["pool"] = self.pool_stats()
+        if reset:
+            self.soap_stats.reset()
+            if self.connection_pool is not None:
+                self.connection_pool.reset()
+        return res
+
+    # -------------------------------------------------------------------------
+    def pool_stats(self):
+        """
+        Return the parameters and the utilisation of the HTTP connection pool as a dict.
+
+        @return: the utilisation or None, if there is no connection to a vSphere
+        @rtype: dict or None
+        """
+        if self.connection_pool is None:
+            return None
+        return self.connection_pool.summary()
+
     # -------------------------------------------------------------------------
     def _check_credentials(self, repeated_password=False):
 
@@ -290,11 +420,12 @@ class BaseVsphereHandler(HandlingObject):
     # -------------------------------------------------------------------------
     def disconnect(self):
         """Disconnect from the the configured vSphere instance."""
-        if self.service_instance:
-            LOG.debug(_("Disconnecting from vSphere {!r}.").format(self.connect_info.url))
-            Disconnect(self.service_instance)
+        with self._session_lock:
+            if self.service_instance:
+                LOG.debug(_("Disconnecting from vSphere {!r}.").format(self.connect_info.url))
+                Disconnect(self.service_instance)
 
-        self.service_instance = None
+            self.service_instance = None
 
     # -------------------------------------------------------------------------
     def get_obj(self, content, vimtype, name):
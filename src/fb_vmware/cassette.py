@@ -0,0 +1,534 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+@summary: A module for recording and replaying the SOAP traffic to a vSphere.
+
+A cassette is a gzip compressed file in JSON lines format. The first line
+is a header, followed by one line per recorded vSphere session and one line
+per recorded SOAP request with the raw request and response and the latency.
+
+@author: Frank Brehm
+@contact: frank@brehm-online.com
+@copyright: © 2022 - 2026 by Frank Brehm, Berlin
+"""
+from __future__ import absolute_import
+
+# Standard modules
+import collections
+import datetime
+import gzip
+import hashlib
+import io
+import json
+import logging
+import pathlib
+import threading
+import time
+import zlib
+from http.client import HTTPConnection
+
+# Third party modules
+from fb_tools.obj import FbGenericBaseObject
+
+from pyVmomi import vim
+from pyVmomi.SoapAdapter import SoapResponseDeserializer
+from pyVmomi.SoapAdapter import SoapStubAdapter
+from pyVmomi.SoapAdapter import StubAdapterBase
+
+# Own modules
+from .errors import VSphereCassetteError
+from .propset import current_consumer
+from .propset import parse_property_sets
+from .xlate import XLATOR
+
+__version__ = "0.2.0"
+
+LOG = logging.getLogger(__name__)
+
+_ = XLATOR.gettext
+
+CASSETTE_FORMAT = "fb_vmware-cassette"
+CASSETTE_FORMAT_VERSION = 1
+CASSETTE_MODES = ("record", "replay")
+
+
+# =============================================================================
+def request_key(request):
+    """Return the key of a serialized SOAP request for finding its recorded response."""
+    if isinstance(request, str):
+        request = request.encode("utf-8")
+    return hashlib.sha1(request).hexdigest()
+
+
+# =============================================================================
+def call_name(mo, info, args):
+    """Return the name of a SOAP call as 'Type.property' or 'Type.Method'."""
+    if info.wsdlName == "Fetch":
+        return "{t}.{p}".format(t=mo._wsdlName, p=args[0])
+    return "{t}.{m}".format(t=mo._wsdlName, m=info.name)
+
+
+# =============================================================================
+class VsphereCassette(FbGenericBaseObject):
+    """
+    A cassette with recorded SOAP requests to one or more vSphere instances.
+
+    In mode 'record' all requests of the connected service instances are
+    appended to the file. In mode 'replay' the file is read in completely
+    and the recorded responses are served to the same code path, with the
+    original latencies multiplied with the given latency factor.
+    """
+
+    # -------------------------------------------------------------------------
+    def __init__(self, filename, mode="replay", latency_factor=0.0):
+        """Initialize a VsphereCassette object."""
+        if mode not in CASSETTE_MODES:
+            msg = _("Invalid cassette mode {m!r}, valid modes are: {v}.").format(
+                m=mode, v=", ".join(CASSETTE_MODES)
+            )
+            raise VSphereCassetteError(msg)
+
+        self.filename = pathlib.Path(filename)
+        self.mode = mode
+        self.latency_factor = float(latency_factor)
+        if self.latency_factor < 0:
+            msg = _("The latency factor must not be negative, but is {}.").format(latency_factor)
+            raise VSphereCassetteError(msg)
+
+        self.header = None
+        self.sessions = {}
+        self.entries = []
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._fh = None
+        self._started = time.perf_counter()
+        self._used = set()
+        self._by_request = collections.defaultdict(collections.deque)
+        self._by_call = collections.defaultdict(collections.deque)
+
+        if self.mode == "record":
+            self._open_for_recording()
+        else:
+            self._load()
+
+    # -------------------------------------------------------------------------
+    def __repr__(self):
+        """Typecasting into a string for reproduction."""
+        return "<{c}(filename={f!r}, mode={m!r}, latency_factor={lf!r})>".format(
+            c=self.__class__.__name__,
+            f=str(self.filename),
+            m=self.mode,
+            lf=self.latency_factor,
+        )
+
+    # -------------------------------------------------------------------------
+    def __len__(self):
+        """Return the number of recorded requests."""
+        return len(self.entries)
+
+    # -------------------------------------------------------------------------
+    def __enter__(self):
+        """Use the cassette in a context manager."""
+        return self
+
+    # -------------------------------------------------------------------------
+    def __exit__(self, exc_type, exc_value, traceback):
+        """Close the cassette file on leaving the context."""
+        self.close()
+
+    # -------------------------------------------------------------------------
+    def _open_for_recording(self):
+
+        self.header = {
+            "type": "header",
+            "format": CASSETTE_FORMAT,
+            "version": CASSETTE_FORMAT_VERSION,
+            "created": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+        }
+        LOG.debug(_("Recording SOAP requests into cassette {!r}.").format(str(self.filename)))
+        if self.filename.parent:
+            self.filename.parent.mkdir(parents=True, exist_ok=True)
+        self._fh = gzip.open(str(self.filename), "wt", encoding="utf-8")
+        self._write(self.header)
+
+    # -------------------------------------------------------------------------
+    def _write(self, record):
+
+        self._fh.write(json.dumps(record, ensure_ascii=False, separators=(",", ":")) + "\n")
+
+    # -------------------------------------------------------------------------
+    def _load(self):
+
+        LOG.debug(_("Loading SOAP requests from cassette {!r}.").format(str(self.filename)))
+        try:
+            with gzip.open(str(self.filename), "rt", encoding="utf-8") as fh:
+                for line in fh:
+                    line = line.strip()
+                    if line:
+                        self._add_record(json.loads(line))
+        except (OSError, EOFError, ValueError) as e:
+            msg = _("Could not read cassette {f!r}: {e}").format(f=str(self.filename), e=e)
+            raise VSphereCassetteError(msg)
+
+        if self.header is None:
+            msg = _("The file {!r} is not a cassette with SOAP requests.").format(
+                str(self.filename)
+            )
+            raise VSphereCassetteError(msg)
+
+        LOG.debug(
+            _("Loaded {n} SOAP requests of {s} sessions from cassette {f!r}.").format(
+                n=len(self.entries), s=len(self.sessions), f=str(self.filename)
+            )
+        )
+
+    # -------------------------------------------------------------------------
+    def _add_record(self, record):
+
+        rtype = record.get("type")
+        if rtype == "header":
+            if record.get("format") != CASSETTE_FORMAT:
+                msg = _("The file {!r} is not a cassette with SOAP requests.").format(
+                    str(self.filename)
+                )
+                raise VSphereCassetteError(msg)
+            if record.get("version", 0) > CASSETTE_FORMAT_VERSION:
+                msg = _("Unsupported version {v!r} of cassette {f!r}.").format(
+                    v=record.get("version"), f=str(self.filename)
+                )
+                raise VSphereCassetteError(msg)
+            self.header = record
+        elif rtype == "session":
+            self.sessions[record["vsphere"]] = record
+        elif rtype == "call":
+            index = len(self.entries)
+            self.entries.append(record)
+            self._by_request[(record["vsphere"], record["key"])].append(index)
+            self._by_call[(record["vsphere"], record["moid"], record["call"])].append(index)
+
+    # -------------------------------------------------------------------------
+    def close(self):
+        """Close the cassette file, if it was opened for recording."""
+        with self._lock:
+            if self._fh is not None:
+                self._fh.close()
+                self._fh = None
+                LOG.debug(
+                    _("Recorded {n} SOAP requests into cassette {f!r}.").format(
+                        n=len(self.entries), f=str(self.filename)
+                    )
+                )
+
+    # -------------------------------------------------------------------------
+    def record(self, service_instance, vsphere):
+        """
+        Return a copy of the service instance, which is recording its requests.
+
+        @param service_instance: the connected service instance
+        @type service_instance: vim.ServiceInstance
+        @param vsphere: the name of the vSphere in the cassette, e.g. 'host:port'
+        @type vsphere: str
+
+        @return: a service instance bound to a VsphereRecordingStub
+        @rtype: vim.ServiceInstance
+        """
+        if self.mode != "record":
+            msg = _("The cassette {!r} was not opened for recording.").format(str(self.filename))
+            raise VSphereCassetteError(msg)
+
+        soap_stub = service_instance._stub
+        session = {
+            "type": "session",
+            "vsphere": vsphere,
+            "version": soap_stub.version,
+            "path": getattr(soap_stub, "path", "/sdk"),
+        }
+        with self._lock:
+            self.sessions[vsphere] = session
+            self._write(session)
+
+        stub = VsphereRecordingStub(soap_stub, self, vsphere)
+        return vim.ServiceInstance(service_instance._moId, stub)
+
+    # -------------------------------------------------------------------------
+    def replay(self, vsphere, host="localhost", port=443):
+        """
+        Return a service instance serving the recorded responses of the given vSphere.
+
+        If there is no session recorded for the given vSphere, but only one
+        session at all, this one is used.
+        """
+        if self.mode != "replay":
+            msg = _("The cassette {!r} was not opened for replaying.").format(str(self.filename))
+            raise VSphereCassetteError(msg)
+
+        session = self.sessions.get(vsphere)
+        if session is None and len(self.sessions) == 1:
+            session = list(self.sessions.values())[0]
+        if session is None:
+            msg = _("No session of vSphere {v!r} recorded in cassette {f!r}.").format(
+                v=vsphere, f=str(self.filename)
+            )
+            raise VSphereCassetteError(msg)
+
+        LOG.debug(
+            _("Replaying SOAP requests of {v!r} from cassette {f!r}.").format(
+                v=session["vsphere"], f=str(self.filename)
+            )
+        )
+        stub = VsphereReplayStub(
+            self,
+            session["vsphere"],
+            host=host,
+            port=port,
+            path=session.get("path", "/sdk"),
+            version=session["version"],
+        )
+        return vim.ServiceInstance("ServiceInstance", stub)
+
+    # -------------------------------------------------------------------------
+    def add_entry(self, vsphere, mo, call, key, request, status, response, seconds, start):
+        """Append a recorded SOAP request with its response to the cassette."""
+        entry = {
+            "type": "call",
+            "vsphere": vsphere,
+            "moid": mo._moId,
+            "call": call,
+            "key": key,
+            "status": status,
+            "seconds": round(seconds, 6),
+            "offset": round(start - self._started, 6),
+            "thread": threading.current_thread().name,
+            "request": request,
+            "response": response,
+        }
+        with self._lock:
+            if self._fh is None:
+                LOG.warning(
+                    _("Cassette {!r} is already closed, request not recorded.").format(
+                        str(self.filename)
+                    )
+                )
+                return
+            self.entries.append(entry)
+            self._write(entry)
+
+    # -------------------------------------------------------------------------
+    def find_entry(self, vsphere, mo, call, key):
+        """
+        Return the next unused recorded entry for the given request.
+
+        A recorded request with exactly the same body is preferred, else the
+        next unused request of the same call on the same managed object is
+        taken. This allows replaying requests with variable contents, like
+        generated UUIDs.
+        """
+        with self._lock:
+            for (index_map, index_key) in (
+                (self._by_request, (vsphere, key)),
+                (self._by_call, (vsphere, mo._moId, call)),
+            ):
+                queue = index_map.get(index_key)
+                while queue:
+                    index = queue.popleft()
+                    if index not in self._used:
+                        self._used.add(index)
+                        return self.entries[index]
+
+        msg = _("No recorded response for {c!r} on {m!r} of {v!r} in cassette {f!r}.").format(
+            c=call, m=mo._moId, v=vsphere, f=str(self.filename)
+        )
+        raise VSphereCassetteError(msg)
+
+    # -------------------------------------------------------------------------
+    def unused_entries(self):
+        """Return the number of recorded requests, which were not replayed."""
+        with self._lock:
+            return len(self.entries) - len(self._used)
+
+
+# =============================================================================
+class _RecordingResponse(object):
+    """A wrapper of a HTTP response keeping a copy of the read body."""
+
+    # -------------------------------------------------------------------------
+    def __init__(self, response, cassette):
+
+        self._response = response
+        self._cassette = cassette
+
+    # -------------------------------------------------------------------------
+    def __getattr__(self, name):
+
+        return getattr(self._response, name)
+
+    # -------------------------------------------------------------------------
+    def read(self, *args):
+
+        data = self._response.read(*args)
+        chunks = getattr(self._cassette._local, "response", None)
+        if chunks is not None and data:
+            chunks.append(data)
+        return data
+
+
+# =============================================================================
+def recording_connection_class(scheme, cassette):
+    """Return a subclass of the given HTTP connection class keeping the SOAP messages."""
+
+    class RecordingConnection(scheme):
+
+        def request(self, method, url, body=None, headers={}, **kwargs):
+            cassette._local.request = body
+            cassette._local.response = []
+            cassette._local.encoding = "identity"
+            return super(RecordingConnection, self).request(
+                method, url, body=body, headers=headers, **kwargs
+            )
+
+        def getresponse(self):
+            response = super(RecordingConnection, self).getresponse()
+            cassette._local.encoding = response.getheader("Content-Encoding", "identity").lower()
+            return _RecordingResponse(response, cassette)
+
+    RecordingConnection.__name__ = "Recording" + scheme.__name__
+    return RecordingConnection
+
+
+# =============================================================================
+def _decode_body(data, encoding):
+
+    if encoding == "gzip":
+        data = gzip.decompress(data)
+    elif encoding == "deflate":
+        data = zlib.decompress(data)
+    return data.decode("utf-8")
+
+
+# =============================================================================
+class VsphereRecordingStub(StubAdapterBase):
+    """
+    A stub adapter wrapping the SOAP stub adapter of pyVmomi.
+
+    It writes all SOAP requests with their responses and latencies
+    into a VsphereCassette object.
+    """
+
+    # -------------------------------------------------------------------------
+    def __init__(self, soap_stub, cassette, vsphere):
+        """Initialize a VsphereRecordingStub object."""
+        StubAdapterBase.__init__(self, version=soap_stub.version)
+        self.soap_stub = soap_stub
+        self.cassette = cassette
+        self.vsphere = vsphere
+
+        scheme = getattr(soap_stub, "scheme", None)
+        if not (isinstance(scheme, type) and issubclass(scheme, HTTPConnection)):
+            msg = _("Cannot record the SOAP requests with scheme {!r}.").format(scheme)
+            raise VSphereCassetteError(msg)
+        soap_stub.scheme = recording_connection_class(scheme, cassette)
+        soap_stub.DropConnections()
+
+    # -------------------------------------------------------------------------
+    def __getattr__(self, name):
+        """Delegate unknown attributes to the wrapped SOAP stub."""
+        if name.startswith("__") or name == "soap_stub":
+            raise AttributeError(name)
+        return getattr(self.soap_stub, name)
+
+    # -------------------------------------------------------------------------
+    def DropConnections(self):  # noqa: N802
+        """Drop all cached connections of the wrapped SOAP stub."""
+        self.soap_stub.DropConnections()
+
+    # -------------------------------------------------------------------------
+    def InvokeMethod(self, mo, info, args, outerStub=None):  # noqa: N802
+        """Invoke the given managed method and record request and response."""
+        local = self.cassette._local
+        local.request = None
+        local.response = None
+
+        start = time.perf_counter()
+        (status, obj) = self.soap_stub.InvokeMethod(mo, info, args, outerStub or self)
+        duration = time.perf_counter() - start
+
+        request = local.request
+        if local.response is None or request is None:
+            LOG.debug(_("No SOAP message captured for {!r}.").format(call_name(mo, info, args)))
+        else:
+            if isinstance(request, bytes):
+                request = request.decode("utf-8")
+            self.cassette.add_entry(
+                self.vsphere,
+                mo,
+                call_name(mo, info, args),
+                request_key(request),
+                request,
+                status,
+                _decode_body(b"".join(local.response), local.encoding),
+                duration,
+                start,
+            )
+        local.request = None
+        local.response = None
+
+        if outerStub is not None:
+            return (status, obj)
+        if status == 200:
+            return obj
+        raise obj
+
+
+# =============================================================================
+class VsphereReplayStub(SoapStubAdapter):
+    """
+    A SOAP stub adapter serving recorded responses from a VsphereCassette.
+
+    It never opens a connection to the vSphere. The requests are serialized
+    as usual to find the matching recorded response, which is deserialized
+    by pyVmomi the same way as a response from a real vSphere.
+    """
+
+    # -------------------------------------------------------------------------
+    def __init__(self, cassette, vsphere, host="localhost", port=443, path="/sdk", version=None):
+        """Initialize a VsphereReplayStub object."""
+        SoapStubAdapter.__init__(self, host=host, port=port, path=path, version=version)
+        self.cassette = cassette
+        self.vsphere = vsphere
+
+    # -------------------------------------------------------------------------
+    def InvokeMethod(self, mo, info, args, outerStub=None):  # noqa: N802
+        """Return the recorded response of the given managed method."""
+        if outerStub is None:
+            outerStub = self
+
+        request = self.SerializeRequest(mo, info, args)
+        entry = self.cassette.find_entry(
+            self.vsphere, mo, call_name(mo, info, args), request_key(request)
+        )
+        if self.cassette.latency_factor:
+            time.sleep(entry["seconds"] * self.cassette.latency_factor)
+
+        status = entry["status"]
+        fd = io.BytesIO(entry["response"].encode("utf-8"))
+        consumer = current_consumer(info)
+        if consumer is not None and status == 200:
+            obj = parse_property_sets(fd, consumer)
+        else:
+            obj = SoapResponseDeserializer(outerStub).Deserialize(fd, info.result)
+
+        if outerStub is not self:
+            return (status, obj)
+        if status == 200:
+            return obj
+        raise obj
+
+
+# =============================================================================
+if __name__ == "__main__":
+
+    pass
+
+# =============================================================================
+
+# vim: tabstop=4 expandtab shiftwidth=4 softtabstop=4 list
@@ -0,0 +1,178 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+@summary: The module for the streaming decompression of SOAP responses.
+
+The SOAP stub of pyVmomi requests compressed responses and inflates them in
+chunks of 512 bytes. This module provides a HTTP response class, which inflates
+gzip or deflate encoded bodies itself in larger chunks, while the deserializer
+is reading from it, and counts the transferred and the decoded bytes.
+
+@author: Frank Brehm
+@contact: frank@brehm-online.com
+@copyright: © 2022 - 2026 by Frank Brehm, Berlin
+"""
+from __future__ import absolute_import
+
+# Standard modules
+import logging
+import zlib
+
+# Third party modules
+
+# Own modules
+from .xlate import XLATOR
+
+__version__ = "0.1.0"
+LOG = logging.getLogger(__name__)
+
+_ = XLATOR.gettext
+
+DEFAULT_READ_CHUNK_SIZE = 64 * 1024
+CONTENT_ENCODINGS = ("gzip", "x-gzip", "deflate")
+
+
+# =============================================================================
+class StreamingDecoder(object):
+    """Inflating a gzip or deflate encoded stream chunk by chunk."""
+
+    # -------------------------------------------------------------------------
+    def __init__(self, encoding):
+        """Initialize a StreamingDecoder object for the given content encoding."""
+        self.encoding = encoding.lower()
+        if self.encoding not in CONTENT_ENCODINGS:
+            msg = _("Unsupported content encoding {!r}.").format(encoding)
+            raise ValueError(msg)
+        self._unzip = None
+        self._finished = False
+        self.bytes_in = 0
+        self.bytes_out = 0
+
+    # -------------------------------------------------------------------------
+    def _create_unzip(self, first_chunk):
+
+        if self.encoding != "deflate" or first_chunk[:2] == b"\x1f\x8b":
+            # Some servers are sending gzip as deflate
+            return zlib.decompressobj(zlib.MAX_WBITS | 16)
+        if len(first_chunk) >= 2:
+            (b0, b1) = (first_chunk[0], first_chunk[1])
+            if (b0 & 0x0F) == 8 and (b0 * 256 + b1) % 31 == 0:
+                return zlib.decompressobj(zlib.MAX_WBITS)
+        # Raw deflate without zlib header
+        return zlib.decompressobj(-zlib.MAX_WBITS)
+
+    # -------------------------------------------------------------------------
+    def decompress(self, chunk):
+        """Return the inflated data of the given chunk."""
+        if self._unzip is None:
+            if not chunk:
+                return b""
+            self._unzip = self._create_unzip(chunk)
+        self.bytes_in += len(chunk)
+        data = self._unzip.decompress(chunk)
+        self.bytes_out += len(data)
+        return data
+
+    # -------------------------------------------------------------------------
+    def flush(self):
+        """Return all remaining inflated data."""
+        if self._unzip is None or self._finished:
+            return b""
+        self._finished = True
+        data = self._unzip.flush()
+        self.bytes_out += len(data)
+        return data
+
+
+# =============================================================================
+def decoding_connection_class(scheme, stats=None, chunk_size=DEFAULT_READ_CHUNK_SIZE):
+    """
+    Return a subclass of the given HTTP connection class inflating compressed responses.
+
+    The responses are presenting an identity encoding to the reader, so pyVmomi does
+    not inflate them again. If a VsphereSoapStats object is given, the decoded bytes
+    are counted in it.
+    """
+
+    class DecodingResponse(scheme.response_class):
+
+        def begin(self):
+            super(DecodingResponse, self).begin()
+            self.decoder = None
+            self._pending = b""
+            self._offset = 0
+            encoding = (self.getheader("Content-Encoding") or "identity").strip().lower()
+            if encoding in CONTENT_ENCODINGS:
+                self.decoder = StreamingDecoder(encoding)
+                self.content_encoding = encoding
+                del self.headers["Content-Encoding"]
+                self.headers["Content-Encoding"] = "identity"
+            else:
+                self.content_encoding = "identity"
+
+        def read(self, amt=None):
+            if self.decoder is None:
+                data = super(DecodingResponse, self).read(amt)
+                if stats is not None and data:
+                    stats.add_bytes_decoded(len(data))
+                return data
+
+            if amt is None or amt < 0:
+                parts = [self._pending[self._offset:]]
+                self._pending = b""
+                self._offset = 0
+                while True:
+                    chunk = super(DecodingResponse, self).read(chunk_size)
+                    if not chunk:
+                        break
+                    parts.append(self.decoder.decompress(chunk))
+                parts.append(self.decoder.flush())
+                data = b"".join(parts)
+                self._count(data, last=True)
+                return data
+
+            # The XML parser reads small pieces, so the inflated data is consumed
+            # by moving an offset instead of copying the remainder on every read.
+            if len(self._pending) - self._offset < amt:
+                parts = [self._pending[self._offset:]]
+                available = len(parts[0])
+                while available < amt:
+                    chunk = super(DecodingResponse, self).read(chunk_size)
+                    data = self.decoder.decompress(chunk) if chunk else self.decoder.flush()
+                    parts.append(data)
+                    available += len(data)
+                    if not chunk:
+                        break
+                self._pending = b"".join(parts)
+                self._offset = 0
+
+            data = self._pending[self._offset:self._offset + amt]
+            self._offset += len(data)
+            self._count(data, last=not data)
+            return data
+
+        def _count(self, data, last=False):
+            if stats is None:
+                return
+            if data:
+                stats.add_bytes_decoded(len(data))
+            if last and not getattr(self, "_counted", False):
+                self._counted = True
+                stats.add_compressed_response(self.decoder.bytes_in, self.decoder.bytes_out)
+
+    class DecodingConnection(scheme):
+
+        response_class = DecodingResponse
+
+    DecodingConnection.__name__ = "Decoding" + scheme.__name__
+    return DecodingConnection
+
+
+# =============================================================================
+if __name__ == "__main__":
+
+    pass
+
+# =============================================================================
+
+# vim: tabstop=4 expandtab shiftwidth=4 softtabstop=4 list
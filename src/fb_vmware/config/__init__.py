@@ -27,9 +27,14 @@ from fb_tools.obj import FbGenericBaseObject
 # Own modules
 from ..errors import WrongPortTypeError
 from ..errors import WrongPortValueError
+from ..pool import DEFAULT_CONNECT_TIMEOUT
+from ..pool import DEFAULT_KEEP_ALIVE
+from ..pool import DEFAULT_POOL_SIZE
+from ..pool import DEFAULT_READ_TIMEOUT
+from ..pool import DEFAULT_TLS_SESSION_REUSE
 from ..xlate import XLATOR
 
-__version__ = "1.1.1"
+__version__ = "1.6.0"
 LOG = logging.getLogger(__name__)
 
 _ = XLATOR.gettext
@@ -44,6 +49,8 @@ DEFAULT_VSPHERE_CLUSTER = "vmcc-l105-01"
 DEFAULT_PORT_HTTP = 80
 DEFAULT_PORT_HTTPS = 443
 
+DEFAULT_CONVERT_WORKERS = 0
+
 MAX_PORT_NUMBER = (2**16) - 1
 
 
@@ -58,6 +65,19 @@ class VmwareConfigError(MultiConfigError):
 class VSPhereConfigInfo(FbBaseObject):
     """Encapsulating all necessary data to connect to a vSphere server."""
 
+    connection_options = (
+        "pool_size",
+        "keep_alive",
+        "connect_timeout",
+        "read_timeout",
+        "tls_session_reuse",
+        "compression",
+        "fast_parse",
+        "convert_workers",
+        "reservation_ledger",
+        "reservation_ttl",
+    )
+
     # -------------------------------------------------------------------------
     def __init__(
         self,
@@ -72,6 +92,16 @@ class VSPhereConfigInfo(FbBaseObject):
         user=DEFAULT_VSPHERE_USER,
         configured_password=None,
         password=None,
+        pool_size=DEFAULT_POOL_SIZE,
+        keep_alive=DEFAULT_KEEP_ALIVE,
+        connect_timeout=DEFAULT_CONNECT_TIMEOUT,
+        read_timeout=DEFAULT_READ_TIMEOUT,
+        tls_session_reuse=DEFAULT_TLS_SESSION_REUSE,
+        compression=True,
+        fast_parse=False,
+        convert_workers=DEFAULT_CONVERT_WORKERS,
+        reservation_ledger=None,
+        reservation_ttl=None,
         initialized=False,
     ):
         """Initialize the VSPhereConfigInfo object."""
@@ -82,6 +112,16 @@ class VSPhereConfigInfo(FbBaseObject):
         self._user = DEFAULT_VSPHERE_USER
         self._configured_password = None
         self._password = None
+        self._pool_size = DEFAULT_POOL_SIZE
+        self._keep_alive = DEFAULT_KEEP_ALIVE
+        self._connect_timeout = DEFAULT_CONNECT_TIMEOUT
+        self._read_timeout = DEFAULT_READ_TIMEOUT
+        self._tls_session_reuse = DEFAULT_TLS_SESSION_REUSE
+        self._compression = True
+        self._fast_parse = False
+        self._convert_workers = DEFAULT_CONVERT_WORKERS
+        self._reservation_ledger = None
+        self._reservation_ttl = None
 
         super(VSPhereConfigInfo, self).__init__(
             appname=appname, verbose=verbose, version=version, base_dir=base_dir, initialized=False
@@ -94,6 +134,16 @@ class VSPhereConfigInfo(FbBaseObject):
         self.user = user
         self.configured_password = configured_password
         self.password = password
+        self.pool_size = pool_size
+        self.keep_alive = keep_alive
+        self.connect_timeout = connect_timeout
+        self.read_timeout = read_timeout
+        self.tls_session_reuse = tls_session_reuse
+        self.compression = compression
+        self.fast_parse = fast_parse
+        self.convert_workers = convert_workers
+        self.reservation_ledger = reservation_ledger
+        self.reservation_ttl = reservation_ttl
 
         if initialized:
             self.initialized = True
@@ -111,13 +161,23 @@ class VSPhereConfigInfo(FbBaseObject):
         """
         res = super(VSPhereConfigInfo, self).as_dict(short=short)
 
+        res["compression"] = self.compression
         res["configured_password"] = self.show_configured_password
+        res["connect_timeout"] = self.connect_timeout
+        res["convert_workers"] = self.convert_workers
         res["dc"] = self.dc
+        res["fast_parse"] = self.fast_parse
         res["full_url"] = self.full_url
         res["host"] = self.host
+        res["keep_alive"] = self.keep_alive
         res["password"] = self.show_password
+        res["pool_size"] = self.pool_size
         res["port"] = self.port
+        res["read_timeout"] = self.read_timeout
+        res["reservation_ledger"] = self.reservation_ledger
+        res["reservation_ttl"] = self.reservation_ttl
         res["schema"] = self.schema
+        res["tls_session_reuse"] = self.tls_session_reuse
         res["url"] = self.url
         res["use_https"] = self.use_https
         res["user"] = self.user
@@ -219,6 +279,143 @@ class VSPhereConfigInfo(FbBaseObject):
             return
         self._configured_password = str(value).strip()
 
+    # -----------------------------------------------------------
+    @property
+    def pool_size(self):
+        """Return the maximum number of idle HTTP connections kept for reuse."""
+        return self._pool_size
+
+    @pool_size.setter
+    def pool_size(self, value):
+        val = int(value)
+        if val < 1:
+            msg = _("The size of the connection pool must be at least one, not {!r}.").format(
+                value
+            )
+            raise ValueError(msg)
+        self._pool_size = val
+
+    # -----------------------------------------------------------
+    @property
+    def keep_alive(self):
+        """Return the time in seconds, an idle HTTP connection is kept open."""
+        return self._keep_alive
+
+    @keep_alive.setter
+    def keep_alive(self, value):
+        val = int(value)
+        if val < -1:
+            msg = _(
+                "The keep-alive time must be a number of seconds, 0 for disabling or -1 "
+                "for no timeout, not {!r}."
+            ).format(value)
+            raise ValueError(msg)
+        self._keep_alive = val
+
+    # -----------------------------------------------------------
+    @property
+    def connect_timeout(self):
+        """Return the timeout in seconds for establishing a HTTP connection."""
+        return self._connect_timeout
+
+    @connect_timeout.setter
+    def connect_timeout(self, value):
+        self._connect_timeout = self._eval_timeout(value, "connect_timeout")
+
+    # -----------------------------------------------------------
+    @property
+    def read_timeout(self):
+        """Return the timeout in seconds for waiting on a response."""
+        return self._read_timeout
+
+    @read_timeout.setter
+    def read_timeout(self, value):
+        self._read_timeout = self._eval_timeout(value, "read_timeout")
+
+    # -----------------------------------------------------------
+    @property
+    def tls_session_reuse(self):
+        """Return, whether new connections should resume the TLS session of former ones."""
+        return self._tls_session_reuse
+
+    @tls_session_reuse.setter
+    def tls_session_reuse(self, value):
+        self._tls_session_reuse = to_bool(value)
+
+    # -----------------------------------------------------------
+    @property
+    def compression(self):
+        """Return, whether gzip or deflate compressed SOAP responses should be requested."""
+        return self._compression
+
+    @compression.setter
+    def compression(self, value):
+        self._compression = to_bool(value)
+
+    # -----------------------------------------------------------
+    @property
+    def fast_parse(self):
+        """Return, whether property sets should be parsed by the fast streaming parser."""
+        return self._fast_parse
+
+    @fast_parse.setter
+    def fast_parse(self, value):
+        self._fast_parse = to_bool(value)
+
+    # -----------------------------------------------------------
+    @property
+    def convert_workers(self):
+        """Return the number of processes converting property sets into VM objects."""
+        return self._convert_workers
+
+    @convert_workers.setter
+    def convert_workers(self, value):
+        val = int(value)
+        if val < 0:
+            msg = _(
+                "The number of converting processes must be a positive number or 0 for "
+                "converting in the current process, not {!r}."
+            ).format(value)
+            raise ValueError(msg)
+        self._convert_workers = val
+
+    # -----------------------------------------------------------
+    @property
+    def reservation_ledger(self):
+        """Return the filename of the ledger of datastore space reservations, if any."""
+        return self._reservation_ledger
+
+    @reservation_ledger.setter
+    def reservation_ledger(self, value):
+        if value is None or str(value).strip() == "":
+            self._reservation_ledger = None
+            return
+        self._reservation_ledger = str(value).strip()
+
+    # -----------------------------------------------------------
+    @property
+    def reservation_ttl(self):
+        """Return the time in seconds, after which reservations in the ledger expire."""
+        return self._reservation_ttl
+
+    @reservation_ttl.setter
+    def reservation_ttl(self, value):
+        self._reservation_ttl = self._eval_timeout(value, "reservation_ttl")
+
+    # -------------------------------------------------------------------------
+    @classmethod
+    def _eval_timeout(cls, value, name):
+
+        if value is None or str(value).strip() == "":
+            return None
+        val = float(value)
+        if val <= 0:
+            msg = _("The value of {n!r} must be a positive number of seconds, not {v!r}.").format(
+                n=name, v=value
+            )
+            raise ValueError(msg)
+        return val
+
     # -----------------------------------------------------------
     @property
     def show_password(self):
@@ -322,6 +519,9 @@ class VSPhereConfigInfo(FbBaseObject):
                 if key.lower() == "password":
                     info.configured_password = value
                     continue
+                if key.lower().replace("-", "_") in cls.connection_options:
+                    setattr(info, key.lower().replace("-", "_"), value)
+                    continue
 
                 msg = _(
                     "Unknown key {k!r} with value {v!r} for vSphere {vs!r} in section "
@@ -361,6 +561,8 @@ class VSPhereConfigInfo(FbBaseObject):
         fields.append("user={!r}".format(self.user))
         fields.append("configured_password={!r}".format(self.configured_password))
         fields.append("password={!r}".format(self.password))
+        for name in self.connection_options:
+            fields.append("{n}={v!r}".format(n=name, v=getattr(self, name)))
         fields.append("verbose={!r}".format(self.verbose))
         fields.append("base_dir={!r}".format(self.base_dir))
         fields.append("initialized={!r}".format(self.initialized))
@@ -397,6 +599,16 @@ class VSPhereConfigInfo(FbBaseObject):
             dc=self.dc,
             user=self.user,
             password=self.password,
+            pool_size=self.pool_size,
+            keep_alive=self.keep_alive,
+            connect_timeout=self.connect_timeout,
+            read_timeout=self.read_timeout,
+            tls_session_reuse=self.tls_session_reuse,
+            compression=self.compression,
+            fast_parse=self.fast_parse,
+            convert_workers=self.convert_workers,
+            reservation_ledger=self.reservation_ledger,
+            reservation_ttl=self.reservation_ttl,
             initialized=self.initialized,
         )
 
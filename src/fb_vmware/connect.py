@@ -11,12 +11,15 @@ from __future__ import absolute_import
 
 # Standard modules
 import datetime
+import functools
 import logging
 import re
 import socket
+import threading
 import time
 import uuid
 from numbers import Number
+from types import MappingProxyType
 
 try:
     from collections.abc import Sequence
@@ -26,7 +29,9 @@ except ImportError:
 # Third party modules
 from fb_tools.common import RE_TF_NAME, pp
 from fb_tools.common import is_sequence
+from fb_tools.common import to_bool
 from fb_tools.errors import HandlerError
+from fb_tools.xlate import format_list
 
 from pyVmomi import vim, vmodl
 
@@ -40,6 +45,7 @@ from .base import BaseVsphereHandler, DEFAULT_TZ_NAME
 from .cluster import VsphereCluster
 from .config import DEFAULT_VSPHERE_CLUSTER
 from .controller import VsphereDiskController
+from .convert import VmPropertySet, VsphereVmConverter
 from .datastore import VsphereDatastore, VsphereDatastoreDict
 from .dc import VsphereDatacenter
 from .ds_cluster import VsphereDsCluster, VsphereDsClusterDict
@@ -49,13 +55,23 @@ from .errors import VSphereDatacenterNotFoundError
 from .errors import VSphereExpectedError
 from .errors import VSphereNoDatastoresFoundError
 from .errors import VSphereVmNotFoundError
-from .host import VsphereHost
+from .host import HOST_PROPERTIES, VsphereHost
 from .iface import VsphereVmInterface
+from .ledger import DEFAULT_RESERVATION_TTL, VsphereReservationLedger
+from .name_table import NAME_TABLE_PROPERTIES, VsphereNameTable
 from .network import VsphereNetwork, VsphereNetworkDict
-from .vm import VsphereVm, VsphereVmList
+from .propset import DEFAULT_PAGE_SIZE
+from .propset import MoRef
+from .propset import property_set_from_content
+from .propset import streaming_property_sets
+from .propset import vmodl_type_of
+from .singleflight import DEFAULT_RESULT_TTL, SingleFlight
+from .snapshot import SNAPSHOT_KINDS, VsphereInventorySnapshot
+from .traverse import InventoryWalker, WALK_CONTINUE, WALK_PRUNE, WALK_STOP
+from .vm import VM_PROPERTIES, VsphereVm, VsphereVmList
 from .xlate import XLATOR
 
-__version__ = "2.11.4"
+__version__ = "2.25.2"
 LOG = logging.getLogger(__name__)
 
 DEFAULT_OS_VERSION = "rhel9_64Guest"
@@ -98,27 +114,41 @@ class VsphereConnection(BaseVsphereHandler):
         force=None,
         terminal_has_colors=False,
         tz=DEFAULT_TZ_NAME,
+        collect_stats=False,
+        cassette=None,
+        result_ttl=DEFAULT_RESULT_TTL,
+        fast_parse=None,
+        convert_workers=None,
+        ledger=None,
         initialized=False,
     ):
         """Initialize a VsphereConnection object."""
         self._name = None
-
-        self.datastores = VsphereDatastoreDict()
-        self.ds_clusters = VsphereDsClusterDict()
-        self.networks = VsphereNetworkDict()
-        self.dv_portgroups = VsphereNetworkDict()
+        self._fast_parse = False
+        self._convert_workers = 0
+        self._vm_converter = None
+        self._converter_lock = threading.Lock()
+        self.single_flight = SingleFlight(ttl=result_ttl)
+
+        self._custom_fields_lock = threading.Lock()
+
+        # The results of the last retrievals, they are only replaced as a whole
+        self.datastores = VsphereDatastoreDict().freeze()
+        self.ds_clusters = VsphereDsClusterDict().freeze()
+        self.networks = VsphereNetworkDict().freeze()
+        self.dv_portgroups = VsphereNetworkDict().freeze()
         self.about = None
         self.dc_obj = None
-        self.dvs = {}
+        self.dvs = MappingProxyType({})
 
-        self.datacenters = {}
+        self.datacenters = MappingProxyType({})
 
-        self.ds_mapping = {}
-        self.ds_cluster_mapping = {}
-        self.network_mapping = {}
+        self.ds_mapping = MappingProxyType({})
+        self.ds_cluster_mapping = MappingProxyType({})
+        self.network_mapping = MappingProxyType({})
 
-        self.clusters = []
-        self.hosts = {}
+        self.clusters = ()
+        self.hosts = MappingProxyType({})
         self.custom_fields = None
 
         super(VsphereConnection, self).__init__(
@@ -133,10 +163,26 @@ class VsphereConnection(BaseVsphereHandler):
             auto_close=auto_close,
             terminal_has_colors=terminal_has_colors,
             tz=tz,
+            collect_stats=collect_stats,
+            cassette=cassette,
             initialized=False,
         )
 
         self.name = name
+        if fast_parse is None:
+            fast_parse = self.connect_info.fast_parse
+        self.fast_parse = fast_parse
+        if convert_workers is None:
+            convert_workers = self.connect_info.convert_workers
+        self.convert_workers = convert_workers
+
+        # The ledger of datastore space reservations shared with other processes
+        if ledger is None and self.connect_info.reservation_ledger:
+            ledger = VsphereReservationLedger(
+                self.connect_info.reservation_ledger,
+                ttl=self.connect_info.reservation_ttl or DEFAULT_RESERVATION_TTL,
+            )
+        self.ledger = ledger
 
         self.initialized = initialized
 
@@ -166,6 +212,60 @@ class VsphereConnection(BaseVsphereHandler):
 
         self._name = val
 
+    # -----------------------------------------------------------
+    @property
+    def result_ttl(self):
+        """Return the time in seconds, for which coalesced retrieval results are reused."""
+        return self.single_flight.ttl
+
+    @result_ttl.setter
+    def result_ttl(self, value):
+        self.single_flight.ttl = value
+
+    # -----------------------------------------------------------
+    @property
+    def fast_parse(self):
+        """Return, whether property sets are parsed by the fast streaming parser."""
+        return self._fast_parse
+
+    @fast_parse.setter
+    def fast_parse(self, value):
+        self._fast_parse = to_bool(value)
+
+    # -----------------------------------------------------------
+    @property
+    def convert_workers(self):
+        """Return the number of processes converting property sets into VM objects."""
+        return self._convert_workers
+
+    @convert_workers.setter
+    def convert_workers(self, value):
+        val = int(value)
+        if val < 0:
+            msg = _("The number of converting processes must not be negative, not {!r}.").format(
+                value
+            )
+            raise ValueError(msg)
+        with self._converter_lock:
+            if val != self._convert_workers and self._vm_converter is not None:
+                self._vm_converter.close()
+                self._vm_converter = None
+            self._convert_workers = val
+
+    # -----------------------------------------------------------
+    @property
+    def vm_converter(self):
+        """Return the object converting property sets into VsphereVm objects."""
+        with self._converter_lock:
+            if self._vm_converter is None:
+                self._vm_converter = VsphereVmConverter(
+                    workers=self.convert_workers,
+                    appname=self.appname,
+                    verbose=self.verbose,
+                    base_dir=self.base_dir,
+                )
+            return self._vm_converter
+
     # -------------------------------------------------------------------------
     def as_dict(self, short=True):
         """
@@ -179,20 +279,229 @@ class VsphereConnection(BaseVsphereHandler):
         """
         res = super(VsphereConnection, self).as_dict(short=short)
         res["name"] = self.name
+        res["result_ttl"] = self.result_ttl
+        res["fast_parse"] = self.fast_parse
+        res["convert_workers"] = self.convert_workers
+        res["ledger"] = self.ledger
 
         return res
 
+    # -------------------------------------------------------------------------
+    def disconnect(self):
+        """Disconnect from the vSphere instance and shut down the converting processes."""
+        super(VsphereConnection, self).disconnect()
+        with self._converter_lock:
+            converter = self._vm_converter
+            self._vm_converter = None
+        if converter is not None:
+            converter.close()
+
+    # -------------------------------------------------------------------------
+    def retrieve_properties(
+        self, prop_specs, container=None, page_size=DEFAULT_PAGE_SIZE, objects=None
+    ):
+        """
+        Retrieve the given properties of all managed objects of the given types.
+
+        The objects are retrieved page by page with RetrievePropertiesEx() from
+        a container view. If fast_parse is set and the installed pyVmomi supports
+        the streaming, the responses are parsed by the fast streaming parser of
+        fb_vmware.propset, else by pyVmomi.
+
+        If objects are given, only the properties of these objects are retrieved
+        instead, with up to page_size objects per request. Objects, which were
+        removed in the meantime, are omitted.
+
+        @param prop_specs: pairs of a managed object type and a list of property paths
+        @type prop_specs: list of tuple
+        @param container: the folder or datacenter to search in, the root folder if None
+        @type container: vim.ManagedEntity or None
+        @param page_size: the maximum number of objects per response
+        @type page_size: int
+        @param objects: the managed objects as MoRefs or pyVmomi objects
+        @type objects: iterable or None
+
+        @return: a generator of the MoRef and the dict of the properties of every object
+        @rtype: iterator of tuple
+        """
+        self.ensure_connected()
+        content = self.service_instance.RetrieveContent()
+        pc = vmodl.query.PropertyCollector
+        prop_set = [
+            pc.PropertySpec(type=mo_type, pathSet=list(paths)) for (mo_type, paths) in prop_specs
+        ]
+        options = pc.RetrieveOptions(maxObjects=page_size)
+        collector = content.propertyCollector
+
+        if objects is not None:
+            stub = self.service_instance._stub
+            mos = []
+            for obj in objects:
+                if isinstance(obj, MoRef):
+                    obj = vmodl_type_of(obj)(obj.value, stub)
+                mos.append(obj)
+            for start in range(0, len(mos), page_size):
+                yield from self._retrieve_objects(
+                    collector, mos[start:start + page_size], prop_set, options
+                )
+            return
+
+        if container is None:
+            container = content.rootFolder
+
+        view = content.viewManager.CreateContainerView(
+            container, [spec[0] for spec in prop_specs], True
+        )
+        traversal = pc.TraversalSpec(
+            name="traverseView", path="view", skip=False, type=vim.view.ContainerView
+        )
+        obj_spec = pc.ObjectSpec(obj=view, skip=True, selectSet=[traversal])
+        filter_spec = pc.FilterSpec(objectSet=[obj_spec], propSet=prop_set)
+        try:
+            yield from self._retrieve_pages(collector, filter_spec, options)
+        finally:
+            view.Destroy()
+
+    # -------------------------------------------------------------------------
+    def _retrieve_objects(self, collector, mos, prop_set, options):
+
+        pc = vmodl.query.PropertyCollector
+        while mos:
+            obj_set = [pc.ObjectSpec(obj=mo, skip=False) for mo in mos]
+            filter_spec = pc.FilterSpec(objectSet=obj_set, propSet=prop_set)
+            try:
+                # Collected in full, because a missing object fails the whole request
+                return list(self._retrieve_pages(collector, filter_spec, options))
+            except vmodl.fault.ManagedObjectNotFound as e:
+                missing = MoRef(e.obj._wsdlName, e.obj._moId)
+                remaining = [mo for mo in mos if MoRef(mo._wsdlName, mo._moId) != missing]
+                if len(remaining) == len(mos):
+                    raise
+                LOG.debug(_("Managed object {} was removed in the meantime.").format(missing))
+                mos = remaining
+        return []
+
+    # -------------------------------------------------------------------------
+    def _retrieve_pages(self, collector, filter_spec, options):
+
+        page = []
+        result = None
+        try:
+            result = self._retrieve_page(
+                collector.RetrievePropertiesEx, page, [filter_spec], options
+            )
+            while True:
+                yield from page
+                del page[:]
+                if result is None or not result.token:
+                    break
+                result = self._retrieve_page(
+                    collector.ContinueRetrievePropertiesEx, page, result.token
+                )
+            result = None
+        finally:
+            if result is not None and result.token:
+                collector.CancelRetrievePropertiesEx(result.token)
+
+    # -------------------------------------------------------------------------
+    def _retrieve_page(self, method, page, *args):
+
+        if not self.fast_parse or not self.streaming:
+            result = method(*args)
+            if result is not None:
+                page.extend(property_set_from_content(content) for content in result.objects)
+            return result
+
+        def consumer(moref, props):
+            page.append((moref, props))
+
+        with streaming_property_sets(consumer):
+            return method(*args)
+
+    # -------------------------------------------------------------------------
+    def get_name_table(self, lazy=False):
+        """
+        Get the names of all datacenters, folders, compute resources, resource pools and hosts.
+
+        They are retrieved with one bulk retrieval of properties, so the references
+        of many VMs to them are resolved by lookups in the returned table.
+
+        @param lazy: retrieve the names not before the first lookup in the table
+        @type lazy: bool
+
+        @return: the table of the names
+        @rtype: VsphereNameTable
+        """
+        loader = functools.partial(self.retrieve_properties, NAME_TABLE_PROPERTIES)
+        if lazy:
+            return VsphereNameTable(loader=loader)
+        return VsphereNameTable(loader())
+
+    # -------------------------------------------------------------------------
+    def get_property_sets(self, mo_type, paths=(), re_name=None, disconnect=False):
+        """
+        Get only the given properties of all managed objects of the given type.
+
+        The name and the parent of the objects are always retrieved. If re_name is
+        given, the names are retrieved first and the other properties only of the
+        objects with a matching name.
+
+        @param mo_type: the type of the managed objects, e.g. vim.HostSystem
+        @type mo_type: type
+        @param paths: the property paths to retrieve additionally
+        @type paths: iterable of str
+        @param re_name: a regex to filter the objects by their name
+        @type re_name: re.Pattern or None
+
+        @return: the MoRef and the dict of the properties of every found object
+        @rtype: list of tuple
+        """
+        base_paths = ["name", "parent"]
+        other_paths = [path for path in dict.fromkeys(paths) if path not in base_paths]
+
+        try:
+            if re_name is None:
+                return list(self.retrieve_properties(((mo_type, base_paths + other_paths),)))
+
+            found = []
+            for (moref, props) in self.retrieve_properties(((mo_type, base_paths),)):
+                if re_name.search(props.get("name") or ""):
+                    found.append((moref, props))
+            if not found or not other_paths:
+                return found
+
+            details = dict(
+                self.retrieve_properties(
+                    ((mo_type, other_paths),), objects=[moref for (moref, props) in found]
+                )
+            )
+            property_sets = []
+            for (moref, props) in found:
+                if moref not in details:
+                    continue
+                props.update(details[moref])
+                property_sets.append((moref, props))
+            return property_sets
+
+        finally:
+            if disconnect:
+                self.disconnect()
+
     # -------------------------------------------------------------------------
     def get_about(self, disconnect=False):
-        """Get the 'about' information from vSphere as a VsphereAboutInfo object."""
+        """
+        Get the 'about' information from vSphere as a VsphereAboutInfo object.
+
+        @return: the 'about' information, which is also set as self.about.
+        @rtype: VsphereAboutInfo
+        """
         LOG.debug(_("Trying to get some 'about' information from vSphere."))
 
         try:
 
-            if not self.service_instance:
-                self.connect()
+            self.ensure_connected()
 
-            self.about = VsphereAboutInfo.from_summary(
+            about = VsphereAboutInfo.from_summary(
                 self.service_instance.content.about,
                 appname=self.appname,
                 verbose=self.verbose,
@@ -214,54 +523,63 @@ class VsphereConnection(BaseVsphereHandler):
             if disconnect:
                 self.disconnect()
 
+        self.about = about
+
         if self.verbose:
-            LOG.info(_("vSphere version: {!r}").format(self.about.os_version))
+            LOG.info(_("vSphere version: {!r}").format(about.os_version))
         if self.verbose > 1:
-            LOG.debug(_("Found vSphere about-information:") + "\n" + pp(self.about.as_dict()))
+            LOG.debug(_("Found vSphere about-information:") + "\n" + pp(about.as_dict()))
+
+        return about
 
     # -------------------------------------------------------------------------
     def get_datacenter(self, disconnect=False):
-        """Get the datacenter from vSphere as a VsphereDatacenter object."""
+        """
+        Get the datacenter from vSphere as a VsphereDatacenter object.
+
+        @return: the datacenter, which is also set as self.dc_obj.
+        @rtype: VsphereDatacenter
+        """
         LOG.debug(_("Trying to get datacenter from vSphere ..."))
 
         try:
 
-            if not self.service_instance:
-                self.connect()
+            self.ensure_connected()
 
             content = self.service_instance.RetrieveContent()
             dc_obj = self.get_obj(content, [vim.Datacenter], self.dc)
             if not dc_obj:
                 raise VSphereDatacenterNotFoundError(self.dc)
 
-            self.dc_obj = VsphereDatacenter.from_summary(
+            datacenter = VsphereDatacenter.from_summary(
                 dc_obj, appname=self.appname, verbose=self.verbose, base_dir=self.base_dir
             )
-            LOG.debug(_("Found vSphere datacenter {!r}.").format(self.dc_obj.name))
+            LOG.debug(_("Found vSphere datacenter {!r}.").format(datacenter.name))
             if self.verbose > 2:
-                LOG.debug(_("Info about datacenter:") + "\n" + str(self.dc_obj))
+                LOG.debug(_("Info about datacenter:") + "\n" + str(datacenter))
 
         finally:
             if disconnect:
                 self.disconnect()
 
-        return
+        self.dc_obj = datacenter
+        return datacenter
 
     # -------------------------------------------------------------------------
     def get_datacenters(self, disconnect=False):
         """
         Get all datacenters controlled by the current vCenter.
 
-        The evaluated datacenters are stored as VsphereDatacenter objects in
-        self.datacenters with their names as keys.
+        @return: a read-only mapping of the datacenter names to VsphereDatacenter
+                 objects, which is also set as self.datacenters.
+        @rtype: MappingProxyType
         """
         LOG.debug(_("Trying to get all datacenters from vSphere ..."))
-        self.datacenters = {}
+        datacenters = {}
 
         try:
 
-            if not self.service_instance:
-                self.connect()
+            self.ensure_connected()
 
             content = self.service_instance.RetrieveContent()
             for child in content.rootFolder.childEntity:
@@ -270,117 +588,131 @@ class VsphereConnection(BaseVsphereHandler):
                         child, appname=self.appname, verbose=self.verbose, base_dir=self.base_dir
                     )
                     LOG.debug(_("Found vSphere datacenter {!r}.").format(dc_obj.name))
-                    self.datacenters[dc_obj.name] = dc_obj
+                    datacenters[dc_obj.name] = dc_obj
 
         finally:
             if disconnect:
                 self.disconnect()
 
-        return
+        self.datacenters = MappingProxyType(datacenters)
+        return self.datacenters
 
     # -------------------------------------------------------------------------
     def get_clusters(self, vsphere_name=None, search_in_dc=None, disconnect=False):
-        """Get all computing clusters from vSphere as VsphereCluster objects."""
+        """
+        Get all computing clusters from vSphere as VsphereCluster objects.
+
+        @return: the found clusters, which are also set as self.clusters.
+        @rtype: tuple
+        """
         LOG.debug(_("Trying to get all clusters from vSphere ..."))
 
-        self.clusters = []
+        clusters = []
 
         if vsphere_name is None:
             vsphere_name = self.name
 
         try:
 
-            if not self.service_instance:
-                self.connect()
+            self.ensure_connected()
 
-            self.get_datacenters()
-            content = self.service_instance.RetrieveContent()
-
-            for dc_name in self.datacenters.keys():
-                if search_in_dc is not None:
-                    if dc_name != search_in_dc:
-                        continue
-                if self.verbose > 1:
-                    LOG.debug(_("Get all computing clusters in DC {!r} ...").format(dc_name))
-                dc = self.get_obj(content, [vim.Datacenter], dc_name)
-
-                for child in dc.hostFolder.childEntity:
-                    self._get_clusters(child, vsphere_name=vsphere_name, dc_name=dc_name)
+            walker = InventoryWalker(max_depth=self.max_search_depth)
+            walker.add_visitor(
+                vim.ComputeResource,
+                functools.partial(
+                    self._visit_cluster, clusters=clusters, vsphere_name=vsphere_name
+                ),
+            )
+            walker.run(
+                self._datacenter_roots(
+                    "hostFolder",
+                    search_in_dc=search_in_dc,
+                    msg=_("Get all computing clusters in DC {!r} ..."),
+                )
+            )
 
         finally:
             if disconnect:
                 self.disconnect()
 
+        self.clusters = tuple(clusters)
+
         if self.verbose > 2:
             out = []
-            for cluster in self.clusters:
+            for cluster in clusters:
                 out.append(cluster.as_dict())
             LOG.debug(_("Found clusters:") + "\n" + pp(out))
         elif self.verbose:
             out = []
-            for cluster in self.clusters:
+            for cluster in clusters:
                 out.append(cluster.name)
             LOG.debug(_("Found clusters:") + "\n" + pp(out))
 
+        return self.clusters
+
     # -------------------------------------------------------------------------
-    def _get_clusters(self, child, vsphere_name=None, dc_name=None, depth=1):
+    def _datacenter_roots(self, folder, search_in_dc=None, cached=False, msg=None, min_verbose=2):
+
+        folders = (folder,) if isinstance(folder, str) else tuple(folder)
+        datacenters = self.datacenters if cached else None
+        if not datacenters:
+            datacenters = self.get_datacenters()
+        content = self.service_instance.RetrieveContent()
+
+        for dc_name in datacenters.keys():
+            if search_in_dc is not None and dc_name != search_in_dc:
+                continue
+            if msg and self.verbose >= min_verbose:
+                LOG.debug(msg.format(dc_name))
+            dc = self.get_obj(content, [vim.Datacenter], dc_name)
+            for folder_name in folders:
+                yield (getattr(dc, folder_name), dc_name)
+
+    # -------------------------------------------------------------------------
+    def _visit_cluster(self, item, clusters, vsphere_name=None):
 
         if vsphere_name is None:
             vsphere_name = self.name
 
-        if hasattr(child, "childEntity"):
-            if depth > self.max_search_depth:
-                return
-            for sub_child in child.childEntity:
-                self._get_clusters(
-                    sub_child,
-                    vsphere_name=vsphere_name,
-                    dc_name=dc_name,
-                    depth=(depth + 1),
+        child = item.obj
+        cluster = VsphereCluster.from_summary(
+            child,
+            appname=self.appname,
+            verbose=self.verbose,
+            base_dir=self.base_dir,
+            vsphere=vsphere_name,
+            dc_name=item.dc_name,
+        )
+        if self.verbose > 1:
+            obj_name = _("Found standalone host")
+            if isinstance(child, vim.ClusterComputeResource):
+                obj_name = _("Found cluster")
+            host_label = ngettext("host", "hosts", cluster.hosts_total)
+            cpus_label = ngettext("CPU", "CPUs", cluster.cpu_cores)
+            thr_label = ngettext("thread", "threads", cluster.cpu_threads)
+            nw_label = ngettext("network", "networks", len(cluster.networks))
+            ds_label = ngettext("datastore", "datastores", len(cluster.datastores))
+            LOG.debug(
+                _(
+                    "{on} {cl!r}, {h} {h_l}, {cpu} {cpu_l}, {thr} {t_l}, "
+                    "{mem:0.1f} GiB Memory, {net} {nw_l} and {ds} {ds_l}."
+                ).format(
+                    on=obj_name,
+                    cl=cluster.name,
+                    h=cluster.hosts_total,
+                    h_l=host_label,
+                    cpu=cluster.cpu_cores,
+                    cpu_l=cpus_label,
+                    thr=cluster.cpu_threads,
+                    t_l=thr_label,
+                    mem=cluster.mem_gb_total,
+                    net=len(cluster.networks),
+                    nw_l=nw_label,
+                    ds=len(cluster.datastores),
+                    ds_l=ds_label,
                 )
-            return
-
-        if isinstance(child, (vim.ClusterComputeResource, vim.ComputeResource)):
-            cluster = VsphereCluster.from_summary(
-                child,
-                appname=self.appname,
-                verbose=self.verbose,
-                base_dir=self.base_dir,
-                vsphere=vsphere_name,
-                dc_name=dc_name,
             )
-            if self.verbose > 1:
-                obj_name = _("Found standalone host")
-                if isinstance(child, vim.ClusterComputeResource):
-                    obj_name = _("Found cluster")
-                host_label = ngettext("host", "hosts", cluster.hosts_total)
-                cpus_label = ngettext("CPU", "CPUs", cluster.cpu_cores)
-                thr_label = ngettext("thread", "threads", cluster.cpu_threads)
-                nw_label = ngettext("network", "networks", len(cluster.networks))
-                ds_label = ngettext("datastore", "datastores", len(cluster.datastores))
-                LOG.debug(
-                    _(
-                        "{on} {cl!r}, {h} {h_l}, {cpu} {cpu_l}, {thr} {t_l}, "
-                        "{mem:0.1f} GiB Memory, {net} {nw_l} and {ds} {ds_l}."
-                    ).format(
-                        on=obj_name,
-                        cl=cluster.name,
-                        h=cluster.hosts_total,
-                        h_l=host_label,
-                        cpu=cluster.cpu_cores,
-                        cpu_l=cpus_label,
-                        thr=cluster.cpu_threads,
-                        t_l=thr_label,
-                        mem=cluster.mem_gb_total,
-                        net=len(cluster.networks),
-                        nw_l=nw_label,
-                        ds=len(cluster.datastores),
-                        ds_l=ds_label,
-                    )
-                )
-            self.clusters.append(cluster)
-
-        return
+        clusters.append(cluster)
 
     # -------------------------------------------------------------------------
     def get_cluster_by_name(self, cl_name):
@@ -401,133 +733,117 @@ class VsphereConnection(BaseVsphereHandler):
         disconnect=False,
         detailled=False,
     ):
-        """Get all datastores from vSphere as VsphereDatastore objects."""
-        LOG.debug(_("Trying to get all datastores from vSphere ..."))
-        self.datastores = VsphereDatastoreDict()
-        self.ds_mapping = {}
+        """
+        Get all datastores from vSphere as VsphereDatastore objects.
 
+        Identical concurrent calls are coalesced into one retrieval, whose result
+        is shared by all callers and must not be changed by them.
+
+        @return: the found datastores, which are also set as self.datastores.
+        @rtype: VsphereDatastoreDict
+        """
         if vsphere_name is None:
             vsphere_name = self.name
 
+        key = ("datastores", vsphere_name, bool(no_local_ds), search_in_dc, bool(detailled))
         try:
-
-            if not self.service_instance:
-                self.connect()
-
-            self.get_datacenters()
-            content = self.service_instance.RetrieveContent()
-            for dc_name in self.datacenters.keys():
-                if search_in_dc is not None:
-                    if dc_name != search_in_dc:
-                        continue
-                if self.verbose > 1:
-                    LOG.debug(_("Get all datastores in DC {!r} ...").format(dc_name))
-                dc = self.get_obj(content, [vim.Datacenter], dc_name)
-                for child in dc.datastoreFolder.childEntity:
-                    self._get_datastores(
-                        child,
-                        vsphere_name=vsphere_name,
-                        dc_name=dc_name,
-                        no_local_ds=no_local_ds,
-                        detailled=detailled,
-                    )
-
+            (datastores, ds_mapping) = self.single_flight.do(
+                key,
+                self._retrieve_datastores,
+                vsphere_name=vsphere_name,
+                no_local_ds=no_local_ds,
+                search_in_dc=search_in_dc,
+                detailled=detailled,
+            )
         finally:
             if disconnect:
                 self.disconnect()
 
-        if self.datastores:
-            if self.verbose > 1:
-                if self.verbose > 2:
-                    LOG.debug(_("Found datastores:") + "\n" + pp(self.datastores.as_list()))
-                else:
-                    LOG.debug(_("Found datastores:") + "\n" + pp(list(self.datastores.keys())))
-        elif warn_if_empty:
+        self.datastores = datastores
+        self.ds_mapping = ds_mapping
+
+        if not datastores and warn_if_empty:
             raise VSphereNoDatastoresFoundError()
 
-        for ds_name, ds in self.datastores.items():
-            self.ds_mapping[ds_name] = ds.tf_name
+        return datastores
+
+    # -------------------------------------------------------------------------
+    def _retrieve_datastores(self, vsphere_name, no_local_ds, search_in_dc, detailled):
+
+        LOG.debug(_("Trying to get all datastores from vSphere ..."))
+        datastores = VsphereDatastoreDict(ledger=self.ledger)
+        ds_mapping = {}
+        pods = {}
+
+        self.ensure_connected()
+
+        walker = InventoryWalker(max_depth=self.max_search_depth)
+        walker.add_visitor(vim.StoragePod, functools.partial(self._visit_storage_pod, pods=pods))
+        walker.add_visitor(
+            vim.Datastore,
+            functools.partial(
+                self._visit_datastore,
+                datastores=datastores,
+                pods=pods,
+                vsphere_name=vsphere_name,
+                no_local_ds=no_local_ds,
+                detailled=detailled,
+            ),
+        )
+        walker.run(
+            self._datacenter_roots(
+                "datastoreFolder",
+                search_in_dc=search_in_dc,
+                msg=_("Get all datastores in DC {!r} ..."),
+            )
+        )
+
+        if datastores and self.verbose > 1:
+            if self.verbose > 2:
+                LOG.debug(_("Found datastores:") + "\n" + pp(datastores.as_list()))
+            else:
+                LOG.debug(_("Found datastores:") + "\n" + pp(list(datastores.keys())))
+
+        for ds_name, ds in datastores.items():
+            ds_mapping[ds_name] = ds.tf_name
 
         if self.verbose > 2:
-            LOG.debug(_("Datastore mappings:") + "\n" + pp(self.ds_mapping))
+            LOG.debug(_("Datastore mappings:") + "\n" + pp(ds_mapping))
+
+        return (datastores.freeze(), MappingProxyType(ds_mapping))
 
     # -------------------------------------------------------------------------
-    def _get_datastores(
-        self,
-        child,
-        vsphere_name=None,
-        dc_name=None,
-        cluster=None,
-        no_local_ds=True,
-        depth=1,
-        detailled=False,
-    ):
+    def _visit_storage_pod(self, item, pods):
 
-        if self.verbose > 3:
-            LOG.debug(_("Found a {} child.").format(child.__class__.__name__))
+        pods[item.obj] = item.obj.summary.name
 
-        if isinstance(child, vim.StoragePod):
-            if depth > self.max_search_depth:
-                return
-            ds = VsphereDsCluster.from_summary(
-                child,
-                vsphere=vsphere_name,
-                dc_name=dc_name,
-                appname=self.appname,
-                verbose=self.verbose,
-                base_dir=self.base_dir,
-            )
-            for sub_child in child.childEntity:
-                self._get_datastores(
-                    sub_child,
-                    vsphere_name=vsphere_name,
-                    dc_name=dc_name,
-                    cluster=ds.name,
-                    no_local_ds=no_local_ds,
-                    depth=(depth + 1),
-                    detailled=detailled,
-                )
-            return
-
-        if hasattr(child, "childEntity"):
-            if depth > self.max_search_depth:
-                return
-            for sub_child in child.childEntity:
-                self._get_datastores(
-                    sub_child,
-                    vsphere_name=vsphere_name,
-                    dc_name=dc_name,
-                    cluster=cluster,
-                    no_local_ds=no_local_ds,
-                    depth=(depth + 1),
-                    detailled=detailled,
-                )
-            return
+    # -------------------------------------------------------------------------
+    def _visit_datastore(
+        self, item, datastores, pods, vsphere_name=None, no_local_ds=True, detailled=False
+    ):
 
-        if isinstance(child, vim.Datastore):
-            if no_local_ds and self.re_local_ds.match(child.summary.name):
-                if self.verbose > 2:
-                    LOG.debug(_("Datastore {!r} seems to be local.").format(child.summary.name))
-                return
-            ds = VsphereDatastore.from_summary(
-                child,
-                vsphere=vsphere_name,
-                dc_name=dc_name,
-                cluster=cluster,
-                appname=self.appname,
-                verbose=self.verbose,
-                base_dir=self.base_dir,
-                detailled=detailled,
-            )
+        child = item.obj
+        if no_local_ds and self.re_local_ds.match(child.summary.name):
             if self.verbose > 2:
-                LOG.debug(
-                    _("Found datastore {ds!r} of type {t!r}, capacity {c:0.1f} GByte.").format(
-                        ds=ds.name, t=ds.storage_type, c=ds.capacity_gb
-                    )
+                LOG.debug(_("Datastore {!r} seems to be local.").format(child.summary.name))
+            return
+        ds = VsphereDatastore.from_summary(
+            child,
+            vsphere=vsphere_name,
+            dc_name=item.dc_name,
+            cluster=pods.get(item.parent),
+            appname=self.appname,
+            verbose=self.verbose,
+            base_dir=self.base_dir,
+            detailled=detailled,
+        )
+        if self.verbose > 2:
+            LOG.debug(
+                _("Found datastore {ds!r} of type {t!r}, capacity {c:0.1f} GByte.").format(
+                    ds=ds.name, t=ds.storage_type, c=ds.capacity_gb
                 )
-            self.datastores.append(ds)
-
-        return
+            )
+        datastores.append(ds)
 
     # -------------------------------------------------------------------------
     def get_ds_clusters(
@@ -538,98 +854,193 @@ class VsphereConnection(BaseVsphereHandler):
         disconnect=False,
         detailled=False,
     ):
-        """Get all datastores clusters from vSphere as VsphereDsCluster objects."""
+        """
+        Get all datastores clusters from vSphere as VsphereDsCluster objects.
+
+        @return: the found datastore clusters, which are also set as self.ds_clusters.
+        @rtype: VsphereDsClusterDict
+        """
         LOG.debug(_("Trying to get all datastore clusters from vSphere ..."))
-        self.ds_clusters = VsphereDsClusterDict()
-        self.ds_cluster_mapping = {}
+        ds_clusters = VsphereDsClusterDict()
+        ds_cluster_mapping = {}
 
         if vsphere_name is None:
             vsphere_name = self.name
 
         try:
 
-            if not self.service_instance:
-                self.connect()
+            self.ensure_connected()
 
-            self.get_datacenters()
-            content = self.service_instance.RetrieveContent()
-
-            for dc_name in self.datacenters.keys():
-                if search_in_dc is not None:
-                    if dc_name != search_in_dc:
-                        continue
-                if self.verbose > 1:
-                    LOG.debug(_("Get all datastore clusters in DC {!r} ...").format(dc_name))
-                dc = self.get_obj(content, [vim.Datacenter], dc_name)
-                for child in dc.datastoreFolder.childEntity:
-                    self._get_ds_clusters(
-                        child,
-                        vsphere_name=vsphere_name,
-                        dc_name=dc_name,
-                        detailled=detailled,
-                    )
+            walker = InventoryWalker(max_depth=self.max_search_depth)
+            walker.add_visitor(
+                vim.StoragePod,
+                functools.partial(
+                    self._visit_ds_cluster,
+                    ds_clusters=ds_clusters,
+                    vsphere_name=vsphere_name,
+                    detailled=detailled,
+                ),
+            )
+            walker.run(
+                self._datacenter_roots(
+                    "datastoreFolder",
+                    search_in_dc=search_in_dc,
+                    msg=_("Get all datastore clusters in DC {!r} ..."),
+                )
+            )
 
         finally:
             if disconnect:
                 self.disconnect()
 
-        if self.ds_clusters:
+        if ds_clusters:
             if self.verbose > 1:
                 if self.verbose > 3:
-                    LOG.debug(
-                        _("Found datastore clusters:") + "\n" + pp(self.ds_clusters.as_list())
-                    )
+                    LOG.debug(_("Found datastore clusters:") + "\n" + pp(ds_clusters.as_list()))
                 else:
                     LOG.debug(
-                        _("Found datastore clusters:") + "\n" + pp(list(self.ds_clusters.keys()))
+                        _("Found datastore clusters:") + "\n" + pp(list(ds_clusters.keys()))
                     )
         elif warn_if_empty:
             LOG.warning(_("No vSphere datastore clusters found."))
 
-        for dsc_name, dsc in self.ds_clusters.items():
-            self.ds_cluster_mapping[dsc_name] = dsc.tf_name
+        for dsc_name, dsc in ds_clusters.items():
+            ds_cluster_mapping[dsc_name] = dsc.tf_name
 
         if self.verbose > 2:
-            LOG.debug(_("Datastore cluster mappings:") + "\n" + pp(self.ds_cluster_mapping))
+            LOG.debug(_("Datastore cluster mappings:") + "\n" + pp(ds_cluster_mapping))
+
+        self.ds_clusters = ds_clusters.freeze()
+        self.ds_cluster_mapping = MappingProxyType(ds_cluster_mapping)
+        return ds_clusters
 
     # -------------------------------------------------------------------------
-    def _get_ds_clusters(
+    def _visit_ds_cluster(
         self,
-        child,
+        item,
+        ds_clusters,
+        datastores=None,
+        pods=None,
         vsphere_name=None,
-        dc_name=None,
-        depth=1,
+        no_local_ds=True,
         detailled=False,
     ):
 
-        if self.verbose > 3:
-            LOG.debug(_("Found a {} child.").format(child.__class__.__name__))
+        dsc = VsphereDsCluster.from_summary(
+            item.obj,
+            vsphere=vsphere_name,
+            dc_name=item.dc_name,
+            appname=self.appname,
+            verbose=self.verbose,
+            base_dir=self.base_dir,
+            detailled=detailled,
+        )
+        ds_clusters.append(dsc)
+        if pods is not None:
+            pods[item.obj] = dsc.name
 
-        if hasattr(child, "childEntity"):
-            if depth > self.max_search_depth:
-                return
-            for sub_child in child.childEntity:
-                self._get_ds_clusters(
-                    sub_child,
+        if datastores is None:
+            return WALK_PRUNE
+
+        # The members of a detailled datastore cluster are already retrieved
+        if detailled and dsc.datastores is not None:
+            for ds in dsc.datastores.values():
+                if no_local_ds and self.re_local_ds.match(ds.name):
+                    continue
+                datastores.append(ds)
+            return WALK_PRUNE
+
+        return WALK_CONTINUE
+
+    # -------------------------------------------------------------------------
+    def get_storages(
+        self,
+        vsphere_name=None,
+        no_local_ds=True,
+        search_in_dc=None,
+        warn_if_empty=True,
+        disconnect=False,
+        detailled=False,
+    ):
+        """
+        Get all datastore clusters and datastores from vSphere in one pass.
+
+        The datastore clusters are stored in self.ds_clusters, the datastores
+        (including the members of the datastore clusters) in self.datastores.
+        If detailled, the members of a datastore cluster are taken over from
+        the detailled datastore cluster object instead of retrieving them again.
+
+        @return: the found datastore clusters and datastores
+        @rtype: tuple of VsphereDsClusterDict and VsphereDatastoreDict
+        """
+        LOG.debug(_("Trying to get all datastore clusters and datastores from vSphere ..."))
+        datastores = VsphereDatastoreDict(ledger=self.ledger)
+        ds_clusters = VsphereDsClusterDict()
+        ds_mapping = {}
+        ds_cluster_mapping = {}
+        pods = {}
+
+        if vsphere_name is None:
+            vsphere_name = self.name
+
+        try:
+
+            self.ensure_connected()
+
+            walker = InventoryWalker(max_depth=self.max_search_depth)
+            walker.add_visitor(
+                vim.StoragePod,
+                functools.partial(
+                    self._visit_ds_cluster,
+                    ds_clusters=ds_clusters,
+                    datastores=datastores,
+                    pods=pods,
                     vsphere_name=vsphere_name,
-                    dc_name=dc_name,
-                    depth=depth + 1,
+                    no_local_ds=no_local_ds,
                     detailled=detailled,
+                ),
+            )
+            walker.add_visitor(
+                vim.Datastore,
+                functools.partial(
+                    self._visit_datastore,
+                    datastores=datastores,
+                    pods=pods,
+                    vsphere_name=vsphere_name,
+                    no_local_ds=no_local_ds,
+                    detailled=detailled,
+                ),
+            )
+            walker.run(
+                self._datacenter_roots(
+                    "datastoreFolder",
+                    search_in_dc=search_in_dc,
+                    msg=_("Get all datastore clusters and datastores in DC {!r} ..."),
                 )
-
-        if isinstance(child, vim.StoragePod):
-            ds = VsphereDsCluster.from_summary(
-                child,
-                vsphere=vsphere_name,
-                dc_name=dc_name,
-                appname=self.appname,
-                verbose=self.verbose,
-                base_dir=self.base_dir,
-                detailled=detailled,
             )
-            self.ds_clusters.append(ds)
 
-        return
+        finally:
+            if disconnect:
+                self.disconnect()
+
+        if self.verbose > 1:
+            LOG.debug(_("Found datastore clusters:") + "\n" + pp(list(ds_clusters.keys())))
+            LOG.debug(_("Found datastores:") + "\n" + pp(list(datastores.keys())))
+
+        for dsc_name, dsc in ds_clusters.items():
+            ds_cluster_mapping[dsc_name] = dsc.tf_name
+        for ds_name, ds in datastores.items():
+            ds_mapping[ds_name] = ds.tf_name
+
+        self.ds_clusters = ds_clusters.freeze()
+        self.datastores = datastores.freeze()
+        self.ds_cluster_mapping = MappingProxyType(ds_cluster_mapping)
+        self.ds_mapping = MappingProxyType(ds_mapping)
+
+        if not datastores and warn_if_empty:
+            raise VSphereNoDatastoresFoundError()
+
+        return (ds_clusters, datastores)
 
     # -------------------------------------------------------------------------
     def get_ds_cluster(
@@ -649,8 +1060,7 @@ class VsphereConnection(BaseVsphereHandler):
         LOG.debug(msg)
 
         try:
-            if not self.service_instance:
-                self.connect()
+            self.ensure_connected()
 
             if not self.datacenters.keys():
                 self.get_datacenters()
@@ -701,127 +1111,144 @@ class VsphereConnection(BaseVsphereHandler):
 
     # -------------------------------------------------------------------------
     def get_networks(self, vsphere_name=None, disconnect=False):
-        """Get all networks from vSphere as VsphereNetwork objects."""
-        LOG.debug(_("Trying to get all networks from vSphere ..."))
-        self.dv_portgroups = VsphereNetworkDict()
-        self.networks = VsphereNetworkDict()
-        self.network_mapping = {}
+        """
+        Get all networks from vSphere as VsphereNetwork objects.
 
+        Identical concurrent calls are coalesced into one retrieval, whose result
+        is shared by all callers and must not be changed by them.
+
+        @return: the found virtual networks, which are also set as self.networks,
+                 the Distributed Virtual Port Groups are set as self.dv_portgroups.
+        @rtype: VsphereNetworkDict
+        """
         if vsphere_name is None:
             vsphere_name = self.name
 
         try:
-
-            if not self.service_instance:
-                self.connect()
-
-            self.get_datacenters()
-            content = self.service_instance.RetrieveContent()
-            for dc_name in self.datacenters.keys():
-                if self.verbose > 0:
-                    LOG.debug(_("Get all networking objects in DC {!r} ...").format(dc_name))
-                dc = self.get_obj(content, [vim.Datacenter], dc_name)
-                for child in dc.networkFolder.childEntity:
-                    self._get_networks(child, vsphere_name=vsphere_name, dc_name=dc_name)
-
+            (networks, dv_portgroups, network_mapping, dvs) = self.single_flight.do(
+                ("networks", vsphere_name), self._retrieve_networks, vsphere_name=vsphere_name
+            )
         finally:
             if disconnect:
                 self.disconnect()
 
-        if self.dv_portgroups:
+        self.networks = networks
+        self.dv_portgroups = dv_portgroups
+        self.network_mapping = network_mapping
+        all_dvs = dict(self.dvs)
+        all_dvs.update(dvs)
+        self.dvs = MappingProxyType(all_dvs)
+
+        return networks
+
+    # -------------------------------------------------------------------------
+    def _retrieve_networks(self, vsphere_name):
+
+        LOG.debug(_("Trying to get all networks from vSphere ..."))
+        found = {
+            "networks": VsphereNetworkDict(),
+            "dv_portgroups": VsphereNetworkDict(),
+            "dvs": {},
+        }
+        dv_portgroups = found["dv_portgroups"]
+        networks = found["networks"]
+        network_mapping = {}
+
+        self.ensure_connected()
+
+        walker = InventoryWalker(max_depth=self.max_search_depth)
+        walker.add_visitor(
+            (vim.DistributedVirtualSwitch, vim.Network),
+            functools.partial(self._visit_network, found=found, vsphere_name=vsphere_name),
+        )
+        walker.run(
+            self._datacenter_roots(
+                "networkFolder", msg=_("Get all networking objects in DC {!r} ..."), min_verbose=1
+            )
+        )
+
+        if dv_portgroups:
             msg = ngettext(
                 "Found one Distributed Virtual Port Group.",
                 "Found {n} Distributed Virtual Port Groups.",
-                len(self.dv_portgroups),
+                len(dv_portgroups),
             )
-            LOG.debug(msg.format(n=len(self.dv_portgroups)))
+            LOG.debug(msg.format(n=len(dv_portgroups)))
             if self.verbose > 2:
                 msg = _("Found Distributed Virtual Port Groups:") + "\n"
                 if self.verbose > 3:
-                    msg += pp(self.dv_portgroups.as_list())
+                    msg += pp(dv_portgroups.as_list())
                 else:
-                    msg += pp(list(self.dv_portgroups.keys()))
+                    msg += pp(list(dv_portgroups.keys()))
                 LOG.debug(msg)
         else:
             if self.verbose:
                 LOG.info(_("No Distributed Virtual Port Groups found."))
 
-        if self.networks:
+        if networks:
             msg = ngettext(
-                "Found one Virtual Network.", "Found {n} Virtual Networks.", len(self.networks)
+                "Found one Virtual Network.", "Found {n} Virtual Networks.", len(networks)
             )
-            LOG.debug(msg.format(n=len(self.networks)))
+            LOG.debug(msg.format(n=len(networks)))
             if self.verbose > 2:
                 if self.verbose > 3:
-                    LOG.debug(_("Found Virtual Networks:") + "\n" + pp(self.networks.as_list()))
+                    LOG.debug(_("Found Virtual Networks:") + "\n" + pp(networks.as_list()))
                 else:
-                    LOG.debug(_("Found Virtual Networks:") + "\n" + pp(list(self.networks.keys())))
+                    LOG.debug(_("Found Virtual Networks:") + "\n" + pp(list(networks.keys())))
         else:
             LOG.info(_("No Virtual Networks found."))
 
-        for net_name, dvpg in self.dv_portgroups.items():
-            self.network_mapping[net_name] = dvpg.tf_name
-        for net_name, net in self.networks.items():
-            if net_name not in self.network_mapping:
-                self.network_mapping[net_name] = net.tf_name
+        for net_name, dvpg in dv_portgroups.items():
+            network_mapping[net_name] = dvpg.tf_name
+        for net_name, net in networks.items():
+            if net_name not in network_mapping:
+                network_mapping[net_name] = net.tf_name
 
         if self.verbose > 2:
-            LOG.debug(_("Network mappings:") + "\n" + pp(self.network_mapping))
+            LOG.debug(_("Network mappings:") + "\n" + pp(network_mapping))
 
-    # -------------------------------------------------------------------------
-    def _get_networks(self, child, vsphere_name=None, dc_name=None, depth=1):
+        return (
+            networks.freeze(),
+            dv_portgroups.freeze(),
+            MappingProxyType(network_mapping),
+            MappingProxyType(found["dvs"]),
+        )
 
-        if self.verbose > 3:
-            LOG.debug(_("Found a {} child.").format(child.__class__.__name__))
+    # -------------------------------------------------------------------------
+    def _visit_network(self, item, found, vsphere_name=None):
 
-        if hasattr(child, "childEntity"):
-            if depth > self.max_search_depth:
-                return
-            for sub_child in child.childEntity:
-                self._get_networks(
-                    sub_child, vsphere_name=vsphere_name, dc_name=dc_name, depth=depth + 1
-                )
+        child = item.obj
+        params = {
+            "vsphere": vsphere_name,
+            "dc_name": item.dc_name,
+            "appname": self.appname,
+            "verbose": self.verbose,
+            "base_dir": self.base_dir,
+        }
 
         if isinstance(child, vim.DistributedVirtualSwitch):
-            dvs = VsphereDVS.from_summary(
-                child,
-                vsphere=vsphere_name,
-                dc_name=dc_name,
-                appname=self.appname,
-                verbose=self.verbose,
-                base_dir=self.base_dir,
-            )
-            uuid = dvs.uuid
-            self.dvs[uuid] = dvs
-        elif isinstance(child, vim.Network):
-            if isinstance(child, vim.dvs.DistributedVirtualPortgroup):
-                portgroup = VsphereDvPortGroup.from_summary(
-                    child,
-                    vsphere=vsphere_name,
-                    dc_name=dc_name,
-                    appname=self.appname,
-                    verbose=self.verbose,
-                    base_dir=self.base_dir,
-                )
-                self.dv_portgroups.append(portgroup)
-            elif isinstance(child, vim.OpaqueNetwork):
-                LOG.debug("Evaluating Opaque Network later ...")
-            else:
-                network = VsphereNetwork.from_summary(
-                    child,
-                    vsphere=vsphere_name,
-                    dc_name=dc_name,
-                    appname=self.appname,
-                    verbose=self.verbose,
-                    base_dir=self.base_dir,
-                )
-                self.networks.append(network)
-
-        return
+            dvs = VsphereDVS.from_summary(child, **params)
+            found["dvs"][dvs.uuid] = dvs
+        elif isinstance(child, vim.dvs.DistributedVirtualPortgroup):
+            portgroup = VsphereDvPortGroup.from_summary(child, **params)
+            found["dv_portgroups"].append(portgroup)
+        elif isinstance(child, vim.OpaqueNetwork):
+            LOG.debug("Evaluating Opaque Network later ...")
+        else:
+            network = VsphereNetwork.from_summary(child, **params)
+            found["networks"].append(network)
 
     # -------------------------------------------------------------------------
     def get_hosts(self, re_name=None, vsphere_name=None, disconnect=False):
-        """Get all physical hosts from vSphere as VsphereHost objects."""
+        """
+        Get all physical hosts from vSphere as VsphereHost objects.
+
+        The computing clusters of the hosts are set as self.clusters.
+
+        @return: a read-only mapping of the host names to the found hosts,
+                 which is also set as self.hosts.
+        @rtype: MappingProxyType
+        """
         if re_name is not None:
             if not hasattr(re_name, "match"):
                 msg = _("Parameter {p!r} => {r!r} seems not to be a regex object.").format(
@@ -839,133 +1266,151 @@ class VsphereConnection(BaseVsphereHandler):
         if vsphere_name is None:
             vsphere_name = self.name
 
-        self.clusters = []
-        self.hosts = {}
+        clusters = []
+        found = []
+        hosts = {}
 
         try:
 
-            if not self.service_instance:
-                self.connect()
+            self.ensure_connected()
+
+            # First phase: only the names of all hosts for filtering them
+            host_names = None
+            if re_name is not None:
+                host_names = {}
+                for (moref, props) in self.retrieve_properties(((vim.HostSystem, ["name"]),)):
+                    host_names[moref] = props.get("name")
+
+            walker = InventoryWalker()
+            walker.add_visitor(
+                vim.ComputeResource,
+                functools.partial(
+                    self._visit_host_cluster,
+                    found=found,
+                    clusters=clusters,
+                    re_name=re_name,
+                    vsphere_name=vsphere_name,
+                    host_names=host_names,
+                ),
+            )
+            walker.run(
+                self._datacenter_roots(
+                    "hostFolder", msg=_("Get all computing clusters in DC {!r} ..."), min_verbose=1
+                )
+            )
 
-            self.get_datacenters()
-            content = self.service_instance.RetrieveContent()
-            for dc_name in self.datacenters.keys():
-                if self.verbose > 0:
-                    LOG.debug(_("Get all computing clusters in DC {!r} ...").format(dc_name))
-                dc = self.get_obj(content, [vim.Datacenter], dc_name)
-                for child in dc.hostFolder.childEntity:
-                    self._get_hosts(
-                        child, re_name=re_name, vsphere_name=vsphere_name, dc_name=dc_name
-                    )
+            # Second phase: all properties of the found hosts
+            self._retrieve_hosts(found, hosts, vsphere_name=vsphere_name)
 
         finally:
             if disconnect:
                 self.disconnect()
 
+        self.clusters = tuple(clusters)
+        self.hosts = MappingProxyType(hosts)
+
         if self.verbose > 2:
             out = []
-            for host_name in self.hosts.keys():
-                host = self.hosts[host_name]
+            for host_name in hosts.keys():
+                host = hosts[host_name]
                 out.append(host.as_dict())
             LOG.debug(_("Found hosts:") + "\n" + pp(out))
         elif self.verbose:
             out = []
-            for host_name in self.hosts.keys():
+            for host_name in hosts.keys():
                 out.append(host_name)
             LOG.debug(_("Found hosts:") + "\n" + pp(out))
 
-    # -------------------------------------------------------------------------
-    def _get_hosts(
-        self, child, depth=1, re_name=None, vsphere_name=None, cluster_name=None, dc_name=None
-    ):
-
-        if dc_name is None:
-            dc_name = self.dc
+        return self.hosts
 
-        if self.verbose > 1:
-            LOG.debug(
-                _("Checking {o}-object in dc {dc!r}, cluster {c!r} ...").format(
-                    o=child.__class__.__name__, dc=dc_name, c=cluster_name
-                )
-            )
+    # -------------------------------------------------------------------------
+    def _retrieve_hosts(self, found, hosts, vsphere_name=None):
 
-        if isinstance(child, vim.Folder):
-            for item in child.childEntity:
-                self._get_hosts(
-                    item,
-                    depth=(depth + 1),
-                    re_name=re_name,
-                    vsphere_name=vsphere_name,
-                    dc_name=dc_name,
-                )
+        if not found:
             return
-
-        if isinstance(child, (vim.ClusterComputeResource, vim.ComputeResource)):
-            cluster = VsphereCluster.from_summary(
-                child,
+        details = dict(
+            self.retrieve_properties(
+                ((vim.HostSystem, HOST_PROPERTIES),), objects=[host[0] for host in found]
+            )
+        )
+        for (moref, dc_name, cluster_name) in found:
+            props = details.get(moref)
+            if props is None:
+                continue
+            host = VsphereHost.from_properties(
+                props,
                 vsphere=vsphere_name,
                 dc_name=dc_name,
+                cluster_name=cluster_name,
                 appname=self.appname,
                 verbose=self.verbose,
                 base_dir=self.base_dir,
             )
-            cluster_name = cluster.name
-            if self.verbose:
-                obj_name = _("Found standalone host")
-                if isinstance(child, vim.ClusterComputeResource):
-                    obj_name = _("Found cluster")
-                host_label = ngettext("host", "hosts", cluster.hosts_total)
-                cpus_label = ngettext("CPU", "CPUs", cluster.cpu_cores)
-                thr_label = ngettext("thread", "threads", cluster.cpu_threads)
-                nw_label = ngettext("network", "networks", len(cluster.networks))
-                ds_label = ngettext("datastore", "datastores", len(cluster.datastores))
-                LOG.debug(
-                    _(
-                        "{on} {cl!r} in dc {dc!r}, {h} {h_l}, {cpu} {cpu_l}, {thr} {t_l}, "
-                        "{mem:0.1f} GiB Memory, {net} {nw_l} and {ds} {ds_l}."
-                    ).format(
-                        on=obj_name,
-                        cl=cluster.name,
-                        dc=dc_name,
-                        h=cluster.hosts_total,
-                        h_l=host_label,
-                        cpu=cluster.cpu_cores,
-                        cpu_l=cpus_label,
-                        thr=cluster.cpu_threads,
-                        t_l=thr_label,
-                        mem=cluster.mem_gb_total,
-                        net=len(cluster.networks),
-                        nw_l=nw_label,
-                        ds=len(cluster.datastores),
-                        ds_l=ds_label,
-                    )
-                )
+            hosts[host.name] = host
 
-            self.clusters.append(cluster)
+    # -------------------------------------------------------------------------
+    def _visit_host_cluster(
+        self, item, found, clusters, re_name=None, vsphere_name=None, host_names=None
+    ):
 
-            for host_def in child.host:
+        child = item.obj
+        dc_name = item.dc_name
+        cluster = VsphereCluster.from_summary(
+            child,
+            vsphere=vsphere_name,
+            dc_name=dc_name,
+            appname=self.appname,
+            verbose=self.verbose,
+            base_dir=self.base_dir,
+        )
+        cluster_name = cluster.name
+        if self.verbose:
+            obj_name = _("Found standalone host")
+            if isinstance(child, vim.ClusterComputeResource):
+                obj_name = _("Found cluster")
+            host_label = ngettext("host", "hosts", cluster.hosts_total)
+            cpus_label = ngettext("CPU", "CPUs", cluster.cpu_cores)
+            thr_label = ngettext("thread", "threads", cluster.cpu_threads)
+            nw_label = ngettext("network", "networks", len(cluster.networks))
+            ds_label = ngettext("datastore", "datastores", len(cluster.datastores))
+            LOG.debug(
+                _(
+                    "{on} {cl!r} in dc {dc!r}, {h} {h_l}, {cpu} {cpu_l}, {thr} {t_l}, "
+                    "{mem:0.1f} GiB Memory, {net} {nw_l} and {ds} {ds_l}."
+                ).format(
+                    on=obj_name,
+                    cl=cluster.name,
+                    dc=dc_name,
+                    h=cluster.hosts_total,
+                    h_l=host_label,
+                    cpu=cluster.cpu_cores,
+                    cpu_l=cpus_label,
+                    thr=cluster.cpu_threads,
+                    t_l=thr_label,
+                    mem=cluster.mem_gb_total,
+                    net=len(cluster.networks),
+                    nw_l=nw_label,
+                    ds=len(cluster.datastores),
+                    ds_l=ds_label,
+                )
+            )
 
-                hostname = host_def.summary.config.name
+        clusters.append(cluster)
 
-                if re_name is not None:
-                    if not re_name.search(hostname):
-                        continue
+        for host_def in child.host:
 
+            moref = MoRef(host_def._wsdlName, host_def._moId)
+            if re_name is not None:
+                hostname = host_names.get(moref)
+                if hostname is None:
+                    hostname = host_def.name
+                if not re_name.search(hostname):
+                    continue
                 LOG.debug(
                     _("Found host {h!r} in cluster {c!r}.").format(h=hostname, c=cluster_name)
                 )
-                host = VsphereHost.from_summary(
-                    host_def,
-                    vsphere=vsphere_name,
-                    dc_name=dc_name,
-                    cluster_name=cluster_name,
-                    appname=self.appname,
-                    verbose=self.verbose,
-                    base_dir=self.base_dir,
-                )
-                self.hosts[host.name] = host
 
-        return
+            found.append((moref, dc_name, cluster_name))
 
     # -------------------------------------------------------------------------
     def get_vm(
@@ -1024,8 +1469,7 @@ class VsphereConnection(BaseVsphereHandler):
         )
 
         try:
-            if not self.service_instance:
-                self.connect()
+            self.ensure_connected()
 
             if not self.datacenters.keys():
                 self.get_datacenters()
@@ -1075,22 +1519,109 @@ class VsphereConnection(BaseVsphereHandler):
                     base_dir=self.base_dir,
                 )
 
-                return vm
+                return vm
+
+            else:
+                msg = _("vSphere VM {!r} not found.").format(vm_name)
+                if no_error:
+                    LOG.debug(msg)
+                else:
+                    LOG.error(msg)
+                return None
+
+        finally:
+            if disconnect:
+                self.disconnect()
+
+    # -------------------------------------------------------------------------
+    def get_vms_by_names(self, names, vsphere_name=None, disconnect=False):
+        """
+        Get many virtual machines from vSphere as VsphereVm objects by their names.
+
+        The names of all VMs are retrieved in one bulk retrieval and then all
+        properties only of the requested VMs in a second one, instead of scanning
+        all VMs once for every name. If there are several VMs with the same name,
+        the first one found is taken.
+
+        @param names: the names of the requested VMs
+        @type names: iterable of str
+
+        @return: the found VM for every requested name, or None, if it was not found
+        @rtype: dict
+        """
+        if vsphere_name is None:
+            vsphere_name = self.name
+
+        vms = dict.fromkeys(names)
+        if not vms:
+            return vms
+
+        LOG.debug(
+            _("Searching for {c} VMs in vSphere {v!r} ...").format(c=len(vms), v=vsphere_name)
+        )
+
+        try:
+            name_table = self.get_name_table()
+
+            found = {}
+            for (moref, props) in self.retrieve_properties(
+                ((vim.VirtualMachine, ["name", "parent"]),)
+            ):
+                vm_name = props.get("name")
+                if vm_name in vms and vm_name not in found:
+                    found[vm_name] = (moref, props.get("parent"))
+
+            if found:
+                details = dict(
+                    self.retrieve_properties(
+                        ((vim.VirtualMachine, VM_PROPERTIES),),
+                        objects=[moref for (moref, parent) in found.values()],
+                    )
+                )
+
+                property_sets = []
+                for (moref, parent) in found.values():
+                    props = details.get(moref)
+                    if props is None:
+                        continue
+                    location = name_table.folder_location(parent)
+                    if location is None:
+                        # e.g. a VM in a vApp, which has no parent folder
+                        location = (name_table.datacenter_of(props.get("runtime.host")), "/")
+                    (dc_name, path) = location
+                    property_sets.append(
+                        VmPropertySet(
+                            props=props,
+                            path=path,
+                            vsphere=vsphere_name,
+                            dc_name=dc_name,
+                            cluster_name=name_table.cluster_name_of(props.get("resourcePool")),
+                            host=name_table.name_of(props.get("runtime.host")),
+                        )
+                    )
 
-            else:
-                msg = _("vSphere VM {!r} not found.").format(vm_name)
-                if no_error:
-                    LOG.debug(msg)
-                else:
-                    LOG.error(msg)
-                return None
+                for vm in self.vm_converter.convert(property_sets):
+                    vms[vm.name] = vm
+
+            if self.verbose > 1:
+                not_found = [name for name in vms if vms[name] is None]
+                LOG.debug(
+                    _("Found {f} of {c} VMs in vSphere {v!r}, not found: {n}.").format(
+                        f=len(vms) - len(not_found),
+                        c=len(vms),
+                        v=vsphere_name,
+                        n=format_list(not_found, do_repr=True) if not_found else "~",
+                    )
+                )
+
+            return vms
 
         finally:
             if disconnect:
                 self.disconnect()
 
     # -------------------------------------------------------------------------
-    def _dict_from_vim_obj(self, vm, cur_path):
+    def _dict_from_vim_obj(self, vm, cur_path, name_table=None):
 
         if not isinstance(vm, vim.VirtualMachine):
             msg = _("Parameter {t!r} must be a {e}, {v!r} was given.").format(
@@ -1100,13 +1631,20 @@ class VsphereConnection(BaseVsphereHandler):
 
         summary = vm.summary
         vm_config = summary.config
+        runtime = vm.runtime
+        guest = vm.guest
+        config = vm.config
 
         vm_info = {}
         vm_info["name"] = vm_config.name
         vm_info["tf_name"] = "vm_" + RE_TF_NAME.sub("_", vm_config.name.lower())
         vm_info["cluster"] = None
-        if vm.resourcePool:
-            vm_info["cluster"] = vm.resourcePool.owner.name
+        pool = vm.resourcePool
+        if pool:
+            if name_table is not None:
+                vm_info["cluster"] = name_table.cluster_name_of(pool)
+            if vm_info["cluster"] is None:
+                vm_info["cluster"] = pool.owner.name
         vm_info["path"] = cur_path
         vm_info["memorySizeMB"] = vm_config.memorySizeMB
         vm_info["numCpu"] = vm_config.numCpu
@@ -1116,35 +1654,38 @@ class VsphereConnection(BaseVsphereHandler):
         vm_info["guestFullName"] = vm_config.guestFullName
         vm_info["guestId"] = vm_config.guestId
         vm_info["vm_tools"] = {}
-        if vm.guest:
+        if guest:
             vm_info["vm_tools"]["install_type"] = None
-            if hasattr(vm.guest, "toolsInstallType"):
-                vm_info["vm_tools"]["install_type"] = vm.guest.toolsInstallType
+            if hasattr(guest, "toolsInstallType"):
+                vm_info["vm_tools"]["install_type"] = guest.toolsInstallType
             vm_info["vm_tools"]["state"] = None
-            if hasattr(vm.guest, "toolsRunningStatus"):
-                vm_info["vm_tools"]["state"] = vm.guest.toolsRunningStatus
+            if hasattr(guest, "toolsRunningStatus"):
+                vm_info["vm_tools"]["state"] = guest.toolsRunningStatus
             else:
-                vm_info["vm_tools"]["state"] = vm.guest.toolsStatus
-            vm_info["vm_tools"]["version"] = vm.guest.toolsVersion
+                vm_info["vm_tools"]["state"] = guest.toolsStatus
+            vm_info["vm_tools"]["version"] = guest.toolsVersion
             vm_info["vm_tools"]["version_state"] = None
-            if hasattr(vm.guest, "toolsVersionStatus2"):
-                vm_info["vm_tools"]["version_state"] = vm.guest.toolsVersionStatus2
+            if hasattr(guest, "toolsVersionStatus2"):
+                vm_info["vm_tools"]["version_state"] = guest.toolsVersionStatus2
             else:
-                vm_info["vm_tools"]["version_state"] = vm.guest.toolsVersionStatus
+                vm_info["vm_tools"]["version_state"] = guest.toolsVersionStatus
         vm_info["host"] = None
-        if vm.runtime.host:
-            vm_info["host"] = vm.runtime.host.name
+        if runtime.host:
+            if name_table is not None:
+                vm_info["host"] = name_table.name_of(runtime.host)
+            if vm_info["host"] is None:
+                vm_info["host"] = runtime.host.name
         vm_info["instanceUuid"] = vm_config.instanceUuid
-        vm_info["power_state"] = vm.runtime.powerState
+        vm_info["power_state"] = runtime.powerState
         if vm_config.instanceUuid:
             vm_info["instanceUuid"] = uuid.UUID(vm_config.instanceUuid)
         vm_info["uuid"] = vm_config.uuid
         if vm_config.uuid:
             vm_info["uuid"] = uuid.UUID(vm_config.uuid)
         vm_info["vmPathName"] = vm_config.vmPathName
-        vm_info["cfg_version"] = vm.config.version
+        vm_info["cfg_version"] = config.version
         vm_info["disks"] = {}
-        for device in vm.config.hardware.device:
+        for device in config.hardware.device:
             if not isinstance(device, vim.vm.device.VirtualDisk):
                 continue
             unit_nr = device.unitNumber
@@ -1161,7 +1702,7 @@ class VsphereConnection(BaseVsphereHandler):
                 disk["uuid"] = uuid.UUID(device.backing.uuid)
             vm_info["disks"][unit_nr] = disk
         vm_info["interfaces"] = {}
-        for device in vm.config.hardware.device:
+        for device in config.hardware.device:
             if not isinstance(device, vim.vm.device.VirtualEthernetCard):
                 continue
             unit_nr = device.unitNumber
@@ -1229,44 +1770,44 @@ class VsphereConnection(BaseVsphereHandler):
             )
 
         try:
-            if not self.service_instance:
-                self.connect()
-
-            if not self.datacenters.keys():
-                self.get_datacenters()
-            content = self.service_instance.RetrieveContent()
-
-            for dc_name in self.datacenters.keys():
-                if self.verbose > 0:
-                    LOG.debug(
-                        _("Searching for virtual machines in DC {} ...").format(
-                            self.colored(dc_name, "CYAN")
-                        )
-                    )
-                dc = self.get_obj(content, [vim.Datacenter], dc_name)
+            self.ensure_connected()
 
-                for child in dc.vmFolder.childEntity:
-                    path = "/" + child.name
-                    if self.verbose == 1:
-                        LOG.debug(
-                            _("Searching in top path {} ...").format(self.colored(path, "CYAN"))
-                        )
-                    vms = self._get_vm_list(
-                        child,
-                        re_name,
-                        parent_path="/",
+            if self.fast_parse:
+                self._get_vm_list_fast(
+                    vm_list,
+                    re_name,
+                    vsphere_name=vsphere_name,
+                    is_template=is_template,
+                    name_only=name_only,
+                    stop_at_found=stop_at_found,
+                )
+            else:
+                name_table = None
+                if not name_only:
+                    name_table = self.get_name_table(lazy=True)
+                walker = InventoryWalker(max_depth=self.max_search_depth, with_paths=True)
+                walker.add_visitor(
+                    vim.VirtualMachine,
+                    functools.partial(
+                        self._visit_vm,
+                        vm_list=vm_list,
+                        re_name=re_name,
                         vsphere_name=vsphere_name,
-                        dc_name=dc_name,
                         is_template=is_template,
                         name_only=name_only,
                         stop_at_found=stop_at_found,
+                        name_table=name_table,
+                        vm_names=self._get_vm_names(is_template),
+                    ),
+                )
+                walker.run(
+                    self._datacenter_roots(
+                        "vmFolder",
+                        cached=True,
+                        msg=_("Searching for virtual machines in DC {} ..."),
+                        min_verbose=1,
                     )
-                    if vms:
-                        vm_list += vms
-                        if stop_at_found:
-                            break
-                if len(vm_list) and stop_at_found:
-                    break
+                )
         finally:
             if disconnect:
                 self.disconnect()
@@ -1288,120 +1829,190 @@ class VsphereConnection(BaseVsphereHandler):
         return vm_list
 
     # -------------------------------------------------------------------------
-    def _get_vm_list(  # noqa: C901
+    def _get_vm_list_fast(
         self,
-        entry,
+        vm_list,
         re_name,
-        parent_path,
         vsphere_name=None,
-        dc_name=None,
         is_template=None,
-        depth=1,
         name_only=False,
         stop_at_found=False,
+        name_table=None,
     ):
 
-        vm_list = []
-        if not name_only:
-            vm_list = VsphereVmList(
-                appname=self.appname,
-                verbose=self.verbose,
-                base_dir=self.base_dir,
-                initialized=True,
-            )
-
-        if isinstance(entry, vim.VirtualMachine):
-
-            summary = entry.summary
-            vm_config = summary.config
-            vm_name = vm_config.name
-
-            add_to_list = True
+        if name_table is None:
+            name_table = self.get_name_table()
+
+        # First phase: only the names of all VMs for filtering them
+        vm_paths = ["name", "parent", "runtime.host"]
+        if is_template is not None:
+            vm_paths.append("config.template")
+
+        found = []
+        for (moref, props) in self.retrieve_properties(((vim.VirtualMachine, vm_paths),)):
+            vm_name = props.get("name")
+            parent = props.get("parent")
+            location = name_table.folder_location(parent, self.max_search_depth)
+            if location is None:
+                if parent is not None:
+                    LOG.debug(
+                        _(
+                            "Skipping VM {vm!r} in folder {f}, which is unknown or deeper "
+                            "than {d} levels."
+                        ).format(vm=vm_name, f=parent, d=self.max_search_depth)
+                    )
+                    continue
+                # e.g. a VM in a vApp, which has no parent folder
+                location = (name_table.datacenter_of(props.get("runtime.host")), "/")
+            (dc_name, path) = location
 
-            if self.verbose > 2:
-                LOG.debug(_("Checking VM {} ...").format(self.colored(vm_name, "CYAN")))
             if is_template is not None:
-                if self.verbose > 3:
-                    msg = _("Checking VM {!r} for being a template ...")
-                    if not is_template:
-                        msg = _("Checking VM {!r} for being not a template ...")
-                    LOG.debug(msg.format(vm_name))
-                if is_template and not vm_config.template:
-                    add_to_list = False
-                if not is_template and vm_config.template:
-                    add_to_list = False
-
-            if add_to_list:
-                if self.verbose > 3:
-                    LOG.debug(_("Checking VM {!r} for pattern.").format(vm_name))
-                if not re_name.search(vm_name):
-                    add_to_list = False
+                if bool(props.get("config.template")) != bool(is_template):
+                    continue
+            if not re_name.search(vm_name):
+                continue
 
-            if add_to_list:
-                if self.verbose > 1:
-                    vsn = "~"
-                    if vsphere_name:
-                        vsn = vsphere_name
-                    dcn = "~"
-                    if dc_name:
-                        dcn = dc_name
-                    LOG.debug(
-                        _("Found VM {vm} in vSphere {vs}, DC {dc}, path {p}.").format(
-                            vm=self.colored(vm_name, "CYAN"),
-                            vs=self.colored(vsn, "CYAN"),
-                            dc=self.colored(dcn, "CYAN"),
-                            p=self.colored(parent_path, "CYAN"),
-                        )
+            if self.verbose > 1:
+                LOG.debug(
+                    _("Found VM {vm} in vSphere {vs}, DC {dc}, path {p}.").format(
+                        vm=self.colored(vm_name, "CYAN"),
+                        vs=self.colored(vsphere_name or "~", "CYAN"),
+                        dc=self.colored(dc_name or "~", "CYAN"),
+                        p=self.colored(path, "CYAN"),
                     )
+                )
 
-                if name_only:
-                    vm_list.append((vm_name, dc_name, parent_path))
-                else:
-                    if self.verbose > 1:
-                        LOG.debug(f"Get VM {vm_name!r} as an object.")
-
-                    vm = VsphereVm.from_summary(
-                        entry,
-                        parent_path,
-                        vsphere=vsphere_name,
-                        dc_name=dc_name,
-                        appname=self.appname,
-                        verbose=self.verbose,
-                        base_dir=self.base_dir,
-                    )
-                    vm_list.append(vm)
+            if name_only:
+                vm_list.append((vm_name, dc_name, path))
+            else:
+                found.append((moref, dc_name, path))
 
-                if stop_at_found:
-                    return vm_list
+            if stop_at_found:
+                break
 
-        if hasattr(entry, "childEntity"):
-            if depth > self.max_search_depth:
-                return vm_list
+        if not found:
+            return vm_list
 
-            if parent_path != "/":
-                cur_path = parent_path + "/" + entry.name
-            else:
-                cur_path = "/" + entry.name
-            if self.verbose > 1:
-                LOG.debug(_("Searching in path {} ...").format(self.colored(cur_path, "CYAN")))
-            for child in entry.childEntity:
-                vms = self._get_vm_list(
-                    child,
-                    re_name,
-                    parent_path=cur_path,
-                    vsphere_name=vsphere_name,
+        # Second phase: all properties of the found VMs
+        details = dict(
+            self.retrieve_properties(
+                ((vim.VirtualMachine, VM_PROPERTIES),), objects=[vm[0] for vm in found]
+            )
+        )
+
+        property_sets = []
+        for (moref, dc_name, path) in found:
+            props = details.get(moref)
+            if props is None:
+                continue
+            property_sets.append(
+                VmPropertySet(
+                    props=props,
+                    path=path,
+                    vsphere=vsphere_name,
                     dc_name=dc_name,
-                    is_template=is_template,
-                    depth=depth + 1,
-                    name_only=name_only,
-                    stop_at_found=stop_at_found,
+                    cluster_name=name_table.cluster_name_of(props.get("resourcePool")),
+                    host=name_table.name_of(props.get("runtime.host")),
                 )
+            )
 
-                if len(vms):
-                    vm_list += vms
+        if property_sets:
+            self.vm_converter.convert(property_sets, vm_list)
 
         return vm_list
 
+    # -------------------------------------------------------------------------
+    def _get_vm_names(self, is_template=None):
+
+        vm_paths = ["name"]
+        if is_template is not None:
+            vm_paths.append("config.template")
+
+        vm_names = {}
+        for (moref, props) in self.retrieve_properties(((vim.VirtualMachine, vm_paths),)):
+            vm_names[moref] = (props.get("name"), props.get("config.template"))
+        return vm_names
+
+    # -------------------------------------------------------------------------
+    def _visit_vm(
+        self,
+        item,
+        vm_list,
+        re_name,
+        vsphere_name=None,
+        is_template=None,
+        name_only=False,
+        as_obj=True,
+        as_vmw_obj=False,
+        relative_path=False,
+        stop_at_found=False,
+        name_table=None,
+        vm_names=None,
+    ):
+
+        names = None
+        if vm_names is not None:
+            names = vm_names.get(MoRef(item.obj._wsdlName, item.obj._moId))
+        if names is None:
+            vm_config = item.obj.summary.config
+            names = (vm_config.name, vm_config.template)
+        (vm_name, template) = names
+        dc_name = item.dc_name
+        path = item.path
+        if relative_path:
+            path = path.lstrip("/")
+
+        if self.verbose > 2:
+            LOG.debug(_("Checking VM {} ...").format(self.colored(vm_name, "CYAN")))
+        if is_template is not None:
+            if self.verbose > 3:
+                msg = _("Checking VM {!r} for being a template ...")
+                if not is_template:
+                    msg = _("Checking VM {!r} for being not a template ...")
+                LOG.debug(msg.format(vm_name))
+            if bool(is_template) != bool(template):
+                return WALK_CONTINUE
+
+        if self.verbose > 3:
+            LOG.debug(_("Checking VM {!r} for pattern.").format(vm_name))
+        if not re_name.search(vm_name):
+            return WALK_CONTINUE
+
+        if self.verbose > 1:
+            LOG.debug(
+                _("Found VM {vm} in vSphere {vs}, DC {dc}, path {p}.").format(
+                    vm=self.colored(vm_name, "CYAN"),
+                    vs=self.colored(vsphere_name or "~", "CYAN"),
+                    dc=self.colored(dc_name or "~", "CYAN"),
+                    p=self.colored(path, "CYAN"),
+                )
+            )
+
+        if name_only:
+            vm_list.append((vm_name, dc_name, path))
+        elif as_obj:
+            if self.verbose > 1:
+                LOG.debug(f"Get VM {vm_name!r} as an object.")
+            vm = VsphereVm.from_summary(
+                item.obj,
+                path,
+                vsphere=vsphere_name,
+                dc_name=dc_name,
+                appname=self.appname,
+                verbose=self.verbose,
+                base_dir=self.base_dir,
+                name_table=name_table,
+            )
+            vm_list.append(vm)
+        elif as_vmw_obj:
+            vm_list.append(item.obj)
+        else:
+            vm_list.append(self._dict_from_vim_obj(item.obj, path, name_table=name_table))
+
+        if stop_at_found:
+            return WALK_STOP
+        return WALK_CONTINUE
+
     # -------------------------------------------------------------------------
     def get_vms(
         self,
@@ -1443,42 +2054,37 @@ class VsphereConnection(BaseVsphereHandler):
             )
 
         try:
-            if not self.service_instance:
-                self.connect()
-
-            if not self.datacenters.keys():
-                self.get_datacenters()
-            content = self.service_instance.RetrieveContent()
-            for dc_name in self.datacenters.keys():
-                if self.verbose > 0:
-                    LOG.debug(
-                        _("Searching for virtual machines in DC {} ...").format(
-                            self.colored(dc_name, "CYAN")
-                        )
-                    )
-                dc = self.get_obj(content, [vim.Datacenter], dc_name)
-
-                for child in dc.vmFolder.childEntity:
-                    path = child.name
-                    if self.verbose > 0:
-                        LOG.debug(_("Searching in path {} ...").format(self.colored(path, "CYAN")))
-                    vms = self._get_vms(
-                        child,
-                        re_name,
-                        vsphere_name=vsphere_name,
-                        dc_name=dc_name,
-                        is_template=is_template,
-                        as_vmw_obj=as_vmw_obj,
-                        as_obj=as_obj,
-                        name_only=name_only,
-                        stop_at_found=stop_at_found,
-                    )
-                    if vms:
-                        vm_list += vms
-                        if stop_at_found:
-                            break
-                if vms and stop_at_found:
-                    break
+            self.ensure_connected()
+
+            name_table = None
+            if not name_only and not as_vmw_obj:
+                name_table = self.get_name_table(lazy=True)
+            walker = InventoryWalker(max_depth=self.max_search_depth, with_paths=True)
+            walker.add_visitor(
+                vim.VirtualMachine,
+                functools.partial(
+                    self._visit_vm,
+                    vm_list=vm_list,
+                    re_name=re_name,
+                    vsphere_name=vsphere_name,
+                    is_template=is_template,
+                    name_only=name_only,
+                    as_obj=as_obj,
+                    as_vmw_obj=as_vmw_obj,
+                    relative_path=True,
+                    stop_at_found=stop_at_found,
+                    name_table=name_table,
+                    vm_names=self._get_vm_names(is_template),
+                ),
+            )
+            walker.run(
+                self._datacenter_roots(
+                    "vmFolder",
+                    cached=True,
+                    msg=_("Searching for virtual machines in DC {} ..."),
+                    min_verbose=1,
+                )
+            )
 
         finally:
             if disconnect:
@@ -1492,187 +2098,265 @@ class VsphereConnection(BaseVsphereHandler):
         return vm_list
 
     # -------------------------------------------------------------------------
-    def _get_vms(
-        self,
-        child,
-        re_name,
-        cur_path="",
-        vsphere_name=None,
-        dc_name=None,
-        is_template=None,
-        depth=1,
-        as_vmw_obj=False,
-        as_obj=False,
-        name_only=False,
-        stop_at_found=False,
-    ):
+    def get_inventory(self, kinds=None, vsphere_name=None, no_local_ds=True, disconnect=False):
+        """
+        Get the objects of all wanted kinds from vSphere in one pass.
 
-        vm_list = []
-        if as_obj:
-            vm_list = VsphereVmList(
+        The references between the objects are retrieved by one bulk retrieval of
+        properties, the objects itself are collected by one walk through the folders
+        of all datacenters. If fast_parse is set, the VMs are retrieved like in
+        get_vm_list() instead. The retrieved objects are also set as the attributes
+        self.clusters, self.hosts, self.datastores a.s.o.
+
+        @param kinds: the kinds of objects to retrieve, all of SNAPSHOT_KINDS if None
+        @type kinds: list of str or None
+        @param no_local_ds: don't retrieve local datastores of the hosts
+        @type no_local_ds: bool
+
+        @return: the snapshot of the inventory with resolved cross references
+        @rtype: VsphereInventorySnapshot
+        """
+        if kinds is None:
+            kinds = SNAPSHOT_KINDS
+        elif isinstance(kinds, str):
+            kinds = (kinds,)
+        invalid = [kind for kind in kinds if kind not in SNAPSHOT_KINDS]
+        if invalid:
+            msg = _("Invalid kinds of inventory objects: {}.").format(
+                ", ".join(repr(kind) for kind in invalid)
+            )
+            raise ValueError(msg)
+        kinds = tuple(kind for kind in SNAPSHOT_KINDS if kind in kinds)
+
+        if vsphere_name is None:
+            vsphere_name = self.name
+
+        LOG.debug(
+            _("Trying to get the inventory of {} from vSphere ...").format(", ".join(kinds))
+        )
+        found = {
+            "clusters": [],
+            "hosts": {},
+            "host_refs": [],
+            "datastores": VsphereDatastoreDict(ledger=self.ledger),
+            "ds_clusters": VsphereDsClusterDict(),
+            "networks": VsphereNetworkDict(),
+            "dv_portgroups": VsphereNetworkDict(),
+            "dvs": {},
+            "vms": VsphereVmList(
                 appname=self.appname,
                 verbose=self.verbose,
                 base_dir=self.base_dir,
                 initialized=True,
-            )
+            ),
+        }
 
-        # if self.verbose > 3:
-        #     LOG.debug(_("Searching in path {!r} ...").format(cur_path))
-        #     LOG.debug(_("Found a {} child.").format(child.__class__.__name__))
-
-        if hasattr(child, "childEntity"):
-            if depth > self.max_search_depth:
-                return vm_list
-            return self._get_vm_childs(
-                child,
-                re_name,
-                cur_path=cur_path,
-                vsphere_name=vsphere_name,
-                dc_name=dc_name,
-                is_template=is_template,
-                depth=depth,
-                as_vmw_obj=as_vmw_obj,
-                as_obj=as_obj,
-                name_only=name_only,
-                stop_at_found=stop_at_found,
-            )
+        try:
+            self.ensure_connected()
 
-        if isinstance(child, vim.VirtualMachine):
+            datacenters = self.get_datacenters()
+            (name_table, ds_hosts) = self._retrieve_inventory_refs(kinds)
 
-            summary = child.summary
-            vm_config = summary.config
-            vm_name = vm_config.name
+            (walker, folders) = self._inventory_walker(
+                kinds, found, name_table, vsphere_name=vsphere_name, no_local_ds=no_local_ds
+            )
+            if folders:
+                walker.run(
+                    self._datacenter_roots(
+                        folders,
+                        cached=True,
+                        msg=_("Get the inventory of DC {!r} ..."),
+                        min_verbose=1,
+                    )
+                )
+            self._retrieve_hosts(found["host_refs"], found["hosts"], vsphere_name=vsphere_name)
+            if "vms" in kinds and self.fast_parse:
+                self._get_vm_list_fast(
+                    found["vms"],
+                    re.compile(r".*"),
+                    vsphere_name=vsphere_name,
+                    name_table=name_table,
+                )
 
-            if self.verbose > 2:
-                LOG.debug(_("Checking VM {} ...").format(self.colored(vm_name, "CYAN")))
-            if is_template is not None:
-                if self.verbose > 3:
-                    msg = _("Checking VM {!r} for being a template ...")
-                    if not is_template:
-                        msg = _("Checking VM {!r} for being not a template ...")
-                    LOG.debug(msg.format(vm_name))
-                if is_template and not vm_config.template:
-                    return []
-                if not is_template and vm_config.template:
-                    return []
+        finally:
+            if disconnect:
+                self.disconnect()
 
-            if self.verbose > 3:
-                LOG.debug(_("Checking VM {!r} for pattern.").format(vm_name))
-            if re_name.search(vm_name):
-                if self.verbose > 1:
-                    vsn = "~"
-                    if vsphere_name:
-                        vsn = vsphere_name
-                    dcn = "~"
-                    if dc_name:
-                        dcn = dc_name
-                    LOG.debug(
-                        _("Found VM {vm} in vSphere {vs}, DC {dc}, path {p}.").format(
-                            vm=self.colored(vm_name, "CYAN"),
-                            vs=self.colored(vsn, "CYAN"),
-                            dc=self.colored(dcn, "CYAN"),
-                            p=self.colored(cur_path, "CYAN"),
-                        )
-                    )
-                if name_only:
-                    vm_list.append((vm_name, dc_name, cur_path))
-                elif as_obj:
-                    if self.verbose > 1:
-                        LOG.debug(f"Get VM {vm_name!r} as an object.")
-                    vm = VsphereVm.from_summary(
-                        child,
-                        cur_path,
-                        vsphere=vsphere_name,
-                        dc_name=dc_name,
-                        appname=self.appname,
-                        verbose=self.verbose,
-                        base_dir=self.base_dir,
-                    )
-                    vm_list.append(vm)
-                elif as_vmw_obj:
-                    vm_list.append(child)
-                else:
-                    vm_data = self._dict_from_vim_obj(child, cur_path)
-                    vm_list.append(vm_data)
+        # Resolving the hosts of the datastores
+        for ds in found["datastores"].values():
+            host_refs = ds_hosts.get(ds.name)
+            if host_refs is None:
+                continue
+            ds.hosts = set()
+            ds.compute_clusters = set()
+            for host_ref in host_refs:
+                host_name = name_table.name_of(host_ref)
+                if host_name:
+                    ds.hosts.add(host_name)
+                cluster_name = name_table.cluster_name_of(host_ref)
+                if cluster_name:
+                    ds.compute_clusters.add(cluster_name)
+
+        snapshot = VsphereInventorySnapshot(
+            vsphere=vsphere_name,
+            kinds=kinds,
+            datacenters=datacenters if "datacenters" in kinds else None,
+            clusters=found["clusters"],
+            hosts=found["hosts"],
+            datastores=found["datastores"].freeze(),
+            ds_clusters=found["ds_clusters"].freeze(),
+            networks=found["networks"].freeze(),
+            dv_portgroups=found["dv_portgroups"].freeze(),
+            dvs=found["dvs"],
+            vms=found["vms"],
+        )
+        self._publish_inventory(snapshot)
 
-        return vm_list
+        if self.verbose > 1:
+            LOG.debug(_("Retrieved inventory:") + "\n" + pp(snapshot.as_dict()))
+
+        return snapshot
 
     # -------------------------------------------------------------------------
-    def _get_vm_childs(
-        self,
-        child,
-        re_name,
-        cur_path="",
-        vsphere_name=None,
-        dc_name=None,
-        is_template=None,
-        depth=1,
-        as_vmw_obj=False,
-        as_obj=False,
-        name_only=False,
-        stop_at_found=False,
-    ):
+    def _retrieve_inventory_refs(self, kinds):
 
-        vm_list = []
-        if as_obj:
-            vm_list = VsphereVmList(
-                appname=self.appname,
-                verbose=self.verbose,
-                base_dir=self.base_dir,
-                initialized=True,
-            )
+        name_table = VsphereNameTable()
+        ds_hosts = {}
+        if "vms" not in kinds and "datastores" not in kinds:
+            return (name_table, ds_hosts)
 
-        if self.verbose > 4:
-            msg = _("Searching VMs in vSphere {vs}, DC '{dc}' in path '{p}'.").format(
-                vs=self.colored(vsphere_name, "CYAN"),
-                dc=self.colored(dc_name, "CYAN"),
-                p=self.colored(cur_path, "CYAN"),
-            )
-            LOG.debug(msg)
+        prop_specs = list(NAME_TABLE_PROPERTIES)
+        if "datastores" in kinds:
+            prop_specs.append((vim.Datastore, ("summary.name", "host")))
 
-        for sub_child in child.childEntity:
+        for (moref, props) in self.retrieve_properties(prop_specs):
+            if name_table.add(moref, props):
+                continue
+            mounts = props.get("host") or ()
+            ds_hosts[props.get("summary.name")] = [mount.key for mount in mounts]
 
-            child_path = ""
-            if cur_path:
-                child_path = cur_path + "/" + child.name
-            else:
-                child_path = child.name
+        return (name_table, ds_hosts)
+
+    # -------------------------------------------------------------------------
+    def _inventory_walker(self, kinds, found, name_table, vsphere_name=None, no_local_ds=True):
+
+        folders = []
+        with_paths = "vms" in kinds and not self.fast_parse
+        walker = InventoryWalker(max_depth=self.max_search_depth, with_paths=with_paths)
+
+        if "hosts" in kinds:
+            folders.append("hostFolder")
+            walker.add_visitor(
+                vim.ComputeResource,
+                functools.partial(
+                    self._visit_host_cluster,
+                    found=found["host_refs"],
+                    clusters=found["clusters"],
+                    vsphere_name=vsphere_name,
+                ),
+            )
+        elif "clusters" in kinds:
+            folders.append("hostFolder")
+            walker.add_visitor(
+                vim.ComputeResource,
+                functools.partial(
+                    self._visit_cluster, clusters=found["clusters"], vsphere_name=vsphere_name
+                ),
+            )
 
-            if self.verbose > 3 and not isinstance(sub_child, vim.VirtualMachine):
-                msg = _("Searching VMs in vSphere {vs}, DC '{dc}' in path '{p}'.").format(
-                    vs=self.colored(vsphere_name, "CYAN"),
-                    dc=self.colored(dc_name, "CYAN"),
-                    p=self.colored(child_path, "CYAN"),
+        if "datastores" in kinds or "ds_clusters" in kinds:
+            folders.append("datastoreFolder")
+            pods = {}
+            datastores = found["datastores"] if "datastores" in kinds else None
+            if "ds_clusters" in kinds:
+                walker.add_visitor(
+                    vim.StoragePod,
+                    functools.partial(
+                        self._visit_ds_cluster,
+                        ds_clusters=found["ds_clusters"],
+                        datastores=datastores,
+                        pods=pods,
+                        vsphere_name=vsphere_name,
+                        no_local_ds=no_local_ds,
+                    ),
+                )
+            else:
+                walker.add_visitor(
+                    vim.StoragePod, functools.partial(self._visit_storage_pod, pods=pods)
+                )
+            if datastores is not None:
+                walker.add_visitor(
+                    vim.Datastore,
+                    functools.partial(
+                        self._visit_datastore,
+                        datastores=datastores,
+                        pods=pods,
+                        vsphere_name=vsphere_name,
+                        no_local_ds=no_local_ds,
+                    ),
                 )
-                LOG.debug(msg)
 
-            vms = self._get_vms(
-                sub_child,
-                re_name,
-                cur_path=child_path,
-                vsphere_name=vsphere_name,
-                dc_name=dc_name,
-                is_template=is_template,
-                depth=(depth + 1),
-                as_vmw_obj=as_vmw_obj,
-                as_obj=as_obj,
-                name_only=name_only,
-                stop_at_found=stop_at_found,
+        if "networks" in kinds:
+            folders.append("networkFolder")
+            walker.add_visitor(
+                (vim.DistributedVirtualSwitch, vim.Network),
+                functools.partial(self._visit_network, found=found, vsphere_name=vsphere_name),
             )
-            if vms:
-                vm_list += vms
-            if stop_at_found and vm_list:
-                break
 
-        return vm_list
+        if with_paths:
+            folders.append("vmFolder")
+            walker.add_visitor(
+                vim.VirtualMachine,
+                functools.partial(
+                    self._visit_vm,
+                    vm_list=found["vms"],
+                    re_name=re.compile(r".*"),
+                    vsphere_name=vsphere_name,
+                    name_table=name_table,
+                ),
+            )
+
+        return (walker, folders)
+
+    # -------------------------------------------------------------------------
+    def _publish_inventory(self, snapshot):
+
+        if "datacenters" in snapshot.kinds:
+            self.datacenters = snapshot.datacenters
+        if "clusters" in snapshot.kinds or "hosts" in snapshot.kinds:
+            self.clusters = snapshot.clusters
+        if "hosts" in snapshot.kinds:
+            self.hosts = snapshot.hosts
+        if "datastores" in snapshot.kinds:
+            self.datastores = snapshot.datastores
+            self.ds_mapping = MappingProxyType(
+                {ds_name: ds.tf_name for (ds_name, ds) in snapshot.datastores.items()}
+            )
+        if "ds_clusters" in snapshot.kinds:
+            self.ds_clusters = snapshot.ds_clusters
+            self.ds_cluster_mapping = MappingProxyType(
+                {dsc_name: dsc.tf_name for (dsc_name, dsc) in snapshot.ds_clusters.items()}
+            )
+        if "networks" in snapshot.kinds:
+            network_mapping = {}
+            for (net_name, dvpg) in snapshot.dv_portgroups.items():
+                network_mapping[net_name] = dvpg.tf_name
+            for (net_name, net) in snapshot.networks.items():
+                if net_name not in network_mapping:
+                    network_mapping[net_name] = net.tf_name
+            self.networks = snapshot.networks
+            self.dv_portgroups = snapshot.dv_portgroups
+            self.network_mapping = MappingProxyType(network_mapping)
+            all_dvs = dict(self.dvs)
+            all_dvs.update(snapshot.dvs)
+            self.dvs = MappingProxyType(all_dvs)
 
     # -------------------------------------------------------------------------
     def poweron_vm(self, vm, max_wait=20, disconnect=False):
         """Power on the given virtual machine."""
         try:
 
-            if not self.service_instance:
-                self.connect()
+            self.ensure_connected()
 
             if isinstance(vm, vim.VirtualMachine):
                 vm_obj = vm
@@ -1702,8 +2386,7 @@ class VsphereConnection(BaseVsphereHandler):
         """Power off the given virtual machine."""
         try:
 
-            if not self.service_instance:
-                self.connect()
+            self.ensure_connected()
 
             if isinstance(vm, vim.VirtualMachine):
                 vm_obj = vm
@@ -1734,8 +2417,7 @@ class VsphereConnection(BaseVsphereHandler):
         LOG.debug(_("Ensuring existence of vSphere VM folders:") + "\n" + pp(folders))
         try:
 
-            if not self.service_instance:
-                self.connect()
+            self.ensure_connected()
 
             for folder in folders:
                 self.ensure_vm_folder(folder, disconnect=False)
@@ -1758,8 +2440,7 @@ class VsphereConnection(BaseVsphereHandler):
 
         try:
 
-            if not self.service_instance:
-                self.connect()
+            self.ensure_connected()
 
             content = self.service_instance.RetrieveContent()
             dc = self.get_obj(content, [vim.Datacenter], self.dc)
@@ -1816,8 +2497,7 @@ class VsphereConnection(BaseVsphereHandler):
 
         try:
 
-            if not self.service_instance:
-                self.connect()
+            self.ensure_connected()
 
             content = self.service_instance.RetrieveContent()
             dc = self.get_obj(content, [vim.Datacenter], self.dc)
@@ -1858,8 +2538,7 @@ class VsphereConnection(BaseVsphereHandler):
 
         try:
 
-            if not self.service_instance:
-                self.connect()
+            self.ensure_connected()
 
             property_collector = self.service_instance.content.propertyCollector
             task_list = [str(task) for task in tasks]
@@ -1929,18 +2608,44 @@ class VsphereConnection(BaseVsphereHandler):
 
         if self.simulate:
             LOG.info(_("Simulation mode - VM {!r} will not be created.").format(name))
+            self.release_dv_ports(vm_config_spec)
             return
 
         start_time = time.time()
 
-        task = vm_folder.CreateVM_Task(config=vm_config_spec, pool=pool)
+        try:
+            task = vm_folder.CreateVM_Task(config=vm_config_spec, pool=pool)
+            finished = self.wait_for_tasks(
+                [task], poll_time=0.2, max_wait=max_wait, start_time=start_time
+            )
+        except Exception:
+            self.release_dv_ports(vm_config_spec)
+            raise
 
-        if not self.wait_for_tasks(
-            [task], poll_time=0.2, max_wait=max_wait, start_time=start_time
-        ):
+        if not finished:
+            # The VM may still be created after the timeout, so its ports stay reserved.
             time_diff = time.time() - start_time
             raise TimeoutCreateVmError(name, time_diff)
 
+    # -------------------------------------------------------------------------
+    def release_dv_ports(self, vm_config_spec):
+        """
+        Release the DVS ports reserved for the network interfaces of the given VM spec.
+
+        This gives the ports back to the port cache of their Distributed Virtual
+        Switch, if the VM was not created.
+        """
+        for dev_spec in vm_config_spec.deviceChange or []:
+            backing = getattr(dev_spec.device, "backing", None)
+            if not isinstance(
+                backing, vim.vm.device.VirtualEthernetCard.DistributedVirtualPortBackingInfo
+            ):
+                continue
+            port = backing.port
+            if port is None or not port.portKey or port.switchUuid not in self.dvs:
+                continue
+            self.dvs[port.switchUuid].release_port(port.portKey)
+
     # -------------------------------------------------------------------------
     def generate_vm_create_spec(
         self,
@@ -2162,6 +2867,8 @@ class VsphereConnection(BaseVsphereHandler):
         if not len(self.dv_portgroups) and not len(self.networks):
             self.get_networks()
 
+        self._load_dv_ports(ifaces)
+
         dev_changes = []
         dev_name = "eth{}"
         i = -1
@@ -2179,6 +2886,21 @@ class VsphereConnection(BaseVsphereHandler):
 
         return dev_changes
 
+    # -------------------------------------------------------------------------
+    def _load_dv_ports(self, ifaces):
+
+        pg_keys = {}
+        for iface in ifaces:
+            if iface.network_name not in self.dv_portgroups:
+                continue
+            portgroup = self.dv_portgroups[iface.network_name]
+            if portgroup.dvs_uuid not in pg_keys:
+                pg_keys[portgroup.dvs_uuid] = []
+            pg_keys[portgroup.dvs_uuid].append(portgroup.key)
+
+        for dvs_uuid in pg_keys:
+            self.dvs[dvs_uuid].ensure_ports(*pg_keys[dvs_uuid])
+
     # -------------------------------------------------------------------------
     def _generate_if_create_spec(self, interface, dev_name):
 
@@ -2207,8 +2929,7 @@ class VsphereConnection(BaseVsphereHandler):
         if interface.network_name in self.dv_portgroups:
             portgroup = self.dv_portgroups[interface.network_name]
             dvs = self.dvs[portgroup.dvs_uuid]
-            port_keys = dvs.search_port_keys(portgroup.key)
-            port = dvs.find_port_by_portkey(port_keys[0])
+            port = dvs.reserve_port(portgroup.key)
             backing_device = portgroup.get_if_backing_device(port)
         elif interface.network_name in self.networks:
             network = self.networks[interface.network_name]
@@ -2243,8 +2964,7 @@ class VsphereConnection(BaseVsphereHandler):
         """Purge a vitual machine completely from vSphere."""
         try:
 
-            if not self.service_instance:
-                self.connect()
+            self.ensure_connected()
 
             if isinstance(vm, vim.VirtualMachine):
                 vm_obj = vm
@@ -2270,8 +2990,7 @@ class VsphereConnection(BaseVsphereHandler):
     # -------------------------------------------------------------------------
     def set_mac_of_nic(self, vm, new_mac, nic_nr=0):
         """Set a virtual network interface to a new MAC address."""
-        if not self.service_instance:
-            self.connect()
+        self.ensure_connected()
 
         if isinstance(vm, vim.VirtualMachine):
             vm_obj = vm
@@ -2328,21 +3047,31 @@ class VsphereConnection(BaseVsphereHandler):
         names are cached in the dict self.custom_fields from the customFieldsManager.
         If the key could not be detected, None is returned.
         """
-        if self.custom_fields is None:
+        custom_fields = self.custom_fields
+        if custom_fields is None:
+            custom_fields = self._load_custom_fields()
+
+        return custom_fields.get(key_id)
+
+    # -------------------------------------------------------------------------
+    def _load_custom_fields(self):
+
+        with self._custom_fields_lock:
+            if self.custom_fields is not None:
+                return self.custom_fields
 
             if self.verbose > 1:
-                msg = _("Trying to detect all field names of custom field definitions.")
+                LOG.debug(_("Trying to detect all field names of custom field definitions."))
 
-            self.custom_fields = {}
+            custom_fields = {}
 
             try:
-                if not self.service_instance:
-                    self.connect()
+                self.ensure_connected()
                 content = self.service_instance.RetrieveContent()
                 cfm = content.customFieldsManager
 
                 for custom_field in cfm.field:
-                    self.custom_fields[custom_field.key] = custom_field.name
+                    custom_fields[custom_field.key] = custom_field.name
 
             except (
                 socket.timeout,
@@ -2357,13 +3086,11 @@ class VsphereConnection(BaseVsphereHandler):
 
             if self.verbose > 2:
                 msg = _("Got custom field names from vSphere {}:").format(self.connect_info.url)
-                msg += "\n" + pp(self.custom_fields)
+                msg += "\n" + pp(custom_fields)
                 LOG.debug(msg)
 
-        if key_id in self.custom_fields:
-            return self.custom_fields[key_id]
-
-        return None
+            self.custom_fields = MappingProxyType(custom_fields)
+            return self.custom_fields
 
 
 # =============================================================================
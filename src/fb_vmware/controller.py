@@ -27,9 +27,11 @@ from pyVmomi import vim
 
 # Own modules
 from .errors import VSphereDiskCtrlrTypeNotFoudError
+from .propset import vmodl_isinstance
+from .propset import vmodl_type_of
 from .xlate import XLATOR
 
-__version__ = "1.1.0"
+__version__ = "1.2.0"
 LOG = logging.getLogger(__name__)
 
 _ = XLATOR.gettext
@@ -316,7 +318,7 @@ class VsphereDiskController(FbBaseObject):
 
         else:
 
-            if not isinstance(data, vim.vm.device.VirtualController):
+            if not vmodl_isinstance(data, vim.vm.device.VirtualController):
                 msg = _("Parameter {t!r} must be a {e}, {v!r} ({vt}) was given.").format(
                     t="data",
                     e="vim.vm.device.VirtualController",
@@ -336,17 +338,19 @@ class VsphereDiskController(FbBaseObject):
         }
         for disk_id in data.device:
             params["devices"].append(disk_id)
-        if isinstance(data, vim.vm.device.VirtualSCSIController):
+        if vmodl_isinstance(data, vim.vm.device.VirtualSCSIController):
             params["hot_add_remove"] = data.hotAddRemove
             params["scsi_ctrl_nr"] = data.scsiCtlrUnitNumber
             params["sharing"] = data.sharedBus
 
         if verbose > 2:
-            LOG.debug(_("Checking class of controller: {!r}").format(data.__class__.__name__))
+            LOG.debug(
+                _("Checking class of controller: {!r}").format(vmodl_type_of(data).__name__)
+            )
 
         try:
             for pair in cls.ctrl_types:
-                if isinstance(data, pair[0]):
+                if vmodl_isinstance(data, pair[0]):
                     params["ctrl_type"] = pair[1]
                     break
         except Exception:
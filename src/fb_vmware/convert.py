@@ -0,0 +1,231 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+@summary: The module for converting property sets of VMs into VsphereVm objects.
+
+Creating VsphereVm objects with their disks, network interfaces and controllers
+from the property sets of the fast parser is CPU bound work in pure Python. For
+large inventories the property sets are distributed in chunks to a pool of worker
+processes, which are returning the pickled VsphereVm objects.
+
+@author: Frank Brehm
+@contact: frank@brehm-online.com
+@copyright: © 2022 - 2026 by Frank Brehm, Berlin
+"""
+from __future__ import absolute_import
+
+# Standard modules
+import collections
+import logging
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+# Third party modules
+from fb_tools.obj import FbGenericBaseObject
+
+# Own modules
+from .config import DEFAULT_CONVERT_WORKERS
+from .vm import VsphereVm, VsphereVmList
+from .xlate import XLATOR
+
+__version__ = "0.1.0"
+LOG = logging.getLogger(__name__)
+
+_ = XLATOR.gettext
+
+DEFAULT_CONVERT_CHUNK_SIZE = 250
+
+VmPropertySet = collections.namedtuple(
+    "VmPropertySet", ["props", "path", "vsphere", "dc_name", "cluster_name", "host"]
+)
+
+
+# =============================================================================
+def convert_vm_chunk(items, appname=None, verbose=0, base_dir=None):
+    """
+    Create VsphereVm objects from the given VmPropertySet tuples.
+
+    This is the function executed in the worker processes.
+
+    @return: the VsphereVm objects in the order of the given items
+    @rtype: list
+    """
+    vms = []
+    for item in items:
+        vms.append(
+            VsphereVm.from_properties(
+                item.props,
+                item.path,
+                vsphere=item.vsphere,
+                dc_name=item.dc_name,
+                cluster_name=item.cluster_name,
+                host=item.host,
+                appname=appname,
+                verbose=verbose,
+                base_dir=base_dir,
+            )
+        )
+    return vms
+
+
+# =============================================================================
+class VsphereVmConverter(FbGenericBaseObject):
+    """
+    Converting property sets of VMs into VsphereVm objects, in parallel if wanted.
+
+    The pool of worker processes is started on the first conversion with more
+    property sets than one chunk and is kept until close() is called.
+    """
+
+    # -------------------------------------------------------------------------
+    def __init__(
+        self,
+        workers=DEFAULT_CONVERT_WORKERS,
+        chunk_size=DEFAULT_CONVERT_CHUNK_SIZE,
+        appname=None,
+        verbose=0,
+        base_dir=None,
+    ):
+        """
+        Initialize a VsphereVmConverter object.
+
+        @param workers: the number of worker processes, 0 converts all property sets
+                        in the current process.
+        @type workers: int
+        @param chunk_size: the number of property sets given at once to a worker.
+        @type chunk_size: int
+        """
+        self.workers = int(workers)
+        if self.workers < 0:
+            msg = _("The number of worker processes must not be negative, not {!r}.").format(
+                workers
+            )
+            raise ValueError(msg)
+        self.chunk_size = int(chunk_size)
+        if self.chunk_size < 1:
+            msg = _("The chunk size must be at least one, not {!r}.").format(chunk_size)
+            raise ValueError(msg)
+
+        self.appname = appname
+        self.verbose = verbose
+        self.base_dir = base_dir
+
+        self._lock = threading.Lock()
+        self._executor = None
+
+    # -------------------------------------------------------------------------
+    def __repr__(self):
+        """Typecasting into a string for reproduction."""
+        return "<{c}(workers={w!r}, chunk_size={s!r})>".format(
+            c=self.__class__.__name__, w=self.workers, s=self.chunk_size
+        )
+
+    # -------------------------------------------------------------------------
+    def __enter__(self):
+        """Enter the context of the converter."""
+        return self
+
+    # -------------------------------------------------------------------------
+    def __exit__(self, exc_type, exc_value, traceback):
+        """Shut down the worker processes on leaving the context."""
+        self.close()
+
+    # -------------------------------------------------------------------------
+    def _get_executor(self):
+
+        with self._lock:
+            if self._executor is None:
+                # Forking a process with running threads is not safe
+                methods = multiprocessing.get_all_start_methods()
+                method = "forkserver" if "forkserver" in methods else "spawn"
+                LOG.debug(
+                    _("Starting {n} worker processes ({m}) for converting VMs.").format(
+                        n=self.workers, m=method
+                    )
+                )
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers, mp_context=multiprocessing.get_context(method)
+                )
+            return self._executor
+
+    # -------------------------------------------------------------------------
+    def convert(self, items, vm_list=None):
+        """
+        Create VsphereVm objects from the given VmPropertySet tuples.
+
+        @param items: the property sets of the VMs
+        @type items: list of VmPropertySet
+        @param vm_list: the list, to which the new VMs are appended. If not given,
+                        a new VsphereVmList is created.
+        @type vm_list: VsphereVmList or None
+
+        @return: the list with the new VMs in the order of the property sets
+        @rtype: VsphereVmList
+        """
+        if vm_list is None:
+            vm_list = VsphereVmList(
+                appname=self.appname,
+                verbose=self.verbose,
+                base_dir=self.base_dir,
+                initialized=True,
+            )
+        params = {"appname": self.appname, "verbose": self.verbose, "base_dir": self.base_dir}
+        items = list(items)
+
+        if not self.workers or len(items) <= self.chunk_size:
+            vm_list.extend(convert_vm_chunk(items, **params))
+            return vm_list
+
+        chunks = [items[i:i + self.chunk_size] for i in range(0, len(items), self.chunk_size)]
+        if self.verbose > 1:
+            LOG.debug(
+                _("Converting {v} VMs in {c} chunks by {w} worker processes.").format(
+                    v=len(items), c=len(chunks), w=self.workers
+                )
+            )
+        try:
+            executor = self._get_executor()
+            futures = [executor.submit(convert_vm_chunk, chunk, **params) for chunk in chunks]
+            results = [future.result() for future in futures]
+        except (BrokenProcessPool, OSError) as e:
+            LOG.warning(
+                _("The worker processes failed ({}), converting the VMs in this process.").format(
+                    e
+                )
+            )
+            self.close()
+            self.workers = 0
+            results = [convert_vm_chunk(items, **params)]
+
+        for vms in results:
+            vm_list.extend(vms)
+        return vm_list
+
+    # -------------------------------------------------------------------------
+    def close(self):
+        """Shut down the worker processes."""
+        with self._lock:
+            executor = self._executor
+            self._executor = None
+        if executor is not None:
+            executor.shutdown(wait=True)
+
+    # -------------------------------------------------------------------------
+    def as_dict(self, short=True):
+        """Transform the elements of the object into a dict."""
+        res = super(VsphereVmConverter, self).as_dict(short=short)
+        res["workers"] = self.workers
+        res["chunk_size"] = self.chunk_size
+        return res
+
+
+# =============================================================================
+if __name__ == "__main__":
+
+    pass
+
+# =============================================================================
+
+# vim: tabstop=4 expandtab shiftwidth=4 softtabstop=4 list
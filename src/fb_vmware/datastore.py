@@ -10,10 +10,10 @@
 from __future__ import absolute_import
 
 # Standard modules
-import copy
 import logging
 import random
 import re
+import weakref
 
 try:
     from collections.abc import MutableMapping
@@ -28,14 +28,15 @@ from fb_tools.xlate import format_list
 from pyVmomi import vim
 
 # Own modules
-from .errors import FbVMWareRuntimeError
 from .errors import VSphereHandlerError
 from .errors import VSphereNameError
 from .errors import VSphereNoDatastoreFoundError
 from .obj import VsphereObject
+from .placement import PLACEMENT_LOCK, VspherePlacementEngine, usage_changed
+from .typed_dict import FreezableMixin
 from .xlate import XLATOR
 
-__version__ = "1.9.0"
+__version__ = "1.12.1"
 LOG = logging.getLogger(__name__)
 
 _ = XLATOR.gettext
@@ -142,6 +143,8 @@ class VsphereDatastore(VsphereObject):
         self._storage_type = self.default_storage_type
 
         self._calculated_usage = 0.0
+        self._ledger_usage = 0.0
+        self._placement_engines = weakref.WeakSet()
 
         self.hosts = None
         self.compute_clusters = None
@@ -331,16 +334,36 @@ class VsphereDatastore(VsphereObject):
     def calculated_usage(self, value):
         val = float(value)
         self._calculated_usage = val
+        usage_changed(self)
+
+    # -----------------------------------------------------------
+    @property
+    def ledger_usage(self):
+        """Return the space reserved by other processes in the reservation ledger, in GiBytes."""
+        return self._ledger_usage
+
+    @ledger_usage.setter
+    def ledger_usage(self, value):
+        val = float(value)
+        self._ledger_usage = val
+        usage_changed(self)
+
+    # -----------------------------------------------------------
+    @property
+    def placement_engines(self):
+        """Return the placement engines indexing this datastore."""
+        return self._placement_engines
 
     # -----------------------------------------------------------
     @property
     def avail_space_gb(self):
-        """Available space of datastore in GiB in respect of calculated space."""
+        """Available space of datastore in GiB in respect of calculated and ledger space."""
         if not self.free_space:
             return 0.0
-        if not self.calculated_usage:
+        usage = self.calculated_usage + self.ledger_usage
+        if not usage:
             return self.free_space_gb
-        return self.free_space_gb - self.calculated_usage
+        return self.free_space_gb - usage
 
     # -------------------------------------------------------------------------
     @classmethod
@@ -539,6 +562,7 @@ class VsphereDatastore(VsphereObject):
         res["accessible"] = self.accessible
         res["avail_space_gb"] = self.avail_space_gb
         res["calculated_usage"] = self.calculated_usage
+        res["ledger_usage"] = self.ledger_usage
         res["capacity"] = self.capacity
         res["capacity_gb"] = self.capacity_gb
         res["cluster"] = self.cluster
@@ -604,7 +628,7 @@ class VsphereDatastore(VsphereObject):
 
 
 # =============================================================================
-class VsphereDatastoreDict(MutableMapping, FbGenericBaseObject):
+class VsphereDatastoreDict(FreezableMixin, MutableMapping, FbGenericBaseObject):
     """
     A dictionary containing VsphereDatastore objects.
 
@@ -634,13 +658,22 @@ class VsphereDatastoreDict(MutableMapping, FbGenericBaseObject):
     def __init__(self, *args, **kwargs):
         """Initialize a VsphereDatastoreDict object."""
         self._map = {}
+        self._placement_engine = None
+        self.ledger = kwargs.get("ledger")
+        self.ledger_reservations = []
 
         for arg in args:
             self.append(arg)
 
+    # -------------------------------------------------------------------------
+    def copy(self):
+        """Return a changeable shallow copy of the dict with the same ledger."""
+        return self.__class__(*self.values(), ledger=self.ledger)
+
     # -------------------------------------------------------------------------
     def _set_item(self, key, ds):
 
+        self._check_frozen()
         if not isinstance(ds, VsphereDatastore):
             raise TypeError(self.msg_invalid_ds_type.format(ds.__class__.__name__))
 
@@ -649,6 +682,7 @@ class VsphereDatastoreDict(MutableMapping, FbGenericBaseObject):
             raise KeyError(self.msg_key_not_name.format(k=key, n=ds_name))
 
         self._map[ds_name] = ds
+        self._placement_engine = None
 
     # -------------------------------------------------------------------------
     def append(self, ds):
@@ -677,6 +711,7 @@ class VsphereDatastoreDict(MutableMapping, FbGenericBaseObject):
     # -------------------------------------------------------------------------
     def _del_item(self, key, strict=True):
 
+        self._check_frozen()
         if key is None:
             raise TypeError(self.msg_none_type_error)
 
@@ -688,6 +723,7 @@ class VsphereDatastoreDict(MutableMapping, FbGenericBaseObject):
             return
 
         del self._map[ds_name]
+        self._placement_engine = None
 
     # -------------------------------------------------------------------------
     # The next five methods are requirements of the ABC.
@@ -783,6 +819,7 @@ class VsphereDatastoreDict(MutableMapping, FbGenericBaseObject):
     # -------------------------------------------------------------------------
     def pop(self, key, *args):
         """Get the datastore by its name and remove it in dict."""
+        self._check_frozen()
         if key is None:
             raise TypeError(self.msg_none_type_error)
 
@@ -790,23 +827,28 @@ class VsphereDatastoreDict(MutableMapping, FbGenericBaseObject):
         if ds_name == "":
             raise ValueError(self.msg_empty_key_error.format(key))
 
+        self._placement_engine = None
         return self._map.pop(ds_name, *args)
 
     # -------------------------------------------------------------------------
     def popitem(self):
         """Remove and return a arbitrary (datastore name and object) pair from the dictionary."""
+        self._check_frozen()
         if not len(self._map):
             return None
 
         ds_name = self.keys()[0]
         ds = self._map[ds_name]
         del self._map[ds_name]
+        self._placement_engine = None
         return (ds_name, ds)
 
     # -------------------------------------------------------------------------
     def clear(self):
         """Remove all items from the dictionary."""
+        self._check_frozen()
         self._map = {}
+        self._placement_engine = None
 
     # -------------------------------------------------------------------------
     def setdefault(self, key, default):
@@ -860,28 +902,112 @@ class VsphereDatastoreDict(MutableMapping, FbGenericBaseObject):
             res.append(self._map[ds_name].as_dict(short))
         return res
 
+    # -------------------------------------------------------------------------
+    def get_placement_engine(self):
+        """
+        Return the placement engine with indexes of all datastores in this dict.
+
+        The engine is created on the first call and dropped on any change of this dict.
+        """
+        with PLACEMENT_LOCK:
+            if self._placement_engine is None:
+                self._placement_engine = VspherePlacementEngine(self)
+            return self._placement_engine
+
+    # -------------------------------------------------------------------------
+    def get_search_chain(self, storage_type="any", use_local=False):
+        """Return the storage types to search for the given storage type as a tuple."""
+        st_type = storage_type.lower()
+        if use_local:
+            search_chains = SEARCH_CHAINS_WITH_LOCAL
+        else:
+            search_chains = SEARCH_CHAINS
+
+        if st_type not in search_chains:
+            raise ValueError(_("Could not handle storage type {!r}.").format(storage_type))
+
+        return search_chains[st_type]
+
+    # -------------------------------------------------------------------------
+    def sync_ledger(self):
+        """
+        Apply the reservations of other processes from the reservation ledger.
+
+        The sum of the active reservations of all other processes is set as the
+        ledger usage of the appropriate datastores, so they are respected on searching
+        space. The calculated usage of the datastores is not changed, so syncing the
+        same datastores by several dicts (e.g. copies) counts them only once.
+        """
+        with PLACEMENT_LOCK:
+            if self.ledger is None:
+                return
+
+            foreign = self.ledger.reserved_map(foreign_only=True)
+
+            for ds_name, ds in self._map.items():
+                new_usage = foreign.get((ds.vsphere or "", ds_name), 0.0)
+                if new_usage == ds.ledger_usage:
+                    continue
+                LOG.debug(
+                    _("Foreign reservations on datastore {ds!r}: {u:0.1f} GiB.").format(
+                        ds=ds_name, u=new_usage
+                    )
+                )
+                ds.ledger_usage = new_usage
+
+    # -------------------------------------------------------------------------
+    def _reserve(self, ds_name, needed_gb):
+
+        if self.ledger is not None:
+            ds = self._map[ds_name]
+            reservation_id = self.ledger.reserve(
+                ds.vsphere, ds_name, needed_gb, limit_gb=ds.free_space_gb
+            )
+            if reservation_id is None:
+                LOG.debug(
+                    _("Datastore {!r} was meanwhile reserved by another process.").format(ds_name)
+                )
+                return False
+            self.ledger_reservations.append(reservation_id)
+
+        self.get_placement_engine().reserve(ds_name, needed_gb)
+        return True
+
+    # -------------------------------------------------------------------------
+    def release_reservations(self):
+        """Release all reservations of the current process in the reservation ledger."""
+        with PLACEMENT_LOCK:
+            if self.ledger is None:
+                return
+            for reservation_id in self.ledger_reservations:
+                self.ledger.release(reservation_id)
+            self.ledger_reservations = []
+
     # -------------------------------------------------------------------------
     def find_ds(self, needed_gb, ds_type="sata", reserve_space=True, use_ds=None, no_k8s=False):
         """Find a datastore in dict with the given minimum free space and the given type."""
-        search_chains = {
-            "sata": ("sata", "sas", "ssd"),
-            "sas": ("sas", "sata", "ssd"),
-            "ssd": ("ssd", "sas", "sata"),
-        }
-
-        if ds_type not in search_chains:
-            raise ValueError(_("Could not handle datastore type {!r}.").format(ds_type))
-        for dstp in search_chains[ds_type]:
-            ds_name = self._find_ds(needed_gb, dstp, reserve_space, use_ds=use_ds, no_k8s=no_k8s)
-            if ds_name:
-                return ds_name
+        with PLACEMENT_LOCK:
+            search_chains = {
+                "sata": ("sata", "sas", "ssd"),
+                "sas": ("sas", "sata", "ssd"),
+                "ssd": ("ssd", "sas", "sata"),
+            }
+
+            if ds_type not in search_chains:
+                raise ValueError(_("Could not handle datastore type {!r}.").format(ds_type))
+            for dstp in search_chains[ds_type]:
+                ds_name = self._find_ds(
+                    needed_gb, dstp, reserve_space, use_ds=use_ds, no_k8s=no_k8s
+                )
+                if ds_name:
+                    return ds_name
 
-        LOG.error(
-            _("Could not found a datastore for {c:0.1f} GiB of type {t!r}.").format(
-                c=needed_gb, t=ds_type
+            LOG.error(
+                _("Could not found a datastore for {c:0.1f} GiB of type {t!r}.").format(
+                    c=needed_gb, t=ds_type
+                )
             )
-        )
-        return None
+            return None
 
     # -------------------------------------------------------------------------
     def _find_ds(self, needed_gb, ds_type, reserve_space=True, use_ds=None, no_k8s=False):
@@ -890,27 +1016,28 @@ class VsphereDatastoreDict(MutableMapping, FbGenericBaseObject):
             _("Searching datastore for {c:0.1f} GiB of type {t!r}.").format(c=needed_gb, t=ds_type)
         )
 
-        avail_ds_names = []
-        for ds_name, ds in self.items():
-            if use_ds:
-                if ds.name not in use_ds:
+        self.sync_ledger()
+        engine = self.get_placement_engine()
+
+        for _attempt in range(len(self._map) + 1):
+            avail_ds_names = []
+            for ds_name in engine.candidates(needed_gb, ds_type):
+                if use_ds:
+                    if ds_name not in use_ds:
+                        continue
+                if no_k8s and self._map[ds_name].for_k8s:
                     continue
-            if ds.storage_type.lower() != ds_type.lower():
-                continue
-            if no_k8s and ds.for_k8s:
-                continue
-            if ds.avail_space_gb >= needed_gb:
                 avail_ds_names.append(ds_name)
 
-        if not avail_ds_names:
-            return None
+            if not avail_ds_names:
+                return None
 
-        ds_name = random.choice(avail_ds_names)
-        if reserve_space:
-            ds = self[ds_name]
-            ds.calculated_usage += needed_gb
+            ds_name = random.choice(avail_ds_names)
+            if not reserve_space or self._reserve(ds_name, needed_gb):
+                return ds_name
+            self.sync_ledger()
 
-        return ds_name
+        return None
 
     # -------------------------------------------------------------------------
     def search_space(
@@ -921,32 +1048,27 @@ class VsphereDatastoreDict(MutableMapping, FbGenericBaseObject):
         compute_cluster=None,
         use_local=False,
         use_random_select=False,
+        strategy=None,
     ):
         """Find a datastore in dict with the given minimum free space and the given type."""
-        st_type = storage_type.lower()
-        if use_local:
-            search_chains = copy.copy(SEARCH_CHAINS_WITH_LOCAL)
-        else:
-            search_chains = copy.copy(SEARCH_CHAINS)
-
-        if st_type not in search_chains:
-            raise ValueError(
-                _("Could not handle storage type {}.").format(self.colored(storage_type, "RED"))
-            )
-
-        for st_tp in search_chains[st_type]:
-            ds_name = self._search_space(
-                needed_gb,
-                storage_type=st_tp,
-                reserve_space=reserve_space,
-                compute_cluster=compute_cluster,
-                use_random_select=use_random_select,
-            )
-            if ds_name:
-                LOG.debug(_("Found usable datastore {!r}.").format(ds_name))
-                return ds_name
+        with PLACEMENT_LOCK:
+            search_chain = self.get_search_chain(storage_type, use_local=use_local)
+            self.sync_ledger()
+
+            for st_tp in search_chain:
+                ds_name = self._search_space(
+                    needed_gb,
+                    storage_type=st_tp,
+                    reserve_space=reserve_space,
+                    compute_cluster=compute_cluster,
+                    use_random_select=use_random_select,
+                    strategy=strategy,
+                )
+                if ds_name:
+                    LOG.debug(_("Found usable datastore {!r}.").format(ds_name))
+                    return ds_name
 
-        raise VSphereNoDatastoreFoundError(needed_gb)
+            raise VSphereNoDatastoreFoundError(needed_gb)
 
     # -------------------------------------------------------------------------
     def _search_space(
@@ -956,6 +1078,7 @@ class VsphereDatastoreDict(MutableMapping, FbGenericBaseObject):
         reserve_space=True,
         compute_cluster=None,
         use_random_select=False,
+        strategy=None,
     ):
 
         LOG.debug(
@@ -965,59 +1088,72 @@ class VsphereDatastoreDict(MutableMapping, FbGenericBaseObject):
         )
         LOG.debug(_("Given compute cluster: {!r}.").format(compute_cluster))
 
-        avail_ds_names = []
-        spaces = {}
-        for ds_name, ds in self.items():
-            usable = True
-            if ds.storage_type.lower() != storage_type.lower():
-                # LOG.debug(f"Datastore {ds_name} has wrong storage type {ds.storage_type}.")
-                continue
-            if ds.avail_space_gb < needed_gb:
-                # LOG.debug(f"Datastore {ds_name} is too small with {ds.avail_space_gb:0f} GB.")
-                usable = False
-
-            if usable and compute_cluster:
-                if ds.compute_clusters is None:
-                    msg = _(
-                        "Cannot detect connection with compute cluster {!r}, datastore "
-                        "was not detailled discovered."
-                    ).format(ds_name)
-                    raise FbVMWareRuntimeError(msg)
-                found = False
-                for cc_name in ds.compute_clusters:
-                    # LOG.debug(f"Checking for CC {cc_name!r} == {compute_cluster!r}.")
-                    if cc_name == compute_cluster:
-                        found = True
-                        break
-                if not found:
-                    # LOG.debug(
-                    #     f"Datastore {ds_name} is connected with wrong computing clusters: "
-                    #     + pp(ds_cluster.compute_clusters)
-                    # )
-                    usable = False
-
-            if usable:
-                avail_ds_names.append(ds_name)
-                spaces[ds_name] = ds.avail_space_gb
+        if use_random_select:
+            strategy = "random"
 
-        if not avail_ds_names:
-            return None
+        engine = self.get_placement_engine()
 
-        if use_random_select:
-            ds_name = random.choice(avail_ds_names)
-        else:
-            ds_name = None
-            last_val = 0.0
-            for n in spaces.keys():
-                if spaces[n] > last_val:
-                    ds_name = n
-                    last_val = spaces[n]
-
-        if reserve_space:
-            ds = self[ds_name]
-            ds.calculated_usage += needed_gb
-
-        return ds_name
+        for _attempt in range(len(self._map) + 1):
+            ds_name = engine.find(
+                needed_gb, storage_type, compute_cluster=compute_cluster, strategy=strategy
+            )
+            if not ds_name or not reserve_space:
+                return ds_name
+            if self._reserve(ds_name, needed_gb):
+                return ds_name
+            # Another process was faster, get its reservations and search again.
+            self.sync_ledger()
+
+        return None
+
+    # -------------------------------------------------------------------------
+    def place_many(
+        self,
+        requests,
+        storage_type="any",
+        strategy=None,
+        reserve_space=True,
+        compute_cluster=None,
+        use_local=False,
+        no_error=False,
+    ):
+        """
+        Find datastores for a batch of virtual disks.
+
+        Each request may be a number (the needed space in GiB), a tuple
+        (needed_gb, storage_type[, compute_cluster]) or a dict with the keys
+        'needed_gb' and optional 'storage_type', 'compute_cluster' and 'strategy'.
+
+        The names of the found datastores are returned as a list in the order of
+        the requests. If no datastore was found for a request, a
+        VSphereNoDatastoreFoundError is raised, or None is used, if no_error is True.
+        """
+        with PLACEMENT_LOCK:
+            self.sync_ledger()
+            results = []
+
+            for request in requests:
+                (needed_gb, st_type, cc_name, req_strategy) = VspherePlacementEngine.eval_request(
+                    request, storage_types=storage_type, strategy=strategy
+                )
+                if cc_name is None:
+                    cc_name = compute_cluster
+                ds_name = None
+                for st_tp in self.get_search_chain(st_type, use_local=use_local):
+                    ds_name = self._search_space(
+                        needed_gb,
+                        storage_type=st_tp,
+                        reserve_space=reserve_space,
+                        compute_cluster=cc_name,
+                        strategy=req_strategy,
+                    )
+                    if ds_name:
+                        break
+                if ds_name is None and not no_error:
+                    raise VSphereNoDatastoreFoundError(needed_gb)
+                results.append(ds_name)
+
+            return results
 
 
 # =============================================================================
@@ -27,9 +27,10 @@ from fb_tools.xlate import format_list
 from pyVmomi import vim
 
 # Own modules
+from .propset import vmodl_isinstance
 from .xlate import XLATOR
 
-__version__ = "1.0.1"
+__version__ = "1.1.0"
 LOG = logging.getLogger(__name__)
 
 _ = XLATOR.gettext
@@ -423,7 +424,7 @@ class VsphereDisk(FbBaseObject):
 
         else:
 
-            if not isinstance(data, vim.vm.device.VirtualDisk):
+            if not vmodl_isinstance(data, vim.vm.device.VirtualDisk):
                 msg = _(
                     "Parameter {t!r} must be a {e} object, a {v} object was given " "instead."
                 ).format(t="data", e="vim.vm.device.VirtualDisk", v=data.__class__.__qualname__)
@@ -11,7 +11,7 @@ from __future__ import absolute_import
 
 # Standard modules
 import logging
-import random
+import weakref
 
 try:
     from collections.abc import MutableMapping
@@ -28,14 +28,15 @@ from pyVmomi import vim
 # Own modules
 from .datastore import VsphereDatastore
 from .datastore import VsphereDatastoreDict
-from .errors import FbVMWareRuntimeError
 from .errors import VSphereHandlerError
 from .errors import VSphereNameError
 from .errors import VSphereNoDsClusterFoundError
 from .obj import VsphereObject
+from .placement import PLACEMENT_LOCK, VspherePlacementEngine, usage_changed
+from .typed_dict import FreezableMixin
 from .xlate import XLATOR
 
-__version__ = "1.9.0"
+__version__ = "1.12.0"
 LOG = logging.getLogger(__name__)
 
 _ = XLATOR.gettext
@@ -99,6 +100,7 @@ class VsphereDsCluster(VsphereObject):
         self.compute_clusters = None
 
         self._calculated_usage = 0.0
+        self._placement_engines = weakref.WeakSet()
         self._storage_type = self.default_storage_type
 
         super(VsphereDsCluster, self).__init__(
@@ -176,6 +178,13 @@ class VsphereDsCluster(VsphereObject):
     def calculated_usage(self, value):
         val = float(value)
         self._calculated_usage = val
+        usage_changed(self)
+
+    # -----------------------------------------------------------
+    @property
+    def placement_engines(self):
+        """Return the placement engines indexing this datastore cluster."""
+        return self._placement_engines
 
     # -----------------------------------------------------------
     @property
@@ -420,7 +429,7 @@ class VsphereDsCluster(VsphereObject):
 
 
 # =============================================================================
-class VsphereDsClusterDict(MutableMapping, FbGenericBaseObject):
+class VsphereDsClusterDict(FreezableMixin, MutableMapping, FbGenericBaseObject):
     """
     A dictionary containing VsphereDsCluster objects.
 
@@ -445,6 +454,7 @@ class VsphereDsClusterDict(MutableMapping, FbGenericBaseObject):
     def __init__(self, *args, **kwargs):
         """Initialize a VsphereDsClusterDict object."""
         self._map = {}
+        self._placement_engine = None
 
         for arg in args:
             self.append(arg)
@@ -452,6 +462,7 @@ class VsphereDsClusterDict(MutableMapping, FbGenericBaseObject):
     # -------------------------------------------------------------------------
     def _set_item(self, key, cluster):
 
+        self._check_frozen()
         if not isinstance(cluster, VsphereDsCluster):
             raise TypeError(self.msg_invalid_cluster_type.format(cluster.__class__.__name__))
 
@@ -460,6 +471,7 @@ class VsphereDsClusterDict(MutableMapping, FbGenericBaseObject):
             raise KeyError(self.msg_key_not_name.format(k=key, n=cluster_name))
 
         self._map[cluster_name] = cluster
+        self._placement_engine = None
 
     # -------------------------------------------------------------------------
     def append(self, cluster):
@@ -488,6 +500,7 @@ class VsphereDsClusterDict(MutableMapping, FbGenericBaseObject):
     # -------------------------------------------------------------------------
     def _del_item(self, key, strict=True):
 
+        self._check_frozen()
         if key is None:
             raise TypeError(self.msg_none_type_error)
 
@@ -499,6 +512,7 @@ class VsphereDsClusterDict(MutableMapping, FbGenericBaseObject):
             return
 
         del self._map[cluster_name]
+        self._placement_engine = None
 
     # -------------------------------------------------------------------------
     # The next five methods are requirements of the ABC.
@@ -594,6 +608,7 @@ class VsphereDsClusterDict(MutableMapping, FbGenericBaseObject):
     # -------------------------------------------------------------------------
     def pop(self, key, *args):
         """Get the datastore cluster by its name and remove it in dict."""
+        self._check_frozen()
         if key is None:
             raise TypeError(self.msg_none_type_error)
 
@@ -601,23 +616,28 @@ class VsphereDsClusterDict(MutableMapping, FbGenericBaseObject):
         if cluster_name == "":
             raise ValueError(self.msg_empty_key_error.format(key))
 
+        self._placement_engine = None
         return self._map.pop(cluster_name, *args)
 
     # -------------------------------------------------------------------------
     def popitem(self):
         """Remove and return a arbitrary (ds cluster name and object) pair from the dictionary."""
+        self._check_frozen()
         if not len(self._map):
             return None
 
         cluster_name = self.keys()[0]
         cluster = self._map[cluster_name]
         del self._map[cluster_name]
+        self._placement_engine = None
         return (cluster_name, cluster)
 
     # -------------------------------------------------------------------------
     def clear(self):
         """Remove all items from the dictionary."""
+        self._check_frozen()
         self._map = {}
+        self._placement_engine = None
 
     # -------------------------------------------------------------------------
     def setdefault(self, key, default):
@@ -671,6 +691,27 @@ class VsphereDsClusterDict(MutableMapping, FbGenericBaseObject):
             res.append(self._map[cluster_name].as_dict(short))
         return res
 
+    # -------------------------------------------------------------------------
+    def get_placement_engine(self):
+        """
+        Return the placement engine with indexes of all datastore clusters in this dict.
+
+        The engine is created on the first call and dropped on any change of this dict.
+        """
+        with PLACEMENT_LOCK:
+            if self._placement_engine is None:
+                self._placement_engine = VspherePlacementEngine(self)
+            return self._placement_engine
+
+    # -------------------------------------------------------------------------
+    def get_search_chain(self, storage_type="any"):
+        """Return the storage types to search for the given storage type as a tuple."""
+        st_type = storage_type.lower()
+        if st_type not in SEARCH_CHAINS:
+            raise ValueError(_("Could not handle storage type {!r}.").format(storage_type))
+
+        return SEARCH_CHAINS[st_type]
+
     # -------------------------------------------------------------------------
     def search_space(
         self,
@@ -679,29 +720,24 @@ class VsphereDsClusterDict(MutableMapping, FbGenericBaseObject):
         reserve_space=True,
         compute_cluster=None,
         use_random_select=False,
+        strategy=None,
     ):
         """Find a datastore cluster with the given minimum free space and the given type."""
-        st_type = storage_type.lower()
-        search_chains = SEARCH_CHAINS
-
-        if st_type not in search_chains:
-            raise ValueError(
-                _("Could not handle storage type {}.").format(self.colored(storage_type, "RED"))
-            )
-
-        for st_tp in search_chains[st_type]:
-            ds_cluster_name = self._search_space(
-                needed_gb,
-                storage_type=st_tp,
-                reserve_space=reserve_space,
-                compute_cluster=compute_cluster,
-                use_random_select=use_random_select,
-            )
-            if ds_cluster_name:
-                LOG.debug(_("Found usable datastore cluster {!r}.").format(ds_cluster_name))
-                return ds_cluster_name
+        with PLACEMENT_LOCK:
+            for st_tp in self.get_search_chain(storage_type):
+                ds_cluster_name = self._search_space(
+                    needed_gb,
+                    storage_type=st_tp,
+                    reserve_space=reserve_space,
+                    compute_cluster=compute_cluster,
+                    use_random_select=use_random_select,
+                    strategy=strategy,
+                )
+                if ds_cluster_name:
+                    LOG.debug(_("Found usable datastore cluster {!r}.").format(ds_cluster_name))
+                    return ds_cluster_name
 
-        raise VSphereNoDsClusterFoundError(needed_gb)
+            raise VSphereNoDsClusterFoundError(needed_gb)
 
     # -------------------------------------------------------------------------
     def _search_space(
@@ -711,6 +747,7 @@ class VsphereDsClusterDict(MutableMapping, FbGenericBaseObject):
         reserve_space=True,
         compute_cluster=None,
         use_random_select=False,
+        strategy=None,
     ):
 
         LOG.debug(
@@ -720,59 +757,17 @@ class VsphereDsClusterDict(MutableMapping, FbGenericBaseObject):
         )
         LOG.debug(_("Given compute cluster: {!r}.").format(compute_cluster))
 
-        avail_dsc_names = []
-        spaces = {}
-        for dsc_name, dsc in self.items():
-            usable = True
-            if dsc.storage_type.lower() != storage_type.lower():
-                # LOG.debug(f"DS cluster {dsc_name} has wrong storage type {ds.storage_type}.")
-                continue
-            if dsc.avail_space_gb < needed_gb:
-                # LOG.debug(f"DS cluster {dsc_name} is too small with {ds.avail_space_gb:0f} GB.")
-                usable = False
-
-            if usable and compute_cluster:
-                if dsc.compute_clusters is None:
-                    msg = _(
-                        "Cannot detect connection with compute cluster {!r}, datastore cluster "
-                        "was not detailled discovered."
-                    ).format(dsc_name)
-                    raise FbVMWareRuntimeError(msg)
-                found = False
-                for cc_name in dsc.compute_clusters:
-                    # LOG.debug(f"Checking for CC {cc_name!r} == {compute_cluster!r}.")
-                    if cc_name == compute_cluster:
-                        found = True
-                        break
-                if not found:
-                    # LOG.debug(
-                    #     f"DS cluster {dsc_name} is connected with wrong computing clusters: "
-                    #     + pp(dsc.compute_clusters)
-                    # )
-                    usable = False
-
-            if usable:
-                avail_dsc_names.append(dsc_name)
-                spaces[dsc_name] = dsc.avail_space_gb
-
-        if not avail_dsc_names:
-            return None
-
         if use_random_select:
-            dsc_name = random.choice(avail_dsc_names)
-        else:
-            dsc_name = None
-            last_val = 0.0
-            for n in spaces.keys():
-                if spaces[n] > last_val:
-                    dsc_name = n
-                    last_val = spaces[n]
-
-        if reserve_space:
-            dsc = self[dsc_name]
-            dsc.calculated_usage += needed_gb
-
-        return dsc_name
+            strategy = "random"
+
+        engine = self.get_placement_engine()
+        return engine.place(
+            needed_gb,
+            storage_type,
+            compute_cluster=compute_cluster,
+            strategy=strategy,
+            reserve_space=reserve_space,
+        )
 
 
 # =============================================================================
@@ -15,6 +15,7 @@ from __future__ import absolute_import
 
 # Standard modules
 import logging
+import time
 
 # Third party modules
 from fb_tools.common import pp, to_bool
@@ -27,13 +28,16 @@ from .errors import VSphereNameError
 from .network import VsphereNetwork
 from .obj import DEFAULT_OBJ_STATUS
 from .obj import VsphereObject
+from .propset import vmodl_isinstance
 from .xlate import XLATOR
 
-__version__ = "1.1.1"
+__version__ = "1.4.0"
 LOG = logging.getLogger(__name__)
 
 _ = XLATOR.gettext
 
+DEFAULT_PORT_CACHE_TTL = 60
+
 
 # =============================================================================
 class VsphereDVS(VsphereObject):
@@ -127,6 +131,11 @@ class VsphereDVS(VsphereObject):
             setattr(self, "_" + prop, None)
 
         self._dvs = None
+        self._ports = {}
+        self._free_ports = {}
+        self._loaded = {}
+        self._reserved = set()
+        self.port_cache_ttl = DEFAULT_PORT_CACHE_TTL
 
         super(VsphereDVS, self).__init__(
             name=name,
@@ -356,43 +365,157 @@ class VsphereDVS(VsphereObject):
         return True
 
     # -------------------------------------------------------------------------
-    def search_port_keys(self, portgroup_key):
-        """Search usable ports in the current DVS by a Port Group key."""
+    def _check_dvs_ref(self):
+
         if not self._dvs:
             msg = _("No {o} reference found in VDS {n!r}.").format(
                 o="vim.DistributedVirtualSwitch", n=self.name
             )
             raise RuntimeError(msg)
 
-        port_keys = []
+    # -------------------------------------------------------------------------
+    def load_ports(self, *portgroup_keys):
+        """
+        Fetch all unconnected ports of the given Port Groups into the port cache.
+
+        All Port Groups are fetched with one single request. The keys of the fetched
+        ports are building the pools of free ports of the appropriate Port Groups,
+        replacing the existing pools of these Port Groups. Ports reserved by
+        reserve_port() are not taken into the pools, as long as they are unconnected.
+        """
+        self._check_dvs_ref()
+
         criteria = vim.dvs.PortCriteria()
         criteria.connected = False
         criteria.inside = True
-        criteria.portgroupKey = portgroup_key
+        criteria.portgroupKey = list(portgroup_keys)
+
+        for pg_key in portgroup_keys:
+            self._free_ports[pg_key] = []
+
+        fetched = set()
+        for port in self._dvs.FetchDVPorts(criteria):
+            fetched.add(port.key)
+            self._ports[port.key] = port
+            if port.portgroupKey in self._free_ports and port.key not in self._reserved:
+                self._free_ports[port.portgroupKey].append(port.key)
+
+        # Reserved ports, which are not unconnected anymore, are in use now
+        for port_key in list(self._reserved):
+            port = self._ports.get(port_key)
+            if port is not None and port.portgroupKey in portgroup_keys:
+                if port_key not in fetched:
+                    self._reserved.discard(port_key)
+
+        now = time.monotonic()
+        for pg_key in portgroup_keys:
+            self._loaded[pg_key] = now
+
+        if self.verbose > 1:
+            for pg_key in portgroup_keys:
+                msg = _("Found usable port keys for DVS {!r}:").format(self.name)
+                LOG.debug(msg + " " + pp(self._free_ports[pg_key]))
+
+    # -------------------------------------------------------------------------
+    def _port_pool_expired(self, pg_key):
+
+        if pg_key not in self._free_ports:
+            return True
+        if self.port_cache_ttl is None:
+            return False
+        return time.monotonic() - self._loaded.get(pg_key, 0) >= self.port_cache_ttl
+
+    # -------------------------------------------------------------------------
+    def ensure_ports(self, *portgroup_keys):
+        """
+        Fetch the ports of all given Port Groups, which are not in the port cache yet.
+
+        The ports of Port Groups fetched longer than port_cache_ttl seconds ago are
+        fetched again. If port_cache_ttl is None, they are never fetched again.
+        """
+        missing = []
+        for pg_key in portgroup_keys:
+            if self._port_pool_expired(pg_key) and pg_key not in missing:
+                missing.append(pg_key)
+        if missing:
+            self.load_ports(*missing)
+
+    # -------------------------------------------------------------------------
+    def clear_port_cache(self):
+        """Remove all cached ports and pools of free ports, the reservations are kept."""
+        self._ports = {}
+        self._free_ports = {}
+        self._loaded = {}
+
+    # -------------------------------------------------------------------------
+    def search_port_keys(self, portgroup_key, refresh=False):
+        """
+        Search usable ports in the current DVS by a Port Group key.
+
+        The ports are fetched only once per Port Group and port_cache_ttl, ports
+        reserved by reserve_port() are not contained in the result.
+        """
+        if refresh:
+            self.load_ports(portgroup_key)
+        else:
+            self.ensure_ports(portgroup_key)
+
+        return list(self._free_ports[portgroup_key])
+
+    # -------------------------------------------------------------------------
+    def reserve_port(self, portgroup_key):
+        """
+        Reserve a free port of the given Port Group in the port cache and return it.
+
+        The port will not be given out again by this object, until it was released
+        with release_port(). If there is no free port, None will be returned.
+        """
+        self.ensure_ports(portgroup_key)
+
+        pool = self._free_ports[portgroup_key]
+        if not pool:
+            LOG.debug(
+                _("No free port of port group {pg!r} in DVS {n!r} available.").format(
+                    pg=portgroup_key, n=self.name
+                )
+            )
+            return None
 
-        ports = self._dvs.FetchDVPorts(criteria)
-        for port in ports:
-            port_keys.append(port.key)
+        port_key = pool.pop(0)
+        self._reserved.add(port_key)
         if self.verbose > 1:
-            msg = _("Found usable port keys for DVS {!r}:").format(self.name)
-            msg += " " + pp(port_keys)
+            LOG.debug(_("Reserved port {p!r} in DVS {n!r}.").format(p=port_key, n=self.name))
+        return self._ports[port_key]
 
-        return port_keys
+    # -------------------------------------------------------------------------
+    def release_port(self, port_key):
+        """Give a port reserved by reserve_port() back to the pool of its Port Group."""
+        self._reserved.discard(port_key)
+        port = self._ports.get(port_key)
+        if port is None:
+            return
+        if self.verbose > 1:
+            LOG.debug(_("Released port {p!r} in DVS {n!r}.").format(p=port_key, n=self.name))
+        pool = self._free_ports.get(port.portgroupKey)
+        if pool is not None and port_key not in pool:
+            pool.insert(0, port_key)
 
     # -------------------------------------------------------------------------
     def find_port_by_portkey(self, port_key):
         """Find a port object by a given port key."""
-        if not self._dvs:
-            msg = _("No {o} reference found in VDS {n!r}.").format(
-                o="vim.DistributedVirtualSwitch", n=self.name
-            )
-            raise RuntimeError(msg)
+        if port_key in self._ports:
+            return self._ports[port_key]
+
+        self._check_dvs_ref()
+
+        criteria = vim.dvs.PortCriteria()
+        criteria.portKey = [port_key]
 
         obj = None
-        ports = self._dvs.FetchDVPorts()
-        for port in ports:
+        for port in self._dvs.FetchDVPorts(criteria):
             if port.key == port_key:
                 obj = port
+                self._ports[port_key] = port
 
         return obj
 
@@ -784,21 +907,37 @@ class VsphereDvPortGroup(VsphereNetwork):
 
         if hasattr(data.config, "defaultPortConfig"):
             if hasattr(data.config.defaultPortConfig, "vlan"):
-                vlan_info = data.config.defaultPortConfig.vlan
-                vlan_spec = vim.dvs.VmwareDistributedVirtualSwitch.TrunkVlanSpec
-                if isinstance(vlan_info, vlan_spec):
-                    vlanlist = []
-                    for item in vlan_info.vlanId:
-                        if item.start == item.end:
-                            vlanlist.append(str(item.start))
-                        else:
-                            vlanlist.append(str(item.start) + "-" + str(item.end))
-                    params["vlan_id"] = ",".join(vlanlist)
-                else:
-                    params["vlan_id"] = str(vlan_info.vlanId)
+                params["vlan_id"] = cls.vlan_id_of(data.config.defaultPortConfig.vlan)
 
         return params
 
+    # -------------------------------------------------------------------------
+    @staticmethod
+    def vlan_id_of(vlan_info):
+        """
+        Return the VLAN ID of the given VLAN specification of a port setting.
+
+        @param vlan_info: the 'vlan' of the default port config as pyVmomi object or DataRecord
+        @type vlan_info: vim.dvs.VmwareDistributedVirtualSwitch.VlanSpec
+
+        @return: the VLAN ID or a comma separated list of VLAN ID ranges of a trunk
+        @rtype: str or None
+        """
+        if vlan_info is None:
+            return None
+
+        vlan_spec = vim.dvs.VmwareDistributedVirtualSwitch.TrunkVlanSpec
+        if vmodl_isinstance(vlan_info, vlan_spec):
+            vlanlist = []
+            for item in vlan_info.vlanId:
+                if item.start == item.end:
+                    vlanlist.append(str(item.start))
+                else:
+                    vlanlist.append(str(item.start) + "-" + str(item.end))
+            return ",".join(vlanlist)
+
+        return str(vlan_info.vlanId)
+
     # -------------------------------------------------------------------------
     def get_params_dict(self):
         """Return a dict with all keys for init a new network object with __init__."""
@@ -811,8 +950,12 @@ class VsphereDvPortGroup(VsphereNetwork):
         return params
 
     # -------------------------------------------------------------------------
-    def get_if_backing_device(self, port):
-        """Return a backing device for a new virtual network interface."""
+    def get_if_backing_device(self, port=None):
+        """
+        Return a backing device for a new virtual network interface.
+
+        If no port is given, vSphere will assign a port of this Port Group.
+        """
         if self.verbose > 1:
             msg = _(
                 "Creating network device backing specification with a "
@@ -823,9 +966,13 @@ class VsphereDvPortGroup(VsphereNetwork):
         backing_device = vim.vm.device.VirtualEthernetCard.DistributedVirtualPortBackingInfo()
 
         backing_device.port = vim.dvs.PortConnection()
-        backing_device.port.portgroupKey = port.portgroupKey
-        backing_device.port.switchUuid = port.dvsUuid
-        backing_device.port.portKey = port.key
+        if port is None:
+            backing_device.port.portgroupKey = self.key
+            backing_device.port.switchUuid = self.dvs_uuid
+        else:
+            backing_device.port.portgroupKey = port.portgroupKey
+            backing_device.port.switchUuid = port.dvsUuid
+            backing_device.port.portKey = port.key
 
         if self.verbose > 0:
             msg = _("Got Backing device for port group {!r}:").format(self.name)
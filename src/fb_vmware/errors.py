@@ -18,7 +18,7 @@ from fb_tools.errors import FbHandlerError
 # Own modules
 from .xlate import XLATOR
 
-__version__ = "1.4.1"
+__version__ = "1.8.0"
 
 _ = XLATOR.gettext
 
@@ -210,6 +210,34 @@ class VSphereNoDsClusterFoundError(VSphereExpectedError):
         return msg
 
 
+# =============================================================================
+class VSphereReservationLedgerError(VSphereExpectedError):
+    """Error class for all errors on using a reservation ledger."""
+
+    pass
+
+
+# =============================================================================
+class VSphereCassetteError(VSphereExpectedError):
+    """Error class for all errors on recording and replaying SOAP requests."""
+
+    pass
+
+
+# =============================================================================
+class VSphereInventoryError(VSphereExpectedError):
+    """Error class for all errors of the inventory daemon and its clients."""
+
+    pass
+
+
+# =============================================================================
+class VSpherePropertySetError(VSphereExpectedError):
+    """Error class for all errors on parsing the property sets of a SOAP response."""
+
+    pass
+
+
 # =============================================================================
 class VSphereNetworkNotExistingError(VSphereExpectedError):
     """Special error class for the case, if the expected network is not existing."""
@@ -26,9 +26,11 @@ from fb_tools.xlate import format_list
 from pyVmomi import vim
 
 # Own modules
+from .propset import vmodl_isinstance
+from .propset import vmodl_type_of
 from .xlate import XLATOR
 
-__version__ = "1.1.2"
+__version__ = "1.2.0"
 LOG = logging.getLogger(__name__)
 
 _ = XLATOR.gettext
@@ -448,7 +450,7 @@ class VsphereEthernetcard(FbBaseObject):
         if test_mode:
             cls._check_summary_data(data)
         else:
-            if not isinstance(data, vim.vm.device.VirtualEthernetCard):
+            if not vmodl_isinstance(data, vim.vm.device.VirtualEthernetCard):
                 msg = _("Parameter {t!r} must be a {e}, {v!r} ({vt}) was given.").format(
                     t="data",
                     e="vim.vm.device.VirtualEthernetCard",
@@ -460,12 +462,12 @@ class VsphereEthernetcard(FbBaseObject):
         if verbose > 3:
             LOG.debug("Given ethernet card data:\n" + pp(data))
 
-        eth_class = data.__class__.__name__
-        bclass = data.backing.__class__.__name__
+        eth_class = vmodl_type_of(data).__name__
+        bclass = vmodl_type_of(data.backing).__name__
         bdev = "[unknown]"
         if hasattr(data.backing, "deviceName"):
             bdev = data.backing.deviceName
-        elif isinstance(
+        elif vmodl_isinstance(
             data.backing, vim.vm.device.VirtualEthernetCard.DistributedVirtualPortBackingInfo
         ):
             bdev = "Switch {}".format(data.backing.port.switchUuid)
@@ -515,24 +517,26 @@ class VsphereEthernetcard(FbBaseObject):
     def _get_ethertype(cls, data, verbose=0):
 
         if verbose > 2:
-            LOG.debug(_("Checking class of ethernet card: {!r}").format(data.__class__.__name__))
+            LOG.debug(
+                _("Checking class of ethernet card: {!r}").format(vmodl_type_of(data).__name__)
+            )
 
         try:
-            if isinstance(data, vim.vm.device.VirtualE1000e):
+            if vmodl_isinstance(data, vim.vm.device.VirtualE1000e):
                 return "e1000e"
-            elif isinstance(data, vim.vm.device.VirtualE1000):
+            elif vmodl_isinstance(data, vim.vm.device.VirtualE1000):
                 return "e1000"
-            elif isinstance(data, vim.vm.device.VirtualPCNet32):
+            elif vmodl_isinstance(data, vim.vm.device.VirtualPCNet32):
                 return "pcnet32"
-            elif isinstance(data, vim.vm.device.VirtualSriovEthernetCard):
+            elif vmodl_isinstance(data, vim.vm.device.VirtualSriovEthernetCard):
                 return "sriov"
-            elif isinstance(data, vim.vm.device.VirtualVmxnet2):
+            elif vmodl_isinstance(data, vim.vm.device.VirtualVmxnet2):
                 return "vmxnet2"
-            elif isinstance(data, vim.vm.device.VirtualVmxnet3Vrdma):
+            elif vmodl_isinstance(data, vim.vm.device.VirtualVmxnet3Vrdma):
                 return "vmxnet3_rdma"
-            elif isinstance(data, vim.vm.device.VirtualVmxnet3):
+            elif vmodl_isinstance(data, vim.vm.device.VirtualVmxnet3):
                 return "vmxnet3"
-            elif isinstance(data, vim.vm.device.VirtualVmxnet):
+            elif vmodl_isinstance(data, vim.vm.device.VirtualVmxnet):
                 return "vmxnet"
         except Exception:
             pass
@@ -35,13 +35,36 @@ from .errors import VSphereNameError
 from .host_port_group import VsphereHostPortgroup, VsphereHostPortgroupList
 from .obj import DEFAULT_OBJ_STATUS, OBJ_STATUS_GREEN
 from .obj import VsphereObject
+from .propset import vmodl_isinstance
 from .xlate import XLATOR
 
-__version__ = "1.3.1"
+__version__ = "1.5.0"
 LOG = logging.getLogger(__name__)
 
 _ = XLATOR.gettext
 
+# The properties of a host system needed by VsphereHost.from_properties()
+HOST_PROPERTIES = (
+    "name",
+    "summary.config.name",
+    "summary.managementServerIp",
+    "summary.rebootRequired",
+    "hardware.biosInfo",
+    "hardware.cpuInfo",
+    "hardware.memorySize",
+    "hardware.systemInfo",
+    "runtime.bootTime",
+    "runtime.connectionState",
+    "runtime.powerState",
+    "runtime.standbyMode",
+    "runtime.inMaintenanceMode",
+    "runtime.inQuarantineMode",
+    "config.product",
+    "config.network.ipV6Enabled",
+    "config.network.atBootIpV6Enabled",
+    "config.network.portgroup",
+)
+
 
 # =============================================================================
 class VsphereHostBiosInfo(FbBaseObject):
@@ -273,7 +296,7 @@ class VsphereHostBiosInfo(FbBaseObject):
                 raise AssertionError(msg)
 
         else:
-            if not isinstance(data, vim.host.BIOSInfo):
+            if not vmodl_isinstance(data, vim.host.BIOSInfo):
                 msg = _("Parameter {t!r} must be a {e}, {v!r} ({vt}) was given.").format(
                     t="data", e="vim.host.BIOSInfo", v=data, vt=data.__class__.__name__
                 )
@@ -517,11 +540,7 @@ class VsphereHost(VsphereObject):
     @property
     def online(self):
         """Return, whether this host generally online or not."""
-        if self.power_state is None:
-            return False
-        if self.power_state.lower() in ("poweredoff", "unknown"):
-            return False
-        return True
+        return self.online_by_state(self.power_state)
 
     # -----------------------------------------------------------
     @property
@@ -666,6 +685,16 @@ class VsphereHost(VsphereObject):
 
         return True
 
+    # -------------------------------------------------------------------------
+    @staticmethod
+    def online_by_state(power_state):
+        """Return, whether a host with the given power state is generally online."""
+        if power_state is None:
+            return False
+        if power_state.lower() in ("poweredoff", "unknown"):
+            return False
+        return True
+
     # -------------------------------------------------------------------------
     @classmethod
     def from_summary(
@@ -689,8 +718,83 @@ class VsphereHost(VsphereObject):
                 )
                 raise TypeError(msg)
 
-        if not data.config:
-            LOG.error(_("Host {!r} seems to be offline!").format(data.summary.config.name))
+        # Every access to a property of a managed object is a round trip
+        summary = data.summary
+        hardware = data.hardware
+        runtime = data.runtime
+        config = data.config
+
+        props = {
+            "summary.config.name": summary.config.name,
+            "summary.managementServerIp": summary.managementServerIp,
+            "summary.rebootRequired": summary.rebootRequired,
+            "hardware.biosInfo": hardware.biosInfo,
+            "hardware.cpuInfo": hardware.cpuInfo,
+            "hardware.memorySize": hardware.memorySize,
+            "hardware.systemInfo": hardware.systemInfo,
+        }
+        for field in (
+            "bootTime",
+            "connectionState",
+            "powerState",
+            "standbyMode",
+            "inMaintenanceMode",
+            "inQuarantineMode",
+        ):
+            props["runtime." + field] = getattr(runtime, field)
+        if config:
+            props["config.product"] = config.product
+            network = config.network
+            if network:
+                props["config.network.ipV6Enabled"] = network.ipV6Enabled
+                props["config.network.atBootIpV6Enabled"] = network.atBootIpV6Enabled
+                props["config.network.portgroup"] = network.portgroup
+
+        return cls.from_properties(
+            props,
+            vsphere=vsphere,
+            appname=appname,
+            verbose=verbose,
+            base_dir=base_dir,
+            dc_name=dc_name,
+            cluster_name=cluster_name,
+            test_mode=test_mode,
+        )
+
+    # -------------------------------------------------------------------------
+    @classmethod
+    def from_properties(
+        cls,
+        props,
+        vsphere=None,
+        appname=None,
+        verbose=0,
+        base_dir=None,
+        dc_name=None,
+        cluster_name=None,
+        test_mode=False,
+    ):
+        """
+        Create a new VsphereHost object from a property set of a host system.
+
+        @param props: the properties of the host with the paths of HOST_PROPERTIES as keys,
+                      as given by fb_vmware.propset
+        @type props: dict
+        @param cluster_name: the name of the cluster or the standalone host
+        @type cluster_name: str or None
+
+        @return: the new host object
+        @rtype: VsphereHost
+        """
+        host_name = props.get("summary.config.name") or props.get("name")
+        if host_name is None:
+            msg = _("The property {p!r} of a host was not retrieved.").format(
+                p="summary.config.name"
+            )
+            raise VSphereHandlerError(msg)
+
+        if props.get("config.product") is None:
+            LOG.error(_("Host {!r} seems to be offline!").format(host_name))
 
         params = {
             "vsphere": vsphere,
@@ -698,7 +802,7 @@ class VsphereHost(VsphereObject):
             "verbose": verbose,
             "base_dir": base_dir,
             "initialized": True,
-            "name": data.summary.config.name,
+            "name": host_name,
             "dc_name": dc_name,
             "cluster_name": cluster_name,
             "status": DEFAULT_OBJ_STATUS,
@@ -711,52 +815,60 @@ class VsphereHost(VsphereObject):
         host = cls(**params)
 
         host.bios = VsphereHostBiosInfo.from_summary(
-            data.hardware.biosInfo,
+            props.get("hardware.biosInfo"),
             appname=appname,
             verbose=verbose,
             base_dir=base_dir,
             test_mode=test_mode,
         )
 
-        host.cpu_speed = data.hardware.cpuInfo.hz
-        host.cpu_cores = data.hardware.cpuInfo.numCpuCores
-        host.cpu_pkgs = data.hardware.cpuInfo.numCpuPackages
-        host.cpu_threads = data.hardware.cpuInfo.numCpuThreads
-        host.memory = data.hardware.memorySize
+        cpu_info = props.get("hardware.cpuInfo")
+        host.cpu_speed = cpu_info.hz
+        host.cpu_cores = cpu_info.numCpuCores
+        host.cpu_pkgs = cpu_info.numCpuPackages
+        host.cpu_threads = cpu_info.numCpuThreads
+        host.memory = props.get("hardware.memorySize")
 
-        host.model = data.hardware.systemInfo.model
+        system_info = props.get("hardware.systemInfo")
+        host.model = system_info.model
         try:
-            host.uuid = uuid.UUID(data.hardware.systemInfo.uuid)
+            host.uuid = uuid.UUID(system_info.uuid)
         except Exception:
-            host.uuid = data.hardware.systemInfo.uuid
-        host.vendor = data.hardware.systemInfo.vendor
+            host.uuid = system_info.uuid
+        host.vendor = system_info.vendor
 
-        host.boot_time = data.runtime.bootTime
-        host.connection_state = data.runtime.connectionState
-        host.power_state = data.runtime.powerState
-        host.standby = data.runtime.standbyMode
-        host.maintenance = data.runtime.inMaintenanceMode
-        host.quarantaine = data.runtime.inQuarantineMode
+        host.boot_time = props.get("runtime.bootTime")
+        host.connection_state = props.get("runtime.connectionState")
+        host.power_state = props.get("runtime.powerState")
+        host.standby = props.get("runtime.standbyMode")
+        host.maintenance = props.get("runtime.inMaintenanceMode")
+        host.quarantaine = props.get("runtime.inQuarantineMode")
 
-        host.mgmt_ip = data.summary.managementServerIp
-        host.reboot_required = data.summary.rebootRequired
+        host.mgmt_ip = props.get("summary.managementServerIp")
+        host.reboot_required = props.get("summary.rebootRequired")
 
         host.product = None
-        if data.config:
+        product = props.get("config.product")
+        if product is not None:
             host.product = VsphereAboutInfo.from_summary(
-                data.config.product,
+                product,
                 appname=appname,
                 verbose=verbose,
                 base_dir=base_dir,
                 test_mode=test_mode,
             )
-            if data.config.network:
-                host.ipv6_enabled = data.config.network.ipV6Enabled
-                host.atboot_ipv6_enabled = data.config.network.atBootIpV6Enabled
+            network_paths = (
+                "config.network.ipV6Enabled",
+                "config.network.atBootIpV6Enabled",
+                "config.network.portgroup",
+            )
+            if any(path in props for path in network_paths):
+                host.ipv6_enabled = props.get("config.network.ipV6Enabled")
+                host.atboot_ipv6_enabled = props.get("config.network.atBootIpV6Enabled")
                 host.portgroups = VsphereHostPortgroupList(
                     appname=appname, verbose=verbose, base_dir=base_dir, hostname=host.name
                 )
-                for pg_data in data.config.network.portgroup:
+                for pg_data in props.get("config.network.portgroup") or []:
                     pgroup = VsphereHostPortgroup.from_summary(
                         pg_data,
                         hostname=host.name,
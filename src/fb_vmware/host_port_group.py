@@ -26,9 +26,10 @@ from fb_tools.xlate import format_list
 from pyVmomi import vim
 
 # Own modules
+from .propset import vmodl_isinstance
 from .xlate import XLATOR
 
-__version__ = "1.0.3"
+__version__ = "1.1.0"
 LOG = logging.getLogger(__name__)
 
 _ = XLATOR.gettext
@@ -218,7 +219,7 @@ class VsphereHostPortgroup(FbBaseObject):
                 raise AssertionError(msg)
 
         else:
-            if not isinstance(data, vim.host.PortGroup):
+            if not vmodl_isinstance(data, vim.host.PortGroup):
                 msg = _("Parameter {t!r} must be a {e}, {v!r} ({vt}) was given.").format(
                     t="data", e="vim.host.PortGroup", v=data, vt=data.__class__.__name__
                 )
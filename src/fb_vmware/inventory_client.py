@@ -0,0 +1,280 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+@summary: A module for a client of the inventory daemon fb-vmware-inventoryd.
+
+The daemon is answering JSON queries either on a Unix socket or on a HTTP
+port of the localhost. The address of the daemon is either given explicitly,
+or taken from the environment variable FB_VMWARE_INVENTORYD, or the default
+Unix socket is used.
+
+@author: Frank Brehm
+@contact: frank@brehm-online.com
+@copyright: © 2022 - 2026 by Frank Brehm, Berlin
+"""
+from __future__ import absolute_import
+
+# Standard modules
+import json
+import logging
+import os
+import socket
+import tempfile
+from http.client import HTTPConnection, HTTPException
+from urllib.parse import urlencode, urlsplit
+
+# Third party modules
+from fb_tools.obj import FbGenericBaseObject
+
+# Own modules
+from .errors import VSphereInventoryError
+from .xlate import XLATOR
+
+__version__ = "0.1.1"
+
+LOG = logging.getLogger(__name__)
+
+_ = XLATOR.gettext
+
+INVENTORYD_ENV = "FB_VMWARE_INVENTORYD"
+INVENTORYD_SOCKET_NAME = "fb-vmware-inventoryd.sock"
+DEFAULT_INVENTORYD_PORT = 8730
+DEFAULT_CLIENT_TIMEOUT = 30
+DEFAULT_WAIT_SECONDS = 30
+DEFAULT_RESYNC_INTERVAL = 3600
+
+
+# =============================================================================
+def default_socket_path():
+    """Return the path of the default Unix socket of the inventory daemon."""
+    run_dir = os.environ.get("XDG_RUNTIME_DIR")
+    if not run_dir:
+        run_dir = tempfile.gettempdir()
+    return os.path.join(run_dir, INVENTORYD_SOCKET_NAME)
+
+
+# =============================================================================
+def default_address():
+    """Return the address of the inventory daemon from the environment or the default socket."""
+    address = os.environ.get(INVENTORYD_ENV, "").strip()
+    if address:
+        return address
+    return default_socket_path()
+
+
+# =============================================================================
+class InventoryRecord(dict):
+    """
+    A record of the inventory as a dict with access of its items as attributes.
+
+    Nested dicts are returned also as InventoryRecord objects, so the records can
+    be used in place of the VsphereVm, VsphereHost a.s.o. objects for reading.
+    """
+
+    # -------------------------------------------------------------------------
+    def __getattr__(self, name):
+        """Return the item with the given name."""
+        if name.startswith("__"):
+            raise AttributeError(name)
+        try:
+            value = self[name]
+        except KeyError:
+            raise AttributeError(name)
+        if isinstance(value, dict) and not isinstance(value, InventoryRecord):
+            return InventoryRecord(value)
+        return value
+
+    # -------------------------------------------------------------------------
+    def as_dict(self, short=True):
+        """Return the record as a plain dict."""
+        return dict(self)
+
+
+# =============================================================================
+class UnixHTTPConnection(HTTPConnection):
+    """A HTTP connection over a Unix socket."""
+
+    # -------------------------------------------------------------------------
+    def __init__(self, path, timeout=DEFAULT_CLIENT_TIMEOUT):
+        """Initialize a UnixHTTPConnection object."""
+        super(UnixHTTPConnection, self).__init__("localhost", timeout=timeout)
+        self.path = path
+
+    # -------------------------------------------------------------------------
+    def connect(self):
+        """Connect to the Unix socket."""
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.settimeout(self.timeout)
+        sock.connect(self.path)
+        self.sock = sock
+
+
+# =============================================================================
+class VsphereInventoryClient(FbGenericBaseObject):
+    """A client of the inventory daemon fb-vmware-inventoryd."""
+
+    # -------------------------------------------------------------------------
+    def __init__(self, address=None, timeout=DEFAULT_CLIENT_TIMEOUT):
+        """
+        Initialize a VsphereInventoryClient object.
+
+        @param address: the path of the Unix socket or a URL like 'http://localhost:8730'
+                        of the daemon, if None the address is taken from the environment
+                        variable FB_VMWARE_INVENTORYD or the default socket is used.
+        @type address: str or None
+        """
+        if not address:
+            address = default_address()
+        self.address = str(address)
+        self.timeout = timeout
+
+        self.socket_path = None
+        self.host = None
+        self.port = None
+        if "://" in self.address:
+            url = urlsplit(self.address)
+            if url.scheme != "http":
+                msg = _("Invalid URL {!r} of the inventory daemon, only 'http' is supported.")
+                raise VSphereInventoryError(msg.format(self.address))
+            self.host = url.hostname or "localhost"
+            self.port = url.port or DEFAULT_INVENTORYD_PORT
+        else:
+            self.socket_path = self.address
+
+    # -------------------------------------------------------------------------
+    def __repr__(self):
+        """Typecasting into a string for reproduction."""
+        return "<{c}(address={a!r}, timeout={t!r})>".format(
+            c=self.__class__.__name__, a=self.address, t=self.timeout
+        )
+
+    # -------------------------------------------------------------------------
+    def _connection(self):
+
+        if self.socket_path:
+            return UnixHTTPConnection(self.socket_path, timeout=self.timeout)
+        return HTTPConnection(self.host, self.port, timeout=self.timeout)
+
+    # -------------------------------------------------------------------------
+    def request(self, path, method="GET", **params):
+        """
+        Send a query to the daemon and return the decoded result.
+
+        Parameters with a value of None are omitted.
+        """
+        query = {}
+        for (key, value) in params.items():
+            if value is None:
+                continue
+            if isinstance(value, bool):
+                value = "yes" if value else "no"
+            query[key] = str(value)
+        url = "/" + path.lstrip("/")
+        if query:
+            url += "?" + urlencode(query)
+
+        conn = self._connection()
+        try:
+            conn.request(method, url, headers={"Accept": "application/json"})
+            response = conn.getresponse()
+            body = response.read()
+        except (OSError, HTTPException) as e:
+            msg = _("Could not query the inventory daemon on {a!r}: {e}").format(
+                a=self.address, e=e
+            )
+            raise VSphereInventoryError(msg)
+        finally:
+            conn.close()
+
+        try:
+            data = json.loads(body.decode("utf-8"))
+        except ValueError as e:
+            msg = _("Invalid response of the inventory daemon on {a!r}: {e}").format(
+                a=self.address, e=e
+            )
+            raise VSphereInventoryError(msg)
+
+        if response.status != 200 or data.get("status") != "ok":
+            msg = _("The inventory daemon answered with an error: {}").format(
+                data.get("error", response.reason)
+            )
+            raise VSphereInventoryError(msg)
+
+        return data.get("result")
+
+    # -------------------------------------------------------------------------
+    def _records(self, path, **params):
+
+        return [InventoryRecord(r) for r in self.request(path, **params)]
+
+    # -------------------------------------------------------------------------
+    def ping(self):
+        """Return, whether the daemon is answering."""
+        try:
+            self.request("ping")
+        except VSphereInventoryError as e:
+            LOG.debug(str(e))
+            return False
+        return True
+
+    # -------------------------------------------------------------------------
+    def vspheres(self):
+        """Return the states of all vSphere instances known by the daemon."""
+        return self._records("vspheres")
+
+    # -------------------------------------------------------------------------
+    def vms(self, vsphere=None, pattern=None, template=None):
+        """Return the VMs, maybe filtered by vSphere, name pattern and being a template."""
+        return self._records("vms", vsphere=vsphere, pattern=pattern, template=template)
+
+    # -------------------------------------------------------------------------
+    def hosts(self, vsphere=None, pattern=None):
+        """Return the physical hosts, maybe filtered by vSphere and name pattern."""
+        return self._records("hosts", vsphere=vsphere, pattern=pattern)
+
+    # -------------------------------------------------------------------------
+    def datastores(self, vsphere=None, pattern=None, no_local=None):
+        """Return the datastores, maybe filtered by vSphere and name pattern."""
+        return self._records("datastores", vsphere=vsphere, pattern=pattern, no_local=no_local)
+
+    # -------------------------------------------------------------------------
+    def ds_clusters(self, vsphere=None, pattern=None):
+        """Return the datastore clusters, maybe filtered by vSphere and name pattern."""
+        return self._records("ds_clusters", vsphere=vsphere, pattern=pattern)
+
+    # -------------------------------------------------------------------------
+    def networks(self, vsphere=None, pattern=None):
+        """Return the networks and distributed port groups, maybe filtered."""
+        return self._records("networks", vsphere=vsphere, pattern=pattern)
+
+    # -------------------------------------------------------------------------
+    def placement(
+        self, size_gb, storage_type="any", vsphere=None, compute_cluster=None, strategy=None
+    ):
+        """Return the best storage location for a disk of the given size, or None."""
+        result = self.request(
+            "placement",
+            size_gb=size_gb,
+            storage_type=storage_type,
+            vsphere=vsphere,
+            compute_cluster=compute_cluster,
+            strategy=strategy,
+        )
+        if result is None:
+            return None
+        return InventoryRecord(result)
+
+    # -------------------------------------------------------------------------
+    def refresh(self, vsphere=None):
+        """Request a full reload of the inventory of the given or all vSphere instances."""
+        return self.request("refresh", method="POST", vsphere=vsphere)
+
+
+# =============================================================================
+if __name__ == "__main__":
+
+    pass
+
+# =============================================================================
+
+# vim: tabstop=4 expandtab shiftwidth=4 softtabstop=4 list
@@ -0,0 +1,1048 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+@summary: A module for the inventory service of the daemon fb-vmware-inventoryd.
+
+The service keeps a session to every vSphere and an inventory of the VMs,
+hosts, datastores, datastore clusters and networks in memory. After an
+initial full load the inventory is kept up to date by a property filter and
+WaitForUpdatesEx() of the property collector: changed VMs are converted again
+one by one, on changes of other objects the respective kind is reloaded.
+
+The inventory is served as JSON records over a Unix socket or a HTTP port on
+the localhost, see fb_vmware.inventory_client for the client side.
+
+@author: Frank Brehm
+@contact: frank@brehm-online.com
+@copyright: © 2022 - 2026 by Frank Brehm, Berlin
+"""
+from __future__ import absolute_import
+
+# Standard modules
+import datetime
+import ipaddress
+import json
+import logging
+import os
+import re
+import socket
+import socketserver
+import stat
+import threading
+import time
+from collections.abc import Iterable, Mapping
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+# Third party modules
+from fb_tools.common import to_bool
+from fb_tools.obj import FbGenericBaseObject
+
+from pyVmomi import vim, vmodl
+from pyVmomi.VmomiSupport import ManagedObject
+
+# Own modules
+from .connect import VsphereConnection
+from .errors import VSphereInventoryError
+from .inventory_client import DEFAULT_RESYNC_INTERVAL, DEFAULT_WAIT_SECONDS
+from .inventory_client import VsphereInventoryClient
+from .placement import VsphereStorageSearch
+from .vm import VsphereVm
+from .xlate import XLATOR
+
+__version__ = "0.2.2"
+
+LOG = logging.getLogger(__name__)
+
+_ = XLATOR.gettext
+
+INVENTORY_KINDS = ("vms", "hosts", "datastores", "ds_clusters", "networks")
+
+DEFAULT_RETRY_DELAY = 10
+DEFAULT_INITIAL_WAIT = 120
+MAX_INCREMENTAL_VMS = 200
+
+VM_FIELDS = (
+    "name",
+    "vsphere",
+    "dc_name",
+    "cluster_name",
+    "path",
+    "template",
+    "online",
+    "power_state",
+    "host",
+    "config_version",
+    "guest_id",
+    "guest_fullname",
+    "num_cpu",
+    "memory_mb",
+    "num_vdisk",
+    "num_ethernet",
+    "uuid",
+    "instance_uuid",
+    "config_path",
+)
+
+HOST_FIELDS = (
+    "name",
+    "vsphere",
+    "dc_name",
+    "cluster_name",
+    "connection_state",
+    "power_state",
+    "online",
+    "maintenance",
+    "quarantaine",
+    "standby",
+    "reboot_required",
+    "cpu_cores",
+    "cpu_threads",
+    "memory_gb",
+    "vendor",
+    "model",
+    "uuid",
+    "mgmt_ip",
+    "boot_time",
+    "portgroups",
+)
+
+ABOUT_FIELDS = ("name", "full_name", "vendor", "os_version", "os_type", "api_version")
+
+DATASTORE_FIELDS = (
+    "name",
+    "vsphere",
+    "dc_name",
+    "cluster",
+    "storage_type",
+    "accessible",
+    "capacity_gb",
+    "free_space_gb",
+    "avail_space_gb",
+    "maintenance_mode",
+    "fs_type",
+    "url",
+    "hosts",
+    "compute_clusters",
+)
+
+DS_CLUSTER_FIELDS = (
+    "name",
+    "vsphere",
+    "dc_name",
+    "storage_type",
+    "capacity_gb",
+    "free_space_gb",
+    "avail_space_gb",
+)
+
+NETWORK_FIELDS = ("name", "vsphere", "dc_name", "accessible", "network")
+
+DV_PORTGROUP_FIELDS = NETWORK_FIELDS + (
+    "dvs_uuid",
+    "key",
+    "vlan_id",
+    "pg_type",
+    "uplink",
+    "num_ports",
+    "description",
+)
+
+# The watched managed object types with the inventory kind to update
+# and the properties indicating a change
+WATCHED_TYPES = (
+    (
+        vim.VirtualMachine,
+        "vms",
+        (
+            "name",
+            "parent",
+            "resourcePool",
+            "summary.config",
+            "summary.runtime.powerState",
+            "summary.runtime.host",
+        ),
+    ),
+    (
+        vim.HostSystem,
+        "hosts",
+        (
+            "name",
+            "parent",
+            "runtime.connectionState",
+            "runtime.inMaintenanceMode",
+            "runtime.powerState",
+        ),
+    ),
+    (vim.Datastore, "storage", ("name", "parent", "summary")),
+    (vim.StoragePod, "storage", ("name", "parent", "summary")),
+    (vim.Network, "networks", ("name", "parent", "summary.accessible")),
+    (vim.DistributedVirtualSwitch, "networks", ("name", "parent")),
+)
+
+
+# =============================================================================
+def to_json_value(value):
+    """Convert the given value of an inventory object into a JSON serializable value."""
+    if value is None or isinstance(value, (bool, int, float, str)):
+        return value
+    if isinstance(value, (datetime.datetime, datetime.date)):
+        return value.isoformat()
+    if isinstance(value, (ipaddress._BaseAddress, ipaddress._BaseNetwork)):
+        return str(value)
+    if isinstance(value, ManagedObject):
+        return value._moId
+    if isinstance(value, Mapping):
+        return {str(k): to_json_value(v) for (k, v) in value.items()}
+    if isinstance(value, (set, frozenset)):
+        return sorted((to_json_value(v) for v in value), key=str)
+    if isinstance(value, Iterable):
+        return [to_json_value(v) for v in value]
+    name = getattr(value, "name", None)
+    if isinstance(name, str):
+        return name
+    return str(value)
+
+
+# =============================================================================
+def make_record(obj, fields, **extra):
+    """Return a dict with the given fields of the inventory object for serving it as JSON."""
+    record = {}
+    for field in fields:
+        record[field] = to_json_value(getattr(obj, field, None))
+    record.update(extra)
+    return record
+
+
+# =============================================================================
+class VsphereInventory(FbGenericBaseObject):
+    """
+    The inventory of one vSphere, kept up to date in a background thread.
+
+    The records of each kind are stored in a dict, which is replaced as a whole
+    on every change, so readers are never seeing a half updated inventory.
+    """
+
+    # -------------------------------------------------------------------------
+    def __init__(
+        self,
+        name,
+        connection,
+        wait_seconds=DEFAULT_WAIT_SECONDS,
+        resync_interval=DEFAULT_RESYNC_INTERVAL,
+        retry_delay=DEFAULT_RETRY_DELAY,
+    ):
+        """Initialize a VsphereInventory object."""
+        if not isinstance(connection, VsphereConnection):
+            msg = _("The given parameter {pc!r} ({pv!r}) is not a {o} object.").format(
+                pc="connection", pv=connection, o="VsphereConnection"
+            )
+            raise VSphereInventoryError(msg)
+
+        self.name = name
+        self.connection = connection
+        self.wait_seconds = int(wait_seconds)
+        self.resync_interval = resync_interval
+        self.retry_delay = retry_delay
+
+        self.datastores = None
+        self.ds_clusters = None
+        self.loaded_at = None
+        self.updated_at = None
+        self.error = None
+        self.generation = 0
+        self.full_loads = 0
+        self.updates = 0
+
+        self._records = {kind: {} for kind in INVENTORY_KINDS}
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._loaded = threading.Event()
+        self._resync = threading.Event()
+        self._wait_lock = threading.Lock()
+        self._waiting = None
+        self._thread = None
+        self._view = None
+        self._filter = None
+        self._version = None
+        self._last_full_load = None
+        self._name_table = None
+
+    # -------------------------------------------------------------------------
+    def __repr__(self):
+        """Typecasting into a string for reproduction."""
+        return "<{c}(name={n!r}, wait_seconds={w!r}, resync_interval={r!r})>".format(
+            c=self.__class__.__name__, n=self.name, w=self.wait_seconds, r=self.resync_interval
+        )
+
+    # -----------------------------------------------------------
+    @property
+    def loaded(self):
+        """Return, whether the inventory was loaded at least once."""
+        return self._loaded.is_set()
+
+    # -------------------------------------------------------------------------
+    def start(self):
+        """Start the background thread loading and updating the inventory."""
+        if self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._run, name="inventory-{}".format(self.name), daemon=True
+        )
+        self._thread.start()
+
+    # -------------------------------------------------------------------------
+    def stop(self, timeout=None):
+        """Stop the background thread and wait for its end."""
+        self.request_stop()
+        self.join(timeout)
+
+    # -------------------------------------------------------------------------
+    def request_stop(self):
+        """
+        Tell the background thread to stop without waiting for its end.
+
+        A pending WaitForUpdatesEx() is cancelled in a separate thread, so the
+        background thread does not wait for the end of the long poll.
+        """
+        with self._wait_lock:
+            self._stop.set()
+            collector = self._waiting
+        if collector is not None:
+            threading.Thread(
+                target=self._cancel_wait,
+                args=(collector,),
+                name="cancel-{}".format(self.name),
+                daemon=True,
+            ).start()
+
+    # -------------------------------------------------------------------------
+    def join(self, timeout=None):
+        """Wait for the end of the background thread after requesting its stop."""
+        if self._thread is not None:
+            if timeout is None:
+                timeout = self.wait_seconds + 5
+            self._thread.join(timeout)
+            self._thread = None
+
+    # -------------------------------------------------------------------------
+    def _cancel_wait(self, collector):
+
+        try:
+            collector.CancelWaitForUpdates()
+        except Exception as e:
+            LOG.debug(
+                _("Could not cancel waiting for updates of vSphere {n!r}: {e}").format(
+                    n=self.name, e=e
+                )
+            )
+
+    # -------------------------------------------------------------------------
+    def wait_loaded(self, timeout=None):
+        """Wait for the initial load of the inventory, return whether it is loaded."""
+        return self._loaded.wait(timeout)
+
+    # -------------------------------------------------------------------------
+    def request_resync(self):
+        """Request a full reload of the inventory."""
+        self._resync.set()
+
+    # -------------------------------------------------------------------------
+    def records(self, kind):
+        """Return a list of all records of the given kind."""
+        with self._lock:
+            return list(self._records[kind].values())
+
+    # -------------------------------------------------------------------------
+    def state(self):
+        """Return the state of the inventory as a dict."""
+        with self._lock:
+            counts = {kind: len(self._records[kind]) for kind in INVENTORY_KINDS}
+
+        def _ts(value):
+            if value is None:
+                return None
+            return datetime.datetime.fromtimestamp(value, datetime.timezone.utc).isoformat()
+
+        return {
+            "name": self.name,
+            "host": self.connection.connect_info.host,
+            "loaded": self.loaded,
+            "loaded_at": _ts(self.loaded_at),
+            "updated_at": _ts(self.updated_at),
+            "generation": self.generation,
+            "full_loads": self.full_loads,
+            "updates": self.updates,
+            "error": self.error,
+            "counts": counts,
+        }
+
+    # -------------------------------------------------------------------------
+    def _set_records(self, kind, records):
+
+        with self._lock:
+            self._records[kind] = records
+            self.generation += 1
+        self.updated_at = time.time()
+
+    # -------------------------------------------------------------------------
+    def _run(self):
+
+        need_full = True
+        while not self._stop.is_set():
+            try:
+                if not self.connection.service_instance:
+                    self.connection.connect()
+                    need_full = True
+
+                if need_full or self._resync.is_set():
+                    self._resync.clear()
+                    self._sync()
+                    need_full = False
+                    continue
+
+                update = self._wait_for_updates()
+                if update is not None:
+                    self._version = update.version
+                    self._apply(update)
+
+                if self.resync_interval and self._last_full_load is not None:
+                    if time.monotonic() - self._last_full_load >= self.resync_interval:
+                        LOG.debug(_("Periodic full reload of inventory {!r}.").format(self.name))
+                        need_full = True
+
+            except Exception as e:
+                if self._stop.is_set():
+                    LOG.debug(
+                        _("Stopped updating the inventory of vSphere {n!r}: {e}").format(
+                            n=self.name, e=e
+                        )
+                    )
+                    break
+                self.error = "{c}: {e}".format(c=e.__class__.__name__, e=e)
+                LOG.error(
+                    _("Error on updating the inventory of vSphere {n!r}: {e}").format(
+                        n=self.name, e=self.error
+                    )
+                )
+                self._close_session()
+                need_full = True
+                self._stop.wait(self.retry_delay)
+
+        self._close_session()
+
+    # -------------------------------------------------------------------------
+    def _close_session(self):
+
+        for obj in (self._filter, self._view):
+            if obj is None:
+                continue
+            try:
+                obj.Destroy() if isinstance(obj, vim.view.View) else obj.DestroyPropertyFilter()
+            except Exception as e:
+                LOG.debug(_("Could not destroy {o!r}: {e}").format(o=obj, e=e))
+        self._filter = None
+        self._view = None
+        self._version = None
+        try:
+            self.connection.disconnect()
+        except Exception as e:
+            LOG.debug(_("Could not disconnect from vSphere {n!r}: {e}").format(n=self.name, e=e))
+            self.connection.service_instance = None
+
+    # -------------------------------------------------------------------------
+    def _sync(self):
+
+        LOG.info(_("Loading the complete inventory of vSphere {!r} ...").format(self.name))
+        start = time.monotonic()
+
+        # The filter is created and synchronized before the full load, so no
+        # change during the load gets lost.
+        if self._filter is None:
+            self._create_filter()
+        update = self._wait_for_updates(version="")
+        if update is not None:
+            self._version = update.version
+
+        self._load_vms()
+        self._load_hosts()
+        self._load_storage()
+        self._load_networks()
+
+        self._last_full_load = time.monotonic()
+        self.loaded_at = time.time()
+        self.full_loads += 1
+        self.error = None
+        self._loaded.set()
+        LOG.info(
+            _("Loaded the inventory of vSphere {n!r} in {s:0.2f} seconds.").format(
+                n=self.name, s=time.monotonic() - start
+            )
+        )
+
+    # -------------------------------------------------------------------------
+    def _create_filter(self):
+
+        content = self.connection.service_instance.RetrieveContent()
+        self._view = content.viewManager.CreateContainerView(
+            content.rootFolder, [t[0] for t in WATCHED_TYPES], True
+        )
+
+        pc = vmodl.query.PropertyCollector
+        traversal = pc.TraversalSpec(
+            name="traverseView", path="view", skip=False, type=vim.view.ContainerView
+        )
+        obj_spec = pc.ObjectSpec(obj=self._view, skip=True, selectSet=[traversal])
+        prop_set = []
+        for (mo_type, kind, paths) in WATCHED_TYPES:
+            prop_set.append(pc.PropertySpec(type=mo_type, pathSet=list(paths)))
+        spec = pc.FilterSpec(objectSet=[obj_spec], propSet=prop_set)
+        self._filter = content.propertyCollector.CreateFilter(spec, True)
+        self._version = ""
+
+    # -------------------------------------------------------------------------
+    def _wait_for_updates(self, version=None):
+
+        if version is None:
+            version = self._version
+        collector = self.connection.service_instance.content.propertyCollector
+        options = vmodl.query.PropertyCollector.WaitOptions(maxWaitSeconds=self.wait_seconds)
+        with self._wait_lock:
+            if self._stop.is_set():
+                return None
+            self._waiting = collector
+        try:
+            return collector.WaitForUpdatesEx(version, options)
+        finally:
+            with self._wait_lock:
+                self._waiting = None
+
+    # -------------------------------------------------------------------------
+    def _kind_of(self, obj):
+
+        for (mo_type, kind, paths) in WATCHED_TYPES:
+            if isinstance(obj, mo_type):
+                return kind
+        return None
+
+    # -------------------------------------------------------------------------
+    def _apply(self, update):
+
+        changed_kinds = set()
+        changed_vms = {}
+        removed_vms = set()
+        for filter_update in update.filterSet:
+            for obj_update in filter_update.objectSet:
+                kind = self._kind_of(obj_update.obj)
+                if kind != "vms":
+                    if kind:
+                        changed_kinds.add(kind)
+                    continue
+                if obj_update.kind == "leave":
+                    removed_vms.add(obj_update.obj._moId)
+                else:
+                    changed_vms[obj_update.obj._moId] = obj_update.obj
+
+        if self.connection.verbose > 1:
+            LOG.debug(
+                _("Changes in vSphere {n!r}: {v} VMs, {r} removed VMs, kinds {k}.").format(
+                    n=self.name, v=len(changed_vms), r=len(removed_vms), k=sorted(changed_kinds)
+                )
+            )
+
+        if len(changed_vms) > MAX_INCREMENTAL_VMS:
+            self._load_vms()
+        elif changed_vms or removed_vms:
+            self._update_vms(changed_vms, removed_vms)
+
+        if "hosts" in changed_kinds:
+            self._load_hosts()
+        if "storage" in changed_kinds:
+            self._load_storage()
+        if "networks" in changed_kinds:
+            self._load_networks()
+
+        self.updates += 1
+
+    # -------------------------------------------------------------------------
+    def _vm_record(self, mo, path, dc_name):
+
+        vm = VsphereVm.from_summary(
+            mo,
+            path,
+            vsphere=self.name,
+            dc_name=dc_name,
+            appname=self.connection.appname,
+            verbose=self.connection.verbose,
+            base_dir=self.connection.base_dir,
+            name_table=self._name_table,
+        )
+        return make_record(vm, VM_FIELDS, moid=mo._moId)
+
+    # -------------------------------------------------------------------------
+    def _load_vms(self):
+
+        conn = self.connection
+        conn.get_datacenters()
+        # Later updates are resolving new hosts or clusters by themselves
+        self._name_table = conn.get_name_table(lazy=True)
+        content = conn.service_instance.RetrieveContent()
+        records = {}
+        for dc_name in conn.datacenters.keys():
+            dc = conn.get_obj(content, [vim.Datacenter], dc_name)
+            for child in dc.vmFolder.childEntity:
+                self._walk_vms(child, "/", dc_name, 1, records)
+        self._set_records("vms", records)
+
+    # -------------------------------------------------------------------------
+    def _walk_vms(self, entry, parent_path, dc_name, depth, records):
+
+        if isinstance(entry, vim.VirtualMachine):
+            try:
+                records[entry._moId] = self._vm_record(entry, parent_path, dc_name)
+            except Exception as e:
+                LOG.warning(_("Could not evaluate VM {v!r}: {e}").format(v=entry._moId, e=e))
+
+        if hasattr(entry, "childEntity"):
+            if depth > self.connection.max_search_depth:
+                return
+            if parent_path != "/":
+                cur_path = parent_path + "/" + entry.name
+            else:
+                cur_path = "/" + entry.name
+            for child in entry.childEntity:
+                self._walk_vms(child, cur_path, dc_name, depth + 1, records)
+
+    # -------------------------------------------------------------------------
+    def _vm_location(self, mo):
+
+        names = []
+        obj = mo.parent
+        while obj is not None:
+            parent = obj.parent
+            if isinstance(parent, vim.Datacenter):
+                return (parent.name, "/" + "/".join(reversed(names)))
+            names.append(obj.name)
+            obj = parent
+        return None
+
+    # -------------------------------------------------------------------------
+    def _update_vms(self, changed_vms, removed_vms):
+
+        with self._lock:
+            records = dict(self._records["vms"])
+
+        for moid in removed_vms:
+            records.pop(moid, None)
+
+        for (moid, mo) in changed_vms.items():
+            try:
+                location = self._vm_location(mo)
+                if location is None:
+                    LOG.debug(_("Could not locate VM {!r}, reloading all VMs.").format(moid))
+                    self._load_vms()
+                    return
+                records[moid] = self._vm_record(mo, location[1], location[0])
+            except vmodl.fault.ManagedObjectNotFound:
+                records.pop(moid, None)
+
+        self._set_records("vms", records)
+
+    # -------------------------------------------------------------------------
+    def _load_hosts(self):
+
+        conn = self.connection
+        conn.get_hosts(vsphere_name=self.name)
+        records = {}
+        for (host_name, host) in conn.hosts.items():
+            product = None
+            if host.product:
+                product = make_record(host.product, ABOUT_FIELDS)
+            records[host_name] = make_record(host, HOST_FIELDS, product=product)
+        self._set_records("hosts", records)
+
+    # -------------------------------------------------------------------------
+    def _load_storage(self):
+
+        conn = self.connection
+        conn.get_storages(
+            vsphere_name=self.name, no_local_ds=False, warn_if_empty=False, detailled=True
+        )
+        datastores = {n: make_record(ds, DATASTORE_FIELDS) for (n, ds) in conn.datastores.items()}
+        ds_clusters = {
+            n: make_record(dsc, DS_CLUSTER_FIELDS) for (n, dsc) in conn.ds_clusters.items()
+        }
+        with self._lock:
+            self.datastores = conn.datastores
+            self.ds_clusters = conn.ds_clusters
+        self._set_records("datastores", datastores)
+        self._set_records("ds_clusters", ds_clusters)
+
+    # -------------------------------------------------------------------------
+    def _load_networks(self):
+
+        conn = self.connection
+        conn.dvs = {}
+        conn.get_networks(vsphere_name=self.name)
+        records = {}
+        for (net_name, net) in conn.networks.items():
+            records[net_name] = make_record(net, NETWORK_FIELDS, kind="network")
+        for (net_name, dvpg) in conn.dv_portgroups.items():
+            dvs_name = None
+            if dvpg.dvs_uuid in conn.dvs:
+                dvs_name = conn.dvs[dvpg.dvs_uuid].name
+            records[net_name] = make_record(
+                dvpg, DV_PORTGROUP_FIELDS, kind="dv_portgroup", dvs=dvs_name
+            )
+        self._set_records("networks", records)
+
+    # -------------------------------------------------------------------------
+    def storage_search(self, strategy=None):
+        """Return a VsphereStorageSearch over the current datastores and datastore clusters."""
+        with self._lock:
+            datastores = self.datastores
+            ds_clusters = self.ds_clusters
+        kwargs = {}
+        if strategy:
+            kwargs["strategy"] = strategy
+        return VsphereStorageSearch(
+            ds_clusters=ds_clusters, datastores=datastores, vsphere=self.name, **kwargs
+        )
+
+
+# =============================================================================
+class VsphereInventoryService(FbGenericBaseObject):
+    """The service answering queries about the inventories of all vSphere instances."""
+
+    paths = (
+        "ping",
+        "vspheres",
+        "vms",
+        "hosts",
+        "datastores",
+        "ds_clusters",
+        "networks",
+        "placement",
+        "refresh",
+    )
+
+    # -------------------------------------------------------------------------
+    def __init__(self, inventories, initial_wait=DEFAULT_INITIAL_WAIT):
+        """Initialize a VsphereInventoryService object."""
+        self.inventories = {}
+        for inventory in inventories:
+            self.inventories[inventory.name] = inventory
+        self.initial_wait = initial_wait
+        self.servers = []
+        self.socket_path = None
+        self._threads = []
+
+    # -------------------------------------------------------------------------
+    def __repr__(self):
+        """Typecasting into a string for reproduction."""
+        return "<{c}(vspheres={v!r}, initial_wait={w!r})>".format(
+            c=self.__class__.__name__, v=list(self.inventories.keys()), w=self.initial_wait
+        )
+
+    # -------------------------------------------------------------------------
+    def start(self):
+        """Start updating all inventories."""
+        for inventory in self.inventories.values():
+            inventory.start()
+
+    # -------------------------------------------------------------------------
+    def stop(self):
+        """Stop all servers and the updating of all inventories."""
+        for server in self.servers:
+            server.shutdown()
+            server.server_close()
+        for thread in self._threads:
+            thread.join(5)
+        self.servers = []
+        self._threads = []
+
+        if self.socket_path and os.path.exists(self.socket_path):
+            os.unlink(self.socket_path)
+        self.socket_path = None
+
+        # All inventories are stopping in parallel, within the longest poll time
+        inventories = list(self.inventories.values())
+        for inventory in inventories:
+            inventory.request_stop()
+        if inventories:
+            deadline = time.monotonic() + max(inv.wait_seconds for inv in inventories) + 5
+            for inventory in inventories:
+                inventory.join(max(deadline - time.monotonic(), 0))
+
+    # -------------------------------------------------------------------------
+    def listen_unix(self, path):
+        """Serve the queries on the given Unix socket, only accessible by the current user."""
+        path = str(path)
+        if os.path.exists(path):
+            if not stat.S_ISSOCK(os.stat(path).st_mode):
+                msg = _("The path {!r} exists and is not a socket.").format(path)
+                raise VSphereInventoryError(msg)
+            if VsphereInventoryClient(path, timeout=2).ping():
+                msg = _("There is already an inventory daemon listening on {!r}.").format(path)
+                raise VSphereInventoryError(msg)
+            LOG.debug(_("Removing stale socket {!r}.").format(path))
+            os.unlink(path)
+
+        old_umask = os.umask(0o177)
+        try:
+            server = InventoryUnixServer(path, self)
+        finally:
+            os.umask(old_umask)
+        os.chmod(path, 0o600)
+        self.socket_path = path
+        self._serve(server)
+        LOG.info(_("Listening on Unix socket {!r}.").format(path))
+        return server
+
+    # -------------------------------------------------------------------------
+    def listen_http(self, host, port):
+        """Serve the queries on the given HTTP port of a loopback address."""
+        try:
+            infos = socket.getaddrinfo(host, port, type=socket.SOCK_STREAM)
+        except socket.gaierror as e:
+            msg = _("Could not resolve {h!r}: {e}").format(h=host, e=e)
+            raise VSphereInventoryError(msg)
+        for info in infos:
+            if not ipaddress.ip_address(info[4][0]).is_loopback:
+                msg = _("The inventory daemon may listen only on a loopback address, not {!r}.")
+                raise VSphereInventoryError(msg.format(host))
+
+        server = InventoryHTTPServer((host, port), self)
+        self._serve(server)
+        LOG.info(_("Listening on http://{h}:{p}/.").format(h=host, p=server.server_address[1]))
+        return server
+
+    # -------------------------------------------------------------------------
+    def _serve(self, server):
+
+        thread = threading.Thread(
+            target=server.serve_forever, name="inventory-server", daemon=True
+        )
+        thread.start()
+        self.servers.append(server)
+        self._threads.append(thread)
+
+    # -------------------------------------------------------------------------
+    def _selected(self, params):
+
+        vsphere = params.get("vsphere")
+        if vsphere:
+            if vsphere not in self.inventories:
+                raise VSphereInventoryError(_("Unknown vSphere {!r}.").format(vsphere))
+            inventories = [self.inventories[vsphere]]
+        else:
+            inventories = list(self.inventories.values())
+
+        for inventory in inventories:
+            if not inventory.wait_loaded(self.initial_wait):
+                msg = _("The inventory of vSphere {n!r} is not loaded yet: {e}").format(
+                    n=inventory.name, e=inventory.error or _("still loading")
+                )
+                raise VSphereInventoryError(msg)
+        return inventories
+
+    # -------------------------------------------------------------------------
+    def query(self, path, params=None):
+        """
+        Answer the query with the given path and parameters.
+
+        Raises a VSphereInventoryError on invalid queries.
+        """
+        if params is None:
+            params = {}
+
+        if path == "ping":
+            return {"version": __version__, "vspheres": list(self.inventories.keys())}
+
+        if path == "vspheres":
+            return [inventory.state() for inventory in self.inventories.values()]
+
+        if path == "refresh":
+            names = []
+            for inventory in self._selected_unloaded(params):
+                inventory.request_resync()
+                names.append(inventory.name)
+            return names
+
+        if path == "placement":
+            return self._placement(params)
+
+        if path not in INVENTORY_KINDS:
+            raise VSphereInventoryError(_("Unknown query {!r}.").format(path))
+
+        re_name = None
+        pattern = params.get("pattern")
+        if pattern:
+            try:
+                re_name = re.compile(pattern, re.IGNORECASE)
+            except re.error as e:
+                msg = _("Invalid name pattern {p!r}: {e}").format(p=pattern, e=e)
+                raise VSphereInventoryError(msg)
+
+        template = params.get("template")
+        if template is not None:
+            template = to_bool(template)
+        no_local = to_bool(params.get("no_local", False))
+
+        result = []
+        for inventory in self._selected(params):
+            for record in inventory.records(path):
+                if re_name and not re_name.search(record["name"]):
+                    continue
+                if template is not None and bool(record.get("template")) != template:
+                    continue
+                if no_local and VsphereConnection.re_local_ds.match(record["name"]):
+                    continue
+                result.append(record)
+
+        result.sort(key=lambda r: (r.get("vsphere") or "", r["name"]))
+        return result
+
+    # -------------------------------------------------------------------------
+    def _selected_unloaded(self, params):
+
+        vsphere = params.get("vsphere")
+        if vsphere:
+            if vsphere not in self.inventories:
+                raise VSphereInventoryError(_("Unknown vSphere {!r}.").format(vsphere))
+            return [self.inventories[vsphere]]
+        return list(self.inventories.values())
+
+    # -------------------------------------------------------------------------
+    def _placement(self, params):
+
+        try:
+            size_gb = float(params["size_gb"])
+        except (KeyError, ValueError):
+            msg = _("The parameter {!r} must be given as a number.").format("size_gb")
+            raise VSphereInventoryError(msg)
+        if size_gb <= 0:
+            msg = _("The parameter {!r} must be a positive number.").format("size_gb")
+            raise VSphereInventoryError(msg)
+
+        storage_type = params.get("storage_type") or "any"
+        strategy = params.get("strategy") or None
+        compute_cluster = params.get("compute_cluster") or None
+
+        candidates = []
+        for inventory in self._selected(params):
+            try:
+                search = inventory.storage_search(strategy=strategy)
+                candidate = search.search(
+                    size_gb, storage_type=storage_type, compute_cluster=compute_cluster
+                )
+                candidates.append(candidate)
+            except ValueError as e:
+                raise VSphereInventoryError(str(e))
+
+        best = VsphereStorageSearch.best_candidate(candidates, strategy=strategy or "balanced")
+        if best is None:
+            return None
+        return to_json_value(best.as_dict())
+
+
+# =============================================================================
+class InventoryRequestHandler(BaseHTTPRequestHandler):
+    """The HTTP request handler of the inventory daemon."""
+
+    protocol_version = "HTTP/1.1"
+    server_version = "fb-vmware-inventoryd/" + __version__
+
+    # -------------------------------------------------------------------------
+    def address_string(self):
+        """Return the address of the client for logging."""
+        if isinstance(self.client_address, tuple):
+            return self.client_address[0]
+        return "unix"
+
+    # -------------------------------------------------------------------------
+    def log_message(self, format, *args):
+        """Log the requests only in debug mode."""
+        LOG.debug("%s - %s", self.address_string(), format % args)
+
+    # -------------------------------------------------------------------------
+    def do_GET(self):  # noqa: N802
+        """Answer a query."""
+        self._handle("GET")
+
+    # -------------------------------------------------------------------------
+    def do_POST(self):  # noqa: N802
+        """Answer a request for a reload."""
+        length = int(self.headers.get("Content-Length") or 0)
+        if length:
+            self.rfile.read(length)
+        self._handle("POST")
+
+    # -------------------------------------------------------------------------
+    def _handle(self, method):
+
+        service = self.server.service
+        url = urlsplit(self.path)
+        path = url.path.strip("/")
+        params = {k: v[-1] for (k, v) in parse_qs(url.query).items()}
+
+        status = 200
+        if path not in service.paths:
+            (status, data) = (404, {"status": "error", "error": _("Unknown query {!r}.")})
+            data["error"] = data["error"].format(path)
+        elif (method == "POST") != (path == "refresh"):
+            (status, data) = (405, {"status": "error", "error": _("Method not allowed.")})
+        else:
+            start = time.perf_counter()
+            try:
+                data = {"status": "ok", "result": service.query(path, params)}
+            except VSphereInventoryError as e:
+                (status, data) = (400, {"status": "error", "error": str(e)})
+            except Exception as e:
+                LOG.exception(_("Error on answering query {!r}.").format(self.path))
+                (status, data) = (500, {"status": "error", "error": str(e)})
+            data["seconds"] = round(time.perf_counter() - start, 6)
+
+        body = json.dumps(data, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+# =============================================================================
+class InventoryHTTPServer(ThreadingHTTPServer):
+    """A HTTP server of the inventory daemon on a TCP port."""
+
+    daemon_threads = True
+
+    # -------------------------------------------------------------------------
+    def __init__(self, address, service):
+        """Initialize an InventoryHTTPServer object."""
+        self.service = service
+        super(InventoryHTTPServer, self).__init__(address, InventoryRequestHandler)
+
+
+# =============================================================================
+class InventoryUnixServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    """A HTTP server of the inventory daemon on a Unix socket."""
+
+    daemon_threads = True
+
+    # -------------------------------------------------------------------------
+    def __init__(self, path, service):
+        """Initialize an InventoryUnixServer object."""
+        self.service = service
+        super(InventoryUnixServer, self).__init__(path, InventoryRequestHandler)
+
+
+# =============================================================================
+if __name__ == "__main__":
+
+    pass
+
+# =============================================================================
+
+# vim: tabstop=4 expandtab shiftwidth=4 softtabstop=4 list
@@ -0,0 +1,217 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+@summary: The module for a cross-process reservation ledger for datastore space.
+
+@author: Frank Brehm
+@contact: frank@brehm-online.com
+@copyright: © 2022 - 2026 by Frank Brehm, Berlin
+"""
+from __future__ import absolute_import
+
+# Standard modules
+import logging
+import os
+import socket
+import sqlite3
+import time
+import uuid
+from contextlib import closing
+from pathlib import Path
+
+# Third party modules
+from fb_tools.obj import FbGenericBaseObject
+
+# Own modules
+from .errors import VSphereReservationLedgerError
+from .xlate import XLATOR
+
+__version__ = "0.1.0"
+LOG = logging.getLogger(__name__)
+
+_ = XLATOR.gettext
+
+DEFAULT_RESERVATION_TTL = 3600
+DEFAULT_LEDGER_TIMEOUT = 30
+
+
+# =============================================================================
+class VsphereReservationLedger(FbGenericBaseObject):
+    """
+    A SQLite backed ledger of space reservations on datastores.
+
+    The reservations are keyed by the name of the vSphere and the name of the
+    datastore. They are expiring after a given time, so reservations of crashed
+    processes are not blocking space for ever. Multiple processes (and hosts
+    sharing the ledger file) may use the same ledger file concurrently.
+
+    Each ledger object has its own owner ID, so reservations of the current
+    process can be distinguished from reservations of other processes.
+    """
+
+    schema = (
+        "CREATE TABLE IF NOT EXISTS reservations ("
+        "id INTEGER PRIMARY KEY AUTOINCREMENT, "
+        "vsphere TEXT NOT NULL, "
+        "datastore TEXT NOT NULL, "
+        "size_gb REAL NOT NULL, "
+        "owner TEXT NOT NULL, "
+        "created REAL NOT NULL, "
+        "expires REAL NOT NULL)",
+        "CREATE INDEX IF NOT EXISTS idx_reservations_ds "
+        "ON reservations (vsphere, datastore, expires)",
+    )
+
+    # -------------------------------------------------------------------------
+    def __init__(
+        self, filename, ttl=DEFAULT_RESERVATION_TTL, owner=None, timeout=DEFAULT_LEDGER_TIMEOUT
+    ):
+        """Initialize a VsphereReservationLedger object."""
+        self.filename = Path(filename)
+        self.ttl = float(ttl)
+        self.timeout = float(timeout)
+        if owner is None:
+            owner = "{h}:{p}:{u}".format(h=socket.gethostname(), p=os.getpid(), u=uuid.uuid4())
+        self.owner = str(owner)
+
+        with self._connect() as db:
+            for statement in self.schema:
+                db.execute(statement)
+
+    # -------------------------------------------------------------------------
+    def __repr__(self):
+        """Typecasting into a string for reproduction."""
+        return "<{c}(filename={f!r}, ttl={t!r}, owner={o!r})>".format(
+            c=self.__class__.__name__, f=str(self.filename), t=self.ttl, o=self.owner
+        )
+
+    # -------------------------------------------------------------------------
+    def as_dict(self, short=True):
+        """Transform the elements of the object into a dict."""
+        res = super(VsphereReservationLedger, self).as_dict(short=short)
+        res["filename"] = str(self.filename)
+        return res
+
+    # -------------------------------------------------------------------------
+    def _connect(self):
+
+        try:
+            db = sqlite3.connect(str(self.filename), timeout=self.timeout, isolation_level=None)
+        except sqlite3.Error as e:
+            msg = _("Could not open reservation ledger {f!r}: {e}").format(
+                f=str(self.filename), e=e
+            )
+            raise VSphereReservationLedgerError(msg)
+        return closing(db)
+
+    # -------------------------------------------------------------------------
+    def reserved_gb(self, vsphere, datastore, foreign_only=False):
+        """Return the sum of all active reservations on the given datastore in GiB."""
+        sql = (
+            "SELECT COALESCE(SUM(size_gb), 0.0) FROM reservations "
+            "WHERE vsphere = ? AND datastore = ? AND expires > ?"
+        )
+        params = [vsphere or "", datastore, time.time()]
+        if foreign_only:
+            sql += " AND owner != ?"
+            params.append(self.owner)
+
+        with self._connect() as db:
+            return float(db.execute(sql, params).fetchone()[0])
+
+    # -------------------------------------------------------------------------
+    def reserved_map(self, vsphere=None, foreign_only=False):
+        """
+        Return the sums of all active reservations per vSphere and datastore.
+
+        The result is a dict with tuples (vsphere, datastore) as keys.
+        """
+        sql = "SELECT vsphere, datastore, SUM(size_gb) FROM reservations WHERE expires > ?"
+        params = [time.time()]
+        if vsphere is not None:
+            sql += " AND vsphere = ?"
+            params.append(vsphere)
+        if foreign_only:
+            sql += " AND owner != ?"
+            params.append(self.owner)
+        sql += " GROUP BY vsphere, datastore"
+
+        res = {}
+        with self._connect() as db:
+            for row in db.execute(sql, params):
+                res[(row[0], row[1])] = float(row[2])
+        return res
+
+    # -------------------------------------------------------------------------
+    def reserve(self, vsphere, datastore, size_gb, limit_gb=None, ttl=None):
+        """
+        Record a reservation of the given size on the given datastore.
+
+        If limit_gb is given, the reservation is only made, if the sum of all active
+        reservations including the new one does not exceed this limit. The check and
+        the insert are done in one exclusive transaction.
+
+        Returns the ID of the new reservation, or None, if the limit would be exceeded.
+        """
+        if ttl is None:
+            ttl = self.ttl
+        now = time.time()
+
+        with self._connect() as db:
+            db.execute("BEGIN IMMEDIATE")
+            try:
+                if limit_gb is not None:
+                    cur_gb = db.execute(
+                        "SELECT COALESCE(SUM(size_gb), 0.0) FROM reservations "
+                        "WHERE vsphere = ? AND datastore = ? AND expires > ?",
+                        (vsphere or "", datastore, now),
+                    ).fetchone()[0]
+                    if cur_gb + size_gb > limit_gb:
+                        db.execute("ROLLBACK")
+                        return None
+                cursor = db.execute(
+                    "INSERT INTO reservations "
+                    "(vsphere, datastore, size_gb, owner, created, expires) "
+                    "VALUES (?, ?, ?, ?, ?, ?)",
+                    (vsphere or "", datastore, float(size_gb), self.owner, now, now + ttl),
+                )
+                db.execute("COMMIT")
+            except sqlite3.Error:
+                db.execute("ROLLBACK")
+                raise
+
+        LOG.debug(
+            _("Reserved {s:0.1f} GiB on datastore {ds!r} in vSphere {vs!r}.").format(
+                s=size_gb, ds=datastore, vs=vsphere
+            )
+        )
+        return cursor.lastrowid
+
+    # -------------------------------------------------------------------------
+    def release(self, reservation_id):
+        """Remove the reservation with the given ID."""
+        with self._connect() as db:
+            db.execute("DELETE FROM reservations WHERE id = ?", (reservation_id,))
+
+    # -------------------------------------------------------------------------
+    def release_all(self):
+        """Remove all reservations of the current owner."""
+        with self._connect() as db:
+            db.execute("DELETE FROM reservations WHERE owner = ?", (self.owner,))
+
+    # -------------------------------------------------------------------------
+    def purge_expired(self):
+        """Remove all expired reservations and return their number."""
+        with self._connect() as db:
+            cursor = db.execute("DELETE FROM reservations WHERE expires <= ?", (time.time(),))
+            return cursor.rowcount
+
+
+# =============================================================================
+if __name__ == "__main__":
+
+    pass
+
+# =============================================================================
+
+# vim: tabstop=4 expandtab shiftwidth=4 softtabstop=4 list
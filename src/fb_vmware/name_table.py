@@ -0,0 +1,233 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+@summary: The module for a table of the names of shared managed objects.
+
+Thousands of VMs are referencing the same few hosts, resource pools, compute
+resources and folders. Instead of following these references from every VM with
+extra round trips (e.g. data.resourcePool.owner.name), the names and parents of
+all these objects are retrieved once with one bulk retrieval of properties and
+the references are resolved by dictionary lookups.
+
+@author: Frank Brehm
+@contact: frank@brehm-online.com
+@copyright: © 2022 - 2026 by Frank Brehm, Berlin
+"""
+from __future__ import absolute_import
+
+# Standard modules
+import logging
+
+# Third party modules
+from fb_tools.obj import FbGenericBaseObject
+
+from pyVmomi import vim
+
+# Own modules
+from .propset import MoRef
+from .propset import vmodl_isinstance
+from .xlate import XLATOR
+
+__version__ = "0.2.0"
+LOG = logging.getLogger(__name__)
+
+_ = XLATOR.gettext
+
+# The managed object types of the table with their retrieved properties
+NAME_TABLE_PROPERTIES = (
+    (vim.Datacenter, ("name",)),
+    (vim.Folder, ("name", "parent")),
+    (vim.ComputeResource, ("name", "parent")),
+    (vim.ResourcePool, ("name", "owner")),
+    (vim.HostSystem, ("name", "parent")),
+)
+
+
+# =============================================================================
+class VsphereNameTable(FbGenericBaseObject):
+    """
+    A table of the names of datacenters, folders, compute resources, resource pools and hosts.
+
+    All references are given as MoRef tuples or as pyVmomi managed objects, the
+    latter are converted without a round trip. If a loader is given, the property
+    sets are retrieved on the first lookup.
+    """
+
+    # -------------------------------------------------------------------------
+    def __init__(self, property_sets=None, loader=None):
+        """
+        Initialize a VsphereNameTable object.
+
+        @param property_sets: the MoRef and the properties of the managed objects
+        @type property_sets: iterable of tuple
+        @param loader: a callable returning the property sets on the first lookup
+        @type loader: callable or None
+        """
+        self.names = {}
+        self.parents = {}
+        self.owners = {}
+        self.datacenters = set()
+        self._paths = {}
+        self._loader = loader
+
+        if property_sets is not None:
+            self.update(property_sets)
+
+    # -------------------------------------------------------------------------
+    def __repr__(self):
+        """Typecasting into a string for reproduction."""
+        return "<{c}(names={n}, loaded={lo!r})>".format(
+            c=self.__class__.__name__, n=len(self.names), lo=self.loaded
+        )
+
+    # -------------------------------------------------------------------------
+    def __len__(self):
+        """Return the number of objects in the table."""
+        self.load()
+        return len(self.names)
+
+    # -------------------------------------------------------------------------
+    def __contains__(self, ref):
+        """Return whether the referenced object is in the table."""
+        self.load()
+        return self.key_of(ref) in self.names
+
+    # -----------------------------------------------------------
+    @property
+    def loaded(self):
+        """Return whether there is no pending loader anymore."""
+        return self._loader is None
+
+    # -------------------------------------------------------------------------
+    @staticmethod
+    def key_of(ref):
+        """Return the MoRef of the given reference."""
+        if ref is None or isinstance(ref, MoRef):
+            return ref
+        return MoRef(ref._wsdlName, ref._moId)
+
+    # -------------------------------------------------------------------------
+    def load(self):
+        """Retrieve the property sets by the loader, if not done yet."""
+        loader = self._loader
+        if loader is None:
+            return
+        self._loader = None
+        self.update(loader())
+        LOG.debug(_("Loaded the names of {} managed objects.").format(len(self.names)))
+
+    # -------------------------------------------------------------------------
+    def add(self, moref, props):
+        """
+        Add a managed object with its retrieved properties.
+
+        @return: whether the object is of a type of the table
+        @rtype: bool
+        """
+        if moref.type == "Datacenter":
+            self.datacenters.add(moref)
+        elif vmodl_isinstance(moref, vim.ResourcePool):
+            self.owners[moref] = props.get("owner")
+        elif not (
+            vmodl_isinstance(moref, vim.Folder)
+            or vmodl_isinstance(moref, vim.ComputeResource)
+            or moref.type == "HostSystem"
+        ):
+            return False
+        if "parent" in props:
+            self.parents[moref] = props["parent"]
+        self.names[moref] = props.get("name")
+        self._paths.clear()
+        return True
+
+    # -------------------------------------------------------------------------
+    def update(self, property_sets):
+        """Add all given managed objects of the types of the table."""
+        for (moref, props) in property_sets:
+            self.add(moref, props)
+
+    # -------------------------------------------------------------------------
+    def name_of(self, ref):
+        """Return the name of the referenced object or None."""
+        self.load()
+        return self.names.get(self.key_of(ref))
+
+    # -------------------------------------------------------------------------
+    def cluster_name_of(self, ref):
+        """
+        Return the name of the compute resource of a resource pool or a host.
+
+        @return: the name of the cluster or standalone host, or None, if unknown
+        @rtype: str or None
+        """
+        self.load()
+        key = self.key_of(ref)
+        if key in self.owners:
+            return self.names.get(self.owners[key])
+        if key is not None and key.type == "HostSystem":
+            return self.names.get(self.parents.get(key))
+        return None
+
+    # -------------------------------------------------------------------------
+    def datacenter_of(self, ref):
+        """
+        Return the name of the datacenter, in which the referenced object is located.
+
+        The referenced object itself must not be in the table, e.g. the parent
+        folder of a datastore is sufficient.
+
+        @return: the name of the datacenter or None, if unknown
+        @rtype: str or None
+        """
+        self.load()
+        cur = self.key_of(ref)
+        seen = set()
+        while cur is not None and cur not in seen:
+            if cur in self.datacenters:
+                return self.names.get(cur)
+            seen.add(cur)
+            cur = self.parents.get(cur)
+        return None
+
+    # -------------------------------------------------------------------------
+    def folder_location(self, folder, max_depth=None):
+        """
+        Return the datacenter and the path of the given VM folder.
+
+        The path is the slash separated list of the folder names below the VM
+        folder of the datacenter, e.g. '/' for this folder itself.
+
+        @return: the name of the datacenter and the path, or None, if the folder
+                 is unknown or deeper than max_depth
+        @rtype: tuple of str or None
+        """
+        self.load()
+        folder = self.key_of(folder)
+        if folder in self._paths:
+            return self._paths[folder]
+
+        parts = []
+        cur = folder
+        location = None
+        while cur in self.parents and cur.type == "Folder":
+            parent = self.parents[cur]
+            if parent in self.datacenters:
+                # The VM folder of the datacenter itself
+                if max_depth is None or len(parts) <= max_depth:
+                    location = (self.names[parent], "/" + "/".join(reversed(parts)))
+                break
+            parts.append(self.names[cur])
+            cur = parent
+
+        self._paths[folder] = location
+        return location
+
+
+# =============================================================================
+if __name__ == "__main__":
+
+    pass
+
+# =============================================================================
+
+# vim: tabstop=4 expandtab shiftwidth=4 softtabstop=4 list
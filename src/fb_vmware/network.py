@@ -31,7 +31,7 @@ from .obj import VsphereObject
 from .typed_dict import TypedDict
 from .xlate import XLATOR
 
-__version__ = "1.10.3"
+__version__ = "1.12.0"
 LOG = logging.getLogger(__name__)
 
 _ = XLATOR.gettext
@@ -129,19 +129,9 @@ class VsphereNetwork(VsphereObject):
             if kwargs[argname] is not None:
                 setattr(self, argname, kwargs[argname])
 
-        match = self.re_ipv4_name.search(self.name)
-        if match:
-            ip = "{a}/{m}".format(a=match.group(1), m=match.group(2))
-            if self.verbose > 3:
-                LOG.debug(
-                    _("Trying to get IPv4 network {n!r} -> {i!r}.").format(n=self.name, i=ip)
-                )
-
-            try:
-                net = ipaddress.ip_network(ip)
-                self._network = net
-            except ValueError:
-                LOG.error(_("Could not get IP network from network name {!r}.").format(self.name))
+        net = self.network_by_name(self.name, verbose=self.verbose)
+        if net:
+            self._network = net
 
         if not self.network:
             msg = _("Network {!r} has no IP network assigned.").format(self.name)
@@ -342,6 +332,29 @@ class VsphereNetwork(VsphereObject):
 
         return net
 
+    # -------------------------------------------------------------------------
+    @classmethod
+    def network_by_name(cls, name, verbose=0):
+        """
+        Return the IPv4 network encoded in the given network name, e.g. '10.12.0.0_24'.
+
+        @return: the IP network or None, if the name contains no valid network
+        @rtype: ipaddress.IPv4Network or None
+        """
+        match = cls.re_ipv4_name.search(name or "")
+        if not match:
+            return None
+
+        ip = "{a}/{m}".format(a=match.group(1), m=match.group(2))
+        if verbose > 3:
+            LOG.debug(_("Trying to get IPv4 network {n!r} -> {i!r}.").format(n=name, i=ip))
+
+        try:
+            return ipaddress.ip_network(ip)
+        except ValueError:
+            LOG.error(_("Could not get IP network from network name {!r}.").format(name))
+        return None
+
     # -------------------------------------------------------------------------
     @classmethod
     def get_init_params(cls, data, verbose=0):
@@ -424,6 +437,86 @@ class VsphereNetwork(VsphereObject):
         return backing_device
 
 
+# =============================================================================
+class VsphereNetworkIndex(FbGenericBaseObject):
+    """
+    A longest prefix match index of IP networks.
+
+    The networks are stored in a binary trie for each IP version, so a lookup
+    needs at most as many steps, as the IP address has bits (32 for IPv4 and
+    128 for IPv6), independent of the number of indexed networks.
+    """
+
+    # -------------------------------------------------------------------------
+    def __init__(self):
+        """Initialize a VsphereNetworkIndex object."""
+        self._roots = {4: [None, None, None], 6: [None, None, None]}
+        self._count = 0
+
+    # -------------------------------------------------------------------------
+    def __repr__(self):
+        """Typecasting into a string for reproduction."""
+        return "<{c}(count={n})>".format(c=self.__class__.__name__, n=self._count)
+
+    # -------------------------------------------------------------------------
+    def __len__(self):
+        """Return the number of indexed networks."""
+        return self._count
+
+    # -------------------------------------------------------------------------
+    def as_dict(self, short=True):
+        """Transform the elements of the object into a dict."""
+        return {
+            "__class_name__": self.__class__.__name__,
+            "count": self._count,
+        }
+
+    # -------------------------------------------------------------------------
+    def add(self, network, value):
+        """
+        Add the given IP network with the given value to the index.
+
+        If the network is already indexed, the existing value will be kept.
+        """
+        node = self._roots[network.version]
+        addr = int(network.network_address)
+        max_bits = network.max_prefixlen
+
+        for i in range(network.prefixlen):
+            bit = (addr >> (max_bits - 1 - i)) & 1
+            if node[bit] is None:
+                node[bit] = [None, None, None]
+            node = node[bit]
+
+        if node[2] is None:
+            node[2] = value
+            self._count += 1
+
+    # -------------------------------------------------------------------------
+    def lookup(self, address):
+        """
+        Return the value of the longest network prefix containing the given address.
+
+        If no indexed network contains the address, None will be returned.
+        """
+        if not isinstance(address, (ipaddress.IPv4Address, ipaddress.IPv6Address)):
+            address = ipaddress.ip_address(address)
+
+        node = self._roots[address.version]
+        found = node[2]
+        addr = int(address)
+        max_bits = address.max_prefixlen
+
+        for i in range(max_bits):
+            node = node[(addr >> (max_bits - 1 - i)) & 1]
+            if node is None:
+                break
+            if node[2] is not None:
+                found = node[2]
+
+        return found
+
+
 # =============================================================================
 class VsphereNetworkDict(TypedDict):
     """A dictionary containing VsphereNetwork objects."""
@@ -435,6 +528,42 @@ class VsphereNetworkDict(TypedDict):
     )
     msg_key_not_name = _("The key {k!r} must be equal to the network name {n!r}.")
 
+    # -------------------------------------------------------------------------
+    def __init__(self, *args, **kwargs):
+        """Initialize a VsphereNetworkDict object."""
+        self._ip_index = None
+        super(VsphereNetworkDict, self).__init__(*args, **kwargs)
+
+    # -------------------------------------------------------------------------
+    def _set_item(self, key, item):
+
+        super(VsphereNetworkDict, self)._set_item(key, item)
+        self._ip_index = None
+
+    # -------------------------------------------------------------------------
+    def _del_item(self, key, strict=True):
+
+        super(VsphereNetworkDict, self)._del_item(key, strict=strict)
+        self._ip_index = None
+
+    # -------------------------------------------------------------------------
+    def pop(self, key, *args):
+        """Get the network by its name and remove it in dict."""
+        self._ip_index = None
+        return super(VsphereNetworkDict, self).pop(key, *args)
+
+    # -------------------------------------------------------------------------
+    def popitem(self):
+        """Remove and return a arbitrary (name and network) pair from the dictionary."""
+        self._ip_index = None
+        return super(VsphereNetworkDict, self).popitem()
+
+    # -------------------------------------------------------------------------
+    def clear(self):
+        """Remove all items from the dictionary."""
+        super(VsphereNetworkDict, self).clear()
+        self._ip_index = None
+
     # -------------------------------------------------------------------------
     def check_key_by_item(self, key, item):
         """Check the key by the given item."""
@@ -482,18 +611,37 @@ class VsphereNetworkDict(TypedDict):
 
         return 0
 
+    # -------------------------------------------------------------------------
+    def get_ip_index(self):
+        """
+        Return the longest prefix match index of the IP networks in this dict.
+
+        The index is created on the first call and dropped on any change of this dict.
+        If there are multiple networks with the same IP network, the first one in
+        the order of keys() wins.
+        """
+        if self._ip_index is None:
+            index = VsphereNetworkIndex()
+            for net_name in self.keys():
+                net = self._map[net_name]
+                if net.network:
+                    index.add(net.network, net_name)
+            self._ip_index = index
+        return self._ip_index
+
     # -------------------------------------------------------------------------
     def get_network_for_ip(self, *ips):
         """
         Search a fitting network for the give IP addresses.
 
-        The name of the first matching network for the first IP address, which will
+        The name of the most specific network for the first IP address, which will
         have a match, will be returned.
         """
         if len(self) < 1:
             LOG.debug(_("Empty {what}.").format(what=self.__class__.__name__))
             return None
 
+        index = self.get_ip_index()
         ips_list_str = []
 
         for ip in ips:
@@ -501,14 +649,12 @@ class VsphereNetworkDict(TypedDict):
                 continue
             ips_list_str.append(str(ip))
             LOG.debug(_("Searching vSphere network for address {} ...").format(ip))
-            ipa = ipaddress.ip_address(ip)
 
-            for net_name in self.keys():
-                net = self[net_name]
-                if net.network and ipa in net.network:
-                    desc = net.obj_desc_singular
-                    LOG.debug(_("Found {d} {n!r} for IP {i}.").format(d=desc, n=net_name, i=ip))
-                    return net_name
+            net_name = index.lookup(ip)
+            if net_name:
+                desc = self._map[net_name].obj_desc_singular
+                LOG.debug(_("Found {d} {n!r} for IP {i}.").format(d=desc, n=net_name, i=ip))
+                return net_name
 
             desc = self.value_class.obj_desc_singular
             LOG.debug(_("Could not find {d} for IP {ip}.").format(d=desc, ip=ip))
@@ -523,6 +669,24 @@ class VsphereNetworkDict(TypedDict):
         ).format(d=self.value_class.obj_desc_singular, ips=ips_str)
         raise VSphereNoNetFoundError(msg)
 
+    # -------------------------------------------------------------------------
+    def get_networks_for_ips(self, ips):
+        """
+        Search the fitting networks for all given IP addresses.
+
+        Returns a dict with the given IP addresses as keys and the names of the most
+        specific networks as values, or None, if no network was found for an address.
+        """
+        index = self.get_ip_index()
+        result = {}
+
+        for ip in ips:
+            if not ip or ip in result:
+                continue
+            result[ip] = index.lookup(ip)
+
+        return result
+
 
 # =============================================================================
 class GeneralNetworksDict(dict, FbGenericBaseObject):
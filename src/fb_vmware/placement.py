@@ -0,0 +1,674 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+@summary: The module for an indexed placement engine for datastores and datastore clusters.
+
+@author: Frank Brehm
+@contact: frank@brehm-online.com
+@copyright: © 2022 - 2026 by Frank Brehm, Berlin
+"""
+from __future__ import absolute_import
+
+# Standard modules
+import bisect
+import logging
+import random
+import threading
+from numbers import Number
+
+# Third party modules
+from fb_tools.common import pp
+from fb_tools.obj import FbGenericBaseObject
+
+# Own modules
+from .errors import FbVMWareRuntimeError
+from .xlate import XLATOR
+
+__version__ = "0.3.0"
+LOG = logging.getLogger(__name__)
+
+_ = XLATOR.gettext
+
+PLACEMENT_STRATEGIES = ("balanced", "best-fit", "first-fit", "random")
+DEFAULT_PLACEMENT_STRATEGY = "balanced"
+
+# Serializes all searches and reservations, because placement engines of
+# different searches may share the same storage objects.
+PLACEMENT_LOCK = threading.RLock()
+
+
+# =============================================================================
+def usage_changed(storage):
+    """
+    Notify all placement engines indexing the given storage location about a changed usage.
+
+    The storage location has to keep the engines in its attribute placement_engines,
+    they are re-indexing it on their next search.
+    """
+    engines = getattr(storage, "placement_engines", None)
+    if not engines:
+        return
+    with PLACEMENT_LOCK:
+        for engine in list(engines):
+            engine.mark_outdated(storage.name)
+
+
+# =============================================================================
+class VspherePlacementEngine(FbGenericBaseObject):
+    """
+    An indexed placement engine for storage locations.
+
+    The storage locations may be VsphereDatastore or VsphereDsCluster objects. They
+    are indexed by their storage type and by their storage type in combination with
+    each connected compute cluster. Every index is a list of tuples (available space
+    in GiB and name), which is kept sorted by the available space.
+
+    Reservations made through this engine update the calculated usage of the storage
+    location and its positions in all indexes incrementally. Storage locations with
+    an attribute placement_engines are registering this engine there and are notifying
+    it about usage changes made outside of it by usage_changed(), only these are
+    re-indexed on the next search. All searches and
+    reservations are serialized by PLACEMENT_LOCK, so an engine can be used by
+    several threads.
+
+    Strategies:
+        * balanced:  the location with the most available space
+        * best-fit:  the location with the least sufficient available space
+        * first-fit: the first sufficient location in alphabetical order
+        * random:    a random choice of all sufficient locations
+    """
+
+    # -------------------------------------------------------------------------
+    def __init__(self, storages=None, strategy=DEFAULT_PLACEMENT_STRATEGY, verbose=0):
+        """Initialize a VspherePlacementEngine object."""
+        self._strategy = DEFAULT_PLACEMENT_STRATEGY
+        self.verbose = verbose
+
+        self._storages = {}
+        self._index = {}
+        self._positions = {}
+        self._undetailled = {}
+        self._outdated = set()
+
+        self.strategy = strategy
+
+        if storages:
+            for storage in storages.values():
+                self.add(storage)
+
+    # -----------------------------------------------------------
+    @property
+    def strategy(self):
+        """Return the default placement strategy of this engine."""
+        return self._strategy
+
+    @strategy.setter
+    def strategy(self, value):
+        self._strategy = self.check_strategy(value)
+
+    # -------------------------------------------------------------------------
+    @classmethod
+    def check_strategy(cls, strategy):
+        """Check the given placement strategy and return it in a normalized form."""
+        if strategy is None:
+            return DEFAULT_PLACEMENT_STRATEGY
+        val = str(strategy).strip().lower().replace("_", "-")
+        if val not in PLACEMENT_STRATEGIES:
+            msg = _("Invalid placement strategy {!r} given.").format(strategy)
+            raise ValueError(msg)
+        return val
+
+    # -------------------------------------------------------------------------
+    def __repr__(self):
+        """Typecasting into a string for reproduction."""
+        return "<{c}(strategy={s!r}, storages={n})>".format(
+            c=self.__class__.__name__, s=self.strategy, n=len(self._storages)
+        )
+
+    # -------------------------------------------------------------------------
+    def __len__(self):
+        """Return the number of indexed storage locations."""
+        return len(self._storages)
+
+    # -------------------------------------------------------------------------
+    def __contains__(self, name):
+        """Return, whether a storage location with the given name is indexed."""
+        return name in self._storages
+
+    # -------------------------------------------------------------------------
+    def get(self, name):
+        """Return the indexed storage location with the given name."""
+        return self._storages[name]
+
+    # -------------------------------------------------------------------------
+    def as_dict(self, short=True):
+        """Transform the elements of the object into a dict."""
+        res = {
+            "__class_name__": self.__class__.__name__,
+            "strategy": self.strategy,
+            "storages": sorted(self._storages.keys(), key=str.lower),
+            "index": {},
+        }
+        for key in self._index:
+            st_type, compute_cluster = key
+            idx_name = st_type
+            if compute_cluster is not None:
+                idx_name += "@" + compute_cluster
+            res["index"][idx_name] = len(self._index[key])
+        return res
+
+    # -------------------------------------------------------------------------
+    def _index_keys(self, storage):
+
+        st_type = storage.storage_type.lower()
+        keys = [(st_type, None)]
+        compute_clusters = getattr(storage, "compute_clusters", None)
+        if compute_clusters is not None:
+            for cc_name in compute_clusters:
+                if cc_name is not None:
+                    keys.append((st_type, cc_name))
+        return keys
+
+    # -------------------------------------------------------------------------
+    def add(self, storage):
+        """Add the given storage location to all appropriate indexes."""
+        with PLACEMENT_LOCK:
+            name = storage.name
+            if name in self._storages:
+                self.remove(name)
+
+            self._storages[name] = storage
+            engines = getattr(storage, "placement_engines", None)
+            if engines is not None:
+                engines.add(self)
+            if getattr(storage, "compute_clusters", None) is None:
+                st_type = storage.storage_type.lower()
+                if st_type not in self._undetailled:
+                    self._undetailled[st_type] = set()
+                self._undetailled[st_type].add(name)
+
+            self._insert(storage)
+
+    # -------------------------------------------------------------------------
+    def _insert(self, storage):
+
+        entry = (storage.avail_space_gb, storage.name)
+        keys = self._index_keys(storage)
+        for key in keys:
+            if key not in self._index:
+                self._index[key] = []
+            bisect.insort(self._index[key], entry)
+        self._positions[storage.name] = (entry, keys)
+        self._outdated.discard(storage.name)
+
+    # -------------------------------------------------------------------------
+    def _unlink(self, name):
+
+        (entry, keys) = self._positions.pop(name)
+        for key in keys:
+            idx = self._index[key]
+            i = bisect.bisect_left(idx, entry)
+            if i < len(idx) and idx[i] == entry:
+                del idx[i]
+
+    # -------------------------------------------------------------------------
+    def remove(self, name):
+        """Remove the storage location with the given name from all indexes."""
+        with PLACEMENT_LOCK:
+            if name not in self._storages:
+                return
+            self._unlink(name)
+            self._outdated.discard(name)
+            storage = self._storages.pop(name)
+            engines = getattr(storage, "placement_engines", None)
+            if engines is not None:
+                engines.discard(self)
+            st_type = storage.storage_type.lower()
+            if st_type in self._undetailled:
+                self._undetailled[st_type].discard(name)
+
+    # -------------------------------------------------------------------------
+    def refresh(self, name=None):
+        """
+        Re-index the storage location with the given name after changing its usage.
+
+        If no name is given, all storage locations will be re-indexed.
+        """
+        with PLACEMENT_LOCK:
+            if name is None:
+                for st_name in list(self._storages.keys()):
+                    self.refresh(st_name)
+                return
+
+            storage = self._storages[name]
+            self._unlink(name)
+            self._insert(storage)
+
+    # -------------------------------------------------------------------------
+    def mark_outdated(self, name):
+        """Mark the storage location with the given name for re-indexing on the next search."""
+        with PLACEMENT_LOCK:
+            if name in self._storages:
+                self._outdated.add(name)
+
+    # -------------------------------------------------------------------------
+    def _refresh_outdated(self):
+
+        while self._outdated:
+            name = self._outdated.pop()
+            if self.verbose > 2:
+                LOG.debug(_("Re-indexing outdated storage location {!r}.").format(name))
+            self.refresh(name)
+
+    # -------------------------------------------------------------------------
+    def reserve(self, name, needed_gb):
+        """Reserve the given space on the storage location and update all indexes."""
+        with PLACEMENT_LOCK:
+            storage = self._storages[name]
+            self._unlink(name)
+            storage.calculated_usage += needed_gb
+            self._insert(storage)
+
+    # -------------------------------------------------------------------------
+    def release(self, name, needed_gb):
+        """Release the given space previously reserved on the storage location."""
+        self.reserve(name, -needed_gb)
+
+    # -------------------------------------------------------------------------
+    def _check_undetailled(self, needed_gb, storage_type, compute_cluster):
+
+        for name in self._undetailled.get(storage_type, ()):
+            if self._storages[name].avail_space_gb >= needed_gb:
+                msg = _(
+                    "Cannot detect connection of storage location {st!r} with compute "
+                    "cluster {cc!r}, it was not detailled discovered."
+                ).format(st=name, cc=compute_cluster)
+                raise FbVMWareRuntimeError(msg)
+
+    # -------------------------------------------------------------------------
+    def candidates(self, needed_gb, storage_type, compute_cluster=None):
+        """
+        Return the names of all storage locations with sufficient available space.
+
+        The names are ordered ascending by their available space. Storage locations,
+        whose usage was changed outside of this engine, are re-indexed before.
+        """
+        with PLACEMENT_LOCK:
+            self._refresh_outdated()
+            st_type = storage_type.lower()
+            if compute_cluster:
+                self._check_undetailled(needed_gb, st_type, compute_cluster)
+
+            idx = self._index.get((st_type, compute_cluster or None))
+            if not idx:
+                return []
+
+            start = bisect.bisect_left(idx, (needed_gb, ""))
+            return [entry[1] for entry in idx[start:]]
+
+    # -------------------------------------------------------------------------
+    def _choose(self, idx, start, strategy):
+
+        if strategy == "balanced":
+            return idx[-1]
+        if strategy == "best-fit":
+            return idx[start]
+        if strategy == "random":
+            return random.choice(idx[start:])
+        return min(idx[start:], key=lambda x: x[1].lower())
+
+    # -------------------------------------------------------------------------
+    def find(self, needed_gb, storage_type, compute_cluster=None, strategy=None):
+        """Find a storage location of exact the given storage type, without reserving space."""
+        with PLACEMENT_LOCK:
+            if strategy is None:
+                strategy = self.strategy
+            else:
+                strategy = self.check_strategy(strategy)
+
+            self._refresh_outdated()
+            st_type = storage_type.lower()
+            if compute_cluster:
+                self._check_undetailled(needed_gb, st_type, compute_cluster)
+
+            idx = self._index.get((st_type, compute_cluster or None))
+
+            while idx:
+                start = bisect.bisect_left(idx, (needed_gb, ""))
+                if start >= len(idx):
+                    return None
+
+                entry = self._choose(idx, start, strategy)
+                name = entry[1]
+                if self._storages[name].avail_space_gb == entry[0]:
+                    return name
+
+                # The usage was changed outside of this engine, re-index it and try again.
+                if self.verbose > 2:
+                    LOG.debug(_("Re-indexing outdated storage location {!r}.").format(name))
+                self.refresh(name)
+
+            return None
+
+    # -------------------------------------------------------------------------
+    def place(
+        self,
+        needed_gb,
+        storage_types,
+        compute_cluster=None,
+        strategy=None,
+        reserve_space=True,
+    ):
+        """
+        Find a storage location for the given space along the given storage types.
+
+        The storage types are evaluated in the given order. The name of the found storage
+        location will be returned, or None, if no appropriate location was found.
+        """
+        with PLACEMENT_LOCK:
+            if isinstance(storage_types, str):
+                storage_types = (storage_types,)
+
+            for st_type in storage_types:
+                if self.verbose > 1:
+                    LOG.debug(
+                        _("Searching storage location for {c:0.1f} GiB of type {t!r}.").format(
+                            c=needed_gb, t=st_type
+                        )
+                    )
+                name = self.find(
+                    needed_gb, st_type, compute_cluster=compute_cluster, strategy=strategy
+                )
+                if name:
+                    if reserve_space:
+                        self.reserve(name, needed_gb)
+                    return name
+
+            return None
+
+    # -------------------------------------------------------------------------
+    def place_many(self, requests, storage_types=None, strategy=None, reserve_space=True):
+        """
+        Place a batch of space requests.
+
+        Each request may be a number (the needed space in GiB), a tuple
+        (needed_gb, storage_type[, compute_cluster]) or a dict with the keys
+        'needed_gb' and optional 'storage_type', 'compute_cluster' and 'strategy'.
+        Missing storage types are taken from the parameter storage_types.
+
+        The found names are returned as a list in the order of the requests, with
+        None for each request without an appropriate storage location.
+        """
+        with PLACEMENT_LOCK:
+            results = []
+            for request in requests:
+                (needed_gb, st_types, compute_cluster, req_strategy) = self.eval_request(
+                    request, storage_types=storage_types, strategy=strategy
+                )
+                results.append(
+                    self.place(
+                        needed_gb,
+                        st_types,
+                        compute_cluster=compute_cluster,
+                        strategy=req_strategy,
+                        reserve_space=reserve_space,
+                    )
+                )
+
+            if self.verbose > 2:
+                LOG.debug(_("Results of placement:") + "\n" + pp(results))
+
+            return results
+
+    # -------------------------------------------------------------------------
+    @classmethod
+    def eval_request(cls, request, storage_types=None, strategy=None):
+        """Evaluate a single placement request and return it as a tuple of four members."""
+        compute_cluster = None
+
+        if isinstance(request, Number):
+            needed_gb = request
+        elif isinstance(request, dict):
+            needed_gb = request["needed_gb"]
+            storage_types = request.get("storage_type", storage_types)
+            compute_cluster = request.get("compute_cluster")
+            strategy = request.get("strategy", strategy)
+        else:
+            needed_gb = request[0]
+            if len(request) > 1 and request[1] is not None:
+                storage_types = request[1]
+            if len(request) > 2:
+                compute_cluster = request[2]
+
+        if storage_types is None:
+            msg = _("No storage types given for the placement request {!r}.").format(request)
+            raise ValueError(msg)
+
+        return (float(needed_gb), storage_types, compute_cluster, strategy)
+
+
+# =============================================================================
+class VsphereStorageCandidate(FbGenericBaseObject):
+    """A storage location found by a VsphereStorageSearch."""
+
+    # -------------------------------------------------------------------------
+    def __init__(self, storage, kind, vsphere=None, rank=()):
+        """Initialize a VsphereStorageCandidate object."""
+        self.storage = storage
+        self.kind = kind
+        self.vsphere = vsphere
+        self.rank = tuple(rank)
+
+    # -----------------------------------------------------------
+    @property
+    def name(self):
+        """Return the name of the found storage location."""
+        return self.storage.name
+
+    # -----------------------------------------------------------
+    @property
+    def avail_space_gb(self):
+        """Return the available space of the found storage location in GiB."""
+        return self.storage.avail_space_gb
+
+    # -------------------------------------------------------------------------
+    def __str__(self):
+        """Typecasting into a string."""
+        return self.name
+
+    # -------------------------------------------------------------------------
+    def __repr__(self):
+        """Typecasting into a string for reproduction."""
+        return "<{c}(name={n!r}, kind={k!r}, vsphere={v!r}, rank={r!r})>".format(
+            c=self.__class__.__name__, n=self.name, k=self.kind, v=self.vsphere, r=self.rank
+        )
+
+    # -------------------------------------------------------------------------
+    def as_dict(self, short=True):
+        """Transform the elements of the object into a dict."""
+        return {
+            "__class_name__": self.__class__.__name__,
+            "name": self.name,
+            "kind": self.kind,
+            "vsphere": self.vsphere,
+            "rank": self.rank,
+            "avail_space_gb": self.avail_space_gb,
+        }
+
+    # -------------------------------------------------------------------------
+    def score(self, strategy=DEFAULT_PLACEMENT_STRATEGY):
+        """Return a sort key for this candidate, the lowest key is the best candidate."""
+        if strategy == "balanced":
+            val = -self.avail_space_gb
+        elif strategy == "best-fit":
+            val = self.avail_space_gb
+        elif strategy == "random":
+            val = random.random()
+        else:
+            val = self.name.lower()
+        return (self.rank, val)
+
+
+# =============================================================================
+class VsphereStorageSearch(FbGenericBaseObject):
+    """
+    A unified search for storage locations in datastore clusters and datastores.
+
+    The datastore clusters and the datastores not belonging to a datastore cluster
+    are indexed by two placement engines. A search looks up both indexes along the
+    search chain of the given storage type and returns the best candidate.
+
+    Each candidate has a rank, consisting of the position of its storage type in the
+    search chain and, if datastore clusters are preferred, of its kind. Candidates
+    with a lower rank are always better, candidates with the same rank are compared
+    by the placement strategy. This way candidates of different searches, e.g. in
+    different vSpheres, can be compared with best_candidate().
+    """
+
+    kinds = ("ds_cluster", "datastore")
+
+    # -------------------------------------------------------------------------
+    def __init__(
+        self,
+        ds_clusters=None,
+        datastores=None,
+        vsphere=None,
+        prefer_ds_clusters=True,
+        use_local=True,
+        strategy=DEFAULT_PLACEMENT_STRATEGY,
+        verbose=0,
+    ):
+        """Initialize a VsphereStorageSearch object."""
+        self.ds_clusters = ds_clusters
+        self.datastores = datastores
+        self.vsphere = vsphere
+        self.prefer_ds_clusters = bool(prefer_ds_clusters)
+        self.use_local = bool(use_local)
+        self.verbose = verbose
+        self.strategy = VspherePlacementEngine.check_strategy(strategy)
+
+        self.engines = {}
+        if ds_clusters:
+            self.engines["ds_cluster"] = VspherePlacementEngine(
+                ds_clusters, strategy=self.strategy, verbose=verbose
+            )
+        if datastores:
+            standalone = {}
+            for ds_name, ds in datastores.items():
+                if ds_clusters and ds.cluster and ds.cluster in ds_clusters:
+                    continue
+                standalone[ds_name] = ds
+            self.engines["datastore"] = VspherePlacementEngine(
+                standalone, strategy=self.strategy, verbose=verbose
+            )
+
+    # -------------------------------------------------------------------------
+    def __repr__(self):
+        """Typecasting into a string for reproduction."""
+        return "<{c}(vsphere={v!r}, strategy={s!r}, prefer_ds_clusters={p!r})>".format(
+            c=self.__class__.__name__, v=self.vsphere, s=self.strategy, p=self.prefer_ds_clusters
+        )
+
+    # -------------------------------------------------------------------------
+    def as_dict(self, short=True):
+        """Transform the elements of the object into a dict."""
+        res = {
+            "__class_name__": self.__class__.__name__,
+            "vsphere": self.vsphere,
+            "strategy": self.strategy,
+            "prefer_ds_clusters": self.prefer_ds_clusters,
+            "use_local": self.use_local,
+            "engines": {},
+        }
+        for kind in self.engines:
+            res["engines"][kind] = self.engines[kind].as_dict(short=short)
+        return res
+
+    # -------------------------------------------------------------------------
+    def _search_chain(self, kind, storage_type):
+
+        if kind == "ds_cluster":
+            return self.ds_clusters.get_search_chain(storage_type)
+        return self.datastores.get_search_chain(storage_type, use_local=self.use_local)
+
+    # -------------------------------------------------------------------------
+    def search(
+        self,
+        needed_gb,
+        storage_type="any",
+        compute_cluster=None,
+        strategy=None,
+        reserve_space=False,
+    ):
+        """
+        Search the best storage location for the given space and storage type.
+
+        Returns a VsphereStorageCandidate object, or None, if no appropriate storage
+        location was found.
+        """
+        with PLACEMENT_LOCK:
+            if strategy is None:
+                strategy = self.strategy
+            else:
+                strategy = VspherePlacementEngine.check_strategy(strategy)
+
+            candidates = []
+            for kind_rank, kind in enumerate(self.kinds):
+                if kind not in self.engines:
+                    continue
+                try:
+                    chain = self._search_chain(kind, storage_type)
+                except ValueError:
+                    if kind == "ds_cluster":
+                        continue
+                    raise
+                engine = self.engines[kind]
+                for pos, st_type in enumerate(chain):
+                    name = engine.find(
+                        needed_gb, st_type, compute_cluster=compute_cluster, strategy=strategy
+                    )
+                    if not name:
+                        continue
+                    if self.prefer_ds_clusters:
+                        rank = (kind_rank, pos)
+                    else:
+                        rank = (pos,)
+                    storage = engine.get(name)
+                    candidates.append(
+                        VsphereStorageCandidate(storage, kind, vsphere=self.vsphere, rank=rank)
+                    )
+                    break
+
+            candidate = self.best_candidate(candidates, strategy=strategy)
+            if candidate and reserve_space:
+                self.engines[candidate.kind].reserve(candidate.name, needed_gb)
+
+            if self.verbose > 1:
+                LOG.debug(_("Best storage location candidate: {!r}.").format(candidate))
+
+            return candidate
+
+    # -------------------------------------------------------------------------
+    @classmethod
+    def best_candidate(cls, candidates, strategy=DEFAULT_PLACEMENT_STRATEGY):
+        """Return the best of the given candidates, or None, if no candidate was given."""
+        best = None
+        best_score = None
+        for candidate in candidates:
+            if candidate is None:
+                continue
+            score = candidate.score(strategy)
+            if best is None or score < best_score:
+                best = candidate
+                best_score = score
+        return best
+
+
+# =============================================================================
+if __name__ == "__main__":
+
+    pass
+
+# =============================================================================
+
+# vim: tabstop=4 expandtab shiftwidth=4 softtabstop=4 list
@@ -0,0 +1,289 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+@summary: The module for tuning the HTTP connection pool of the SOAP stub of pyVmomi.
+
+The SOAP stub adapter of pyVmomi keeps a pool of idle HTTP connections, which is
+shared by all threads using the same session. This module applies the configured
+pool size, the keep-alive time of idle connections, the socket timeouts and the
+reuse of TLS sessions to such a stub and counts the utilisation of its pool.
+
+@author: Frank Brehm
+@contact: frank@brehm-online.com
+@copyright: © 2022 - 2026 by Frank Brehm, Berlin
+"""
+from __future__ import absolute_import
+
+# Standard modules
+import logging
+import ssl
+import threading
+from http.client import HTTPSConnection
+
+# Third party modules
+from fb_tools.obj import FbGenericBaseObject
+
+# Own modules
+from .xlate import XLATOR
+
+__version__ = "0.1.0"
+LOG = logging.getLogger(__name__)
+
+_ = XLATOR.gettext
+
+DEFAULT_POOL_SIZE = 10
+DEFAULT_KEEP_ALIVE = 900
+DEFAULT_CONNECT_TIMEOUT = None
+DEFAULT_READ_TIMEOUT = None
+DEFAULT_TLS_SESSION_REUSE = True
+
+
+# =============================================================================
+class TlsSessionCache(object):
+    """Keeping the last TLS session of a server for resuming it in new connections."""
+
+    # -------------------------------------------------------------------------
+    def __init__(self):
+        """Initialize a TlsSessionCache object."""
+        self._lock = threading.Lock()
+        self._session = None
+
+    # -------------------------------------------------------------------------
+    def get(self):
+        """Return the cached TLS session or None."""
+        with self._lock:
+            return self._session
+
+    # -------------------------------------------------------------------------
+    def put(self, sock):
+        """Remember the TLS session of the given socket, if it has one."""
+        session = getattr(sock, "session", None)
+        if session is None:
+            return
+        with self._lock:
+            self._session = session
+
+    # -------------------------------------------------------------------------
+    def clear(self):
+        """Forget the cached TLS session."""
+        with self._lock:
+            self._session = None
+
+
+# =============================================================================
+def tls_session_connection_class(scheme, sessions, pool=None):
+    """Return a subclass of the given HTTPS connection class resuming cached TLS sessions."""
+
+    class TlsSessionConnection(scheme):
+
+        def connect(self):
+            # The TCP part of HTTPSConnection.connect(), including a proxy tunnel
+            super(HTTPSConnection, self).connect()
+            server_hostname = self._tunnel_host or self.host
+            session = sessions.get()
+            try:
+                self.sock = self._context.wrap_socket(
+                    self.sock, server_hostname=server_hostname, session=session
+                )
+            except (ssl.SSLError, ValueError):
+                if session is None:
+                    raise
+                # The cached session does not fit, try it with a full handshake
+                sessions.clear()
+                super(HTTPSConnection, self).connect()
+                self.sock = self._context.wrap_socket(self.sock, server_hostname=server_hostname)
+            if pool is not None:
+                pool.count_handshake(self.sock.session_reused)
+            sessions.put(self.sock)
+
+    TlsSessionConnection.__name__ = "TlsSession" + scheme.__name__
+    return TlsSessionConnection
+
+
+# =============================================================================
+class VsphereConnectionPool(FbGenericBaseObject):
+    """
+    The tuning and the utilisation of the HTTP connection pool of a SOAP stub.
+
+    The pool itself stays inside the stub, this object changes its parameters
+    and wraps its methods for getting and returning connections.
+    """
+
+    # -------------------------------------------------------------------------
+    def __init__(
+        self,
+        pool_size=DEFAULT_POOL_SIZE,
+        keep_alive=DEFAULT_KEEP_ALIVE,
+        read_timeout=DEFAULT_READ_TIMEOUT,
+        tls_session_reuse=DEFAULT_TLS_SESSION_REUSE,
+    ):
+        """
+        Initialize a VsphereConnectionPool object.
+
+        @param pool_size: the maximum number of idle connections kept in the pool.
+        @type pool_size: int
+        @param keep_alive: the time in seconds, an idle connection is kept open,
+                           0 closes every connection after its request,
+                           -1 keeps them open without a timeout.
+        @type keep_alive: int
+        @param read_timeout: the timeout in seconds for waiting on a response
+                             or None for the timeout of connecting.
+        @type read_timeout: float or None
+        @param tls_session_reuse: resume the TLS session of former connections in
+                                  new connections instead of a full handshake.
+        @type tls_session_reuse: bool
+        """
+        self.pool_size = pool_size
+        self.keep_alive = keep_alive
+        self.read_timeout = read_timeout
+        self.tls_session_reuse = tls_session_reuse
+        self.tls_sessions = TlsSessionCache()
+
+        self._lock = threading.Lock()
+        self.stub = None
+        self.reset()
+
+    # -------------------------------------------------------------------------
+    @classmethod
+    def from_connect_info(cls, connect_info):
+        """Create a new VsphereConnectionPool object from a VSPhereConfigInfo object."""
+        return cls(
+            pool_size=connect_info.pool_size,
+            keep_alive=connect_info.keep_alive,
+            read_timeout=connect_info.read_timeout,
+            tls_session_reuse=connect_info.tls_session_reuse,
+        )
+
+    # -------------------------------------------------------------------------
+    def __repr__(self):
+        """Typecasting into a string for reproduction."""
+        return "<{c}(pool_size={s!r}, keep_alive={k!r}, read_timeout={r!r})>".format(
+            c=self.__class__.__name__, s=self.pool_size, k=self.keep_alive, r=self.read_timeout
+        )
+
+    # -------------------------------------------------------------------------
+    def reset(self):
+        """Reset all counters."""
+        with self._lock:
+            self.created = 0
+            self.reused = 0
+            self.returned = 0
+            self.discarded = 0
+            self.dropped = 0
+            self.in_use = 0
+            self.peak_in_use = 0
+            self.tls_handshakes = 0
+            self.tls_resumed = 0
+
+    # -----------------------------------------------------------
+    @property
+    def idle(self):
+        """Return the current number of idle connections in the pool."""
+        if self.stub is None:
+            return 0
+        return len(self.stub.pool)
+
+    # -------------------------------------------------------------------------
+    def apply(self, stub):
+        """Apply the parameters to the given SOAP stub adapter and count its connections."""
+        self.stub = stub
+        stub.poolSize = self.pool_size
+        stub.connectionPoolTimeout = self.keep_alive
+
+        scheme = getattr(stub, "scheme", None)
+        if self.tls_session_reuse and not stub.is_tunnel:
+            if isinstance(scheme, type) and issubclass(scheme, HTTPSConnection):
+                stub.scheme = tls_session_connection_class(scheme, self.tls_sessions, pool=self)
+
+        get_connection = stub.GetConnection
+        return_connection = stub.ReturnConnection
+        drop_connections = stub.DropConnections
+
+        def GetConnection():  # noqa: N802
+            conn = get_connection()
+            if self.read_timeout is not None and conn.sock is not None:
+                conn.sock.settimeout(self.read_timeout)
+            with self._lock:
+                if getattr(conn, "_fb_pooled", False):
+                    self.reused += 1
+                else:
+                    self.created += 1
+                self.in_use += 1
+                if self.in_use > self.peak_in_use:
+                    self.peak_in_use = self.in_use
+            return conn
+
+        def ReturnConnection(conn):  # noqa: N802
+            if self.tls_session_reuse and conn.sock is not None:
+                self.tls_sessions.put(conn.sock)
+            return_connection(conn)
+            with stub.lock:
+                pooled = any(c is conn for (c, last_access) in stub.pool)
+            conn._fb_pooled = pooled
+            with self._lock:
+                self.in_use = max(self.in_use - 1, 0)
+                if pooled:
+                    self.returned += 1
+                else:
+                    self.discarded += 1
+
+        def DropConnections():  # noqa: N802
+            with stub.lock:
+                count = len(stub.pool)
+            drop_connections()
+            with self._lock:
+                self.dropped += count
+
+        with stub.lock:
+            for (conn, last_access) in stub.pool:
+                conn._fb_pooled = True
+
+        stub.GetConnection = GetConnection
+        stub.ReturnConnection = ReturnConnection
+        stub.DropConnections = DropConnections
+
+    # -------------------------------------------------------------------------
+    def count_handshake(self, resumed):
+        """Count a TLS handshake of a new connection."""
+        with self._lock:
+            self.tls_handshakes += 1
+            if resumed:
+                self.tls_resumed += 1
+
+    # -------------------------------------------------------------------------
+    def summary(self):
+        """Return the parameters and the utilisation of the pool as a dict."""
+        with self._lock:
+            return {
+                "pool_size": self.pool_size,
+                "keep_alive": self.keep_alive,
+                "read_timeout": self.read_timeout,
+                "tls_session_reuse": self.tls_session_reuse,
+                "created": self.created,
+                "reused": self.reused,
+                "returned": self.returned,
+                "discarded": self.discarded,
+                "dropped": self.dropped,
+                "in_use": self.in_use,
+                "peak_in_use": self.peak_in_use,
+                "idle": self.idle,
+                "tls_handshakes": self.tls_handshakes,
+                "tls_resumed": self.tls_resumed,
+            }
+
+    # -------------------------------------------------------------------------
+    def as_dict(self, short=True):
+        """Transform the elements of the object into a dict."""
+        res = super(VsphereConnectionPool, self).as_dict(short=short)
+        res.update(self.summary())
+        return res
+
+
+# =============================================================================
+if __name__ == "__main__":
+
+    pass
+
+# =============================================================================
+
+# vim: tabstop=4 expandtab shiftwidth=4 softtabstop=4 list
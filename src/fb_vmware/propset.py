@@ -0,0 +1,752 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+@summary: The module for the fast streaming deserialisation of property sets.
+
+The generic SOAP deserialiser of pyVmomi builds a complete vmodl data object
+for every retrieved property, which costs a lot of CPU time for large
+inventories. This module parses the responses of RetrievePropertiesEx() and
+ContinueRetrievePropertiesEx() incrementally with expat, while they are read
+from the connection, and hands over every retrieved managed object as soon as
+its element is complete as a lightweight property set: a MoRef tuple and a dict
+of the property paths with plain Python values. Data objects are given as
+DataRecord dicts with attribute access, references to managed objects as MoRef
+tuples, so the property sets can be pickled.
+
+The fast path is taken only by calls inside of the context manager
+streaming_property_sets(), all other calls of the SOAP stub are unchanged.
+
+@author: Frank Brehm
+@contact: frank@brehm-online.com
+@copyright: © 2022 - 2026 by Frank Brehm, Berlin
+"""
+from __future__ import absolute_import
+
+# Standard modules
+import base64
+import collections
+import contextlib
+import datetime
+import logging
+import socket
+import threading
+from http.client import HTTPException
+from xml.parsers import expat
+
+# Third party modules
+import pyVmomi
+from pyVmomi import SoapAdapter
+from pyVmomi import VmomiSupport
+from pyVmomi import vmodl
+from pyVmomi.Iso8601 import ParseISO8601
+
+# Own modules
+from .compression import CONTENT_ENCODINGS
+from .compression import DEFAULT_READ_CHUNK_SIZE
+from .compression import StreamingDecoder
+from .errors import VSpherePropertySetError
+from .xlate import XLATOR
+
+__version__ = "0.2.0"
+LOG = logging.getLogger(__name__)
+
+_ = XLATOR.gettext
+
+DEFAULT_PAGE_SIZE = 1000
+STREAMED_METHODS = ("RetrievePropertiesEx", "ContinueRetrievePropertiesEx")
+
+# The streaming replaces SoapStubAdapter.InvokeMethod() and depends on its
+# internals, which were verified only for these releases (major, minor) of pyVmomi
+STREAMING_PYVMOMI_VERSIONS = ((9, 1),)
+STREAMING_STUB_ATTRIBUTES = (
+    "InvokeMethod",
+    "SerializeRequest",
+    "GetConnection",
+    "ReturnConnection",
+    "DropConnections",
+    "cookie",
+    "versionId",
+    "path",
+    "requestModifierList",
+    "_customHeaders",
+    "_acceptCompressedResponses",
+)
+
+VIM_NAMESPACE = "urn:vim25"
+XSI_TYPE = SoapAdapter.XSI_TYPE
+XMLNS_XSD = VmomiSupport.XMLNS_XSD
+
+# The kinds of the type descriptions
+KIND_SCALAR = 0
+KIND_DATA = 1
+KIND_ARRAY = 2
+KIND_MOREF = 3
+
+_local = threading.local()
+
+
+# =============================================================================
+class MoRef(collections.namedtuple("MoRef", ["type", "value"])):
+    """A lightweight reference to a managed object with its type and its ID."""
+
+    __slots__ = ()
+
+    # -------------------------------------------------------------------------
+    def __str__(self):
+        """Typecast into a string."""
+        return "{t}:{v}".format(t=self.type, v=self.value)
+
+
+# =============================================================================
+class DataRecord(dict):
+    """
+    A vmodl data object as a dict of its set properties.
+
+    The properties can be accessed also as attributes. Properties of the vmodl
+    type, which are not set, are returned as None or as an empty list, like by
+    the data objects of pyVmomi. Properties with the name of a dict method
+    (e.g. 'items' or 'values') can only be accessed as keys.
+    """
+
+    __slots__ = ("vmodl_type",)
+
+    # -------------------------------------------------------------------------
+    def __init__(self, vmodl_type, *args, **kwargs):
+        """Initialize a DataRecord object with the WSDL name of its vmodl type."""
+        super(DataRecord, self).__init__(*args, **kwargs)
+        self.vmodl_type = vmodl_type
+
+    # -------------------------------------------------------------------------
+    def __getattr__(self, name):
+        """Return the value of the given property."""
+        try:
+            return self[name]
+        except KeyError:
+            pass
+        if name.startswith("__") or name == "vmodl_type":
+            raise AttributeError(name)
+        defaults = _property_defaults(self.vmodl_type)
+        if name not in defaults:
+            msg = _("{t} has no property {n!r}.").format(t=self.vmodl_type, n=name)
+            raise AttributeError(msg)
+        default = defaults[name]
+        if default is not None:
+            return list(default)
+        return None
+
+    # -------------------------------------------------------------------------
+    def __repr__(self):
+        """Typecasting into a string for reproduction."""
+        return "<{c} {t} {d}>".format(
+            c=self.__class__.__name__, t=self.vmodl_type, d=dict.__repr__(self)
+        )
+
+    # -------------------------------------------------------------------------
+    def __reduce__(self):
+        """Return the data for pickling."""
+        return (self.__class__, (self.vmodl_type, dict(self)))
+
+
+# =============================================================================
+class _TypeDesc(object):
+    """The description of a vmodl type for the parser."""
+
+    __slots__ = ("kind", "vmodl_type", "name", "convert", "item", "_props")
+
+    # -------------------------------------------------------------------------
+    def __init__(self, vmodl_type):
+        """Initialize a _TypeDesc object."""
+        self.vmodl_type = vmodl_type
+        self.name = getattr(vmodl_type, "_wsdlName", vmodl_type.__name__)
+        self.convert = None
+        self.item = None
+        self._props = None
+
+        if issubclass(vmodl_type, list):
+            self.kind = KIND_ARRAY
+        elif issubclass(vmodl_type, VmomiSupport.ManagedObject):
+            self.kind = KIND_MOREF
+        elif issubclass(vmodl_type, VmomiSupport.DataObject):
+            self.kind = KIND_DATA
+        else:
+            self.kind = KIND_SCALAR
+            self.convert = _scalar_converter(vmodl_type)
+
+    # -------------------------------------------------------------------------
+    def prop(self, name):
+        """Return the description of the given property and whether it is an array."""
+        if self._props is None:
+            self._props = {}
+        desc = self._props.get(name)
+        if desc is None:
+            try:
+                prop_type = self.vmodl_type._GetPropertyInfo(name).type
+            except AttributeError:
+                msg = _("Unknown property {p!r} of {t}.").format(p=name, t=self.name)
+                raise VSpherePropertySetError(msg)
+            is_array = issubclass(prop_type, list)
+            desc = (type_desc(prop_type), is_array)
+            self._props[name] = desc
+        return desc
+
+    # -------------------------------------------------------------------------
+    def item_desc(self):
+        """Return the description of the items of an array type."""
+        if self.item is None:
+            self.item = type_desc(self.vmodl_type.Item)
+        return self.item
+
+
+# =============================================================================
+_TYPE_DESCS = {}
+_XSI_TYPES = {}
+_DEFAULTS = {}
+
+
+# -----------------------------------------------------------------------------
+def type_desc(vmodl_type):
+    """Return the cached description of the given vmodl type."""
+    desc = _TYPE_DESCS.get(vmodl_type)
+    if desc is None:
+        desc = _TypeDesc(vmodl_type)
+        _TYPE_DESCS[vmodl_type] = desc
+    return desc
+
+
+# -----------------------------------------------------------------------------
+def _lookup_type(ns, name):
+
+    key = (ns, name)
+    vmodl_type = _XSI_TYPES.get(key)
+    if vmodl_type is not None:
+        return vmodl_type
+    try:
+        vmodl_type = VmomiSupport.GetWsdlType(ns, name)
+    except KeyError:
+        if name.endswith("ManagedObjectReference"):
+            vmodl_type = VmomiSupport.GetWsdlType(
+                VmomiSupport.XMLNS_VMODL_BASE, name[: -len("Reference")]
+            )
+        else:
+            try:
+                vmodl_type = VmomiSupport.GuessWsdlType(name)
+            except KeyError:
+                msg = _("Unknown vmodl type {!r}.").format(name)
+                raise VSpherePropertySetError(msg)
+    _XSI_TYPES[key] = vmodl_type
+    return vmodl_type
+
+
+# -----------------------------------------------------------------------------
+def _property_defaults(wsdl_name):
+
+    defaults = _DEFAULTS.get(wsdl_name)
+    if defaults is None:
+        defaults = {}
+        vmodl_type = _lookup_type(VIM_NAMESPACE, wsdl_name)
+        for prop in vmodl_type._GetPropertyList():
+            defaults[prop.name] = () if issubclass(prop.type, list) else None
+        _DEFAULTS[wsdl_name] = defaults
+    return defaults
+
+
+# -----------------------------------------------------------------------------
+def _to_bool(data):
+
+    if data in ("1", "true"):
+        return True
+    if data in ("0", "false"):
+        return False
+    lowered = data.lower()
+    if lowered == "true":
+        return True
+    if lowered == "false":
+        return False
+    raise VSpherePropertySetError(_("Invalid boolean value {!r}.").format(data))
+
+
+# -----------------------------------------------------------------------------
+def _to_datetime(data):
+
+    value = ParseISO8601(data)
+    if value is None:
+        raise VSpherePropertySetError(_("Invalid timestamp {!r}.").format(data))
+    return value
+
+
+# -----------------------------------------------------------------------------
+def _strip_namespace(data):
+
+    return data.rpartition(":")[2] if data else None
+
+
+# -----------------------------------------------------------------------------
+def _scalar_converter(vmodl_type):
+
+    if vmodl_type is bool:
+        return _to_bool
+    if vmodl_type is datetime.datetime:
+        return _to_datetime
+    if vmodl_type is VmomiSupport.binary:
+        return base64.b64decode
+    if vmodl_type is type or vmodl_type is VmomiSupport.ManagedMethod:
+        return _strip_namespace
+    if issubclass(vmodl_type, float):
+        return float
+    if issubclass(vmodl_type, int):
+        return int
+    return str
+
+
+# -----------------------------------------------------------------------------
+def vmodl_type_of(obj):
+    """Return the vmodl type of a DataRecord, a MoRef or a pyVmomi object."""
+    if isinstance(obj, DataRecord):
+        return _lookup_type(VIM_NAMESPACE, obj.vmodl_type)
+    if isinstance(obj, MoRef):
+        return _lookup_type(VIM_NAMESPACE, obj.type)
+    return obj.__class__
+
+
+# -----------------------------------------------------------------------------
+def vmodl_isinstance(obj, vmodl_type):
+    """Return, whether the given DataRecord or pyVmomi object is of the given vmodl type."""
+    if isinstance(obj, (DataRecord, MoRef)):
+        return issubclass(vmodl_type_of(obj), vmodl_type)
+    return isinstance(obj, vmodl_type)
+
+
+# -----------------------------------------------------------------------------
+def to_record(value):
+    """Convert a value of a pyVmomi object into the lightweight form of a property set."""
+    if value is None or type(value) in (bool, str, int, float, bytes, datetime.datetime):
+        return value
+    if isinstance(value, str):
+        return str(value)
+    if isinstance(value, bytes):
+        return bytes(value)
+    if isinstance(value, float):
+        return float(value)
+    if isinstance(value, int) and not isinstance(value, bool):
+        return int(value)
+    if isinstance(value, VmomiSupport.ManagedObject):
+        return MoRef(value._wsdlName, value._moId)
+    if isinstance(value, VmomiSupport.DataObject):
+        record = DataRecord(value._wsdlName)
+        for prop in value._GetPropertyList():
+            item = getattr(value, prop.name)
+            if item is None or (isinstance(item, list) and not item):
+                continue
+            record[prop.name] = to_record(item)
+        return record
+    if isinstance(value, list):
+        return [to_record(item) for item in value]
+    if isinstance(value, type):
+        return getattr(value, "_wsdlName", value.__name__)
+    return value
+
+
+# -----------------------------------------------------------------------------
+def property_set_from_content(content):
+    """Return the MoRef and the properties of a pyVmomi ObjectContent object."""
+    props = {}
+    for prop in content.propSet:
+        props[prop.name] = to_record(prop.val)
+    return (to_record(content.obj), props)
+
+
+# =============================================================================
+class PropertySetParser(object):
+    """
+    An incremental parser of RetrievePropertiesEx() responses.
+
+    The XML data is given chunk by chunk to feed(), every complete managed
+    object of the response is given to the consumer as a MoRef and a dict
+    of its properties.
+    """
+
+    # -------------------------------------------------------------------------
+    def __init__(self, consumer):
+        """Initialize a PropertySetParser object with the callable for the property sets."""
+        self.consumer = consumer
+        self.token = None
+        self.has_result = False
+        self.objects = 0
+
+        self._depth = 0
+        self._text = []
+        self._prefixes = {}
+        self._moref = None
+        self._moref_type = None
+        self._props = None
+        self._prop_name = None
+        self._skip_below = None
+        # Frames of the value being parsed: [description, is_array, tag, value]
+        self._frames = []
+
+        parser = expat.ParserCreate(namespace_separator=" ")
+        parser.buffer_text = True
+        parser.StartElementHandler = self._start
+        parser.EndElementHandler = self._end
+        parser.CharacterDataHandler = self._text.append
+        parser.StartNamespaceDeclHandler = self._start_ns
+        parser.EndNamespaceDeclHandler = self._end_ns
+        self._parser = parser
+
+    # -------------------------------------------------------------------------
+    def feed(self, data):
+        """Parse the next chunk of the response."""
+        try:
+            self._parser.Parse(data, False)
+        except expat.ExpatError as e:
+            raise VSpherePropertySetError(_("Invalid SOAP response: {}").format(e))
+
+    # -------------------------------------------------------------------------
+    def close(self):
+        """Finish parsing the response."""
+        try:
+            self._parser.Parse(b"", True)
+        except expat.ExpatError as e:
+            raise VSpherePropertySetError(_("Invalid SOAP response: {}").format(e))
+
+    # -------------------------------------------------------------------------
+    def _start_ns(self, prefix, uri):
+
+        self._prefixes.setdefault(prefix, []).append(uri)
+
+    # -------------------------------------------------------------------------
+    def _end_ns(self, prefix):
+
+        self._prefixes[prefix].pop()
+
+    # -------------------------------------------------------------------------
+    def _xsi_type(self, value):
+
+        (prefix, sep, name) = value.rpartition(":")
+        uris = self._prefixes.get(prefix or None)
+        ns = uris[-1] if uris else VIM_NAMESPACE
+        if ns == XMLNS_XSD and name == "anyType":
+            return None
+        return _lookup_type(ns, name)
+
+    # -------------------------------------------------------------------------
+    def _start(self, tag, attrs):
+
+        self._depth += 1
+        del self._text[:]
+        depth = self._depth
+        if self._skip_below is not None:
+            return
+
+        if depth < 8:
+            name = tag.rpartition(" ")[2]
+            if depth == 4 and name == "returnval":
+                self.has_result = True
+            elif depth == 5 and name == "objects":
+                self._moref = None
+                self._props = {}
+            elif depth == 6 and name == "missingSet":
+                self._skip_below = depth
+            elif depth == 7 and name == "val":
+                desc = None
+                xsi_type = attrs.get(XSI_TYPE)
+                if xsi_type:
+                    vmodl_type = self._xsi_type(xsi_type)
+                    if vmodl_type is not None:
+                        desc = type_desc(vmodl_type)
+                if desc is None:
+                    desc = type_desc(VmomiSupport.GetVmodlType("anyType"))
+                self._open(desc, False, name, attrs)
+            elif depth == 6 and name == "obj":
+                self._moref_type = attrs.get("type")
+            return
+
+        parent_desc = self._frames[-1][0]
+        name = tag.rpartition(" ")[2]
+        if parent_desc.kind == KIND_ARRAY:
+            (desc, is_array) = (parent_desc.item_desc(), False)
+        elif parent_desc.kind == KIND_DATA:
+            (desc, is_array) = parent_desc.prop(name)
+        else:
+            msg = _("Unexpected element {t!r} in a {d}.").format(t=name, d=parent_desc.name)
+            raise VSpherePropertySetError(msg)
+
+        xsi_type = attrs.get(XSI_TYPE)
+        if xsi_type and desc.convert is not _strip_namespace:
+            vmodl_type = self._xsi_type(xsi_type)
+            if vmodl_type is not None:
+                dyn_desc = type_desc(vmodl_type)
+                if not (dyn_desc.kind == KIND_ARRAY and desc.kind == KIND_ARRAY):
+                    desc = dyn_desc
+        elif desc.kind == KIND_ARRAY:
+            desc = desc.item_desc()
+
+        self._open(desc, is_array, name, attrs)
+
+    # -------------------------------------------------------------------------
+    def _open(self, desc, is_array, name, attrs):
+
+        if desc.kind == KIND_DATA:
+            value = DataRecord(desc.name)
+        elif desc.kind == KIND_ARRAY:
+            value = []
+        elif desc.kind == KIND_MOREF:
+            value = attrs.get("type", desc.name).rpartition(":")[2]
+        else:
+            value = None
+        self._frames.append([desc, is_array, name, value])
+
+    # -------------------------------------------------------------------------
+    def _end(self, tag):
+
+        depth = self._depth
+        self._depth -= 1
+        if self._skip_below is not None:
+            if depth == self._skip_below:
+                self._skip_below = None
+            return
+
+        if depth >= 7 and self._frames:
+            (desc, is_array, name, value) = self._frames.pop()
+            kind = desc.kind
+            if kind == KIND_SCALAR:
+                value = desc.convert("".join(self._text))
+            elif kind == KIND_MOREF:
+                value = MoRef(value, "".join(self._text))
+            del self._text[:]
+
+            if not self._frames:
+                self._props[self._prop_name] = value
+                return
+
+            parent = self._frames[-1][3]
+            if isinstance(parent, list):
+                parent.append(value)
+            elif is_array and kind != KIND_ARRAY:
+                items = parent.get(name)
+                if items is None:
+                    parent[name] = [value]
+                else:
+                    items.append(value)
+            else:
+                parent[name] = value
+            return
+
+        name = tag.rpartition(" ")[2]
+        if depth == 7 and name == "name":
+            self._prop_name = "".join(self._text)
+        elif depth == 6 and name == "obj":
+            self._moref = MoRef(self._moref_type, "".join(self._text))
+        elif depth == 5:
+            if name == "objects":
+                self.objects += 1
+                self.consumer(self._moref, self._props)
+                self._props = None
+            elif name == "token":
+                self.token = "".join(self._text)
+        del self._text[:]
+
+
+# =============================================================================
+@contextlib.contextmanager
+def streaming_property_sets(consumer):
+    """
+    Stream the property sets of all RetrievePropertiesEx() calls in this context.
+
+    The property sets of the responses are given to the consumer, the calls
+    are returning a RetrieveResult object with the continuation token only.
+    """
+    previous = getattr(_local, "consumer", None)
+    _local.consumer = consumer
+    try:
+        yield
+    finally:
+        _local.consumer = previous
+
+
+# -----------------------------------------------------------------------------
+def current_consumer(info):
+    """Return the consumer of the property sets, if the given method is streamed."""
+    consumer = getattr(_local, "consumer", None)
+    if consumer is None or info.wsdlName not in STREAMED_METHODS:
+        return None
+    return consumer
+
+
+# -----------------------------------------------------------------------------
+def parse_property_sets(fp, consumer, chunk_size=DEFAULT_READ_CHUNK_SIZE):
+    """
+    Parse a RetrievePropertiesEx() response from the given file object.
+
+    @return: a RetrieveResult object without objects or None, if the response
+             was empty
+    @rtype: vmodl.query.PropertyCollector.RetrieveResult or None
+    """
+    parser = PropertySetParser(consumer)
+    while True:
+        chunk = fp.read(chunk_size)
+        if not chunk:
+            break
+        parser.feed(chunk)
+    parser.close()
+    if not parser.has_result:
+        return None
+    return vmodl.query.PropertyCollector.RetrieveResult(token=parser.token)
+
+
+# =============================================================================
+class _DecodedReader(object):
+    """Reading an encoded HTTP response decoded."""
+
+    # -------------------------------------------------------------------------
+    def __init__(self, resp, encoding):
+        """Initialize a _DecodedReader object."""
+        self.resp = resp
+        self.decoder = StreamingDecoder(encoding)
+        self.done = False
+
+    # -------------------------------------------------------------------------
+    def read(self, amt=DEFAULT_READ_CHUNK_SIZE):
+        """Return the next decoded chunk."""
+        while not self.done:
+            chunk = self.resp.read(amt)
+            if chunk:
+                data = self.decoder.decompress(chunk)
+            else:
+                self.done = True
+                data = self.decoder.flush()
+            if data:
+                return data
+        return b""
+
+
+# -----------------------------------------------------------------------------
+def streaming_supported(stub, version=None):
+    """
+    Return, whether the property sets can be streamed with the given SOAP stub adapter.
+
+    @param stub: the SOAP stub adapter of pyVmomi
+    @type stub: pyVmomi.SoapAdapter.SoapStubAdapter
+    @param version: the version of pyVmomi as a tuple, defaults to the installed one
+    @type version: tuple or None
+
+    @return: the reason, why streaming is not supported, or None, if it is supported
+    @rtype: str or None
+    """
+    if version is None:
+        version = getattr(pyVmomi, "version_info", None)
+    if not version or tuple(version[:2]) not in STREAMING_PYVMOMI_VERSIONS:
+        return _("pyVmomi version {v} is not supported, only {s}.").format(
+            v=".".join(str(x) for x in version) if version else _("unknown"),
+            s=", ".join("{}.{}.x".format(*x) for x in STREAMING_PYVMOMI_VERSIONS),
+        )
+
+    missing = [name for name in STREAMING_STUB_ATTRIBUTES if not hasattr(stub, name)]
+    if missing:
+        return _("The SOAP stub {c} has no attributes {a}.").format(
+            c=stub.__class__.__name__, a=", ".join(missing)
+        )
+
+    return None
+
+
+# -----------------------------------------------------------------------------
+def enable_streaming(stub, version=None):
+    """
+    Enable the streaming of property sets for the given SOAP stub adapter of pyVmomi.
+
+    Without an active streaming_property_sets() context the calls are passed
+    unchanged to the original InvokeMethod() of the stub. If the installed
+    pyVmomi or the stub are not supported, the stub is left unchanged.
+
+    @return: whether the streaming was enabled
+    @rtype: bool
+    """
+    reason = streaming_supported(stub, version=version)
+    if reason:
+        LOG.warning(_("Falling back to the property sets of pyVmomi: {}").format(reason))
+        return False
+
+    invoke_method = stub.InvokeMethod
+
+    def InvokeMethod(mo, info, args, outerStub=None):  # noqa: N802
+        consumer = current_consumer(info)
+        if consumer is None:
+            return invoke_method(mo, info, args, outerStub)
+        return _invoke_streaming(stub, mo, info, args, outerStub, consumer)
+
+    stub.InvokeMethod = InvokeMethod
+    return True
+
+
+# -----------------------------------------------------------------------------
+def _invoke_streaming(stub, mo, info, args, outer_stub, consumer):
+
+    if outer_stub is None:
+        outer_stub = stub
+
+    headers = {
+        "Cookie": stub.cookie,
+        "SOAPAction": stub.versionId,
+        "Content-Type": "text/xml; charset={}".format(SoapAdapter.XML_ENCODING),
+        "User-Agent": "pyvmomi {v} fb_vmware/{o}".format(
+            v=getattr(SoapAdapter, "version_info_str", "-"), o=__version__
+        ),
+    }
+    if stub._customHeaders:
+        headers.update(stub._customHeaders)
+    if stub._acceptCompressedResponses:
+        headers["Accept-Encoding"] = "gzip, deflate"
+    req = stub.SerializeRequest(mo, info, args)
+    for modifier in stub.requestModifierList:
+        req = modifier(req)
+
+    conn = stub.GetConnection()
+    try:
+        conn.request("POST", stub.path, req, headers)
+        resp = conn.getresponse()
+    except (socket.error, HTTPException):
+        conn.close()
+        stub.DropConnections()
+        raise
+
+    cookie = resp.getheader("Set-Cookie")
+    if cookie:
+        stub.cookie = cookie
+    status = resp.status
+    if status not in (200, 500):
+        conn.close()
+        raise HTTPException("{0} {1}".format(resp.status, resp.reason))
+
+    try:
+        fp = resp
+        encoding = resp.getheader("Content-Encoding", "identity").strip().lower()
+        if encoding in CONTENT_ENCODINGS:
+            fp = _DecodedReader(resp, encoding)
+        if status == 200:
+            obj = parse_property_sets(fp, consumer)
+        else:
+            obj = SoapAdapter.SoapResponseDeserializer(outer_stub).Deserialize(fp, info.result)
+    except Exception:
+        conn.close()
+        stub.DropConnections()
+        raise
+    else:
+        resp.read()
+        stub.ReturnConnection(conn)
+
+    if outer_stub is not stub:
+        return (status, obj)
+    if status == 200:
+        return obj
+    raise obj
+
+
+# =============================================================================
+if __name__ == "__main__":
+
+    pass
+
+# =============================================================================
+
+# vim: tabstop=4 expandtab shiftwidth=4 softtabstop=4 list
@@ -0,0 +1,177 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+@summary: The module for coalescing identical concurrent retrievals from a vSphere.
+
+If several threads are requesting the same retrieval at the same time, only the
+first one (the leader) is performing it, the others are waiting for its end and
+are getting the same result (or the same exception). Optionally the result is
+kept for a short time to live, so also a burst of requests following each other
+is answered by one retrieval.
+
+The shared results must be treated as read-only by the callers.
+
+@author: Frank Brehm
+@contact: frank@brehm-online.com
+@copyright: © 2022 - 2026 by Frank Brehm, Berlin
+"""
+from __future__ import absolute_import
+
+# Standard modules
+import logging
+import threading
+import time
+
+# Third party modules
+from fb_tools.obj import FbGenericBaseObject
+
+# Own modules
+from .xlate import XLATOR
+
+__version__ = "0.1.0"
+LOG = logging.getLogger(__name__)
+
+_ = XLATOR.gettext
+
+DEFAULT_RESULT_TTL = 0.0
+
+
+# =============================================================================
+class _Flight(object):
+    """A retrieval in progress."""
+
+    __slots__ = ("done", "result", "error", "waiters")
+
+    # -------------------------------------------------------------------------
+    def __init__(self):
+        """Initialize a _Flight object."""
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+        self.waiters = 0
+
+
+# =============================================================================
+class SingleFlight(FbGenericBaseObject):
+    """Coalescing of identical concurrent calls with an optional result TTL."""
+
+    # -------------------------------------------------------------------------
+    def __init__(self, ttl=DEFAULT_RESULT_TTL):
+        """
+        Initialize a SingleFlight object.
+
+        @param ttl: the time in seconds, for which a result is given back to later calls
+                    with the same key, 0 means only coalescing of concurrent calls.
+        @type ttl: float
+        """
+        self._ttl = DEFAULT_RESULT_TTL
+        self._lock = threading.Lock()
+        self._flights = {}
+        self._results = {}
+
+        self.executions = 0
+        self.coalesced = 0
+        self.cache_hits = 0
+
+        self.ttl = ttl
+
+    # -----------------------------------------------------------
+    @property
+    def ttl(self):
+        """Return the time to live of the results in seconds."""
+        return self._ttl
+
+    @ttl.setter
+    def ttl(self, value):
+        value = float(value)
+        if value < 0:
+            msg = _("The time to live of results must not be negative, not {!r}.").format(value)
+            raise ValueError(msg)
+        self._ttl = value
+        if not value:
+            self.forget()
+
+    # -------------------------------------------------------------------------
+    def __repr__(self):
+        """Typecasting into a string for reproduction."""
+        return "<{c}(ttl={t!r})>".format(c=self.__class__.__name__, t=self.ttl)
+
+    # -------------------------------------------------------------------------
+    def as_dict(self, short=True):
+        """Transform the elements of the object into a dict."""
+        res = super(SingleFlight, self).as_dict(short=short)
+        res["ttl"] = self.ttl
+        res["executions"] = self.executions
+        res["coalesced"] = self.coalesced
+        res["cache_hits"] = self.cache_hits
+        res["in_flight"] = len(self._flights)
+        return res
+
+    # -------------------------------------------------------------------------
+    def do(self, key, func, *args, **kwargs):
+        """
+        Call func(*args, **kwargs), if no call with the same key is in progress or cached.
+
+        Otherwise wait for the call in progress and return its result, or return
+        the cached result.
+        """
+        with self._lock:
+            if key in self._results:
+                (expires, result) = self._results[key]
+                if time.monotonic() < expires:
+                    self.cache_hits += 1
+                    return result
+                del self._results[key]
+
+            flight = self._flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = _Flight()
+                self._flights[key] = flight
+                self.executions += 1
+            else:
+                flight.waiters += 1
+                self.coalesced += 1
+
+        if not leader:
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.result
+
+        try:
+            flight.result = func(*args, **kwargs)
+        except BaseException as e:
+            flight.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._flights[key]
+                if flight.error is None and self.ttl:
+                    self._results[key] = (time.monotonic() + self.ttl, flight.result)
+            flight.done.set()
+            if flight.waiters:
+                LOG.debug(
+                    _("Coalesced {n} waiting calls of {k!r}.").format(n=flight.waiters, k=key)
+                )
+
+        return flight.result
+
+    # -------------------------------------------------------------------------
+    def forget(self, key=None):
+        """Remove the cached result of the given key or of all keys."""
+        with self._lock:
+            if key is None:
+                self._results.clear()
+            else:
+                self._results.pop(key, None)
+
+
+# =============================================================================
+if __name__ == "__main__":
+
+    pass
+
+# =============================================================================
+
+# vim: tabstop=4 expandtab shiftwidth=4 softtabstop=4 list
@@ -0,0 +1,210 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+@summary: The module for a consistent snapshot of the inventory of a vSphere.
+
+A snapshot contains the requested kinds of objects of a vSphere, retrieved in one
+pass by VsphereConnection.get_inventory(), with their cross references resolved:
+the host and the cluster of a VM, the cluster of a host, the hosts of a datastore
+and the Distributed Virtual Switch of a port group.
+
+@author: Frank Brehm
+@contact: frank@brehm-online.com
+@copyright: © 2022 - 2026 by Frank Brehm, Berlin
+"""
+from __future__ import absolute_import
+
+# Standard modules
+import datetime
+import logging
+from types import MappingProxyType
+
+# Third party modules
+from fb_tools.obj import FbGenericBaseObject
+
+# Own modules
+from .datastore import VsphereDatastoreDict
+from .ds_cluster import VsphereDsClusterDict
+from .network import VsphereNetworkDict
+from .xlate import XLATOR
+
+__version__ = "0.1.0"
+LOG = logging.getLogger(__name__)
+
+_ = XLATOR.gettext
+
+SNAPSHOT_KINDS = (
+    "datacenters",
+    "clusters",
+    "hosts",
+    "datastores",
+    "ds_clusters",
+    "networks",
+    "vms",
+)
+
+
+# =============================================================================
+class VsphereInventorySnapshot(FbGenericBaseObject):
+    """
+    A snapshot of the inventory of a vSphere with resolved cross references.
+
+    The collections of kinds, which were not requested, are empty. All collections
+    are read-only.
+    """
+
+    # -------------------------------------------------------------------------
+    def __init__(
+        self,
+        vsphere=None,
+        kinds=SNAPSHOT_KINDS,
+        datacenters=None,
+        clusters=None,
+        hosts=None,
+        datastores=None,
+        ds_clusters=None,
+        networks=None,
+        dv_portgroups=None,
+        dvs=None,
+        vms=None,
+        created=None,
+    ):
+        """Initialize a VsphereInventorySnapshot object."""
+        self.vsphere = vsphere
+        self.kinds = tuple(kinds)
+        self.created = created
+        if self.created is None:
+            self.created = datetime.datetime.now(datetime.timezone.utc)
+
+        self.datacenters = MappingProxyType(dict(datacenters or {}))
+        self.clusters = tuple(clusters or ())
+        self.hosts = MappingProxyType(dict(hosts or {}))
+        self.datastores = datastores
+        if self.datastores is None:
+            self.datastores = VsphereDatastoreDict().freeze()
+        self.ds_clusters = ds_clusters
+        if self.ds_clusters is None:
+            self.ds_clusters = VsphereDsClusterDict().freeze()
+        self.networks = networks
+        if self.networks is None:
+            self.networks = VsphereNetworkDict().freeze()
+        self.dv_portgroups = dv_portgroups
+        if self.dv_portgroups is None:
+            self.dv_portgroups = VsphereNetworkDict().freeze()
+        self.dvs = MappingProxyType(dict(dvs or {}))
+        self.vms = tuple(vms or ())
+
+        self._cluster_index = {}
+        for cluster in self.clusters:
+            self._cluster_index[(cluster.dc_name, cluster.name.lower())] = cluster
+
+    # -------------------------------------------------------------------------
+    def __repr__(self):
+        """Typecasting into a string for reproduction."""
+        return "<{c}(vsphere={v!r}, kinds={k!r})>".format(
+            c=self.__class__.__name__, v=self.vsphere, k=self.kinds
+        )
+
+    # -------------------------------------------------------------------------
+    def get_cluster(self, name, dc_name=None):
+        """
+        Return the computing cluster (or standalone host) with the given name.
+
+        @return: the found cluster or None
+        @rtype: VsphereCluster or None
+        """
+        if not name:
+            return None
+        name = name.lower()
+        if dc_name is not None:
+            return self._cluster_index.get((dc_name, name))
+        for (key, cluster) in self._cluster_index.items():
+            if key[1] == name:
+                return cluster
+        return None
+
+    # -------------------------------------------------------------------------
+    def host_of_vm(self, vm):
+        """Return the VsphereHost, on which the given VM is running, or None."""
+        if not vm.host:
+            return None
+        return self.hosts.get(vm.host)
+
+    # -------------------------------------------------------------------------
+    def cluster_of_vm(self, vm):
+        """Return the VsphereCluster of the given VM or None."""
+        return self.get_cluster(vm.cluster_name, vm.dc_name)
+
+    # -------------------------------------------------------------------------
+    def cluster_of_host(self, host):
+        """Return the VsphereCluster of the given host or None."""
+        return self.get_cluster(host.cluster_name, host.dc_name)
+
+    # -------------------------------------------------------------------------
+    def hosts_of_datastore(self, datastore):
+        """
+        Return the hosts, which have mounted the given datastore.
+
+        @rtype: list of VsphereHost
+        """
+        hosts = []
+        for host_name in sorted(datastore.hosts or ()):
+            host = self.hosts.get(host_name)
+            if host is not None:
+                hosts.append(host)
+        return hosts
+
+    # -------------------------------------------------------------------------
+    def vms_of_host(self, host):
+        """
+        Return the VMs running on the given host.
+
+        @rtype: list of VsphereVm
+        """
+        return [vm for vm in self.vms if vm.host == host.name]
+
+    # -------------------------------------------------------------------------
+    def dvs_of_portgroup(self, portgroup):
+        """Return the VsphereDVS of the given Distributed Virtual Port Group or None."""
+        return self.dvs.get(portgroup.dvs_uuid)
+
+    # -------------------------------------------------------------------------
+    def as_dict(self, short=True):
+        """
+        Transform the elements of the object into a dict.
+
+        @param short: don't include local properties in resulting dict.
+        @type short: bool
+
+        @return: structure as dict
+        @rtype:  dict
+        """
+        res = super(VsphereInventorySnapshot, self).as_dict(short=short)
+        res["vsphere"] = self.vsphere
+        res["kinds"] = self.kinds
+        res["created"] = self.created
+        counts = {}
+        for (kind, found) in (
+            ("datacenters", self.datacenters),
+            ("clusters", self.clusters),
+            ("hosts", self.hosts),
+            ("datastores", self.datastores),
+            ("ds_clusters", self.ds_clusters),
+            ("networks", self.networks),
+            ("dv_portgroups", self.dv_portgroups),
+            ("dvs", self.dvs),
+            ("vms", self.vms),
+        ):
+            counts[kind] = len(found)
+        res["counts"] = counts
+        return res
+
+
+# =============================================================================
+if __name__ == "__main__":
+
+    pass
+
+# =============================================================================
+
+# vim: tabstop=4 expandtab shiftwidth=4 softtabstop=4 list
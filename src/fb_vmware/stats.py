@@ -0,0 +1,555 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+@summary: The module for statistics about the SOAP requests to a vSphere.
+
+@author: Frank Brehm
+@contact: frank@brehm-online.com
+@copyright: © 2022 - 2026 by Frank Brehm, Berlin
+"""
+from __future__ import absolute_import
+
+# Standard modules
+import bisect
+import inspect
+import logging
+import sys
+import threading
+import time
+from http.client import HTTPConnection
+
+# Third party modules
+from fb_tools.obj import FbGenericBaseObject
+
+from pyVmomi import vim
+from pyVmomi.SoapAdapter import StubAdapterBase
+
+# Own modules
+from .xlate import XLATOR
+
+__version__ = "0.3.0"
+LOG = logging.getLogger(__name__)
+
+_ = XLATOR.gettext
+
+# Upper bounds of the latency buckets in seconds
+DEFAULT_LATENCY_BUCKETS = (
+    0.001,
+    0.002,
+    0.005,
+    0.01,
+    0.02,
+    0.05,
+    0.1,
+    0.2,
+    0.5,
+    1.0,
+    2.0,
+    5.0,
+    10.0,
+)
+
+UNKNOWN_OPERATION = "-"
+
+
+# =============================================================================
+def compression_ratio(decoded, received):
+    """Return the ratio of the given decoded to received bytes, or None without received bytes."""
+    if not received:
+        return None
+    return decoded / received
+
+
+# =============================================================================
+class LatencyHistogram(FbGenericBaseObject):
+    """A histogram of latencies with fixed buckets."""
+
+    # -------------------------------------------------------------------------
+    def __init__(self, buckets=DEFAULT_LATENCY_BUCKETS):
+        """Initialize a LatencyHistogram object."""
+        self.buckets = tuple(sorted(buckets))
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.min = None
+        self.max = None
+
+    # -------------------------------------------------------------------------
+    def __repr__(self):
+        """Typecasting into a string for reproduction."""
+        return "<{c}(count={n}, total={t:0.6f})>".format(
+            c=self.__class__.__name__, n=self.count, t=self.total
+        )
+
+    # -------------------------------------------------------------------------
+    def __len__(self):
+        """Return the number of recorded latencies."""
+        return self.count
+
+    # -------------------------------------------------------------------------
+    @property
+    def mean(self):
+        """Return the mean latency in seconds."""
+        if not self.count:
+            return None
+        return self.total / self.count
+
+    # -------------------------------------------------------------------------
+    def add(self, seconds):
+        """Record the given latency in seconds."""
+        self.counts[bisect.bisect_left(self.buckets, seconds)] += 1
+        self.count += 1
+        self.total += seconds
+        if self.min is None or seconds < self.min:
+            self.min = seconds
+        if self.max is None or seconds > self.max:
+            self.max = seconds
+
+    # -------------------------------------------------------------------------
+    def percentile(self, percent):
+        """
+        Return an estimation of the given percentile in seconds.
+
+        It is the upper bound of the bucket containing the percentile, limited
+        by the maximum recorded latency.
+        """
+        if not self.count:
+            return None
+        rank = self.count * percent / 100.0
+        seen = 0
+        for (i, count) in enumerate(self.counts):
+            seen += count
+            if seen >= rank and count:
+                if i < len(self.buckets):
+                    return min(self.buckets[i], self.max)
+                return self.max
+        return self.max
+
+    # -------------------------------------------------------------------------
+    def as_dict(self, short=True):
+        """Transform the elements of the object into a dict."""
+        res = super(LatencyHistogram, self).as_dict(short=short)
+        res["mean"] = self.mean
+        res["p50"] = self.percentile(50)
+        res["p95"] = self.percentile(95)
+        res["p99"] = self.percentile(99)
+        return res
+
+
+# =============================================================================
+class VsphereCallStats(FbGenericBaseObject):
+    """Statistics about all SOAP requests of one kind inside one operation."""
+
+    # -------------------------------------------------------------------------
+    def __init__(self, operation, call, buckets=DEFAULT_LATENCY_BUCKETS):
+        """Initialize a VsphereCallStats object."""
+        self.operation = operation
+        self.call = call
+        self.faults = 0
+        self.bytes_sent = 0
+        self.bytes_received = 0
+        self.bytes_decoded = 0
+        self.latency = LatencyHistogram(buckets)
+
+    # -------------------------------------------------------------------------
+    def __repr__(self):
+        """Typecasting into a string for reproduction."""
+        return "<{c}(operation={o!r}, call={m!r}, requests={n})>".format(
+            c=self.__class__.__name__, o=self.operation, m=self.call, n=self.requests
+        )
+
+    # -------------------------------------------------------------------------
+    @property
+    def requests(self):
+        """Return the number of requests."""
+        return self.latency.count
+
+    # -------------------------------------------------------------------------
+    @property
+    def compression_ratio(self):
+        """Return the ratio of the decoded to the received bytes."""
+        return compression_ratio(self.bytes_decoded, self.bytes_received)
+
+    # -------------------------------------------------------------------------
+    def as_dict(self, short=True):
+        """Transform the elements of the object into a dict."""
+        res = super(VsphereCallStats, self).as_dict(short=short)
+        res["requests"] = self.requests
+        res["compression_ratio"] = self.compression_ratio
+        return res
+
+
+# =============================================================================
+class VsphereSoapStats(FbGenericBaseObject):
+    """
+    Statistics about the SOAP requests to a vSphere.
+
+    It counts the requests and the transferred bytes and records histograms of
+    the latencies per SOAP method or fetched property. They are attributed to
+    the outermost public method of the vSphere handler, which triggered them,
+    so N+1 access patterns become visible as a high number of requests of one
+    kind inside one operation.
+    """
+
+    # -------------------------------------------------------------------------
+    def __init__(self, buckets=DEFAULT_LATENCY_BUCKETS):
+        """Initialize a VsphereSoapStats object."""
+        self.buckets = tuple(buckets)
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._calls = {}
+        self.requests = 0
+        self.faults = 0
+        self.bytes_sent = 0
+        self.bytes_received = 0
+        self.bytes_decoded = 0
+        self.compressed_responses = 0
+        self.compressed_bytes_in = 0
+        self.compressed_bytes_out = 0
+        self.started = time.time()
+
+    # -------------------------------------------------------------------------
+    def __repr__(self):
+        """Typecasting into a string for reproduction."""
+        return "<{c}(requests={r}, bytes_sent={s}, bytes_received={b})>".format(
+            c=self.__class__.__name__, r=self.requests, s=self.bytes_sent, b=self.bytes_received
+        )
+
+    # -------------------------------------------------------------------------
+    def reset(self):
+        """Reset all counters."""
+        with self._lock:
+            self._calls = {}
+            self.requests = 0
+            self.faults = 0
+            self.bytes_sent = 0
+            self.bytes_received = 0
+            self.bytes_decoded = 0
+            self.compressed_responses = 0
+            self.compressed_bytes_in = 0
+            self.compressed_bytes_out = 0
+            self.started = time.time()
+
+    # -------------------------------------------------------------------------
+    def _thread_bytes(self):
+
+        return (
+            getattr(self._local, "sent", 0),
+            getattr(self._local, "received", 0),
+            getattr(self._local, "decoded", 0),
+        )
+
+    # -------------------------------------------------------------------------
+    def add_bytes_sent(self, count):
+        """Count the given number of bytes sent to the vSphere."""
+        self._local.sent = getattr(self._local, "sent", 0) + count
+        with self._lock:
+            self.bytes_sent += count
+
+    # -------------------------------------------------------------------------
+    def add_bytes_received(self, count):
+        """Count the given number of bytes received from the vSphere."""
+        self._local.received = getattr(self._local, "received", 0) + count
+        with self._lock:
+            self.bytes_received += count
+
+    # -------------------------------------------------------------------------
+    def add_bytes_decoded(self, count):
+        """Count the given number of bytes of response bodies after decompression."""
+        self._local.decoded = getattr(self._local, "decoded", 0) + count
+        with self._lock:
+            self.bytes_decoded += count
+
+    # -------------------------------------------------------------------------
+    def add_compressed_response(self, bytes_in, bytes_out):
+        """Count a compressed response body with its compressed and its inflated size."""
+        with self._lock:
+            self.compressed_responses += 1
+            self.compressed_bytes_in += bytes_in
+            self.compressed_bytes_out += bytes_out
+
+    # -----------------------------------------------------------
+    @property
+    def compression_ratio(self):
+        """Return the ratio of the decoded response bodies to the received bytes."""
+        return compression_ratio(self.bytes_decoded, self.bytes_received)
+
+    # -------------------------------------------------------------------------
+    def record(
+        self,
+        operation,
+        call,
+        seconds,
+        bytes_sent=0,
+        bytes_received=0,
+        bytes_decoded=0,
+        fault=False,
+    ):
+        """Record a finished SOAP request."""
+        key = (operation, call)
+        with self._lock:
+            entry = self._calls.get(key)
+            if entry is None:
+                entry = VsphereCallStats(operation, call, self.buckets)
+                self._calls[key] = entry
+            entry.latency.add(seconds)
+            entry.bytes_sent += bytes_sent
+            entry.bytes_received += bytes_received
+            entry.bytes_decoded += bytes_decoded
+            self.requests += 1
+            if fault:
+                entry.faults += 1
+                self.faults += 1
+
+    # -------------------------------------------------------------------------
+    def calls(self, operation=None):
+        """Return the statistics of all calls, sorted by descending number of requests."""
+        with self._lock:
+            entries = list(self._calls.values())
+        if operation is not None:
+            entries = [e for e in entries if e.operation == operation]
+        return sorted(entries, key=lambda e: (-e.requests, e.operation, e.call))
+
+    # -------------------------------------------------------------------------
+    def operations(self):
+        """Return a dict with the summarized statistics per operation."""
+        res = {}
+        for entry in self.calls():
+            op = res.setdefault(
+                entry.operation,
+                {
+                    "requests": 0,
+                    "seconds": 0.0,
+                    "faults": 0,
+                    "bytes_sent": 0,
+                    "bytes_received": 0,
+                    "bytes_decoded": 0,
+                },
+            )
+            op["requests"] += entry.requests
+            op["seconds"] += entry.latency.total
+            op["faults"] += entry.faults
+            op["bytes_sent"] += entry.bytes_sent
+            op["bytes_received"] += entry.bytes_received
+            op["bytes_decoded"] += entry.bytes_decoded
+        return res
+
+    # -------------------------------------------------------------------------
+    def summary(self):
+        """Return all statistics as a dict suitable for JSON serialisation."""
+        calls = []
+        for entry in self.calls():
+            calls.append(
+                {
+                    "operation": entry.operation,
+                    "call": entry.call,
+                    "requests": entry.requests,
+                    "faults": entry.faults,
+                    "bytes_sent": entry.bytes_sent,
+                    "bytes_received": entry.bytes_received,
+                    "bytes_decoded": entry.bytes_decoded,
+                    "compression_ratio": entry.compression_ratio,
+                    "latency": entry.latency.as_dict(),
+                }
+            )
+        return {
+            "requests": self.requests,
+            "faults": self.faults,
+            "bytes_sent": self.bytes_sent,
+            "bytes_received": self.bytes_received,
+            "bytes_decoded": self.bytes_decoded,
+            "compression_ratio": self.compression_ratio,
+            "compressed_responses": self.compressed_responses,
+            "compressed_bytes_in": self.compressed_bytes_in,
+            "compressed_bytes_out": self.compressed_bytes_out,
+            "seconds": sum(c["latency"]["total"] for c in calls),
+            "elapsed": time.time() - self.started,
+            "operations": self.operations(),
+            "calls": calls,
+        }
+
+    # -------------------------------------------------------------------------
+    def as_dict(self, short=True):
+        """Transform the elements of the object into a dict."""
+        res = super(VsphereSoapStats, self).as_dict(short=short)
+        res["calls"] = [e.as_dict(short=short) for e in self.calls()]
+        return res
+
+    # -------------------------------------------------------------------------
+    def instrument(self, service_instance, handler=None):
+        """
+        Return a copy of the service instance, which is recording its requests.
+
+        All managed objects retrieved from the returned service instance are
+        using the same instrumented stub.
+        """
+        stub = VsphereInstrumentedStub(service_instance._stub, self, handler=handler)
+        return vim.ServiceInstance(service_instance._moId, stub)
+
+
+# =============================================================================
+class _CountingReader(object):
+    """A wrapper of the file object of a HTTP response counting the read bytes."""
+
+    # -------------------------------------------------------------------------
+    def __init__(self, fp, stats):
+
+        self._fp = fp
+        self._stats = stats
+
+    # -------------------------------------------------------------------------
+    def __getattr__(self, name):
+
+        return getattr(self._fp, name)
+
+    # -------------------------------------------------------------------------
+    def read(self, *args):
+
+        data = self._fp.read(*args)
+        self._stats.add_bytes_received(len(data))
+        return data
+
+    # -------------------------------------------------------------------------
+    def read1(self, *args):
+
+        data = self._fp.read1(*args)
+        self._stats.add_bytes_received(len(data))
+        return data
+
+    # -------------------------------------------------------------------------
+    def readline(self, *args):
+
+        data = self._fp.readline(*args)
+        self._stats.add_bytes_received(len(data))
+        return data
+
+    # -------------------------------------------------------------------------
+    def readinto(self, buffer):
+
+        count = self._fp.readinto(buffer)
+        if count:
+            self._stats.add_bytes_received(count)
+        return count
+
+
+# =============================================================================
+def counting_connection_class(scheme, stats):
+    """Return a subclass of the given HTTP connection class counting all transferred bytes."""
+
+    class CountingResponse(scheme.response_class):
+
+        def __init__(self, sock, *args, **kwargs):
+            super(CountingResponse, self).__init__(sock, *args, **kwargs)
+            self.fp = _CountingReader(self.fp, stats)
+
+    class CountingConnection(scheme):
+
+        response_class = CountingResponse
+
+        def send(self, data):
+            if isinstance(data, (bytes, bytearray)):
+                stats.add_bytes_sent(len(data))
+            return super(CountingConnection, self).send(data)
+
+    CountingConnection.__name__ = "Counting" + scheme.__name__
+    return CountingConnection
+
+
+# =============================================================================
+class VsphereInstrumentedStub(StubAdapterBase):
+    """
+    A stub adapter wrapping the SOAP stub adapter of pyVmomi.
+
+    It records the latencies and the transferred bytes of all requests in
+    a VsphereSoapStats object.
+    """
+
+    # -------------------------------------------------------------------------
+    def __init__(self, soap_stub, stats, handler=None):
+        """Initialize a VsphereInstrumentedStub object."""
+        StubAdapterBase.__init__(self, version=soap_stub.version)
+        self.soap_stub = soap_stub
+        self.stats = stats
+        self._operations = {}
+        if handler is not None:
+            for (name, func) in inspect.getmembers(handler.__class__, inspect.isfunction):
+                if not name.startswith("_"):
+                    self._operations[func.__code__] = name
+
+        # Count the bytes on the innermost stub, if there are more wrapping stubs
+        target = soap_stub
+        while isinstance(getattr(target, "soap_stub", None), StubAdapterBase):
+            target = target.soap_stub
+
+        scheme = getattr(target, "scheme", None)
+        if isinstance(scheme, type) and issubclass(scheme, HTTPConnection):
+            target.scheme = counting_connection_class(scheme, stats)
+            target.DropConnections()
+        else:
+            LOG.debug(_("Cannot count the transferred bytes with scheme {!r}.").format(scheme))
+
+    # -------------------------------------------------------------------------
+    def __getattr__(self, name):
+        """Delegate unknown attributes to the wrapped SOAP stub."""
+        if name.startswith("__") or name == "soap_stub":
+            raise AttributeError(name)
+        return getattr(self.soap_stub, name)
+
+    # -------------------------------------------------------------------------
+    def DropConnections(self):  # noqa: N802
+        """Drop all cached connections of the wrapped SOAP stub."""
+        self.soap_stub.DropConnections()
+
+    # -------------------------------------------------------------------------
+    def current_operation(self):
+        """Return the outermost public method of the handler in the current call stack."""
+        operation = UNKNOWN_OPERATION
+        frame = sys._getframe(1)
+        while frame is not None:
+            name = self._operations.get(frame.f_code)
+            if name:
+                operation = name
+            frame = frame.f_back
+        return operation
+
+    # -------------------------------------------------------------------------
+    def InvokeMethod(self, mo, info, args):  # noqa: N802
+        """Invoke the given managed method and record the request."""
+        if info.wsdlName == "Fetch":
+            call = "{t}.{p}".format(t=mo._wsdlName, p=args[0])
+        else:
+            call = "{t}.{m}".format(t=mo._wsdlName, m=info.name)
+        operation = self.current_operation()
+
+        (sent, received, decoded) = self.stats._thread_bytes()
+        fault = True
+        start = time.perf_counter()
+        try:
+            (status, obj) = self.soap_stub.InvokeMethod(mo, info, args, self)
+            fault = status != 200
+        finally:
+            duration = time.perf_counter() - start
+            (sent_after, received_after, decoded_after) = self.stats._thread_bytes()
+            self.stats.record(
+                operation,
+                call,
+                duration,
+                bytes_sent=sent_after - sent,
+                bytes_received=received_after - received,
+                bytes_decoded=decoded_after - decoded,
+                fault=fault,
+            )
+
+        if status == 200:
+            return obj
+        raise obj
+
+
+# =============================================================================
+if __name__ == "__main__":
+
+    pass
+
+# =============================================================================
+
+# vim: tabstop=4 expandtab shiftwidth=4 softtabstop=4 list
@@ -0,0 +1,158 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+@summary: The module for an iterative traversal of the vSphere inventory.
+
+The inventory below the folders of the datacenters is walked depth first with
+an explicit stack instead of recursive method calls. The walk is a generator
+of WalkItem tuples, visitors for particular vmodl types can be registered to
+collect several kinds of objects in one pass.
+
+@author: Frank Brehm
+@contact: frank@brehm-online.com
+@copyright: © 2022 - 2026 by Frank Brehm, Berlin
+"""
+from __future__ import absolute_import
+
+# Standard modules
+import collections
+import logging
+
+# Third party modules
+from pyVmomi import vim
+
+# Own modules
+from .xlate import XLATOR
+
+__version__ = "0.1.0"
+LOG = logging.getLogger(__name__)
+
+_ = XLATOR.gettext
+
+# Return values of visitors
+WALK_CONTINUE = None
+WALK_PRUNE = "prune"
+WALK_STOP = "stop"
+
+WalkItem = collections.namedtuple("WalkItem", ["obj", "dc_name", "path", "depth", "parent"])
+
+
+# =============================================================================
+class InventoryWalker(object):
+    """
+    Walking iteratively through the vSphere inventory.
+
+    The children of the given root folders have a depth of 1. Folders deeper than
+    max_depth are neither returned nor entered. If with_paths is set, the path of
+    every object is the slash separated list of the names of the folders between
+    the root folder and the object, e.g. '/' for an object in the root folder,
+    otherwise it is None and the names of the folders are not retrieved.
+    """
+
+    # -------------------------------------------------------------------------
+    def __init__(self, max_depth=None, with_paths=False, container_types=(vim.Folder,)):
+        """Initialize an InventoryWalker object."""
+        self.max_depth = max_depth
+        self.with_paths = with_paths
+        self.container_types = tuple(container_types)
+        self.visitors = []
+        self.visited = 0
+        self._pruned = False
+
+    # -------------------------------------------------------------------------
+    def __repr__(self):
+        """Typecasting into a string for reproduction."""
+        return "<{c}(max_depth={d!r}, with_paths={p!r}, visitors={v})>".format(
+            c=self.__class__.__name__, d=self.max_depth, p=self.with_paths, v=len(self.visitors)
+        )
+
+    # -------------------------------------------------------------------------
+    def add_visitor(self, types, visitor):
+        """
+        Register a visitor for objects of the given vmodl types.
+
+        The visitor is called with the WalkItem of every found object of these types.
+        It may return WALK_PRUNE for not entering the object, or WALK_STOP for
+        finishing the walk.
+
+        @return: the walker itself
+        @rtype: InventoryWalker
+        """
+        if not isinstance(types, (tuple, list)):
+            types = (types,)
+        self.visitors.append((tuple(types), visitor))
+        return self
+
+    # -------------------------------------------------------------------------
+    def prune(self):
+        """Do not enter the last object returned by walk()."""
+        self._pruned = True
+
+    # -------------------------------------------------------------------------
+    def walk(self, roots):
+        """
+        Return a generator of all objects below the given root folders.
+
+        @param roots: the root folders and the names of their datacenters
+        @type roots: iterable of tuples (folder, dc_name)
+
+        @return: the found objects, depth first in the order of the inventory
+        @rtype: iterator of WalkItem
+        """
+        for (root, dc_name) in roots:
+            # Every frame is: iterator over the children, path, depth and the parent
+            root_path = "/" if self.with_paths else None
+            stack = [(iter(root.childEntity), root_path, 1, root)]
+            while stack:
+                (children, path, depth, parent) = stack[-1]
+                obj = next(children, None)
+                if obj is None:
+                    stack.pop()
+                    continue
+
+                is_container = isinstance(obj, self.container_types)
+                if is_container and self.max_depth is not None and depth > self.max_depth:
+                    continue
+
+                self.visited += 1
+                self._pruned = False
+                yield WalkItem(obj, dc_name, path, depth, parent)
+
+                if not is_container or self._pruned:
+                    continue
+                child_path = None
+                if self.with_paths:
+                    child_path = path.rstrip("/") + "/" + obj.name
+                stack.append((iter(obj.childEntity), child_path, depth + 1, obj))
+
+    # -------------------------------------------------------------------------
+    def run(self, roots):
+        """
+        Walk through the inventory below the given root folders and call the visitors.
+
+        @return: whether the walk was stopped by a visitor
+        @rtype: bool
+        """
+        if not self.visitors:
+            return False
+
+        for item in self.walk(roots):
+            for (types, visitor) in self.visitors:
+                if not isinstance(item.obj, types):
+                    continue
+                action = visitor(item)
+                if action == WALK_STOP:
+                    return True
+                if action == WALK_PRUNE:
+                    self.prune()
+        return False
+
+
+# =============================================================================
+if __name__ == "__main__":
+
+    pass
+
+# =============================================================================
+
+# vim: tabstop=4 expandtab shiftwidth=4 softtabstop=4 list
@@ -24,14 +24,51 @@ from fb_tools.obj import FbGenericBaseObject
 # Own modules
 from .xlate import XLATOR
 
-__version__ = "0.1.1"
+__version__ = "0.2.0"
 LOG = logging.getLogger(__name__)
 
 _ = XLATOR.gettext
 
 
 # =============================================================================
-class TypedDict(MutableMapping, FbGenericBaseObject):
+class FreezableMixin(object):
+    """
+    A mixin class for dicts, which can be made read-only.
+
+    The results of the retrieval methods of a VsphereConnection are frozen, because
+    they may be shared by several callers. A changeable copy can be get by copy().
+    """
+
+    msg_frozen = _("The {} object is read-only, use copy() to get a changeable copy.")
+
+    _frozen = False
+
+    # -----------------------------------------------------------
+    @property
+    def frozen(self):
+        """Return, whether the dict is read-only."""
+        return self._frozen
+
+    # -------------------------------------------------------------------------
+    def freeze(self):
+        """Make the dict read-only and return it."""
+        self._frozen = True
+        return self
+
+    # -------------------------------------------------------------------------
+    def _check_frozen(self):
+
+        if self._frozen:
+            raise TypeError(self.msg_frozen.format(self.__class__.__name__))
+
+    # -------------------------------------------------------------------------
+    def copy(self):
+        """Return a changeable shallow copy of the dict."""
+        return self.__class__(*self.values())
+
+
+# =============================================================================
+class TypedDict(FreezableMixin, MutableMapping, FbGenericBaseObject):
     """
     A dictionary containing typed objects.
 
@@ -70,6 +107,7 @@ class TypedDict(MutableMapping, FbGenericBaseObject):
 
         The key must be identic to the name of the network.
         """
+        self._check_frozen()
         if not isinstance(item, self.value_class):
             msg = self.msg_invalid_item_type.format(
                 got=item.__class__.__name__, expected=self.value_class.__name__
@@ -125,6 +163,7 @@ class TypedDict(MutableMapping, FbGenericBaseObject):
     # -------------------------------------------------------------------------
     def _del_item(self, key, strict=True):
 
+        self._check_frozen()
         if key is None:
             raise TypeError(self.msg_none_type_error)
 
@@ -252,6 +291,7 @@ class TypedDict(MutableMapping, FbGenericBaseObject):
     # -------------------------------------------------------------------------
     def pop(self, key, *args):
         """Get the item by its name and remove it in dict."""
+        self._check_frozen()
         if key is None:
             raise TypeError(self.msg_none_type_error)
 
@@ -264,6 +304,7 @@ class TypedDict(MutableMapping, FbGenericBaseObject):
     # -------------------------------------------------------------------------
     def popitem(self):
         """Remove and return a arbitrary (key and item) pair from the dictionary."""
+        self._check_frozen()
         if not len(self._map):
             return None
 
@@ -275,6 +316,7 @@ class TypedDict(MutableMapping, FbGenericBaseObject):
     # -------------------------------------------------------------------------
     def clear(self):
         """Remove all items from the dictionary."""
+        self._check_frozen()
         self._map = {}
 
     # -------------------------------------------------------------------------
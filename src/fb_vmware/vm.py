@@ -36,13 +36,32 @@ from .ether import VsphereEthernetcard, VsphereEthernetcardList
 from .obj import DEFAULT_OBJ_STATUS
 from .obj import OBJ_STATUS_GREEN
 from .obj import VsphereObject
+from .propset import vmodl_isinstance
+from .propset import vmodl_type_of
 from .xlate import XLATOR
 
-__version__ = "1.3.2"
+__version__ = "1.6.0"
 LOG = logging.getLogger(__name__)
 
 _ = XLATOR.gettext
 
+# The property paths of a virtual machine needed by VsphereVm.from_properties()
+VM_PROPERTIES = (
+    "name",
+    "parent",
+    "resourcePool",
+    "summary.config",
+    "summary.customValue",
+    "runtime.host",
+    "runtime.powerState",
+    "config.version",
+    "config.hardware.device",
+    "guest.toolsVersion",
+    "guest.toolsInstallType",
+    "guest.toolsRunningStatus",
+    "guest.toolsVersionStatus2",
+)
+
 
 # =============================================================================
 class VsphereVm(VsphereObject):
@@ -349,13 +368,7 @@ class VsphereVm(VsphereObject):
     @property
     def online(self):
         """Is this VM generally online or not."""
-        if self.template:
-            return False
-        if self.power_state is None:
-            return False
-        if self.power_state.lower() in ("poweredoff", "suspended"):
-            return False
-        return True
+        return self.online_by_state(self.power_state, template=self.template)
 
     # -----------------------------------------------------------
     @property
@@ -481,7 +494,7 @@ class VsphereVm(VsphereObject):
         res["config_path_relative"] = self.config_path_relative
         res["config_path_storage"] = self.config_path_storage
         res["config_version"] = self.config_version
-        res["host"] = self.cluster_name
+        res["host"] = self.host
         res["path"] = self.path
         res["template"] = self.template
         res["online"] = self.online
@@ -553,6 +566,18 @@ class VsphereVm(VsphereObject):
 
         return True
 
+    # -------------------------------------------------------------------------
+    @staticmethod
+    def online_by_state(power_state, template=False):
+        """Return, whether a VM with the given power state is generally online."""
+        if template:
+            return False
+        if power_state is None:
+            return False
+        if power_state.lower() in ("poweredoff", "suspended"):
+            return False
+        return True
+
     # -------------------------------------------------------------------------
     @classmethod
     def from_summary(
@@ -565,8 +590,15 @@ class VsphereVm(VsphereObject):
         verbose=0,
         base_dir=None,
         test_mode=False,
+        name_table=None,
     ):
-        """Create a new VsphereVm object based on the data given from pyvmomi."""
+        """
+        Create a new VsphereVm object based on the data given from pyvmomi.
+
+        @param name_table: the names of the hosts and compute resources for resolving
+                           the host and the cluster of the VM without extra round trips
+        @type name_table: VsphereNameTable or None
+        """
         if test_mode:
             cls._check_summary_data(data)
         else:
@@ -576,6 +608,11 @@ class VsphereVm(VsphereObject):
                 )
                 raise TypeError(msg)
 
+        # Every access to a property of a managed object is a round trip
+        summary = data.summary
+        summary_config = summary.config
+        runtime = data.runtime
+
         params = {
             "vsphere": vsphere,
             "dc_name": dc_name,
@@ -583,7 +620,7 @@ class VsphereVm(VsphereObject):
             "verbose": verbose,
             "base_dir": base_dir,
             "initialized": True,
-            "name": data.summary.config.name,
+            "name": summary_config.name,
             "status": DEFAULT_OBJ_STATUS,
             "config_status": OBJ_STATUS_GREEN,
         }
@@ -594,84 +631,67 @@ class VsphereVm(VsphereObject):
         vm = cls(**params)
 
         vm.cluster_name = None
-        if data.resourcePool:
-            vm.cluster_name = data.resourcePool.owner.name
+        pool = data.resourcePool
+        if pool:
+            cluster_name = None
+            if name_table is not None:
+                cluster_name = name_table.cluster_name_of(pool)
+            if cluster_name is None:
+                cluster_name = pool.owner.name
+            vm.cluster_name = cluster_name
 
         vm.host = None
-        if data.runtime.host:
-            vm.host = data.runtime.host
+        if runtime.host:
+            host_name = None
+            if name_table is not None:
+                host_name = name_table.name_of(runtime.host)
+            if host_name is None:
+                host_name = runtime.host.name
+            vm.host = host_name
 
         vm.path = cur_path
-        vm.template = data.summary.config.template
-        vm.memory_mb = data.summary.config.memorySizeMB
-        vm.num_cpu = data.summary.config.numCpu
-        vm.num_ethernet = data.summary.config.numEthernetCards
-        vm.num_vdisk = data.summary.config.numVirtualDisks
-        vm.guest_fullname = data.summary.config.guestFullName
-        vm.guest_id = data.summary.config.guestId
-        vm.uuid = data.summary.config.uuid
-        vm.instance_uuid = data.summary.config.instanceUuid
-        vm.power_state = data.runtime.powerState
-        vm.config_path = data.summary.config.vmPathName
-        vm.config_version = data.config.version
-
-        if hasattr(data.summary, "customValue"):
-            for custom_data in data.summary.customValue:
-                custom_key = custom_data.key
-                custom_value = ""
-
-                if hasattr(custom_data, "value"):
-                    custom_value = custom_data.value
-
-                vm.custom_data.append(
-                    {
-                        custom_key: custom_value,
-                    }
-                )
-
-        if data.guest:
+        vm.template = summary_config.template
+        vm.memory_mb = summary_config.memorySizeMB
+        vm.num_cpu = summary_config.numCpu
+        vm.num_ethernet = summary_config.numEthernetCards
+        vm.num_vdisk = summary_config.numVirtualDisks
+        vm.guest_fullname = summary_config.guestFullName
+        vm.guest_id = summary_config.guestId
+        vm.uuid = summary_config.uuid
+        vm.instance_uuid = summary_config.instanceUuid
+        vm.power_state = runtime.powerState
+        vm.config_path = summary_config.vmPathName
+
+        if hasattr(summary, "customValue"):
+            vm._add_custom_values(summary.customValue)
+
+        guest = data.guest
+        if guest:
 
             vm.vm_tools = {}
 
             vm.vm_tools["install_type"] = None
             vm.vm_tools["state"] = None
-            vm.vm_tools["version"] = data.guest.toolsVersion
+            vm.vm_tools["version"] = guest.toolsVersion
             vm.vm_tools["version_state"] = None
 
-            if hasattr(data.guest, "toolsInstallType"):
-                vm.vm_tools["install_type"] = data.guest.toolsInstallType
+            if hasattr(guest, "toolsInstallType"):
+                vm.vm_tools["install_type"] = guest.toolsInstallType
 
-            if hasattr(data.guest, "toolsRunningStatus"):
-                vm.vm_tools["state"] = data.guest.toolsRunningStatus
+            if hasattr(guest, "toolsRunningStatus"):
+                vm.vm_tools["state"] = guest.toolsRunningStatus
             else:
-                vm.vm_tools["state"] = data.guest.toolsStatus
+                vm.vm_tools["state"] = guest.toolsStatus
 
-            if hasattr(data.guest, "toolsVersionStatus2"):
-                vm.vm_tools["version_state"] = data.guest.toolsVersionStatus2
+            if hasattr(guest, "toolsVersionStatus2"):
+                vm.vm_tools["version_state"] = guest.toolsVersionStatus2
             else:
-                vm.vm_tools["version_state"] = data.guest.toolsVersionStatus
+                vm.vm_tools["version_state"] = guest.toolsVersionStatus
 
-        if data.config and data.config.hardware:
-            for device in data.config.hardware.device:
-                if isinstance(device, vim.vm.device.VirtualDisk):
-                    disk = VsphereDisk.from_summary(
-                        device, appname=appname, verbose=verbose, base_dir=base_dir
-                    )
-                    vm.disks.append(disk)
-                elif isinstance(device, vim.vm.device.VirtualEthernetCard):
-                    iface = VsphereEthernetcard.from_summary(
-                        device, appname=appname, verbose=verbose, base_dir=base_dir
-                    )
-                    vm.interfaces.append(iface)
-                elif isinstance(device, vim.vm.device.VirtualController):
-                    ctrl = VsphereDiskController.from_summary(
-                        device, appname=appname, verbose=verbose, base_dir=base_dir
-                    )
-                    vm.controllers.append(ctrl)
-                elif verbose > 2:
-                    LOG.debug(
-                        _("Unknown hardware device of type {}.").format(device.__class__.__name__)
-                    )
+        config = data.config
+        vm.config_version = config.version if config else None
+        if config and config.hardware:
+            vm._add_devices(config.hardware.device)
         else:
             LOG.error(
                 _(
@@ -684,6 +704,127 @@ class VsphereVm(VsphereObject):
 
         return vm
 
+    # -------------------------------------------------------------------------
+    @classmethod
+    def from_properties(
+        cls,
+        props,
+        cur_path,
+        vsphere=None,
+        dc_name=None,
+        cluster_name=None,
+        host=None,
+        appname=None,
+        verbose=0,
+        base_dir=None,
+    ):
+        """
+        Create a new VsphereVm object from a property set of the fast streaming parser.
+
+        @param props: the properties of the VM with the paths of VM_PROPERTIES as keys,
+                      as given by fb_vmware.propset
+        @type props: dict
+        @param cur_path: the path of the VM folder
+        @type cur_path: str
+        @param cluster_name: the name of the cluster owning the resource pool of the VM
+        @type cluster_name: str or None
+        @param host: the name of the host of the VM
+        @type host: str or None
+
+        @return: the new VM object
+        @rtype: VsphereVm
+        """
+        summary_config = props.get("summary.config")
+        if summary_config is None:
+            msg = _("The property {p!r} of VM {v!r} was not retrieved.").format(
+                p="summary.config", v=props.get("name")
+            )
+            raise VSphereHandlerError(msg)
+
+        params = {
+            "vsphere": vsphere,
+            "dc_name": dc_name,
+            "appname": appname,
+            "verbose": verbose,
+            "base_dir": base_dir,
+            "initialized": True,
+            "name": summary_config.name,
+            "status": DEFAULT_OBJ_STATUS,
+            "config_status": OBJ_STATUS_GREEN,
+        }
+
+        if verbose > 3:
+            LOG.debug(_("Creating {} object from:").format(cls.__name__) + "\n" + pp(params))
+
+        vm = cls(**params)
+
+        vm.cluster_name = cluster_name
+        vm.host = host
+        vm.path = cur_path
+        vm.template = summary_config.template
+        vm.memory_mb = summary_config.memorySizeMB
+        vm.num_cpu = summary_config.numCpu
+        vm.num_ethernet = summary_config.numEthernetCards
+        vm.num_vdisk = summary_config.numVirtualDisks
+        vm.guest_fullname = summary_config.guestFullName
+        vm.guest_id = summary_config.guestId
+        vm.uuid = summary_config.uuid
+        vm.instance_uuid = summary_config.instanceUuid
+        vm.power_state = props.get("runtime.powerState")
+        vm.config_path = summary_config.vmPathName
+        vm.config_version = props.get("config.version")
+
+        vm._add_custom_values(props.get("summary.customValue", []))
+
+        if any(path.startswith("guest.") for path in props):
+            vm.vm_tools = {
+                "install_type": props.get("guest.toolsInstallType"),
+                "state": props.get("guest.toolsRunningStatus"),
+                "version": props.get("guest.toolsVersion"),
+                "version_state": props.get("guest.toolsVersionStatus2"),
+            }
+
+        vm._add_devices(props.get("config.hardware.device", []))
+
+        if verbose > 3:
+            LOG.debug(_("Created {} object:").format(cls.__name__) + "\n" + pp(vm.as_dict()))
+
+        return vm
+
+    # -------------------------------------------------------------------------
+    def _add_custom_values(self, custom_values):
+
+        for custom_data in custom_values:
+            custom_key = custom_data.key
+            custom_value = ""
+
+            if hasattr(custom_data, "value"):
+                custom_value = custom_data.value
+
+            self.custom_data.append(
+                {
+                    custom_key: custom_value,
+                }
+            )
+
+    # -------------------------------------------------------------------------
+    def _add_devices(self, devices):
+
+        params = {"appname": self.appname, "verbose": self.verbose, "base_dir": self.base_dir}
+        for device in devices:
+            if vmodl_isinstance(device, vim.vm.device.VirtualDisk):
+                self.disks.append(VsphereDisk.from_summary(device, **params))
+            elif vmodl_isinstance(device, vim.vm.device.VirtualEthernetCard):
+                self.interfaces.append(VsphereEthernetcard.from_summary(device, **params))
+            elif vmodl_isinstance(device, vim.vm.device.VirtualController):
+                self.controllers.append(VsphereDiskController.from_summary(device, **params))
+            elif self.verbose > 2:
+                LOG.debug(
+                    _("Unknown hardware device of type {}.").format(
+                        vmodl_type_of(device).__name__
+                    )
+                )
+
     # -------------------------------------------------------------------------
     @classmethod
     def _check_summary_data(cls, data):
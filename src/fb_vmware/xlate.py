@@ -5,6 +5,11 @@
 
 It provides a translation object, usable from all other modules in this package.
 
+The translation catalogue is not loaded on import of this module, but on the first
+call of one of the translation methods of XLATOR. The loaded catalogues are cached
+per process. If the environment requests the C or POSIX locale, no catalogue is
+loaded at all and the messages are returned untranslated.
+
 @author: Frank Brehm
 @contact: frank@brehm-online.com
 @copyright: © 2022 - 2026 by Frank Brehm, Berlin
@@ -15,24 +20,16 @@ from __future__ import absolute_import, print_function
 import copy
 import gettext
 import logging
+import os
 import sys
+import threading
 from pathlib import Path
 
-# Third party modules
-import babel
-import babel.lists
-from babel.support import Translations
-
-try:
-    from semver import Version
-except ImportError:
-    from semver import VersionInfo as Version
-
 DOMAIN = "fb_vmware"
 
 LOG = logging.getLogger(__name__)
 
-__version__ = "1.2.0"
+__version__ = "1.3.0"
 
 __me__ = Path(__file__).resolve()
 __module_dir__ = __me__.parent
@@ -63,46 +60,225 @@ else:
                 LOCALE_DIR = str(__base_dir__ / sys.prefix / "share" / "locale")
 
 DEFAULT_LOCALE_DEF = "en_US"
-DEFAULT_LOCALE = babel.core.default_locale()
-if not DEFAULT_LOCALE:
-    DEFAULT_LOCALE = DEFAULT_LOCALE_DEF
-
-__mo_file__ = gettext.find(DOMAIN, LOCALE_DIR)
-if __mo_file__:
-    try:
-        with open(__mo_file__, "rb") as F:
-            XLATOR = Translations(F, DOMAIN)
-    except IOError:
-        XLATOR = gettext.NullTranslations()
-else:
-    XLATOR = gettext.NullTranslations()
-
-CUR_BABEL_VERSION = Version.parse(babel.__version__)
-NEWER_BABEL_VERSION = Version.parse("2.6.0")
 
 SUPPORTED_LANGS = ("de", "en")
 
+NO_TRANSLATION_LOCALES = ("C", "POSIX")
+LOCALE_ENV_VARS = ("LANGUAGE", "LC_ALL", "LC_MESSAGES", "LANG")
+
+_CATALOGUE_CACHE = {}
+_CATALOGUE_LOCK = threading.Lock()
+
+_LAZY_ATTRIBUTES = ("__mo_file__", "DEFAULT_LOCALE", "CUR_BABEL_VERSION", "NEWER_BABEL_VERSION")
+
+
+# =============================================================================
+def no_translation_wanted(environ=None):
+    """
+    Return, whether the environment requests untranslated messages.
+
+    The environment variables are evaluated in the same order as by gettext,
+    the first non empty one wins.
+    """
+    if environ is None:
+        environ = os.environ
+
+    for var in LOCALE_ENV_VARS:
+        value = environ.get(var)
+        if not value:
+            continue
+        lang = value.split(":")[0].split(".")[0].split("@")[0]
+        return lang in NO_TRANSLATION_LOCALES
+
+    return True
+
+
+# =============================================================================
+def get_mo_file(domain=DOMAIN, localedir=LOCALE_DIR):
+    """Return the path to the .mo-file of the given domain for the current locale or None."""
+    return gettext.find(domain, localedir)
+
+
+# =============================================================================
+def load_translations(domain=DOMAIN, localedir=LOCALE_DIR, mo_file=None):
+    """
+    Return the translations of the given domain for the current locale.
+
+    The parsed catalogues are cached per process with the path of the .mo-file
+    as the key, so every catalogue is read only once.
+    """
+    if mo_file is None:
+        if no_translation_wanted():
+            return gettext.NullTranslations()
+        mo_file = get_mo_file(domain, localedir)
+    if not mo_file:
+        return gettext.NullTranslations()
+
+    with _CATALOGUE_LOCK:
+        translations = _CATALOGUE_CACHE.get(mo_file)
+        if translations is not None:
+            return translations
+
+        from babel.support import Translations
+
+        try:
+            with open(mo_file, "rb") as fh:
+                translations = Translations(fh, domain)
+        except IOError as e:
+            LOG.debug("Could not read {f!r}: {e}".format(f=mo_file, e=e))
+            translations = gettext.NullTranslations()
+        _CATALOGUE_CACHE[mo_file] = translations
+
+    return translations
+
+
+# =============================================================================
+def clear_catalogue_cache():
+    """Remove all cached translation catalogues."""
+    with _CATALOGUE_LOCK:
+        _CATALOGUE_CACHE.clear()
+
+
+# =============================================================================
+class LazyTranslations(object):
+    """
+    A proxy for a translation object, which loads its catalogue on first use.
+
+    It provides the usual translation methods of gettext.NullTranslations,
+    so bound methods like XLATOR.gettext may be taken on import time of a module.
+    """
+
+    # -------------------------------------------------------------------------
+    def __init__(self, domain=DOMAIN, localedir=LOCALE_DIR):
+        """Initialize a LazyTranslations object."""
+        self.domain = domain
+        self.localedir = localedir
+        self._translations = None
+
+    # -------------------------------------------------------------------------
+    def __repr__(self):
+        """Typecasting into a string for reproduction."""
+        return "<{c}(domain={d!r}, localedir={l!r}, loaded={lo!r})>".format(
+            c=self.__class__.__name__,
+            d=self.domain,
+            l=self.localedir,
+            lo=self.loaded,
+        )
+
+    # -------------------------------------------------------------------------
+    @property
+    def loaded(self):
+        """Return, whether the translation catalogue was already loaded."""
+        return self._translations is not None
+
+    # -------------------------------------------------------------------------
+    @property
+    def translations(self):
+        """Return the underlying translation object, it will be loaded if necessary."""
+        translations = self._translations
+        if translations is None:
+            translations = load_translations(self.domain, self.localedir)
+            self._translations = translations
+        return translations
+
+    # -------------------------------------------------------------------------
+    def reset(self):
+        """Forget the loaded translation object, it will be reloaded on next use."""
+        self._translations = None
+
+    # -------------------------------------------------------------------------
+    def gettext(self, message):
+        """Return the translation of the given message."""
+        return self.translations.gettext(message)
+
+    # -------------------------------------------------------------------------
+    def ngettext(self, singular, plural, n):
+        """Return the translation of the given message in singular or plural form."""
+        return self.translations.ngettext(singular, plural, n)
+
+    # -------------------------------------------------------------------------
+    def pgettext(self, context, message):
+        """Return the translation of the given message in the given context."""
+        return self.translations.pgettext(context, message)
+
+    # -------------------------------------------------------------------------
+    def npgettext(self, context, singular, plural, n):
+        """Return the translation of the given message in the given context and number."""
+        return self.translations.npgettext(context, singular, plural, n)
+
+    # -------------------------------------------------------------------------
+    def __getattr__(self, name):
+        """Delegate all other attributes to the underlying translation object."""
+        if name.startswith("_"):
+            raise AttributeError(name)
+        return getattr(self.translations, name)
+
+
+XLATOR = LazyTranslations()
+
 _ = XLATOR.gettext
 
 
 # =============================================================================
-def format_list(lst, do_repr=False, style="standard", locale=DEFAULT_LOCALE):
+def __getattr__(name):
+    """Evaluate some expensive module attributes on first access."""
+    if name not in _LAZY_ATTRIBUTES:
+        raise AttributeError("module {m!r} has no attribute {a!r}".format(m=__name__, a=name))
+
+    if name == "__mo_file__":
+        value = get_mo_file()
+    elif name == "DEFAULT_LOCALE":
+        import babel.core
+
+        value = babel.core.default_locale() or DEFAULT_LOCALE_DEF
+    else:
+        import babel
+
+        try:
+            from semver import Version
+        except ImportError:
+            from semver import VersionInfo as Version
+
+        if name == "CUR_BABEL_VERSION":
+            value = Version.parse(babel.__version__)
+        else:
+            value = Version.parse("2.6.0")
+
+    globals()[name] = value
+    return value
+
+
+# -----------------------------------------------------------------------------
+def _get_lazy(name):
+
+    if name in globals():
+        return globals()[name]
+    return __getattr__(name)
+
+
+# =============================================================================
+def format_list(lst, do_repr=False, style="standard", locale=None):
     """
     Format the items in `lst` as a list.
 
     :param lst: a sequence of items to format in to a list
-    :param locale: the locale
+    :param locale: the locale, defaults to DEFAULT_LOCALE
     """
     if not lst:
         return ""
 
+    import babel.lists
+
+    if locale is None:
+        locale = _get_lazy("DEFAULT_LOCALE")
+
     my_list = copy.copy(lst)
     if do_repr:
         my_list = []
         for item in lst:
             my_list.append("{!r}".format(item))
 
-    if CUR_BABEL_VERSION < NEWER_BABEL_VERSION:
+    if _get_lazy("CUR_BABEL_VERSION") < _get_lazy("NEWER_BABEL_VERSION"):
         return babel.lists.format_list(my_list, locale=locale)
     return babel.lists.format_list(my_list, style=style, locale=locale)
 
@@ -117,7 +293,7 @@ if __name__ == "__main__":
     out_list.append([_("Base directory:"), str(__base_dir__)])
     out_list.append([_("Locale directory:"), LOCALE_DIR])
     out_list.append([_("Locale domain:"), DOMAIN])
-    out_list.append([_("Found .mo-file:"), __mo_file__])
+    out_list.append([_("Found .mo-file:"), get_mo_file()])
 
     max_len = 1
     for pair in out_list:
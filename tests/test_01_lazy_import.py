@@ -0,0 +1,136 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+@summary: Test script (and module) for unit tests on the lazy imports of fb_vmware.
+
+@author: Frank Brehm
+@contact: frank@brehm-online.com
+@copyright: © 2026 Frank Brehm, Berlin
+@license: GPL3
+"""
+
+import logging
+import os
+import subprocess
+import sys
+
+try:
+    import unittest2 as unittest
+except ImportError:
+    import unittest
+
+libdir = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "src"))
+sys.path.insert(0, libdir)
+
+from general import FbVMWareTestcase, get_arg_verbose, init_root_logger
+
+LOG = logging.getLogger("test-lazy-import")
+
+
+# =============================================================================
+class TestLazyImport(FbVMWareTestcase):
+    """Testcase for unit tests on the lazy imports of the package fb_vmware."""
+
+    # -------------------------------------------------------------------------
+    def setUp(self):
+        """Execute this on seting up before calling each particular test method."""
+        super(TestLazyImport, self).setUp()
+
+    # -------------------------------------------------------------------------
+    def get_imported_modules(self, module):
+        """Import the given module in a fresh interpreter and return all imported modules."""
+        code = "import sys, {m}; print('\\n'.join(sorted(sys.modules.keys())))".format(m=module)
+        env = dict(os.environ)
+        env["PYTHONPATH"] = libdir
+        output = subprocess.check_output([sys.executable, "-c", code], env=env, text=True)
+        return set(output.splitlines())
+
+    # -------------------------------------------------------------------------
+    def test_lazy_package(self):
+        """Test, that importing fb_vmware does not import pyVmomi."""
+        LOG.info(self.get_method_doc())
+
+        modules = self.get_imported_modules("fb_vmware")
+        self.assertNotIn("pyVmomi", modules)
+        self.assertNotIn("fb_vmware.connect", modules)
+
+        import fb_vmware
+
+        self.assertIn("VsphereConnection", dir(fb_vmware))
+        from fb_vmware import VsphereConnection
+        from fb_vmware.connect import VsphereConnection as VsphereConnectionOrig
+
+        self.assertIs(VsphereConnection, VsphereConnectionOrig)
+
+        # The translation function is still available as fb_vmware._
+        from fb_vmware.xlate import XLATOR
+
+        self.assertEqual(fb_vmware._, XLATOR.gettext)
+        self.assertNotIn("_", fb_vmware.__all__)
+
+        with self.assertRaises(AttributeError) as cm:
+            fb_vmware.NonExistingClass
+        e = cm.exception
+        LOG.debug("%s raised: %s", e.__class__.__qualname__, e)
+
+    # -------------------------------------------------------------------------
+    def test_missing_dependency(self):
+        """Test, that a missing dependency of a submodule is not hidden as AttributeError."""
+        LOG.info(self.get_method_doc())
+
+        code = "\n".join(
+            (
+                "import sys",
+                "sys.modules['pyVmomi'] = None",
+                "import fb_vmware",
+                "try:",
+                "    fb_vmware.NonExistingModule",
+                "except AttributeError:",
+                "    print('AttributeError')",
+                "try:",
+                "    fb_vmware.cassette",
+                "except ModuleNotFoundError as e:",
+                "    print('ModuleNotFoundError:', e.name)",
+            )
+        )
+        env = dict(os.environ)
+        env["PYTHONPATH"] = libdir
+        output = subprocess.check_output([sys.executable, "-c", code], env=env, text=True)
+        LOG.debug("Output:\n{}".format(output))
+        self.assertEqual(output.splitlines(), ["AttributeError", "ModuleNotFoundError: pyVmomi"])
+
+    # -------------------------------------------------------------------------
+    def test_lazy_app(self):
+        """Test, that importing an application module does not import pyVmomi and rich."""
+        LOG.info(self.get_method_doc())
+
+        for module in ("fb_vmware.app.get_vm_list", "fb_vmware.app.inventoryd"):
+            modules = self.get_imported_modules(module)
+            self.assertNotIn("pyVmomi", modules)
+            self.assertNotIn("requests", modules)
+            self.assertNotIn("rich", modules)
+
+
+# =============================================================================
+if __name__ == "__main__":
+
+    verbose = get_arg_verbose()
+    if verbose is None:
+        verbose = 0
+    init_root_logger(verbose)
+
+    LOG.info("Starting tests ...")
+
+    suite = unittest.TestSuite()
+
+    suite.addTest(TestLazyImport("test_lazy_package", verbose))
+    suite.addTest(TestLazyImport("test_missing_dependency", verbose))
+    suite.addTest(TestLazyImport("test_lazy_app", verbose))
+
+    runner = unittest.TextTestRunner(verbosity=verbose)
+
+    result = runner.run(suite)
+
+# =============================================================================
+
+# vim: tabstop=4 expandtab shiftwidth=4 softtabstop=4
@@ -0,0 +1,162 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+@summary: Test script (and module) for unit tests on module fb_vmware.xlate.
+
+@author: Frank Brehm
+@contact: frank@brehm-online.com
+@copyright: © 2026 Frank Brehm, Berlin
+@license: GPL3
+"""
+
+import logging
+import os
+import shutil
+import sys
+import tempfile
+
+try:
+    import unittest2 as unittest
+except ImportError:
+    import unittest
+
+libdir = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "src"))
+sys.path.insert(0, libdir)
+
+from general import FbVMWareTestcase, get_arg_verbose, init_root_logger
+
+LOG = logging.getLogger("test-xlate")
+
+
+# =============================================================================
+class TestXlate(FbVMWareTestcase):
+    """Testcase for unit tests on the module fb_vmware.xlate."""
+
+    # -------------------------------------------------------------------------
+    def setUp(self):
+        """Execute this on seting up before calling each particular test method."""
+        super(TestXlate, self).setUp()
+        self.tmpdir = tempfile.mkdtemp(prefix="test-xlate-")
+
+    # -------------------------------------------------------------------------
+    def tearDown(self):
+        """Execute this after calling each particular test method."""
+        shutil.rmtree(self.tmpdir, ignore_errors=True)
+        super(TestXlate, self).tearDown()
+
+    # -------------------------------------------------------------------------
+    def write_mo_file(self):
+        """Write a compiled german catalogue with one message into the temp directory."""
+        from babel.messages.catalog import Catalog
+        from babel.messages.mofile import write_mo
+
+        catalog = Catalog(locale="de", domain="fb_vmware", fuzzy=False)
+        catalog.add("Hello", "Hallo")
+        mo_dir = os.path.join(self.tmpdir, "de", "LC_MESSAGES")
+        os.makedirs(mo_dir)
+        mo_file = os.path.join(mo_dir, "fb_vmware.mo")
+        with open(mo_file, "wb") as fh:
+            write_mo(fh, catalog)
+        return mo_file
+
+    # -------------------------------------------------------------------------
+    def test_no_translation_wanted(self):
+        """Test detecting the C locale in the environment."""
+        LOG.info(self.get_method_doc())
+
+        from fb_vmware.xlate import no_translation_wanted
+
+        test_data = (
+            ({}, True),
+            ({"LANG": "C"}, True),
+            ({"LANG": "C.UTF-8"}, True),
+            ({"LANG": "POSIX"}, True),
+            ({"LANG": "de_DE.UTF-8"}, False),
+            ({"LANG": "de_DE.UTF-8", "LC_ALL": "C"}, True),
+            ({"LANG": "C", "LC_MESSAGES": "de_DE"}, False),
+            ({"LANG": "C", "LANGUAGE": "de:en"}, False),
+            ({"LANG": "de_DE", "LC_ALL": ""}, False),
+        )
+
+        for (environ, expected) in test_data:
+            LOG.debug("Testing environment {!r}.".format(environ))
+            self.assertEqual(no_translation_wanted(environ), expected)
+
+    # -------------------------------------------------------------------------
+    def test_lazy_loading(self):
+        """Test loading the translation catalogue on first use."""
+        LOG.info(self.get_method_doc())
+
+        import gettext
+
+        from fb_vmware import xlate
+        from fb_vmware.xlate import LazyTranslations
+
+        mo_file = self.write_mo_file()
+
+        translator = LazyTranslations(localedir=self.tmpdir)
+        LOG.debug("Translator: {!r}".format(translator))
+        self.assertFalse(translator.loaded)
+        _ = translator.gettext
+
+        old_env = {}
+        for var in xlate.LOCALE_ENV_VARS:
+            old_env[var] = os.environ.pop(var, None)
+        try:
+            os.environ["LANG"] = "C"
+            self.assertEqual(_("Hello"), "Hello")
+            self.assertTrue(translator.loaded)
+            self.assertIsInstance(translator.translations, gettext.NullTranslations)
+            self.assertNotIn(mo_file, xlate._CATALOGUE_CACHE)
+
+            os.environ["LANG"] = "de_DE.UTF-8"
+            translator.reset()
+            self.assertFalse(translator.loaded)
+            self.assertEqual(_("Hello"), "Hallo")
+            self.assertIn(mo_file, xlate._CATALOGUE_CACHE)
+
+            other = LazyTranslations(localedir=self.tmpdir)
+            self.assertEqual(other.gettext("Hello"), "Hallo")
+            self.assertIs(other.translations, translator.translations)
+        finally:
+            for var in xlate.LOCALE_ENV_VARS:
+                os.environ.pop(var, None)
+                if old_env[var] is not None:
+                    os.environ[var] = old_env[var]
+            xlate.clear_catalogue_cache()
+
+    # -------------------------------------------------------------------------
+    def test_format_list(self):
+        """Test formatting a list with babel."""
+        LOG.info(self.get_method_doc())
+
+        from fb_vmware.xlate import format_list
+
+        self.assertEqual(format_list([]), "")
+        self.assertEqual(format_list(["a", "b", "c"], locale="en"), "a, b, and c")
+        self.assertEqual(format_list(["a", "b"], do_repr=True, locale="en"), "'a' and 'b'")
+
+
+# =============================================================================
+if __name__ == "__main__":
+
+    verbose = get_arg_verbose()
+    if verbose is None:
+        verbose = 0
+    init_root_logger(verbose)
+
+    LOG.info("Starting tests ...")
+
+    suite = unittest.TestSuite()
+
+    suite.addTest(TestXlate("test_no_translation_wanted", verbose))
+    suite.addTest(TestXlate("test_lazy_loading", verbose))
+    suite.addTest(TestXlate("test_format_list", verbose))
+
+    runner = unittest.TextTestRunner(verbosity=verbose)
+
+    result = runner.run(suite)
+
+# =============================================================================
+
+# vim: tabstop=4 expandtab shiftwidth=4 softtabstop=4
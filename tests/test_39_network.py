@@ -125,6 +125,39 @@ class TestVMNetwork(FbVMWareTestcase):
         )
         LOG.debug("VsphereNetwork %s:\n{}".format(network))
 
+    # -------------------------------------------------------------------------
+    def test_network_for_ip(self):
+        """Test the longest prefix match of VsphereNetworkDict.get_network_for_ip()."""
+        LOG.info(self.get_method_doc())
+
+        from fb_vmware import VsphereNetwork
+        from fb_vmware import VsphereNetworkDict
+        from fb_vmware.errors import VSphereNoNetFoundError
+
+        networks = VsphereNetworkDict()
+        for net_name in ("10.0.0.0_8", "10.12.0.0_16", "10.12.11.0_24", "192.168.1.0_24"):
+            networks.append(VsphereNetwork(name=net_name, appname=self.appname))
+
+        self.assertEqual(networks.get_network_for_ip("10.12.11.5"), "10.12.11.0_24")
+        self.assertEqual(networks.get_network_for_ip("10.12.12.5"), "10.12.0.0_16")
+        self.assertEqual(networks.get_network_for_ip("172.16.0.1", "10.1.1.1"), "10.0.0.0_8")
+
+        with self.assertRaises(VSphereNoNetFoundError) as cm:
+            networks.get_network_for_ip("172.16.0.1", "2001:db8::1")
+        e = cm.exception
+        LOG.debug("%s raised: %s", e.__class__.__qualname__, e)
+
+        result = networks.get_networks_for_ips(["192.168.1.10", "10.12.11.1", "8.8.8.8"])
+        LOG.debug("Networks for IPs: {!r}".format(result))
+        self.assertEqual(
+            result,
+            {"192.168.1.10": "192.168.1.0_24", "10.12.11.1": "10.12.11.0_24", "8.8.8.8": None},
+        )
+
+        # The index must be rebuilt after changing the dict
+        del networks["10.12.11.0_24"]
+        self.assertEqual(networks.get_network_for_ip("10.12.11.5"), "10.12.0.0_16")
+
 
 # =============================================================================
 if __name__ == "__main__":
@@ -141,6 +174,7 @@ if __name__ == "__main__":
     suite.addTest(TestVMNetwork("test_import", verbose))
     suite.addTest(TestVMNetwork("test_init_object", verbose))
     suite.addTest(TestVMNetwork("test_init_from_summary", verbose))
+    suite.addTest(TestVMNetwork("test_network_for_ip", verbose))
 
     runner = unittest.TextTestRunner(verbosity=verbose)
 
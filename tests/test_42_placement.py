@@ -0,0 +1,313 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+@summary: Test script (and module) for unit tests on module fb_vmware.placement.
+
+@author: Frank Brehm
+@contact: frank@brehm-online.com
+@copyright: © 2026 Frank Brehm, Berlin
+@license: GPL3
+"""
+
+import logging
+import os
+import sys
+import textwrap
+import threading
+import time
+
+try:
+    import unittest2 as unittest
+except ImportError:
+    import unittest
+
+libdir = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "src"))
+sys.path.insert(0, libdir)
+
+from general import FbVMWareTestcase, get_arg_verbose, init_root_logger
+
+LOG = logging.getLogger("test-placement")
+
+GIBYTE = 1024 * 1024 * 1024
+
+
+# =============================================================================
+class TestVspherePlacement(FbVMWareTestcase):
+    """Testcase for unit tests on a VspherePlacementEngine object."""
+
+    # -------------------------------------------------------------------------
+    def setUp(self):
+        """Execute this on seting up before calling each particular test method."""
+        super(TestVspherePlacement, self).setUp()
+
+    # -------------------------------------------------------------------------
+    def get_datastores(self):
+        """Return a VsphereDatastoreDict with some test datastores."""
+        from fb_vmware import VsphereDatastore
+        from fb_vmware import VsphereDatastoreDict
+
+        datastores = VsphereDatastoreDict()
+        ds_defs = (
+            ("ds-ssd-01", 100, "cl1"),
+            ("ds-ssd-02", 50, "cl2"),
+            ("ds-hdd-01", 300, "cl1"),
+            ("ds-hdd-02", 20, "cl2"),
+        )
+        for ds_name, free_gb, cc_name in ds_defs:
+            ds = VsphereDatastore(
+                name=ds_name,
+                appname=self.appname,
+                capacity=500 * GIBYTE,
+                free_space=free_gb * GIBYTE,
+                vsphere="live",
+                dc_name="dc1",
+            )
+            ds.compute_clusters = {cc_name}
+            datastores.append(ds)
+
+        return datastores
+
+    # -------------------------------------------------------------------------
+    def test_import(self):
+        """Test import of fb_vmware.placement."""
+        LOG.info(self.get_method_doc())
+
+        import fb_vmware.placement
+        from fb_vmware import VspherePlacementEngine
+
+        LOG.debug("Version of fb_vmware.placement: {!r}.".format(fb_vmware.placement.__version__))
+
+        doc = textwrap.dedent(VspherePlacementEngine.__doc__)
+        LOG.debug("Description of VspherePlacementEngine: " + doc)
+
+    # -------------------------------------------------------------------------
+    def test_strategies(self):
+        """Test the placement strategies of a VspherePlacementEngine object."""
+        LOG.info(self.get_method_doc())
+
+        from fb_vmware import VspherePlacementEngine
+
+        datastores = self.get_datastores()
+        engine = VspherePlacementEngine(datastores)
+        LOG.debug("VspherePlacementEngine %s:\n{}".format(engine))
+
+        self.assertEqual(len(engine), 4)
+        self.assertEqual(engine.find(10, "ssd"), "ds-ssd-01")
+        self.assertEqual(engine.find(10, "ssd", strategy="best-fit"), "ds-ssd-02")
+        self.assertEqual(engine.find(60, "ssd", strategy="best-fit"), "ds-ssd-01")
+        self.assertEqual(engine.find(10, "hdd", strategy="first-fit"), "ds-hdd-01")
+        self.assertEqual(engine.find(10, "ssd", compute_cluster="cl2"), "ds-ssd-02")
+        self.assertIsNone(engine.find(60, "ssd", compute_cluster="cl2"))
+        self.assertEqual(engine.candidates(30, "ssd"), ["ds-ssd-02", "ds-ssd-01"])
+
+        # Usage changed outside of the engine must be respected by the candidates
+        datastores["ds-ssd-01"].calculated_usage = 80
+        self.assertEqual(engine.candidates(30, "ssd"), ["ds-ssd-02"])
+        self.assertEqual(engine.candidates(10, "ssd"), ["ds-ssd-01", "ds-ssd-02"])
+        datastores["ds-ssd-01"].calculated_usage = 0
+        self.assertEqual(engine.candidates(30, "ssd"), ["ds-ssd-02", "ds-ssd-01"])
+
+        with self.assertRaises(ValueError) as cm:
+            engine.find(10, "ssd", strategy="worst-fit")
+        e = cm.exception
+        LOG.debug("%s raised: %s", e.__class__.__qualname__, e)
+
+    # -------------------------------------------------------------------------
+    def test_place_many(self):
+        """Test placing a batch of disks in a VsphereDatastoreDict."""
+        LOG.info(self.get_method_doc())
+
+        from fb_vmware.errors import VSphereNoDatastoreFoundError
+
+        datastores = self.get_datastores()
+        results = datastores.place_many(
+            [40, 40, (15, "hdd"), {"needed_gb": 60, "storage_type": "ssd-first"}],
+            storage_type="ssd",
+        )
+        LOG.debug("Placed disks: {!r}".format(results))
+        self.assertEqual(results, ["ds-ssd-01", "ds-ssd-01", "ds-hdd-01", "ds-hdd-01"])
+        self.assertEqual(datastores["ds-ssd-01"].calculated_usage, 80.0)
+        self.assertEqual(datastores["ds-hdd-01"].calculated_usage, 75.0)
+
+        # Usage changed outside of the engine must be respected
+        datastores["ds-hdd-01"].calculated_usage = 290
+        results = datastores.place_many([100], storage_type="hdd", no_error=True)
+        self.assertEqual(results, [None])
+
+        with self.assertRaises(VSphereNoDatastoreFoundError) as cm:
+            datastores.search_space(1000)
+        e = cm.exception
+        LOG.debug("%s raised: %s", e.__class__.__qualname__, e)
+
+    # -------------------------------------------------------------------------
+    def test_usage_released(self):
+        """Test finding a datastore again after its usage went down outside of the engine."""
+        LOG.info(self.get_method_doc())
+
+        from fb_vmware import VspherePlacementEngine
+
+        datastores = self.get_datastores()
+        self.assertEqual(datastores.search_space(90, "ssd"), "ds-ssd-01")
+        self.assertEqual(datastores["ds-ssd-01"].avail_space_gb, 10.0)
+
+        engine = VspherePlacementEngine(datastores)
+        self.assertIn(engine, datastores["ds-ssd-01"].placement_engines)
+        self.assertIn(datastores.get_placement_engine(), datastores["ds-ssd-01"].placement_engines)
+
+        # Releasing the usage outside of the engines notifies all of them
+        datastores["ds-ssd-01"].calculated_usage = 0
+        self.assertEqual(engine.find(60, "ssd", strategy="best-fit"), "ds-ssd-01")
+        self.assertEqual(engine.candidates(45, "ssd"), ["ds-ssd-02", "ds-ssd-01"])
+        self.assertEqual(datastores.search_space(60, "ssd"), "ds-ssd-01")
+
+        # The usage increased again by the reservation of the dict
+        self.assertEqual(datastores["ds-ssd-01"].calculated_usage, 60.0)
+        self.assertEqual(engine.candidates(45, "ssd"), ["ds-ssd-02"])
+
+        engine.remove("ds-ssd-01")
+        self.assertNotIn(engine, datastores["ds-ssd-01"].placement_engines)
+
+    # -------------------------------------------------------------------------
+    def test_concurrent_reservations(self):
+        """Test reserving space in a shared read-only VsphereDatastoreDict by several threads."""
+        LOG.info(self.get_method_doc())
+
+        from fb_vmware import VsphereDatastore
+        from fb_vmware.errors import VSphereNoDatastoreFoundError
+
+        class SlowDatastore(VsphereDatastore):
+            """A datastore giving other threads a chance on every check of its space."""
+
+            @property
+            def avail_space_gb(self):
+                time.sleep(0.0001)
+                return super(SlowDatastore, self).avail_space_gb
+
+        datastores = self.get_datastores()
+        for ds in datastores.values():
+            ds.__class__ = SlowDatastore
+        datastores.freeze()
+        count = 47
+        barrier = threading.Barrier(count)
+        results = []
+        errors = []
+
+        def worker():
+            barrier.wait()
+            try:
+                results.append(datastores.search_space(10))
+            except VSphereNoDatastoreFoundError as e:
+                errors.append(e)
+
+        threads = [threading.Thread(target=worker) for i in range(count)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join(10)
+
+        # The 470 GiB of all datastores are exactly used up
+        self.assertEqual(errors, [])
+        self.assertEqual(len(results), count)
+        for ds in datastores.values():
+            LOG.debug("Datastore {n!r}: {u} GiB used.".format(n=ds.name, u=ds.calculated_usage))
+            self.assertEqual(ds.avail_space_gb, 0)
+            self.assertEqual(results.count(ds.name) * 10, ds.calculated_usage)
+
+        with self.assertRaises(VSphereNoDatastoreFoundError):
+            datastores.search_space(10)
+
+    # -------------------------------------------------------------------------
+    def test_storage_search(self):
+        """Test a unified search in datastore clusters and datastores of two vSpheres."""
+        LOG.info(self.get_method_doc())
+
+        from fb_vmware import VsphereDatastore
+        from fb_vmware import VsphereDatastoreDict
+        from fb_vmware import VsphereDsCluster
+        from fb_vmware import VsphereDsClusterDict
+        from fb_vmware import VsphereStorageSearch
+
+        datastores = self.get_datastores()
+        datastores["ds-hdd-01"].cluster = "dsc-hdd-01"
+        dsc = VsphereDsCluster(
+            name="dsc-hdd-01",
+            appname=self.appname,
+            capacity=1000 * GIBYTE,
+            free_space=200 * GIBYTE,
+            vsphere="live",
+            dc_name="dc1",
+        )
+        dsc.compute_clusters = {"cl1"}
+        ds_clusters = VsphereDsClusterDict(dsc)
+
+        search = VsphereStorageSearch(ds_clusters, datastores, vsphere="live")
+        LOG.debug("VsphereStorageSearch:\n{}".format(search))
+
+        candidate = search.search(150, storage_type="hdd")
+        self.assertEqual(candidate.name, "dsc-hdd-01")
+        self.assertEqual(candidate.kind, "ds_cluster")
+        candidate = search.search(40, storage_type="any", compute_cluster="cl2")
+        self.assertEqual(candidate.name, "ds-ssd-02")
+        self.assertEqual(candidate.kind, "datastore")
+        self.assertIsNone(search.search(250, storage_type="any"))
+
+        for storages in (datastores, ds_clusters):
+            with self.assertRaises(ValueError) as cm:
+                storages.get_search_chain("bogus")
+            LOG.debug("ValueError raised: {}".format(cm.exception))
+
+        # A second vSphere with more space
+        other_datastores = VsphereDatastoreDict(
+            VsphereDatastore(
+                name="ds-hdd-big",
+                appname=self.appname,
+                capacity=1000 * GIBYTE,
+                free_space=500 * GIBYTE,
+                vsphere="test",
+                dc_name="dc1",
+            )
+        )
+        other_search = VsphereStorageSearch(None, other_datastores, vsphere="test")
+        candidates = [
+            search.search(100, storage_type="hdd", reserve_space=True),
+            other_search.search(100, storage_type="hdd"),
+        ]
+        self.assertEqual(dsc.calculated_usage, 100.0)
+        best = VsphereStorageSearch.best_candidate(candidates)
+        LOG.debug("Best candidate: {!r}".format(best))
+        self.assertEqual(best.vsphere, "live")
+
+        search.prefer_ds_clusters = False
+        other_search.prefer_ds_clusters = False
+        best = VsphereStorageSearch.best_candidate(
+            [search.search(50, storage_type="hdd"), other_search.search(50, storage_type="hdd")]
+        )
+        self.assertEqual(best.name, "ds-hdd-big")
+
+
+# =============================================================================
+if __name__ == "__main__":
+
+    verbose = get_arg_verbose()
+    if verbose is None:
+        verbose = 0
+    init_root_logger(verbose)
+
+    LOG.info("Starting tests ...")
+
+    suite = unittest.TestSuite()
+
+    suite.addTest(TestVspherePlacement("test_import", verbose))
+    suite.addTest(TestVspherePlacement("test_strategies", verbose))
+    suite.addTest(TestVspherePlacement("test_place_many", verbose))
+    suite.addTest(TestVspherePlacement("test_usage_released", verbose))
+    suite.addTest(TestVspherePlacement("test_concurrent_reservations", verbose))
+    suite.addTest(TestVspherePlacement("test_storage_search", verbose))
+
+    runner = unittest.TextTestRunner(verbosity=verbose)
+
+    result = runner.run(suite)
+
+# =============================================================================
+
+# vim: tabstop=4 expandtab shiftwidth=4 softtabstop=4
@@ -0,0 +1,187 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+@summary: Test script (and module) for unit tests on module fb_vmware.ledger.
+
+@author: Frank Brehm
+@contact: frank@brehm-online.com
+@copyright: © 2026 Frank Brehm, Berlin
+@license: GPL3
+"""
+
+import logging
+import os
+import shutil
+import sys
+import tempfile
+import textwrap
+
+try:
+    import unittest2 as unittest
+except ImportError:
+    import unittest
+
+libdir = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "src"))
+sys.path.insert(0, libdir)
+
+from general import FbVMWareTestcase, get_arg_verbose, init_root_logger
+
+LOG = logging.getLogger("test-ledger")
+
+GIBYTE = 1024 * 1024 * 1024
+
+
+# =============================================================================
+class TestVsphereLedger(FbVMWareTestcase):
+    """Testcase for unit tests on a VsphereReservationLedger object."""
+
+    # -------------------------------------------------------------------------
+    def setUp(self):
+        """Execute this on seting up before calling each particular test method."""
+        super(TestVsphereLedger, self).setUp()
+        self.tmp_dir = tempfile.mkdtemp(prefix="fb-vmware-ledger-")
+        self.ledger_file = os.path.join(self.tmp_dir, "reservations.db")
+
+    # -------------------------------------------------------------------------
+    def tearDown(self):
+        """Tear down routine for calling each particular test method."""
+        shutil.rmtree(self.tmp_dir, ignore_errors=True)
+
+    # -------------------------------------------------------------------------
+    def get_datastores(self, ledger):
+        """Return a VsphereDatastoreDict with some test datastores."""
+        from fb_vmware import VsphereDatastore
+        from fb_vmware import VsphereDatastoreDict
+
+        datastores = VsphereDatastoreDict(ledger=ledger)
+        for ds_name, free_gb in (("ds-ssd-01", 100), ("ds-ssd-02", 80)):
+            ds = VsphereDatastore(
+                name=ds_name,
+                appname=self.appname,
+                capacity=500 * GIBYTE,
+                free_space=free_gb * GIBYTE,
+                vsphere="live",
+                dc_name="dc1",
+            )
+            datastores.append(ds)
+
+        return datastores
+
+    # -------------------------------------------------------------------------
+    def test_import(self):
+        """Test import of fb_vmware.ledger."""
+        LOG.info(self.get_method_doc())
+
+        import fb_vmware.ledger
+        from fb_vmware import VsphereReservationLedger
+
+        LOG.debug("Version of fb_vmware.ledger: {!r}.".format(fb_vmware.ledger.__version__))
+
+        doc = textwrap.dedent(VsphereReservationLedger.__doc__)
+        LOG.debug("Description of VsphereReservationLedger: " + doc)
+
+    # -------------------------------------------------------------------------
+    def test_reservations(self):
+        """Test reserving and expiring in a VsphereReservationLedger."""
+        LOG.info(self.get_method_doc())
+
+        from fb_vmware import VsphereReservationLedger
+
+        ledger = VsphereReservationLedger(self.ledger_file, owner="worker-1")
+        LOG.debug("VsphereReservationLedger %r: {!r}".format(ledger))
+
+        res_id = ledger.reserve("live", "ds-ssd-01", 60, limit_gb=100)
+        self.assertIsNotNone(res_id)
+        self.assertIsNone(ledger.reserve("live", "ds-ssd-01", 60, limit_gb=100))
+        self.assertEqual(ledger.reserved_gb("live", "ds-ssd-01"), 60.0)
+        self.assertEqual(ledger.reserved_gb("live", "ds-ssd-01", foreign_only=True), 0.0)
+
+        ledger.release(res_id)
+        self.assertEqual(ledger.reserved_gb("live", "ds-ssd-01"), 0.0)
+
+        ledger.reserve("live", "ds-ssd-01", 10, ttl=-1)
+        self.assertEqual(ledger.reserved_gb("live", "ds-ssd-01"), 0.0)
+        self.assertEqual(ledger.purge_expired(), 1)
+
+    # -------------------------------------------------------------------------
+    def test_concurrent_search(self):
+        """Test searching space by two workers sharing one ledger."""
+        LOG.info(self.get_method_doc())
+
+        from fb_vmware import VsphereReservationLedger
+        from fb_vmware.errors import VSphereNoDatastoreFoundError
+
+        ledger1 = VsphereReservationLedger(self.ledger_file, owner="worker-1")
+        ledger2 = VsphereReservationLedger(self.ledger_file, owner="worker-2")
+        datastores1 = self.get_datastores(ledger1)
+        datastores2 = self.get_datastores(ledger2)
+
+        self.assertEqual(datastores1.search_space(70, "ssd"), "ds-ssd-01")
+        self.assertEqual(datastores2.search_space(70, "ssd"), "ds-ssd-02")
+
+        with self.assertRaises(VSphereNoDatastoreFoundError) as cm:
+            datastores2.search_space(40, "ssd")
+        e = cm.exception
+        LOG.debug("%s raised: %s", e.__class__.__qualname__, e)
+
+        datastores1.release_reservations()
+        self.assertEqual(datastores2.search_space(40, "ssd"), "ds-ssd-01")
+
+    # -------------------------------------------------------------------------
+    def test_sync_copies(self):
+        """Test syncing the same datastores from the ledger by a dict and its copy."""
+        LOG.info(self.get_method_doc())
+
+        from fb_vmware import VsphereReservationLedger
+
+        ledger1 = VsphereReservationLedger(self.ledger_file, owner="worker-1")
+        ledger2 = VsphereReservationLedger(self.ledger_file, owner="worker-2")
+        res_id = ledger2.reserve("live", "ds-ssd-01", 40, limit_gb=100)
+        self.assertIsNotNone(res_id)
+
+        datastores = self.get_datastores(ledger1).freeze()
+        ds = datastores["ds-ssd-01"]
+        datastores.sync_ledger()
+        datastores.copy().sync_ledger()
+        datastores.copy().sync_ledger()
+        self.assertEqual(ds.ledger_usage, 40.0)
+        self.assertEqual(ds.calculated_usage, 0.0)
+        self.assertEqual(ds.avail_space_gb, 60.0)
+
+        copy = datastores.copy()
+        copy.pop("ds-ssd-02")
+        self.assertEqual(copy.search_space(50, "ssd"), "ds-ssd-01")
+        self.assertEqual(ds.calculated_usage, 50.0)
+        self.assertEqual(ds.avail_space_gb, 10.0)
+
+        # Released foreign reservations are given back by the next sync
+        ledger2.release(res_id)
+        datastores.sync_ledger()
+        self.assertEqual(ds.ledger_usage, 0.0)
+        self.assertEqual(ds.avail_space_gb, 50.0)
+
+
+# =============================================================================
+if __name__ == "__main__":
+
+    verbose = get_arg_verbose()
+    if verbose is None:
+        verbose = 0
+    init_root_logger(verbose)
+
+    LOG.info("Starting tests ...")
+
+    suite = unittest.TestSuite()
+
+    suite.addTest(TestVsphereLedger("test_import", verbose))
+    suite.addTest(TestVsphereLedger("test_reservations", verbose))
+    suite.addTest(TestVsphereLedger("test_concurrent_search", verbose))
+    suite.addTest(TestVsphereLedger("test_sync_copies", verbose))
+
+    runner = unittest.TextTestRunner(verbosity=verbose)
+
+    result = runner.run(suite)
+
+# =============================================================================
+
+# vim: tabstop=4 expandtab shiftwidth=4 softtabstop=4
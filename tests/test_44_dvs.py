@@ -0,0 +1,182 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+@summary: Test script (and module) for unit tests on module fb_vmware.dvs.
+
+@author: Frank Brehm
+@contact: frank@brehm-online.com
+@copyright: © 2026 Frank Brehm, Berlin
+@license: GPL3
+"""
+
+import logging
+import os
+import sys
+import textwrap
+
+try:
+    import unittest2 as unittest
+except ImportError:
+    import unittest
+
+libdir = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "src"))
+sys.path.insert(0, libdir)
+
+from general import FbVMWareTestcase, get_arg_verbose, init_root_logger
+from general import SimpleTestObject
+
+LOG = logging.getLogger("test-dvs")
+
+
+# =============================================================================
+class FakeDvs(object):
+    """A fake vim.DistributedVirtualSwitch, which counts the fetches of ports."""
+
+    # -------------------------------------------------------------------------
+    def __init__(self, ports):
+        """Initialize a FakeDvs object."""
+        self.ports = ports
+        self.fetches = []
+
+    # -------------------------------------------------------------------------
+    def FetchDVPorts(self, criteria=None):  # noqa: N802
+        """Return all ports matching the given criteria."""
+        self.fetches.append(criteria)
+        result = []
+        for port in self.ports:
+            if criteria.portKey and port.key not in criteria.portKey:
+                continue
+            if criteria.portgroupKey and port.portgroupKey not in criteria.portgroupKey:
+                continue
+            result.append(port)
+        return result
+
+
+# =============================================================================
+class TestVsphereDVS(FbVMWareTestcase):
+    """Testcase for unit tests on a VsphereDVS object."""
+
+    # -------------------------------------------------------------------------
+    def setUp(self):
+        """Execute this on seting up before calling each particular test method."""
+        super(TestVsphereDVS, self).setUp()
+
+    # -------------------------------------------------------------------------
+    def test_import(self):
+        """Test import of fb_vmware.dvs."""
+        LOG.info(self.get_method_doc())
+
+        import fb_vmware.dvs
+        from fb_vmware import VsphereDVS
+        from fb_vmware import VsphereDvPortGroup
+
+        LOG.debug("Version of fb_vmware.dvs: {!r}.".format(fb_vmware.dvs.__version__))
+
+        doc = textwrap.dedent(VsphereDVS.__doc__)
+        LOG.debug("Description of VsphereDVS: " + doc)
+
+        doc = textwrap.dedent(VsphereDvPortGroup.__doc__)
+        LOG.debug("Description of VsphereDvPortGroup: " + doc)
+
+    # -------------------------------------------------------------------------
+    def test_port_cache(self):
+        """Test reserving ports of a VsphereDVS with its port cache."""
+        LOG.info(self.get_method_doc())
+
+        from fb_vmware import VsphereDVS
+
+        ports = []
+        for key, pg_key in (("10", "pg-1"), ("11", "pg-1"), ("20", "pg-2")):
+            port = SimpleTestObject()
+            port.key = key
+            port.portgroupKey = pg_key
+            port.dvsUuid = "dvs-uuid"
+            ports.append(port)
+
+        dvs = VsphereDVS(name="dvs-test", appname=self.appname)
+        dvs._dvs = FakeDvs(ports)
+
+        dvs.ensure_ports("pg-1", "pg-2")
+        self.assertEqual(len(dvs._dvs.fetches), 1)
+
+        self.assertEqual(dvs.reserve_port("pg-1").key, "10")
+        self.assertEqual(dvs.reserve_port("pg-1").key, "11")
+        self.assertIsNone(dvs.reserve_port("pg-1"))
+        self.assertEqual(dvs.reserve_port("pg-2").key, "20")
+        self.assertEqual(dvs.search_port_keys("pg-1"), [])
+
+        dvs.release_port("11")
+        self.assertEqual(dvs.search_port_keys("pg-1"), ["11"])
+        self.assertEqual(dvs.find_port_by_portkey("20").portgroupKey, "pg-2")
+        self.assertEqual(len(dvs._dvs.fetches), 1)
+
+        dvs.clear_port_cache()
+        self.assertEqual(dvs.find_port_by_portkey("11").portgroupKey, "pg-1")
+        self.assertEqual(list(dvs._dvs.fetches[-1].portKey), ["11"])
+        self.assertIsNone(dvs.find_port_by_portkey("99"))
+
+    # -------------------------------------------------------------------------
+    def test_port_cache_expiry(self):
+        """Test refetching expired pools of free ports of a VsphereDVS."""
+        LOG.info(self.get_method_doc())
+
+        from fb_vmware import VsphereDVS
+
+        ports = []
+        for key in ("10", "11", "12"):
+            port = SimpleTestObject()
+            port.key = key
+            port.portgroupKey = "pg-1"
+            port.dvsUuid = "dvs-uuid"
+            ports.append(port)
+
+        dvs = VsphereDVS(name="dvs-test", appname=self.appname)
+        dvs._dvs = FakeDvs(ports)
+        dvs.port_cache_ttl = None
+
+        self.assertEqual(dvs.reserve_port("pg-1").key, "10")
+        dvs.ensure_ports("pg-1")
+        self.assertEqual(len(dvs._dvs.fetches), 1)
+
+        # Port 11 was connected meanwhile by another process
+        del ports[1]
+        dvs.port_cache_ttl = 0
+        self.assertEqual(dvs.search_port_keys("pg-1"), ["12"])
+        self.assertEqual(len(dvs._dvs.fetches), 2)
+
+        # Reserved ports are kept out of refetched pools until they are released
+        dvs.clear_port_cache()
+        self.assertEqual(dvs.search_port_keys("pg-1"), ["12"])
+        dvs.release_port("10")
+        self.assertEqual(dvs.search_port_keys("pg-1"), ["10", "12"])
+
+        # A reserved port, which was connected, is not reserved anymore
+        self.assertEqual(dvs.reserve_port("pg-1").key, "10")
+        del ports[0]
+        self.assertEqual(dvs.search_port_keys("pg-1"), ["12"])
+        self.assertEqual(dvs._reserved, set())
+
+
+# =============================================================================
+if __name__ == "__main__":
+
+    verbose = get_arg_verbose()
+    if verbose is None:
+        verbose = 0
+    init_root_logger(verbose)
+
+    LOG.info("Starting tests ...")
+
+    suite = unittest.TestSuite()
+
+    suite.addTest(TestVsphereDVS("test_import", verbose))
+    suite.addTest(TestVsphereDVS("test_port_cache", verbose))
+    suite.addTest(TestVsphereDVS("test_port_cache_expiry", verbose))
+
+    runner = unittest.TextTestRunner(verbosity=verbose)
+
+    result = runner.run(suite)
+
+# =============================================================================
+
+# vim: tabstop=4 expandtab shiftwidth=4 softtabstop=4
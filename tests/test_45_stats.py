@@ -0,0 +1,239 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+@summary: Test script (and module) for unit tests on module fb_vmware.stats.
+
+@author: Frank Brehm
+@contact: frank@brehm-online.com
+@copyright: © 2026 Frank Brehm, Berlin
+@license: GPL3
+"""
+
+import logging
+import os
+import sys
+
+try:
+    import unittest2 as unittest
+except ImportError:
+    import unittest
+
+libdir = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "src"))
+sys.path.insert(0, libdir)
+
+from general import FbVMWareTestcase, get_arg_verbose, init_root_logger
+
+LOG = logging.getLogger("test-stats")
+
+
+# =============================================================================
+class FakeSoapStub(object):
+    """A replacement of the SoapStubAdapter of pyVmomi returning fixed values."""
+
+    version = "vim.version.version1"
+
+    # -------------------------------------------------------------------------
+    def __init__(self, stats=None):
+        """Initialize a FakeSoapStub object."""
+        self.stats = stats
+        self.calls = []
+
+    # -------------------------------------------------------------------------
+    def DropConnections(self):  # noqa: N802
+        """Nothing to drop."""
+        pass
+
+    # -------------------------------------------------------------------------
+    def InvokeMethod(self, mo, info, args, outerStub=None):  # noqa: N802
+        """Return the name of the method or property as the result."""
+        from pyVmomi import vim
+
+        self.calls.append((mo, info.wsdlName, args))
+        if self.stats is not None:
+            self.stats.add_bytes_sent(100)
+            self.stats.add_bytes_received(1000)
+        if info.wsdlName == "Fetch" and args[0] == "name":
+            return (200, "vm-name")
+        if info.wsdlName == "Fetch" and args[0] == "parent":
+            return (500, vim.fault.NoPermission(privilegeId="System.View"))
+        return (200, None)
+
+
+# =============================================================================
+class FakeHandler(object):
+    """A handler class for testing the attribution of requests."""
+
+    # -------------------------------------------------------------------------
+    def get_name(self, vm):
+        """Return the name of the VM."""
+        return self._get_name(vm)
+
+    # -------------------------------------------------------------------------
+    def _get_name(self, vm):
+
+        return vm.name
+
+
+# =============================================================================
+class TestVsphereSoapStats(FbVMWareTestcase):
+    """Testcase for unit tests on the statistics about SOAP requests."""
+
+    # -------------------------------------------------------------------------
+    def setUp(self):
+        """Execute this on seting up before calling each particular test method."""
+        super(TestVsphereSoapStats, self).setUp()
+
+    # -------------------------------------------------------------------------
+    def test_import(self):
+        """Test import of fb_vmware.stats."""
+        LOG.info(self.get_method_doc())
+
+        import fb_vmware.stats
+
+        LOG.debug("Version of fb_vmware.stats: {!r}.".format(fb_vmware.stats.__version__))
+
+    # -------------------------------------------------------------------------
+    def test_histogram(self):
+        """Test recording latencies in a LatencyHistogram."""
+        LOG.info(self.get_method_doc())
+
+        from fb_vmware.stats import LatencyHistogram
+
+        histogram = LatencyHistogram(buckets=(0.01, 0.1, 1.0))
+        self.assertIsNone(histogram.mean)
+        self.assertIsNone(histogram.percentile(50))
+
+        for seconds in (0.005, 0.005, 0.05, 0.5, 3.0):
+            histogram.add(seconds)
+        LOG.debug("Histogram: {}".format(histogram))
+
+        self.assertEqual(len(histogram), 5)
+        self.assertEqual(histogram.counts, [2, 1, 1, 1])
+        self.assertAlmostEqual(histogram.total, 3.56)
+        self.assertEqual(histogram.min, 0.005)
+        self.assertEqual(histogram.max, 3.0)
+        self.assertEqual(histogram.percentile(40), 0.01)
+        self.assertEqual(histogram.percentile(60), 0.1)
+        self.assertEqual(histogram.percentile(100), 3.0)
+
+    # -------------------------------------------------------------------------
+    def test_record(self):
+        """Test recording requests in a VsphereSoapStats object."""
+        LOG.info(self.get_method_doc())
+
+        from fb_vmware.stats import VsphereSoapStats
+
+        stats = VsphereSoapStats()
+        stats.record("get_vm_list", "VirtualMachine.summary", 0.002, 100, 2000)
+        stats.record("get_vm_list", "VirtualMachine.summary", 0.004, 100, 2000)
+        stats.record("get_vm_list", "VirtualMachine.config", 0.010, 100, 8000)
+        stats.record("get_hosts", "HostSystem.name", 0.001, 100, 500, fault=True)
+
+        self.assertEqual(stats.requests, 4)
+        self.assertEqual(stats.faults, 1)
+
+        calls = stats.calls()
+        self.assertEqual(calls[0].call, "VirtualMachine.summary")
+        self.assertEqual(calls[0].requests, 2)
+        self.assertEqual(calls[0].bytes_received, 4000)
+        self.assertEqual(len(stats.calls("get_hosts")), 1)
+
+        summary = stats.summary()
+        LOG.debug("Summary: {}".format(summary))
+        self.assertEqual(summary["operations"]["get_vm_list"]["requests"], 3)
+        self.assertEqual(summary["operations"]["get_vm_list"]["bytes_received"], 12000)
+        self.assertEqual(summary["operations"]["get_hosts"]["faults"], 1)
+        self.assertAlmostEqual(summary["seconds"], 0.017)
+
+        stats.reset()
+        self.assertEqual(stats.requests, 0)
+        self.assertEqual(stats.calls(), [])
+
+    # -------------------------------------------------------------------------
+    def test_instrumented_stub(self):
+        """Test recording requests with a VsphereInstrumentedStub object."""
+        LOG.info(self.get_method_doc())
+
+        from pyVmomi import vim
+
+        from fb_vmware.stats import VsphereInstrumentedStub
+        from fb_vmware.stats import VsphereSoapStats
+
+        stats = VsphereSoapStats()
+        soap_stub = FakeSoapStub(stats)
+        handler = FakeHandler()
+        stub = VsphereInstrumentedStub(soap_stub, stats, handler=handler)
+        vm = vim.VirtualMachine("vm-1", stub)
+
+        self.assertEqual(handler.get_name(vm), "vm-name")
+        self.assertEqual(vm.name, "vm-name")
+        with self.assertRaises(vim.fault.NoPermission):
+            vm.parent
+
+        calls = {(e.operation, e.call): e for e in stats.calls()}
+        LOG.debug("Recorded calls: {!r}".format(calls))
+        self.assertEqual(stats.requests, 3)
+        self.assertEqual(stats.faults, 1)
+        self.assertEqual(calls[("get_name", "VirtualMachine.name")].requests, 1)
+        self.assertEqual(calls[("get_name", "VirtualMachine.name")].bytes_sent, 100)
+        self.assertEqual(calls[("get_name", "VirtualMachine.name")].bytes_received, 1000)
+        self.assertEqual(calls[("-", "VirtualMachine.name")].requests, 1)
+        self.assertEqual(calls[("-", "VirtualMachine.parent")].faults, 1)
+        self.assertEqual(len(soap_stub.calls), 3)
+
+    # -------------------------------------------------------------------------
+    def test_connection_stats(self):
+        """Test the stats() method of a VsphereConnection object."""
+        LOG.info(self.get_method_doc())
+
+        from fb_vmware import VsphereConnection
+        from fb_vmware.config import VSPhereConfigInfo
+
+        connect_info = VSPhereConfigInfo(
+            host="my-vsphere.uhu-banane.de",
+            user="test.user",
+            password="test-password",
+            appname=self.appname,
+            initialized=True,
+        )
+
+        connect = VsphereConnection(connect_info=connect_info, appname=self.appname)
+        self.assertFalse(connect.collect_stats)
+        self.assertIsNone(connect.stats())
+
+        connect = VsphereConnection(
+            connect_info=connect_info, appname=self.appname, collect_stats=True
+        )
+        self.assertTrue(connect.collect_stats)
+        connect.soap_stats.record("get_hosts", "HostSystem.name", 0.001)
+        stats = connect.stats(reset=True)
+        LOG.debug("Stats: {}".format(stats))
+        self.assertEqual(stats["requests"], 1)
+        self.assertEqual(connect.stats()["requests"], 0)
+
+
+# =============================================================================
+if __name__ == "__main__":
+
+    verbose = get_arg_verbose()
+    if verbose is None:
+        verbose = 0
+    init_root_logger(verbose)
+
+    LOG.info("Starting tests ...")
+
+    suite = unittest.TestSuite()
+
+    suite.addTest(TestVsphereSoapStats("test_import", verbose))
+    suite.addTest(TestVsphereSoapStats("test_histogram", verbose))
+    suite.addTest(TestVsphereSoapStats("test_record", verbose))
+    suite.addTest(TestVsphereSoapStats("test_instrumented_stub", verbose))
+    suite.addTest(TestVsphereSoapStats("test_connection_stats", verbose))
+
+    runner = unittest.TextTestRunner(verbosity=verbose)
+
+    result = runner.run(suite)
+
+# =============================================================================
+
+# vim: tabstop=4 expandtab shiftwidth=4 softtabstop=4
@@ -0,0 +1,263 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+@summary: Test script (and module) for unit tests on module fb_vmware.cassette.
+
+@author: Frank Brehm
+@contact: frank@brehm-online.com
+@copyright: © 2026 Frank Brehm, Berlin
+@license: GPL3
+"""
+
+import gzip
+import logging
+import os
+import shutil
+import sys
+import tempfile
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+try:
+    import unittest2 as unittest
+except ImportError:
+    import unittest
+
+libdir = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "src"))
+sys.path.insert(0, libdir)
+
+from general import FbVMWareTestcase, get_arg_verbose, init_root_logger
+
+LOG = logging.getLogger("test-cassette")
+
+SOAP_START = (
+    '<?xml version="1.0" encoding="UTF-8"?>\n'
+    '<soapenv:Envelope xmlns:soapenc="http://schemas.xmlsoap.org/soap/encoding/" '
+    'xmlns:soapenv="http://schemas.xmlsoap.org/soap/envelope/" '
+    'xmlns:xsd="http://www.w3.org/2001/XMLSchema" '
+    'xmlns:xsi="http://www.w3.org/2001/XMLSchema-instance">\n<soapenv:Body>'
+)
+SOAP_END = "</soapenv:Body>\n</soapenv:Envelope>"
+
+NAME_RESPONSE = (
+    SOAP_START
+    + '<FetchResponse xmlns="urn:vim25"><returnval xsi:type="xsd:string">vm-name</returnval>'
+    + "</FetchResponse>"
+    + SOAP_END
+)
+
+FAULT_RESPONSE = (
+    SOAP_START
+    + "<soapenv:Fault><faultcode>ServerFaultCode</faultcode>"
+    + "<faultstring>Permission to perform this operation was denied.</faultstring>"
+    + '<detail><NoPermissionFault xmlns="urn:vim25" xsi:type="NoPermission">'
+    + "<privilegeId>System.View</privilegeId></NoPermissionFault></detail>"
+    + "</soapenv:Fault>"
+    + SOAP_END
+)
+
+
+# =============================================================================
+class FakeVsphereHandler(BaseHTTPRequestHandler):
+    """A HTTP request handler answering Fetch requests with fixed gzipped SOAP responses."""
+
+    protocol_version = "HTTP/1.1"
+
+    # -------------------------------------------------------------------------
+    def do_POST(self):  # noqa: N802
+        """Answer a SOAP request."""
+        body = self.rfile.read(int(self.headers["Content-Length"])).decode("utf-8")
+        if ">parent</prop>" in body:
+            (status, response) = (500, FAULT_RESPONSE)
+        else:
+            (status, response) = (200, NAME_RESPONSE)
+
+        data = gzip.compress(response.encode("utf-8"))
+        self.send_response(status)
+        self.send_header("Content-Type", "text/xml; charset=utf-8")
+        self.send_header("Content-Encoding", "gzip")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    # -------------------------------------------------------------------------
+    def log_message(self, format, *args):
+        """Log the requests only in debug mode."""
+        LOG.debug(format % args)
+
+
+# =============================================================================
+class TestVsphereCassette(FbVMWareTestcase):
+    """Testcase for unit tests on recording and replaying SOAP requests."""
+
+    # -------------------------------------------------------------------------
+    def setUp(self):
+        """Execute this on seting up before calling each particular test method."""
+        super(TestVsphereCassette, self).setUp()
+        self.tmpdir = tempfile.mkdtemp(prefix="test-cassette-")
+        self.filename = os.path.join(self.tmpdir, "test.jsonl.gz")
+
+    # -------------------------------------------------------------------------
+    def tearDown(self):
+        """Execute this after calling each particular test method."""
+        shutil.rmtree(self.tmpdir, ignore_errors=True)
+        super(TestVsphereCassette, self).tearDown()
+
+    # -------------------------------------------------------------------------
+    def record_cassette(self):
+        """Record some requests to a fake vSphere into a cassette file."""
+        from pyVmomi import VmomiSupport
+        from pyVmomi import vim
+        from pyVmomi.SoapAdapter import SoapStubAdapter
+
+        from fb_vmware.cassette import VsphereCassette
+
+        server = ThreadingHTTPServer(("127.0.0.1", 0), FakeVsphereHandler)
+        server.daemon_threads = True
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+
+        try:
+            soap_stub = SoapStubAdapter(
+                host="127.0.0.1",
+                port=-server.server_address[1],
+                version=VmomiSupport.newestVersions.GetName("vim"),
+            )
+            si = vim.ServiceInstance("ServiceInstance", soap_stub)
+
+            with VsphereCassette(self.filename, mode="record") as cassette:
+                si = cassette.record(si, "test-vsphere:443")
+                vm = vim.VirtualMachine("vm-1", si._stub)
+                self.assertEqual(vm.name, "vm-name")
+                with self.assertRaises(vim.fault.NoPermission):
+                    vm.parent
+                self.assertEqual(len(cassette), 2)
+            soap_stub.DropConnections()
+        finally:
+            server.shutdown()
+            server.server_close()
+
+    # -------------------------------------------------------------------------
+    def test_import(self):
+        """Test import of fb_vmware.cassette."""
+        LOG.info(self.get_method_doc())
+
+        import fb_vmware.cassette
+
+        LOG.debug("Version of fb_vmware.cassette: {!r}.".format(fb_vmware.cassette.__version__))
+
+    # -------------------------------------------------------------------------
+    def test_invalid(self):
+        """Test opening invalid cassettes."""
+        LOG.info(self.get_method_doc())
+
+        from fb_vmware.cassette import VsphereCassette
+        from fb_vmware.errors import VSphereCassetteError
+
+        with self.assertRaises(VSphereCassetteError):
+            VsphereCassette(self.filename, mode="rewind")
+
+        with self.assertRaises(VSphereCassetteError):
+            VsphereCassette(self.filename, mode="replay", latency_factor=-1)
+
+        with self.assertRaises(VSphereCassetteError) as cm:
+            VsphereCassette(self.filename, mode="replay")
+        LOG.debug("%s raised: %s", cm.exception.__class__.__qualname__, cm.exception)
+
+        with gzip.open(self.filename, "wt") as fh:
+            fh.write('{"type": "header", "format": "something-else"}\n')
+        with self.assertRaises(VSphereCassetteError) as cm:
+            VsphereCassette(self.filename, mode="replay")
+        LOG.debug("%s raised: %s", cm.exception.__class__.__qualname__, cm.exception)
+
+    # -------------------------------------------------------------------------
+    def test_record_replay(self):
+        """Test recording requests into a cassette and replaying them."""
+        LOG.info(self.get_method_doc())
+
+        from pyVmomi import vim
+
+        from fb_vmware.cassette import VsphereCassette
+        from fb_vmware.cassette import VsphereReplayStub
+        from fb_vmware.errors import VSphereCassetteError
+
+        self.record_cassette()
+
+        cassette = VsphereCassette(self.filename)
+        LOG.debug("Replaying cassette: {!r}".format(cassette))
+        self.assertEqual(len(cassette), 2)
+        self.assertIn("test-vsphere:443", cassette.sessions)
+        entry = cassette.entries[0]
+        self.assertEqual(entry["call"], "VirtualMachine.name")
+        self.assertEqual(entry["status"], 200)
+        self.assertIn("vm-name", entry["response"])
+        self.assertGreater(entry["seconds"], 0)
+
+        si = cassette.replay("other-vsphere:443")
+        self.assertIsInstance(si._stub, VsphereReplayStub)
+        vm = vim.VirtualMachine("vm-1", si._stub)
+        with self.assertRaises(vim.fault.NoPermission):
+            vm.parent
+        self.assertEqual(vm.name, "vm-name")
+        self.assertEqual(cassette.unused_entries(), 0)
+
+        with self.assertRaises(VSphereCassetteError) as cm:
+            vm.name
+        LOG.debug("%s raised: %s", cm.exception.__class__.__qualname__, cm.exception)
+
+    # -------------------------------------------------------------------------
+    def test_connection_replay(self):
+        """Test connecting a VsphereConnection object to a replayed cassette."""
+        LOG.info(self.get_method_doc())
+
+        from fb_vmware import VsphereConnection
+        from fb_vmware.cassette import VsphereCassette
+        from fb_vmware.cassette import VsphereReplayStub
+        from fb_vmware.config import VSPhereConfigInfo
+
+        self.record_cassette()
+
+        connect_info = VSPhereConfigInfo(
+            host="test-vsphere", appname=self.appname, initialized=True
+        )
+        connect = VsphereConnection(
+            connect_info=connect_info,
+            appname=self.appname,
+            collect_stats=True,
+            cassette=VsphereCassette(self.filename, latency_factor=0.5),
+        )
+        LOG.debug("Connection: {!r}".format(connect))
+        connect.connect()
+        self.assertIsInstance(connect.service_instance._stub.soap_stub, VsphereReplayStub)
+
+        from pyVmomi import vim
+
+        vm = vim.VirtualMachine("vm-1", connect.service_instance._stub)
+        self.assertEqual(vm.name, "vm-name")
+        self.assertEqual(connect.stats()["requests"], 1)
+
+
+# =============================================================================
+if __name__ == "__main__":
+
+    verbose = get_arg_verbose()
+    if verbose is None:
+        verbose = 0
+    init_root_logger(verbose)
+
+    LOG.info("Starting tests ...")
+
+    suite = unittest.TestSuite()
+
+    suite.addTest(TestVsphereCassette("test_import", verbose))
+    suite.addTest(TestVsphereCassette("test_invalid", verbose))
+    suite.addTest(TestVsphereCassette("test_record_replay", verbose))
+    suite.addTest(TestVsphereCassette("test_connection_replay", verbose))
+
+    runner = unittest.TextTestRunner(verbosity=verbose)
+
+    result = runner.run(suite)
+
+# =============================================================================
+
+# vim: tabstop=4 expandtab shiftwidth=4 softtabstop=4
@@ -0,0 +1,311 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+@summary: Test script (and module) for unit tests on the modules fb_vmware.inventoryd
+          and fb_vmware.inventory_client.
+
+@author: Frank Brehm
+@contact: frank@brehm-online.com
+@copyright: © 2026 Frank Brehm, Berlin
+@license: GPL3
+"""
+
+import datetime
+import logging
+import os
+import shutil
+import stat
+import sys
+import tempfile
+import time
+
+try:
+    import unittest2 as unittest
+except ImportError:
+    import unittest
+
+libdir = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "src"))
+sys.path.insert(0, libdir)
+
+benchdir = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "benchmarks"))
+
+from general import FbVMWareTestcase, get_arg_verbose, init_root_logger
+
+LOG = logging.getLogger("test-inventoryd")
+
+
+# =============================================================================
+class TestInventoryDaemon(FbVMWareTestcase):
+    """Testcase for unit tests on the inventory daemon and its client."""
+
+    # -------------------------------------------------------------------------
+    def setUp(self):
+        """Execute this on seting up before calling each particular test method."""
+        super(TestInventoryDaemon, self).setUp()
+        self.tmpdir = tempfile.mkdtemp(prefix="test-inventoryd-")
+
+    # -------------------------------------------------------------------------
+    def tearDown(self):
+        """Execute this after calling each particular test method."""
+        shutil.rmtree(self.tmpdir, ignore_errors=True)
+        super(TestInventoryDaemon, self).tearDown()
+
+    # -------------------------------------------------------------------------
+    def create_inventory(self, name):
+        """Create an inventory with some records without connecting to a vSphere."""
+        from fb_vmware.config import VSPhereConfigInfo
+        from fb_vmware.connect import VsphereConnection
+        from fb_vmware.inventoryd import VsphereInventory
+
+        connect_info = VSPhereConfigInfo(
+            host="{}.example.com".format(name), appname=self.appname, initialized=True
+        )
+        connection = VsphereConnection(connect_info=connect_info, appname=self.appname)
+        inventory = VsphereInventory(name, connection)
+
+        vms = {}
+        for i in range(1, 4):
+            moid = "vm-{}".format(i)
+            vms[moid] = {
+                "name": "{n}-vm{i:02d}".format(n=name, i=i),
+                "vsphere": name,
+                "path": "/",
+                "template": i == 3,
+                "moid": moid,
+            }
+        inventory._set_records("vms", vms)
+        inventory._set_records(
+            "datastores",
+            {
+                "local_esx01": {"name": "local_esx01", "vsphere": name},
+                "{}-ds01".format(name): {"name": "{}-ds01".format(name), "vsphere": name},
+            },
+        )
+        inventory._loaded.set()
+        return inventory
+
+    # -------------------------------------------------------------------------
+    def test_import(self):
+        """Test import of fb_vmware.inventoryd and fb_vmware.inventory_client."""
+        LOG.info(self.get_method_doc())
+
+        import fb_vmware.inventory_client
+        import fb_vmware.inventoryd
+
+        LOG.debug(
+            "Version of fb_vmware.inventoryd: {!r}.".format(fb_vmware.inventoryd.__version__)
+        )
+        LOG.debug(
+            "Version of fb_vmware.inventory_client: {!r}.".format(
+                fb_vmware.inventory_client.__version__
+            )
+        )
+
+    # -------------------------------------------------------------------------
+    def test_records(self):
+        """Test converting inventory objects into JSON records."""
+        LOG.info(self.get_method_doc())
+
+        import ipaddress
+
+        from fb_vmware.inventory_client import InventoryRecord
+        from fb_vmware.inventoryd import make_record
+        from fb_vmware.inventoryd import to_json_value
+
+        class Named(object):
+            name = "named"
+
+        test_data = (
+            (None, None),
+            (3, 3),
+            ("abc", "abc"),
+            (datetime.date(2026, 1, 2), "2026-01-02"),
+            (ipaddress.ip_address("192.0.2.1"), "192.0.2.1"),
+            ({"b", "a"}, ["a", "b"]),
+            (("a", 1), ["a", 1]),
+            ({"x": Named()}, {"x": "named"}),
+        )
+        for (value, expected) in test_data:
+            LOG.debug("Converting {!r} ...".format(value))
+            self.assertEqual(to_json_value(value), expected)
+
+        record = make_record(Named(), ("name", "missing"), kind="test")
+        self.assertEqual(record, {"name": "named", "missing": None, "kind": "test"})
+
+        record = InventoryRecord({"name": "host", "product": {"os_version": "8.0"}})
+        self.assertEqual(record.name, "host")
+        self.assertEqual(record.product.os_version, "8.0")
+        self.assertIsInstance(record.product, InventoryRecord)
+        with self.assertRaises(AttributeError):
+            record.missing
+
+    # -------------------------------------------------------------------------
+    def test_query(self):
+        """Test queries on the inventory service."""
+        LOG.info(self.get_method_doc())
+
+        from fb_vmware.errors import VSphereInventoryError
+        from fb_vmware.inventoryd import VsphereInventoryService
+
+        service = VsphereInventoryService(
+            [self.create_inventory("vs1"), self.create_inventory("vs2")], initial_wait=1
+        )
+
+        self.assertEqual(service.query("ping")["vspheres"], ["vs1", "vs2"])
+        states = service.query("vspheres")
+        self.assertEqual(states[0]["counts"]["vms"], 3)
+        self.assertTrue(states[0]["loaded"])
+
+        self.assertEqual(len(service.query("vms")), 6)
+        self.assertEqual(len(service.query("vms", {"vsphere": "vs2"})), 3)
+        result = service.query("vms", {"pattern": "VM0[12]$", "template": "no"})
+        self.assertEqual(
+            [r["name"] for r in result], ["vs1-vm01", "vs1-vm02", "vs2-vm01", "vs2-vm02"]
+        )
+        result = service.query("vms", {"template": "yes"})
+        self.assertEqual([r["name"] for r in result], ["vs1-vm03", "vs2-vm03"])
+        self.assertEqual(len(service.query("datastores", {"no_local": "yes"})), 2)
+        self.assertEqual(service.query("hosts"), [])
+
+        for (path, params) in (
+            ("nothing", {}),
+            ("vms", {"vsphere": "vs3"}),
+            ("vms", {"pattern": "("}),
+            ("placement", {"size_gb": "many"}),
+            ("placement", {"size_gb": "-1"}),
+        ):
+            with self.assertRaises(VSphereInventoryError) as cm:
+                service.query(path, params)
+            LOG.debug("%s raised: %s", cm.exception.__class__.__qualname__, cm.exception)
+
+    # -------------------------------------------------------------------------
+    def test_client(self):
+        """Test the client of the inventory daemon on a Unix socket."""
+        LOG.info(self.get_method_doc())
+
+        from fb_vmware.errors import VSphereInventoryError
+        from fb_vmware.inventory_client import VsphereInventoryClient
+        from fb_vmware.inventoryd import VsphereInventoryService
+
+        socket_path = os.path.join(self.tmpdir, "inventoryd.sock")
+
+        client = VsphereInventoryClient(socket_path, timeout=5)
+        self.assertFalse(client.ping())
+        with self.assertRaises(VSphereInventoryError):
+            client.vms()
+
+        service = VsphereInventoryService([self.create_inventory("vs1")], initial_wait=1)
+        try:
+            service.listen_unix(socket_path)
+            self.assertEqual(stat.S_IMODE(os.stat(socket_path).st_mode), 0o600)
+
+            self.assertTrue(client.ping())
+            vms = client.vms(template=False)
+            self.assertEqual([vm.name for vm in vms], ["vs1-vm01", "vs1-vm02"])
+            self.assertEqual(vms[0].moid, "vm-1")
+            self.assertEqual(len(client.datastores(no_local=True)), 1)
+            self.assertEqual(client.refresh(vsphere="vs1"), ["vs1"])
+
+            with self.assertRaises(VSphereInventoryError) as cm:
+                client.hosts(vsphere="vs3")
+            LOG.debug("%s raised: %s", cm.exception.__class__.__qualname__, cm.exception)
+            with self.assertRaises(VSphereInventoryError) as cm:
+                client.request("vms", method="POST")
+            LOG.debug("%s raised: %s", cm.exception.__class__.__qualname__, cm.exception)
+
+            with self.assertRaises(VSphereInventoryError):
+                VsphereInventoryService([], initial_wait=1).listen_unix(socket_path)
+        finally:
+            service.stop()
+
+        self.assertFalse(os.path.exists(socket_path))
+
+        with self.assertRaises(VSphereInventoryError):
+            VsphereInventoryClient("https://localhost:8730")
+        with self.assertRaises(VSphereInventoryError):
+            service.listen_http("192.0.2.1", 0)
+
+    # -------------------------------------------------------------------------
+    def test_stop_during_wait(self):
+        """Test stopping the inventories while they are waiting for updates."""
+        LOG.info(self.get_method_doc())
+
+        sys.path.insert(0, benchdir)
+        try:
+            from inventory import SyntheticInventory
+            from vcsim import VcenterSimulator
+        finally:
+            sys.path.remove(benchdir)
+
+        from fb_vmware.config import VSPhereConfigInfo
+        from fb_vmware.connect import VsphereConnection
+        from fb_vmware.inventoryd import VsphereInventory
+        from fb_vmware.inventoryd import VsphereInventoryService
+
+        with VcenterSimulator(SyntheticInventory(vms=5)) as simulator:
+            inventories = []
+            for name in ("vs1", "vs2"):
+                connect_info = VSPhereConfigInfo(
+                    host=simulator.host,
+                    port=simulator.port,
+                    use_https=False,
+                    user=simulator.user,
+                    password=simulator.password,
+                    appname=self.appname,
+                    initialized=True,
+                )
+                connection = VsphereConnection(
+                    connect_info=connect_info, appname=self.appname, auto_close=False
+                )
+                inventories.append(VsphereInventory(name, connection, wait_seconds=30))
+            service = VsphereInventoryService(inventories, initial_wait=10)
+
+            service.start()
+            for inventory in inventories:
+                self.assertTrue(inventory.wait_loaded(30))
+            # Give them the time to enter WaitForUpdatesEx()
+            deadline = time.monotonic() + 10
+            while time.monotonic() < deadline:
+                if all(inventory._waiting is not None for inventory in inventories):
+                    break
+                time.sleep(0.05)
+            self.assertTrue(all(inventory._waiting is not None for inventory in inventories))
+            time.sleep(0.2)
+
+            start = time.monotonic()
+            service.stop()
+            duration = time.monotonic() - start
+            LOG.debug("Stopping the inventories took {:0.2f} seconds.".format(duration))
+
+            self.assertLess(duration, 5)
+            for inventory in inventories:
+                self.assertIsNone(inventory._thread)
+                self.assertIsNone(inventory.error)
+                self.assertIsNone(inventory.connection.service_instance)
+
+
+# =============================================================================
+if __name__ == "__main__":
+
+    verbose = get_arg_verbose()
+    if verbose is None:
+        verbose = 0
+    init_root_logger(verbose)
+
+    LOG.info("Starting tests ...")
+
+    suite = unittest.TestSuite()
+
+    suite.addTest(TestInventoryDaemon("test_import", verbose))
+    suite.addTest(TestInventoryDaemon("test_records", verbose))
+    suite.addTest(TestInventoryDaemon("test_query", verbose))
+    suite.addTest(TestInventoryDaemon("test_client", verbose))
+    suite.addTest(TestInventoryDaemon("test_stop_during_wait", verbose))
+
+    runner = unittest.TextTestRunner(verbosity=verbose)
+
+    result = runner.run(suite)
+
+# =============================================================================
+
+# vim: tabstop=4 expandtab shiftwidth=4 softtabstop=4
@@ -0,0 +1,226 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+@summary: Test script (and module) for unit tests on module fb_vmware.singleflight.
+
+@author: Frank Brehm
+@contact: frank@brehm-online.com
+@copyright: © 2026 Frank Brehm, Berlin
+@license: GPL3
+"""
+
+import logging
+import os
+import sys
+import threading
+import time
+
+try:
+    import unittest2 as unittest
+except ImportError:
+    import unittest
+
+libdir = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "src"))
+sys.path.insert(0, libdir)
+
+from general import FbVMWareTestcase, get_arg_verbose, init_root_logger
+
+LOG = logging.getLogger("test-singleflight")
+
+BURST_SIZE = 50
+
+
+# =============================================================================
+def run_burst(func, count=BURST_SIZE):
+    """Call the given function from the given number of threads at once."""
+    barrier = threading.Barrier(count)
+    results = [None] * count
+    errors = []
+
+    def worker(index):
+        barrier.wait()
+        try:
+            results[index] = func()
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(count)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(10)
+
+    return (results, errors)
+
+
+# =============================================================================
+class TestSingleFlight(FbVMWareTestcase):
+    """Testcase for unit tests on coalescing identical concurrent calls."""
+
+    # -------------------------------------------------------------------------
+    def test_import(self):
+        """Test import of fb_vmware.singleflight."""
+        LOG.info(self.get_method_doc())
+
+        import fb_vmware.singleflight
+
+        LOG.debug(
+            "Version of fb_vmware.singleflight: {!r}.".format(fb_vmware.singleflight.__version__)
+        )
+
+    # -------------------------------------------------------------------------
+    def test_coalescing(self):
+        """Test coalescing a burst of identical concurrent calls."""
+        LOG.info(self.get_method_doc())
+
+        from fb_vmware.singleflight import SingleFlight
+
+        calls = []
+
+        def retrieve(what):
+            calls.append(what)
+            time.sleep(0.2)
+            return {"what": what}
+
+        flight = SingleFlight()
+        (results, errors) = run_burst(lambda: flight.do("key", retrieve, "all"))
+        LOG.debug("Single flight after the burst: {}".format(flight.as_dict()))
+
+        self.assertEqual(errors, [])
+        self.assertEqual(calls, ["all"])
+        self.assertEqual(flight.executions, 1)
+        self.assertEqual(flight.coalesced, BURST_SIZE - 1)
+        for result in results:
+            self.assertIs(result, results[0])
+
+        # Without a TTL the next call is a new retrieval
+        flight.do("key", retrieve, "all")
+        self.assertEqual(len(calls), 2)
+
+    # -------------------------------------------------------------------------
+    def test_ttl(self):
+        """Test the time to live of the results."""
+        LOG.info(self.get_method_doc())
+
+        from fb_vmware.singleflight import SingleFlight
+
+        calls = []
+
+        def retrieve():
+            calls.append(1)
+            return object()
+
+        with self.assertRaises(ValueError):
+            SingleFlight(ttl=-1)
+
+        flight = SingleFlight(ttl=0.3)
+        first = flight.do("key", retrieve)
+        self.assertIs(flight.do("key", retrieve), first)
+        self.assertEqual(flight.cache_hits, 1)
+        self.assertIsNot(flight.do("other", retrieve), first)
+        self.assertEqual(len(calls), 2)
+
+        time.sleep(0.35)
+        self.assertIsNot(flight.do("key", retrieve), first)
+        self.assertEqual(len(calls), 3)
+
+        flight.forget("key")
+        flight.do("key", retrieve)
+        self.assertEqual(len(calls), 4)
+
+    # -------------------------------------------------------------------------
+    def test_errors(self):
+        """Test sharing an exception of a retrieval with all waiting callers."""
+        LOG.info(self.get_method_doc())
+
+        from fb_vmware.singleflight import SingleFlight
+
+        calls = []
+
+        def retrieve():
+            calls.append(1)
+            time.sleep(0.2)
+            raise RuntimeError("Retrieval failed.")
+
+        flight = SingleFlight(ttl=10)
+        (results, errors) = run_burst(lambda: flight.do("key", retrieve), count=10)
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(len(errors), 10)
+        for error in errors:
+            self.assertIsInstance(error, RuntimeError)
+
+        # Errors are not cached
+        with self.assertRaises(RuntimeError):
+            flight.do("key", retrieve)
+        self.assertEqual(len(calls), 2)
+
+    # -------------------------------------------------------------------------
+    def test_connection(self):
+        """Test coalescing concurrent get_datastores() calls of a VsphereConnection."""
+        LOG.info(self.get_method_doc())
+
+        from fb_vmware import VsphereConnection
+        from fb_vmware.config import VSPhereConfigInfo
+        from fb_vmware.datastore import VsphereDatastoreDict
+
+        class CountingConnection(VsphereConnection):
+
+            traversals = 0
+
+            def _retrieve_datastores(self, vsphere_name, no_local_ds, search_in_dc, detailled):
+                self.traversals += 1
+                time.sleep(0.2)
+                return (VsphereDatastoreDict(), {"ds": "ds_tf"})
+
+        connect_info = VSPhereConfigInfo(
+            host="test-vsphere", appname=self.appname, initialized=True
+        )
+        connect = CountingConnection(
+            connect_info=connect_info, appname=self.appname, result_ttl=5
+        )
+        self.assertEqual(connect.result_ttl, 5)
+
+        (results, errors) = run_burst(lambda: connect.get_datastores(warn_if_empty=False))
+        self.assertEqual(errors, [])
+        self.assertEqual(connect.traversals, 1)
+        self.assertIs(connect.datastores, results[0])
+        self.assertEqual(connect.ds_mapping, {"ds": "ds_tf"})
+
+        # Answered from the cached result
+        connect.get_datastores(warn_if_empty=False)
+        self.assertEqual(connect.traversals, 1)
+
+        # Different parameters mean a different retrieval
+        connect.get_datastores(warn_if_empty=False, no_local_ds=False)
+        self.assertEqual(connect.traversals, 2)
+
+        connect.result_ttl = 0
+        connect.get_datastores(warn_if_empty=False)
+        self.assertEqual(connect.traversals, 3)
+
+
+# =============================================================================
+if __name__ == "__main__":
+
+    verbose = get_arg_verbose()
+    if verbose is None:
+        verbose = 0
+    init_root_logger(verbose)
+
+    LOG.info("Starting tests ...")
+
+    suite = unittest.TestSuite()
+
+    suite.addTest(TestSingleFlight("test_import", verbose))
+    suite.addTest(TestSingleFlight("test_coalescing", verbose))
+    suite.addTest(TestSingleFlight("test_ttl", verbose))
+    suite.addTest(TestSingleFlight("test_errors", verbose))
+    suite.addTest(TestSingleFlight("test_connection", verbose))
+
+    runner = unittest.TextTestRunner(verbosity=verbose)
+
+    result = runner.run(suite)
+
+# =============================================================================
+
+# vim: tabstop=4 expandtab shiftwidth=4 softtabstop=4
@@ -0,0 +1,228 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+@summary: Test script (and module) for unit tests on module fb_vmware.pool.
+
+@author: Frank Brehm
+@contact: frank@brehm-online.com
+@copyright: © 2026 Frank Brehm, Berlin
+@license: GPL3
+"""
+
+import logging
+import os
+import shutil
+import ssl
+import subprocess
+import sys
+import tempfile
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+try:
+    import unittest2 as unittest
+except ImportError:
+    import unittest
+
+libdir = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "src"))
+sys.path.insert(0, libdir)
+
+from general import FbVMWareTestcase, get_arg_verbose, init_root_logger
+
+LOG = logging.getLogger("test-pool")
+
+
+# =============================================================================
+class PingHandler(BaseHTTPRequestHandler):
+    """Answering every POST request with a short text."""
+
+    protocol_version = "HTTP/1.1"
+
+    def do_POST(self):  # noqa: N802
+        """Answer a POST request."""
+        length = int(self.headers.get("Content-Length", 0))
+        self.rfile.read(length)
+        body = b"pong"
+        self.send_response(200)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        """Log nothing."""
+        pass
+
+
+# =============================================================================
+class TestConnectionPool(FbVMWareTestcase):
+    """Testcase for unit tests on tuning the HTTP connection pool of the SOAP stub."""
+
+    # -------------------------------------------------------------------------
+    def setUp(self):
+        """Execute this on seting up before calling each particular test method."""
+        super(TestConnectionPool, self).setUp()
+        self.tmpdir = tempfile.mkdtemp(prefix="test-pool-")
+        self.server = None
+
+    # -------------------------------------------------------------------------
+    def tearDown(self):
+        """Execute this after calling each particular test method."""
+        if self.server is not None:
+            self.server.shutdown()
+            self.server.server_close()
+        shutil.rmtree(self.tmpdir, ignore_errors=True)
+        super(TestConnectionPool, self).tearDown()
+
+    # -------------------------------------------------------------------------
+    def start_server(self, context=None):
+        """Start a HTTP server on a free port of the localhost and return the port."""
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), PingHandler)
+        self.server.daemon_threads = True
+        if context is not None:
+            self.server.socket = context.wrap_socket(self.server.socket, server_side=True)
+        thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        thread.start()
+        return self.server.server_address[1]
+
+    # -------------------------------------------------------------------------
+    def ping(self, stub, conn):
+        """Send a request over the given connection of the stub and return it to the pool."""
+        conn.request("POST", "/sdk", b"ping", {"Content-Type": "text/plain"})
+        resp = conn.getresponse()
+        self.assertEqual(resp.read(), b"pong")
+        stub.ReturnConnection(conn)
+
+    # -------------------------------------------------------------------------
+    def test_import(self):
+        """Test import of fb_vmware.pool."""
+        LOG.info(self.get_method_doc())
+
+        import fb_vmware.pool
+
+        LOG.debug("Version of fb_vmware.pool: {!r}.".format(fb_vmware.pool.__version__))
+
+    # -------------------------------------------------------------------------
+    def test_pool(self):
+        """Test the pool size, the keep-alive time and counting the connections."""
+        LOG.info(self.get_method_doc())
+
+        from pyVmomi.SoapAdapter import SoapStubAdapter
+
+        from fb_vmware.config import VSPhereConfigInfo
+        from fb_vmware.pool import VsphereConnectionPool
+
+        port = self.start_server()
+        info = VSPhereConfigInfo(
+            host="127.0.0.1", port=port, pool_size=2, read_timeout=10, appname=self.appname
+        )
+        pool = VsphereConnectionPool.from_connect_info(info)
+        LOG.debug("Connection pool: {!r}".format(pool))
+
+        stub = SoapStubAdapter(host="127.0.0.1", port=-port)
+        pool.apply(stub)
+        self.assertEqual(stub.poolSize, 2)
+
+        conns = [stub.GetConnection() for i in range(3)]
+        self.assertEqual(pool.in_use, 3)
+        self.assertEqual(conns[0].sock.gettimeout(), 10)
+        for conn in conns:
+            self.ping(stub, conn)
+
+        summary = pool.summary()
+        LOG.debug("Utilisation of the pool: {}".format(summary))
+        self.assertEqual(summary["created"], 3)
+        self.assertEqual(summary["peak_in_use"], 3)
+        self.assertEqual(summary["in_use"], 0)
+        self.assertEqual(summary["returned"], 2)
+        self.assertEqual(summary["discarded"], 1)
+        self.assertEqual(summary["idle"], 2)
+
+        self.ping(stub, stub.GetConnection())
+        self.assertEqual(pool.reused, 1)
+        self.assertEqual(pool.created, 3)
+
+        stub.DropConnections()
+        self.assertEqual(pool.dropped, 2)
+        self.assertEqual(pool.idle, 0)
+
+        # Without keep-alive every connection is a new one
+        stub = SoapStubAdapter(host="127.0.0.1", port=-port)
+        pool = VsphereConnectionPool(keep_alive=0)
+        pool.apply(stub)
+        for i in range(3):
+            self.ping(stub, stub.GetConnection())
+        self.assertEqual(pool.created, 3)
+        self.assertEqual(pool.reused, 0)
+
+    # -------------------------------------------------------------------------
+    @unittest.skipUnless(shutil.which("openssl"), "The openssl command is not available.")
+    def test_tls_session_reuse(self):
+        """Test resuming the TLS session in new connections."""
+        LOG.info(self.get_method_doc())
+
+        from pyVmomi.SoapAdapter import SoapStubAdapter
+
+        from fb_vmware.pool import VsphereConnectionPool
+
+        cert_file = os.path.join(self.tmpdir, "cert.pem")
+        key_file = os.path.join(self.tmpdir, "key.pem")
+        subprocess.run(
+            [
+                "openssl", "req", "-x509", "-newkey", "rsa:2048", "-nodes", "-days", "1",
+                "-subj", "/CN=localhost", "-keyout", key_file, "-out", cert_file,
+            ],
+            check=True,
+            capture_output=True,
+        )
+        server_context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+        server_context.load_cert_chain(cert_file, key_file)
+        port = self.start_server(server_context)
+
+        for reuse in (True, False):
+            stub = SoapStubAdapter(
+                host="127.0.0.1", port=port, sslContext=ssl._create_unverified_context()
+            )
+            pool = VsphereConnectionPool(tls_session_reuse=reuse)
+            pool.apply(stub)
+
+            self.ping(stub, stub.GetConnection())
+            # Two connections at once need a second handshake
+            conns = [stub.GetConnection() for i in range(2)]
+            for conn in conns:
+                self.ping(stub, conn)
+
+            summary = pool.summary()
+            LOG.debug(
+                "Utilisation of the pool with TLS session reuse {}: {}".format(reuse, summary)
+            )
+            self.assertEqual(summary["created"], 2)
+            if reuse:
+                self.assertEqual(summary["tls_handshakes"], 2)
+                self.assertEqual(summary["tls_resumed"], 1)
+            else:
+                self.assertEqual(summary["tls_handshakes"], 0)
+
+
+# =============================================================================
+if __name__ == "__main__":
+
+    verbose = get_arg_verbose()
+    if verbose is None:
+        verbose = 0
+    init_root_logger(verbose)
+
+    LOG.info("Starting tests ...")
+
+    suite = unittest.TestSuite()
+
+    suite.addTest(TestConnectionPool("test_import", verbose))
+    suite.addTest(TestConnectionPool("test_pool", verbose))
+    suite.addTest(TestConnectionPool("test_tls_session_reuse", verbose))
+
+    runner = unittest.TextTestRunner(verbosity=verbose)
+
+    result = runner.run(suite)
+
+# =============================================================================
+
+# vim: tabstop=4 expandtab shiftwidth=4 softtabstop=4
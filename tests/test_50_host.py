@@ -85,6 +85,69 @@ class TestVmwareHost(FbVMWareTestcase):
         self.assertEqual(host.verbose, 1)
         self.assertEqual(host.name, host_name)
 
+    # -------------------------------------------------------------------------
+    def test_from_properties(self):
+        """Test creating a VsphereHost object from a property set."""
+        LOG.info(self.get_method_doc())
+
+        from fb_vmware import VsphereHost
+        from fb_vmware.errors import VSphereHandlerError
+        from fb_vmware.propset import DataRecord
+
+        props = {
+            "name": "esx01.example.com",
+            "summary.config.name": "esx01.example.com",
+            "summary.rebootRequired": False,
+            "hardware.biosInfo": DataRecord(
+                "HostBIOSInfo", biosVersion="2.4.1", vendor="Dell Inc."
+            ),
+            "hardware.cpuInfo": DataRecord(
+                "HostCpuInfo", hz=2600000000, numCpuCores=32, numCpuPackages=2, numCpuThreads=64
+            ),
+            "hardware.memorySize": 512 * 1024 * 1024 * 1024,
+            "hardware.systemInfo": DataRecord(
+                "HostSystemInfo",
+                model="PowerEdge R650",
+                uuid="4c4c4544-0042-3010-8057-b4c04f4e3533",
+                vendor="Dell Inc.",
+            ),
+            "runtime.connectionState": "connected",
+            "runtime.powerState": "poweredOn",
+            "runtime.inMaintenanceMode": False,
+            "config.product": DataRecord(
+                "AboutInfo", name="VMware ESXi", version="8.0.2", osType="vmnix-x86"
+            ),
+            "config.network.ipV6Enabled": True,
+            "config.network.portgroup": [
+                DataRecord(
+                    "HostPortGroup",
+                    spec=DataRecord(
+                        "HostPortGroupSpec", name="VM Network", vlanId=100, vswitchName="vSwitch0"
+                    ),
+                ),
+            ],
+        }
+
+        host = VsphereHost.from_properties(
+            props, vsphere="test", dc_name="dc1", cluster_name="cluster01", appname=self.appname
+        )
+        LOG.debug("VsphereHost %s:\n{}".format(host))
+
+        self.assertEqual(host.name, "esx01.example.com")
+        self.assertEqual(host.cluster_name, "cluster01")
+        self.assertEqual(host.cpu_cores, 32)
+        self.assertEqual(host.model, "PowerEdge R650")
+        self.assertEqual(str(host.uuid), "4c4c4544-0042-3010-8057-b4c04f4e3533")
+        self.assertEqual(host.bios.bios_version, "2.4.1")
+        self.assertEqual(host.product.os_version, "8.0.2")
+        self.assertTrue(host.ipv6_enabled)
+        self.assertEqual(len(host.portgroups), 1)
+        self.assertEqual(host.portgroups[0].vlan_id, 100)
+
+        with self.assertRaises(VSphereHandlerError) as cm:
+            VsphereHost.from_properties({}, appname=self.appname)
+        LOG.debug("VSphereHandlerError raised: {}".format(cm.exception))
+
 
 # =============================================================================
 if __name__ == "__main__":
@@ -100,6 +163,7 @@ if __name__ == "__main__":
 
     suite.addTest(TestVmwareHost("test_import", verbose))
     suite.addTest(TestVmwareHost("test_init_object", verbose))
+    suite.addTest(TestVmwareHost("test_from_properties", verbose))
     # suite.addTest(TestVmwareHost('test_init_from_summary', verbose))
 
     runner = unittest.TextTestRunner(verbosity=verbose)
@@ -0,0 +1,206 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+@summary: Test script (and module) for unit tests on module fb_vmware.compression.
+
+@author: Frank Brehm
+@contact: frank@brehm-online.com
+@copyright: © 2026 Frank Brehm, Berlin
+@license: GPL3
+"""
+
+import gzip
+import logging
+import os
+import sys
+import threading
+import zlib
+from http.client import HTTPConnection
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+try:
+    import unittest2 as unittest
+except ImportError:
+    import unittest
+
+libdir = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "src"))
+sys.path.insert(0, libdir)
+
+from general import FbVMWareTestcase, get_arg_verbose, init_root_logger
+
+LOG = logging.getLogger("test-compression")
+
+BODY = b"".join(
+    b'<obj type="VirtualMachine">vm-%d</obj><val>test-vm-%05d</val>\n' % (i, i)
+    for i in range(5000)
+)
+
+
+# =============================================================================
+class GzipHandler(BaseHTTPRequestHandler):
+    """Answering every POST request with a gzip compressed body, if it is accepted."""
+
+    protocol_version = "HTTP/1.1"
+
+    def do_POST(self):  # noqa: N802
+        """Answer a POST request."""
+        length = int(self.headers.get("Content-Length", 0))
+        self.rfile.read(length)
+        body = BODY
+        self.send_response(200)
+        if "gzip" in self.headers.get("Accept-Encoding", ""):
+            body = gzip.compress(body)
+            self.send_header("Content-Encoding", "gzip")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        """Log nothing."""
+        pass
+
+
+# =============================================================================
+class TestCompression(FbVMWareTestcase):
+    """Testcase for unit tests on inflating compressed SOAP responses."""
+
+    # -------------------------------------------------------------------------
+    def setUp(self):
+        """Execute this on seting up before calling each particular test method."""
+        super(TestCompression, self).setUp()
+        self.server = None
+
+    # -------------------------------------------------------------------------
+    def tearDown(self):
+        """Execute this after calling each particular test method."""
+        if self.server is not None:
+            self.server.shutdown()
+            self.server.server_close()
+        super(TestCompression, self).tearDown()
+
+    # -------------------------------------------------------------------------
+    def start_server(self):
+        """Start a HTTP server on a free port of the localhost and return the port."""
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), GzipHandler)
+        self.server.daemon_threads = True
+        thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        thread.start()
+        return self.server.server_address[1]
+
+    # -------------------------------------------------------------------------
+    def test_import(self):
+        """Test import of fb_vmware.compression."""
+        LOG.info(self.get_method_doc())
+
+        import fb_vmware.compression
+
+        LOG.debug(
+            "Version of fb_vmware.compression: {!r}.".format(fb_vmware.compression.__version__)
+        )
+
+    # -------------------------------------------------------------------------
+    def test_decoder(self):
+        """Test inflating gzip, zlib and raw deflate streams chunk by chunk."""
+        LOG.info(self.get_method_doc())
+
+        from fb_vmware.compression import StreamingDecoder
+
+        raw = zlib.compressobj(wbits=-zlib.MAX_WBITS)
+        raw_deflate = raw.compress(BODY) + raw.flush()
+
+        for (encoding, data) in (
+            ("gzip", gzip.compress(BODY)),
+            ("X-Gzip", gzip.compress(BODY)),
+            ("deflate", zlib.compress(BODY)),
+            ("deflate", raw_deflate),
+            ("deflate", gzip.compress(BODY)),
+        ):
+            decoder = StreamingDecoder(encoding)
+            parts = [decoder.decompress(data[i:i + 1000]) for i in range(0, len(data), 1000)]
+            parts.append(decoder.flush())
+            parts.append(decoder.flush())
+            LOG.debug(
+                "Inflated {i} bytes {e} to {o} bytes.".format(
+                    i=decoder.bytes_in, e=encoding, o=decoder.bytes_out
+                )
+            )
+            self.assertEqual(b"".join(parts), BODY)
+            self.assertEqual(decoder.bytes_in, len(data))
+            self.assertEqual(decoder.bytes_out, len(BODY))
+
+        with self.assertRaises(ValueError):
+            StreamingDecoder("br")
+
+    # -------------------------------------------------------------------------
+    def test_connection(self):
+        """Test reading compressed responses through a decoding connection class."""
+        LOG.info(self.get_method_doc())
+
+        from fb_vmware.compression import decoding_connection_class
+        from fb_vmware.stats import VsphereSoapStats
+
+        port = self.start_server()
+        stats = VsphereSoapStats()
+        scheme = decoding_connection_class(HTTPConnection, stats=stats)
+        self.assertEqual(scheme.__name__, "DecodingHTTPConnection")
+
+        conn = scheme("127.0.0.1", port)
+        for amt in (2048, None, 1):
+            conn.request("POST", "/sdk", b"ping", {"Accept-Encoding": "gzip, deflate"})
+            resp = conn.getresponse()
+            self.assertEqual(resp.content_encoding, "gzip")
+            self.assertEqual(resp.getheader("Content-Encoding"), "identity")
+            if amt is None:
+                data = resp.read()
+            else:
+                parts = []
+                chunk = resp.read(amt)
+                while chunk:
+                    parts.append(chunk)
+                    chunk = resp.read(amt if amt > 1 else 100000)
+                data = b"".join(parts)
+            self.assertEqual(data, BODY)
+
+        # An uncompressed response is passed through
+        conn.request("POST", "/sdk", b"ping", {"Accept-Encoding": "identity"})
+        resp = conn.getresponse()
+        self.assertEqual(resp.content_encoding, "identity")
+        self.assertEqual(resp.read(), BODY)
+        conn.close()
+
+        summary = stats.summary()
+        LOG.debug("Summary: {}".format(summary))
+        self.assertEqual(stats.compressed_responses, 3)
+        self.assertEqual(stats.compressed_bytes_out, 3 * len(BODY))
+        self.assertEqual(stats.compressed_bytes_in, 3 * len(gzip.compress(BODY)))
+        self.assertEqual(stats.bytes_decoded, 4 * len(BODY))
+
+        stats.reset()
+        self.assertEqual(stats.compressed_responses, 0)
+        self.assertEqual(stats.bytes_decoded, 0)
+        self.assertIsNone(stats.compression_ratio)
+
+
+# =============================================================================
+if __name__ == "__main__":
+
+    verbose = get_arg_verbose()
+    if verbose is None:
+        verbose = 0
+    init_root_logger(verbose)
+
+    LOG.info("Starting tests ...")
+
+    suite = unittest.TestSuite()
+
+    suite.addTest(TestCompression("test_import", verbose))
+    suite.addTest(TestCompression("test_decoder", verbose))
+    suite.addTest(TestCompression("test_connection", verbose))
+
+    runner = unittest.TextTestRunner(verbosity=verbose)
+
+    result = runner.run(suite)
+
+# =============================================================================
+
+# vim: tabstop=4 expandtab shiftwidth=4 softtabstop=4
@@ -0,0 +1,353 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+@summary: Test script (and module) for unit tests on module fb_vmware.propset.
+
+@author: Frank Brehm
+@contact: frank@brehm-online.com
+@copyright: © 2026 Frank Brehm, Berlin
+@license: GPL3
+"""
+
+import io
+import logging
+import os
+import pickle
+import sys
+import uuid
+
+try:
+    import unittest2 as unittest
+except ImportError:
+    import unittest
+
+libdir = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "src"))
+sys.path.insert(0, libdir)
+
+from general import FbVMWareTestcase, get_arg_verbose, init_root_logger
+
+import pyVmomi
+from pyVmomi import SoapAdapter, VmomiSupport, vim, vmodl
+
+LOG = logging.getLogger("test-propset")
+
+VIM_VERSION = VmomiSupport.newestVersions.GetName("vim")
+VIM_NS = VmomiSupport.GetWsdlNamespace(VIM_VERSION)
+PC = vmodl.query.PropertyCollector
+
+
+# =============================================================================
+def vm_content(vm_id, name):
+    """Return an ObjectContent object of a VM with some of its properties."""
+    disk = vim.vm.device.VirtualDisk(
+        key=2000,
+        capacityInKB=1024,
+        capacityInBytes=1024 * 1024,
+        controllerKey=1000,
+        unitNumber=0,
+        backing=vim.vm.device.VirtualDisk.FlatVer2BackingInfo(
+            fileName="[ds1] {n}/{n}.vmdk".format(n=name),
+            diskMode="persistent",
+            thinProvisioned=True,
+        ),
+        deviceInfo=vim.Description(label="Hard disk 1", summary="1 MB"),
+    )
+    nic = vim.vm.device.VirtualVmxnet3(
+        key=4000,
+        macAddress="00:50:56:01:02:03",
+        addressType="assigned",
+        backing=vim.vm.device.VirtualEthernetCard.NetworkBackingInfo(deviceName="VM Network"),
+        deviceInfo=vim.Description(label="Network adapter 1", summary="VM Network"),
+        connectable=vim.vm.device.VirtualDevice.ConnectInfo(
+            connected=True, startConnected=True, allowGuestControl=True, status="ok"
+        ),
+    )
+    summary = vim.vm.Summary.ConfigSummary(
+        name=name,
+        template=False,
+        vmPathName="[ds1] {n}/{n}.vmx".format(n=name),
+        memorySizeMB=2048,
+        numCpu=2,
+        numEthernetCards=1,
+        numVirtualDisks=1,
+        uuid=str(uuid.uuid5(uuid.NAMESPACE_URL, vm_id)),
+        guestFullName="Debian GNU/Linux 12 (64-bit)",
+    )
+    return PC.ObjectContent(
+        obj=vim.VirtualMachine(vm_id),
+        propSet=[
+            vmodl.DynamicProperty(name="name", val=name),
+            vmodl.DynamicProperty(name="parent", val=vim.Folder("group-v3")),
+            vmodl.DynamicProperty(name="summary.config", val=summary),
+            vmodl.DynamicProperty(name="runtime.powerState", val="poweredOn"),
+            vmodl.DynamicProperty(
+                name="config.hardware.device",
+                val=vim.vm.device.VirtualDevice.Array([disk, nic]),
+            ),
+        ],
+    )
+
+
+# -----------------------------------------------------------------------------
+def serialize_response(result, wsdl_name="RetrievePropertiesEx"):
+    """Return the SOAP response of the given RetrieveResult object as bytes."""
+    ns_map = SoapAdapter.SOAP_NSMAP.copy()
+    ns_map[VIM_NS] = ""
+    parts = [
+        SoapAdapter.XML_HEADER,
+        "\n",
+        SoapAdapter.SOAP_ENVELOPE_START,
+        SoapAdapter.SOAP_BODY_START,
+        '<{m}Response xmlns="{ns}">'.format(m=wsdl_name, ns=VIM_NS),
+    ]
+    if result is not None:
+        info = VmomiSupport.Object(
+            name="returnval", type=PC.RetrieveResult, version=VIM_VERSION, flags=0
+        )
+        parts.append(SoapAdapter.Serialize(result, info, VIM_VERSION, ns_map).decode("utf-8"))
+    parts += [
+        "</{m}Response>".format(m=wsdl_name),
+        SoapAdapter.SOAP_BODY_END,
+        SoapAdapter.SOAP_ENVELOPE_END,
+    ]
+    return "".join(parts).encode("utf-8")
+
+
+# =============================================================================
+class TestPropertySets(FbVMWareTestcase):
+    """Testcase for unit tests on the fast parser of property sets."""
+
+    # -------------------------------------------------------------------------
+    def test_import(self):
+        """Test import of fb_vmware.propset."""
+        LOG.info(self.get_method_doc())
+
+        import fb_vmware.propset
+        from fb_vmware import DataRecord  # noqa: F401
+        from fb_vmware import MoRef  # noqa: F401
+        from fb_vmware import PropertySetParser  # noqa: F401
+
+        LOG.debug("Version of fb_vmware.propset: {!r}.".format(fb_vmware.propset.__version__))
+
+    # -------------------------------------------------------------------------
+    def test_parser(self):
+        """Test parsing a RetrievePropertiesEx() response against the result of pyVmomi."""
+        LOG.info(self.get_method_doc())
+
+        from fb_vmware.errors import VSpherePropertySetError
+        from fb_vmware.propset import MoRef
+        from fb_vmware.propset import PropertySetParser
+        from fb_vmware.propset import parse_property_sets
+        from fb_vmware.propset import property_set_from_content
+
+        contents = [vm_content("vm-{}".format(i), "test-vm-{:02d}".format(i)) for i in range(20)]
+        body = serialize_response(PC.RetrieveResult(objects=contents, token="tok-1"))
+
+        expected = [property_set_from_content(content) for content in contents]
+        got = []
+        result = parse_property_sets(
+            io.BytesIO(body), lambda moref, props: got.append((moref, props)), chunk_size=100
+        )
+        self.assertEqual(result.token, "tok-1")
+        self.assertEqual(len(got), 20)
+        self.assertEqual(got, expected)
+
+        (moref, props) = got[3]
+        LOG.debug("Property set of {}: {!r}".format(moref, props))
+        self.assertEqual(moref, MoRef("VirtualMachine", "vm-3"))
+        self.assertEqual(str(moref), "VirtualMachine:vm-3")
+        self.assertEqual(props["parent"], MoRef("Folder", "group-v3"))
+        self.assertEqual(props["summary.config"].memorySizeMB, 2048)
+        self.assertIs(props["summary.config"].template, False)
+        (disk, nic) = props["config.hardware.device"]
+        self.assertEqual(disk.vmodl_type, "VirtualDisk")
+        self.assertEqual(disk.backing.fileName, "[ds1] test-vm-03/test-vm-03.vmdk")
+        self.assertEqual(nic.vmodl_type, "VirtualVmxnet3")
+
+        # The last page has no token
+        got = []
+        result = parse_property_sets(
+            io.BytesIO(serialize_response(PC.RetrieveResult(objects=contents[:1]))),
+            lambda moref, props: got.append(moref),
+        )
+        self.assertIsNone(result.token)
+        self.assertEqual(len(got), 1)
+
+        # An empty result
+        result = parse_property_sets(io.BytesIO(serialize_response(None)), got.append)
+        self.assertIsNone(result)
+
+        parser = PropertySetParser(got.append)
+        with self.assertRaises(VSpherePropertySetError) as cm:
+            parser.feed(body[:500] + b"</wrong>")
+        LOG.debug("{c} raised: {e}".format(c=cm.exception.__class__.__name__, e=cm.exception))
+
+    # -------------------------------------------------------------------------
+    def test_record(self):
+        """Test the attributes and pickling of DataRecord objects."""
+        LOG.info(self.get_method_doc())
+
+        from fb_vmware.propset import DataRecord
+        from fb_vmware.propset import MoRef
+        from fb_vmware.propset import to_record
+        from fb_vmware.propset import vmodl_isinstance
+        from fb_vmware.propset import vmodl_type_of
+
+        record = to_record(vim.vm.Summary.ConfigSummary(name="test-vm", numCpu=2))
+        LOG.debug("Record: {!r}".format(record))
+        self.assertIsInstance(record, DataRecord)
+        self.assertEqual(record["numCpu"], 2)
+        self.assertNotIn("memorySizeMB", record)
+        self.assertEqual(record.name, "test-vm")
+        self.assertIsNone(record.memorySizeMB)
+        with self.assertRaises(AttributeError):
+            record.no_such_property
+
+        device = to_record(vim.vm.device.VirtualVmxnet3(key=4000))
+        self.assertEqual(device.deviceGroupInfo, None)
+        self.assertIs(vmodl_type_of(device), vim.vm.device.VirtualVmxnet3)
+        self.assertTrue(vmodl_isinstance(device, vim.vm.device.VirtualEthernetCard))
+        self.assertFalse(vmodl_isinstance(device, vim.vm.device.VirtualDisk))
+        self.assertTrue(vmodl_isinstance(MoRef("HostSystem", "host-1"), vim.ManagedEntity))
+        self.assertTrue(vmodl_isinstance(vim.HostSystem("host-1"), vim.HostSystem))
+
+        copy = pickle.loads(pickle.dumps(device))
+        self.assertEqual(copy, device)
+        self.assertEqual(copy.vmodl_type, "VirtualVmxnet3")
+        moref = pickle.loads(pickle.dumps(MoRef("HostSystem", "host-1")))
+        self.assertEqual(moref.value, "host-1")
+
+    # -------------------------------------------------------------------------
+    def test_enable_streaming(self):
+        """Test enabling the streaming on supported and unsupported SOAP stubs."""
+        LOG.info(self.get_method_doc())
+
+        from fb_vmware.propset import STREAMING_PYVMOMI_VERSIONS
+        from fb_vmware.propset import enable_streaming
+        from fb_vmware.propset import streaming_property_sets
+        from fb_vmware.propset import streaming_supported
+
+        class FakeStub(object):
+
+            cookie = None
+            versionId = '"urn:vim25/8.0.3.0"'  # noqa: N815
+            path = "/sdk"
+            requestModifierList = []  # noqa: N815
+            _customHeaders = None
+            _acceptCompressedResponses = False
+
+            def __init__(self):
+                self.calls = []
+
+            def InvokeMethod(self, mo, info, args, outerStub=None):  # noqa: N802
+                self.calls.append(info.wsdlName)
+                return "stock"
+
+            def SerializeRequest(self, mo, info, args):  # noqa: N802
+                return b""
+
+            def GetConnection(self):  # noqa: N802
+                return None
+
+            def ReturnConnection(self, conn):  # noqa: N802
+                pass
+
+            def DropConnections(self):  # noqa: N802
+                pass
+
+        # The stub of the installed pyVmomi must have all internals of a supported release
+        if tuple(pyVmomi.version_info[:2]) in STREAMING_PYVMOMI_VERSIONS:
+            self.assertIsNone(streaming_supported(SoapAdapter.SoapStubAdapter("localhost", 443)))
+
+        supported = STREAMING_PYVMOMI_VERSIONS[0] + (0, 0)
+        info = VmomiSupport.Object(wsdlName="RetrievePropertiesEx")
+
+        # An unsupported release of pyVmomi
+        stub = FakeStub()
+        invoke_method = stub.InvokeMethod
+        reason = streaming_supported(stub, version=(6, 7, 3))
+        LOG.debug("Not supported: {}".format(reason))
+        self.assertIsNotNone(reason)
+        self.assertFalse(enable_streaming(stub, version=(6, 7, 3)))
+        self.assertEqual(stub.InvokeMethod, invoke_method)
+
+        # A stub without the expected internals
+        del FakeStub._customHeaders
+        stub = FakeStub()
+        reason = streaming_supported(stub, version=supported)
+        LOG.debug("Not supported: {}".format(reason))
+        self.assertIn("_customHeaders", reason)
+        self.assertFalse(enable_streaming(stub, version=supported))
+        with streaming_property_sets(lambda moref, props: None):
+            self.assertEqual(stub.InvokeMethod(None, info, ()), "stock")
+        self.assertEqual(stub.calls, ["RetrievePropertiesEx"])
+
+        # A supported stub, calls outside of the streaming context are unchanged
+        FakeStub._customHeaders = None
+        stub = FakeStub()
+        invoke_method = stub.InvokeMethod
+        self.assertIsNone(streaming_supported(stub, version=supported))
+        self.assertTrue(enable_streaming(stub, version=supported))
+        self.assertNotEqual(stub.InvokeMethod, invoke_method)
+        self.assertEqual(stub.InvokeMethod(None, info, ()), "stock")
+        self.assertEqual(stub.calls, ["RetrievePropertiesEx"])
+
+    # -------------------------------------------------------------------------
+    def test_vm_from_properties(self):
+        """Test creating a VsphereVm object from a parsed property set."""
+        LOG.info(self.get_method_doc())
+
+        from fb_vmware import VsphereVm
+        from fb_vmware.errors import VSphereHandlerError
+        from fb_vmware.propset import property_set_from_content
+
+        (moref, props) = property_set_from_content(vm_content("vm-1", "test-vm-01"))
+        vm = VsphereVm.from_properties(
+            props,
+            "/app/test",
+            dc_name="dc1",
+            cluster_name="cluster1",
+            host="esx01.example.com",
+            appname=self.appname,
+        )
+        LOG.debug("VsphereVm %s:\n{}".format(vm))
+        self.assertEqual(vm.name, "test-vm-01")
+        self.assertEqual(vm.path, "/app/test")
+        self.assertEqual(vm.cluster_name, "cluster1")
+        self.assertEqual(vm.host, "esx01.example.com")
+        self.assertEqual(vm.power_state, "poweredOn")
+        self.assertEqual(vm.num_cpu, 2)
+        self.assertEqual(len(vm.disks), 1)
+        self.assertEqual(len(vm.interfaces), 1)
+        self.assertEqual(vm.interfaces[0].mac_address, "00:50:56:01:02:03")
+
+        del props["summary.config"]
+        with self.assertRaises(VSphereHandlerError):
+            VsphereVm.from_properties(props, "/", appname=self.appname)
+
+
+# =============================================================================
+if __name__ == "__main__":
+
+    verbose = get_arg_verbose()
+    if verbose is None:
+        verbose = 0
+    init_root_logger(verbose)
+
+    LOG.info("Starting tests ...")
+
+    suite = unittest.TestSuite()
+
+    suite.addTest(TestPropertySets("test_import", verbose))
+    suite.addTest(TestPropertySets("test_parser", verbose))
+    suite.addTest(TestPropertySets("test_record", verbose))
+    suite.addTest(TestPropertySets("test_enable_streaming", verbose))
+    suite.addTest(TestPropertySets("test_vm_from_properties", verbose))
+
+    runner = unittest.TextTestRunner(verbosity=verbose)
+
+    result = runner.run(suite)
+
+# =============================================================================
+
+# vim: tabstop=4 expandtab shiftwidth=4 softtabstop=4
@@ -0,0 +1,139 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+@summary: Test script (and module) for unit tests on module fb_vmware.convert.
+
+@author: Frank Brehm
+@contact: frank@brehm-online.com
+@copyright: © 2026 Frank Brehm, Berlin
+@license: GPL3
+"""
+
+import logging
+import os
+import sys
+
+try:
+    import unittest2 as unittest
+except ImportError:
+    import unittest
+
+libdir = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "src"))
+sys.path.insert(0, libdir)
+
+from general import FbVMWareTestcase, get_arg_verbose, init_root_logger
+
+from test_52_propset import vm_content
+
+LOG = logging.getLogger("test-convert")
+
+
+# =============================================================================
+class TestVmConverter(FbVMWareTestcase):
+    """Testcase for unit tests on converting property sets into VsphereVm objects."""
+
+    # -------------------------------------------------------------------------
+    def property_sets(self, count):
+        """Return the given number of VmPropertySet tuples."""
+        from fb_vmware.convert import VmPropertySet
+        from fb_vmware.propset import property_set_from_content
+
+        items = []
+        for i in range(count):
+            (moref, props) = property_set_from_content(
+                vm_content("vm-{}".format(i), "test-vm-{:03d}".format(i))
+            )
+            items.append(
+                VmPropertySet(
+                    props=props,
+                    path="/test",
+                    vsphere="test",
+                    dc_name="dc1",
+                    cluster_name="cluster{}".format(i % 2),
+                    host="esx{:02d}.example.com".format(i % 3),
+                )
+            )
+        return items
+
+    # -------------------------------------------------------------------------
+    def test_import(self):
+        """Test import of fb_vmware.convert."""
+        LOG.info(self.get_method_doc())
+
+        import fb_vmware.convert
+        from fb_vmware import VsphereVmConverter  # noqa: F401
+
+        LOG.debug("Version of fb_vmware.convert: {!r}.".format(fb_vmware.convert.__version__))
+
+    # -------------------------------------------------------------------------
+    def test_convert(self):
+        """Test converting property sets in the current process."""
+        LOG.info(self.get_method_doc())
+
+        from fb_vmware import VsphereVmList
+        from fb_vmware.convert import VsphereVmConverter
+
+        items = self.property_sets(5)
+        converter = VsphereVmConverter(appname=self.appname)
+        LOG.debug("Converter: {!r}".format(converter))
+        vm_list = converter.convert(items)
+        self.assertIsInstance(vm_list, VsphereVmList)
+        names = ["test-vm-{:03d}".format(i) for i in range(5)]
+        self.assertEqual([vm.name for vm in vm_list], names)
+        self.assertEqual(vm_list[4].cluster_name, "cluster0")
+        self.assertEqual(vm_list[4].host, "esx01.example.com")
+
+        converter.convert(items[:2], vm_list)
+        self.assertEqual(len(vm_list), 7)
+
+        for (key, value) in (("workers", -1), ("chunk_size", 0)):
+            with self.assertRaises(ValueError) as cm:
+                VsphereVmConverter(**{key: value})
+            LOG.debug("ValueError raised: {}".format(cm.exception))
+
+    # -------------------------------------------------------------------------
+    def test_workers(self):
+        """Test converting property sets in chunks by worker processes."""
+        LOG.info(self.get_method_doc())
+
+        from fb_vmware.convert import VsphereVmConverter
+
+        items = self.property_sets(23)
+        expected = VsphereVmConverter(appname=self.appname).convert(items)
+
+        with VsphereVmConverter(workers=2, chunk_size=5, appname=self.appname) as converter:
+            vm_list = converter.convert(items)
+            self.assertIsNotNone(converter._executor)
+            # The pool is reused by the next conversion
+            executor = converter._executor
+            converter.convert(items[:6])
+            self.assertIs(converter._executor, executor)
+        self.assertIsNone(converter._executor)
+
+        self.assertEqual(vm_list.as_dict(bare=True), expected.as_dict(bare=True))
+        self.assertEqual(len(vm_list[7].disks), 1)
+
+
+# =============================================================================
+if __name__ == "__main__":
+
+    verbose = get_arg_verbose()
+    if verbose is None:
+        verbose = 0
+    init_root_logger(verbose)
+
+    LOG.info("Starting tests ...")
+
+    suite = unittest.TestSuite()
+
+    suite.addTest(TestVmConverter("test_import", verbose))
+    suite.addTest(TestVmConverter("test_convert", verbose))
+    suite.addTest(TestVmConverter("test_workers", verbose))
+
+    runner = unittest.TextTestRunner(verbosity=verbose)
+
+    result = runner.run(suite)
+
+# =============================================================================
+
+# vim: tabstop=4 expandtab shiftwidth=4 softtabstop=4
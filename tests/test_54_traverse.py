@@ -0,0 +1,211 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+@summary: Test script (and module) for unit tests on module fb_vmware.traverse.
+
+@author: Frank Brehm
+@contact: frank@brehm-online.com
+@copyright: © 2026 Frank Brehm, Berlin
+@license: GPL3
+"""
+
+import logging
+import os
+import sys
+
+try:
+    import unittest2 as unittest
+except ImportError:
+    import unittest
+
+libdir = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "src"))
+sys.path.insert(0, libdir)
+
+from general import FbVMWareTestcase, get_arg_verbose, init_root_logger
+
+LOG = logging.getLogger("test-traverse")
+
+
+# =============================================================================
+class FakeEntity(object):
+    """A simple stand-in for a managed entity."""
+
+    def __init__(self, name):
+        """Initialize a FakeEntity object."""
+        self.name = name
+
+    def __repr__(self):
+        """Typecasting into a string for reproduction."""
+        return "<{c}({n!r})>".format(c=self.__class__.__name__, n=self.name)
+
+
+# =============================================================================
+class FakeFolder(FakeEntity):
+    """A simple stand-in for a vim.Folder."""
+
+    def __init__(self, name, *children):
+        """Initialize a FakeFolder object."""
+        super(FakeFolder, self).__init__(name)
+        self.childEntity = list(children)
+
+
+# =============================================================================
+class FakeVm(FakeEntity):
+    """A simple stand-in for a vim.VirtualMachine."""
+
+    pass
+
+
+# =============================================================================
+class FakeNetwork(FakeEntity):
+    """A simple stand-in for a vim.Network."""
+
+    pass
+
+
+# =============================================================================
+class TestInventoryWalker(FbVMWareTestcase):
+    """Testcase for unit tests on the iterative inventory traversal."""
+
+    # -------------------------------------------------------------------------
+    def roots(self):
+        """Return a small inventory of two datacenters."""
+        vm_folder = FakeFolder(
+            "vm",
+            FakeVm("vm01"),
+            FakeFolder(
+                "app",
+                FakeVm("vm02"),
+                FakeFolder("db", FakeVm("vm03"), FakeNetwork("net02")),
+            ),
+            FakeNetwork("net01"),
+        )
+        other_folder = FakeFolder("vm", FakeFolder("empty"), FakeVm("vm04"))
+        return [(vm_folder, "dc1"), (other_folder, "dc2")]
+
+    # -------------------------------------------------------------------------
+    def get_walker(self, **kwargs):
+        """Return an InventoryWalker for the fake inventory."""
+        from fb_vmware.traverse import InventoryWalker
+
+        return InventoryWalker(container_types=(FakeFolder,), **kwargs)
+
+    # -------------------------------------------------------------------------
+    def test_import(self):
+        """Test import of fb_vmware.traverse."""
+        LOG.info(self.get_method_doc())
+
+        import fb_vmware.traverse
+        from fb_vmware import InventoryWalker  # noqa: F401
+        from fb_vmware import WalkItem  # noqa: F401
+
+        LOG.debug("Version of fb_vmware.traverse: {!r}.".format(fb_vmware.traverse.__version__))
+
+    # -------------------------------------------------------------------------
+    def test_walk(self):
+        """Test walking depth first through the inventory."""
+        LOG.info(self.get_method_doc())
+
+        walker = self.get_walker(with_paths=True)
+        LOG.debug("Walker: {!r}".format(walker))
+        items = list(walker.walk(self.roots()))
+        names = [item.obj.name for item in items]
+        self.assertEqual(
+            names, ["vm01", "app", "vm02", "db", "vm03", "net02", "net01", "empty", "vm04"]
+        )
+        self.assertEqual(walker.visited, 9)
+
+        by_name = {item.obj.name: item for item in items}
+        self.assertEqual(by_name["vm01"].path, "/")
+        self.assertEqual(by_name["vm01"].depth, 1)
+        self.assertEqual(by_name["vm03"].path, "/app/db")
+        self.assertEqual(by_name["vm03"].depth, 3)
+        self.assertIs(by_name["vm03"].parent, by_name["db"].obj)
+        self.assertEqual(by_name["vm03"].dc_name, "dc1")
+        self.assertEqual(by_name["vm04"].dc_name, "dc2")
+
+        items = list(self.get_walker().walk(self.roots()))
+        self.assertEqual([item.path for item in items], [None] * 9)
+
+        # Folders deeper than max_depth are neither returned nor entered
+        walker = self.get_walker(max_depth=1)
+        names = [item.obj.name for item in walker.walk(self.roots())]
+        self.assertEqual(names, ["vm01", "app", "vm02", "net01", "empty", "vm04"])
+
+        # Pruning the last returned folder
+        walker = self.get_walker()
+        names = []
+        for item in walker.walk(self.roots()):
+            names.append(item.obj.name)
+            if item.obj.name == "app":
+                walker.prune()
+        self.assertEqual(names, ["vm01", "app", "net01", "empty", "vm04"])
+
+    # -------------------------------------------------------------------------
+    def test_run(self):
+        """Test calling several visitors in one walk."""
+        LOG.info(self.get_method_doc())
+
+        from fb_vmware.traverse import WALK_PRUNE, WALK_STOP
+
+        vms = []
+        networks = []
+        walker = self.get_walker()
+        walker.add_visitor(FakeVm, lambda item: vms.append(item.obj.name))
+        walker.add_visitor([FakeNetwork], lambda item: networks.append(item.obj.name))
+        self.assertFalse(walker.run(self.roots()))
+        self.assertEqual(vms, ["vm01", "vm02", "vm03", "vm04"])
+        self.assertEqual(networks, ["net02", "net01"])
+
+        def prune_db(item):
+            if item.obj.name == "db":
+                return WALK_PRUNE
+
+        vms = []
+        walker = self.get_walker()
+        walker.add_visitor(FakeFolder, prune_db).add_visitor(
+            FakeVm, lambda item: vms.append(item.obj.name)
+        )
+        self.assertFalse(walker.run(self.roots()))
+        self.assertEqual(vms, ["vm01", "vm02", "vm04"])
+
+        def stop_at_vm02(item):
+            vms.append(item.obj.name)
+            if item.obj.name == "vm02":
+                return WALK_STOP
+
+        vms = []
+        walker = self.get_walker().add_visitor(FakeVm, stop_at_vm02)
+        self.assertTrue(walker.run(self.roots()))
+        self.assertEqual(vms, ["vm01", "vm02"])
+        self.assertEqual(walker.visited, 3)
+
+        # Without visitors there is nothing to walk
+        walker = self.get_walker()
+        self.assertFalse(walker.run(self.roots()))
+        self.assertEqual(walker.visited, 0)
+
+
+# =============================================================================
+if __name__ == "__main__":
+
+    verbose = get_arg_verbose()
+    if verbose is None:
+        verbose = 0
+    init_root_logger(verbose)
+
+    LOG.info("Starting tests ...")
+
+    suite = unittest.TestSuite()
+
+    suite.addTest(TestInventoryWalker("test_import", verbose))
+    suite.addTest(TestInventoryWalker("test_walk", verbose))
+    suite.addTest(TestInventoryWalker("test_run", verbose))
+
+    runner = unittest.TextTestRunner(verbosity=verbose)
+
+    result = runner.run(suite)
+
+# =============================================================================
+
+# vim: tabstop=4 expandtab shiftwidth=4 softtabstop=4
@@ -0,0 +1,161 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+@summary: Test script (and module) for unit tests on module fb_vmware.snapshot.
+
+@author: Frank Brehm
+@contact: frank@brehm-online.com
+@copyright: © 2026 Frank Brehm, Berlin
+@license: GPL3
+"""
+
+import logging
+import os
+import sys
+
+try:
+    import unittest2 as unittest
+except ImportError:
+    import unittest
+
+libdir = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "src"))
+sys.path.insert(0, libdir)
+
+from general import FbVMWareTestcase, get_arg_verbose, init_root_logger
+
+LOG = logging.getLogger("test-snapshot")
+
+
+# =============================================================================
+class TestInventorySnapshot(FbVMWareTestcase):
+    """Testcase for unit tests on a VsphereInventorySnapshot object."""
+
+    # -------------------------------------------------------------------------
+    def test_import(self):
+        """Test import of fb_vmware.snapshot."""
+        LOG.info(self.get_method_doc())
+
+        import fb_vmware.snapshot
+        from fb_vmware import SNAPSHOT_KINDS  # noqa: F401
+        from fb_vmware import VsphereInventorySnapshot  # noqa: F401
+
+        LOG.debug("Version of fb_vmware.snapshot: {!r}.".format(fb_vmware.snapshot.__version__))
+
+    # -------------------------------------------------------------------------
+    def test_references(self):
+        """Test resolving the cross references of a snapshot."""
+        LOG.info(self.get_method_doc())
+
+        from fb_vmware import VsphereCluster
+        from fb_vmware import VsphereDVS
+        from fb_vmware import VsphereDatastore
+        from fb_vmware import VsphereDatastoreDict
+        from fb_vmware import VsphereDvPortGroup
+        from fb_vmware import VsphereHost
+        from fb_vmware import VsphereNetworkDict
+        from fb_vmware import VsphereVm
+        from fb_vmware.snapshot import VsphereInventorySnapshot
+
+        params = {"appname": self.appname}
+        clusters = [
+            VsphereCluster(name="Cluster01", dc_name="dc1", **params),
+            VsphereCluster(name="Cluster01", dc_name="dc2", **params),
+        ]
+        hosts = {}
+        for (name, dc_name) in (("esx01", "dc1"), ("esx02", "dc1"), ("esx03", "dc2")):
+            hosts[name] = VsphereHost(
+                name=name, dc_name=dc_name, cluster_name="Cluster01", **params
+            )
+        ds = VsphereDatastore(
+            name="ds01", capacity=(100 * 1024 * 1024 * 1024), free_space=0, **params
+        )
+        ds.hosts = {"esx02", "esx01", "esx99"}
+        vms = []
+        for (name, host) in (("vm01", "esx01"), ("vm02", "esx02"), ("vm03", "esx01")):
+            vm = VsphereVm(name=name, dc_name="dc1", **params)
+            vm.host = host
+            vm.cluster_name = "Cluster01"
+            vms.append(vm)
+        dvs = VsphereDVS(name="dvs01", uuid="50 12 34", **params)
+        portgroup = VsphereDvPortGroup(name="pg01", dvs_uuid="50 12 34", **params)
+
+        snapshot = VsphereInventorySnapshot(
+            vsphere="test",
+            clusters=clusters,
+            hosts=hosts,
+            datastores=VsphereDatastoreDict(ds).freeze(),
+            dv_portgroups=VsphereNetworkDict(portgroup).freeze(),
+            dvs={dvs.uuid: dvs},
+            vms=vms,
+        )
+        LOG.debug("Snapshot: {!r}".format(snapshot))
+
+        self.assertIs(snapshot.host_of_vm(vms[1]), hosts["esx02"])
+        self.assertIs(snapshot.cluster_of_vm(vms[1]), clusters[0])
+        self.assertIs(snapshot.cluster_of_host(hosts["esx03"]), clusters[1])
+        self.assertIs(snapshot.get_cluster("cluster01"), clusters[0])
+        self.assertIsNone(snapshot.get_cluster("cluster02"))
+        self.assertEqual(
+            [host.name for host in snapshot.hosts_of_datastore(ds)], ["esx01", "esx02"]
+        )
+        vm_names = [vm.name for vm in snapshot.vms_of_host(hosts["esx01"])]
+        self.assertEqual(vm_names, ["vm01", "vm03"])
+        self.assertIs(snapshot.dvs_of_portgroup(portgroup), dvs)
+
+        vm = VsphereVm(name="vm04", **params)
+        self.assertIsNone(snapshot.host_of_vm(vm))
+        self.assertIsNone(snapshot.cluster_of_vm(vm))
+
+        # The collections are read-only, not requested ones are empty
+        with self.assertRaises(TypeError):
+            snapshot.hosts["esx04"] = None
+        self.assertTrue(snapshot.networks.frozen)
+        self.assertEqual(len(snapshot.ds_clusters), 0)
+
+        counts = snapshot.as_dict()["counts"]
+        LOG.debug("Counts: {!r}".format(counts))
+        self.assertEqual(counts["hosts"], 3)
+        self.assertEqual(counts["vms"], 3)
+        self.assertEqual(counts["networks"], 0)
+
+    # -------------------------------------------------------------------------
+    def test_invalid_kinds(self):
+        """Test calling get_inventory() with invalid kinds."""
+        LOG.info(self.get_method_doc())
+
+        from fb_vmware import VsphereConnection
+        from fb_vmware.config import VSPhereConfigInfo
+
+        connect_info = VSPhereConfigInfo(
+            host="test-vsphere", appname=self.appname, initialized=True
+        )
+        connect = VsphereConnection(connect_info=connect_info, appname=self.appname)
+
+        with self.assertRaises(ValueError) as cm:
+            connect.get_inventory(kinds=["hosts", "switches"])
+        LOG.debug("ValueError raised: {}".format(cm.exception))
+
+
+# =============================================================================
+if __name__ == "__main__":
+
+    verbose = get_arg_verbose()
+    if verbose is None:
+        verbose = 0
+    init_root_logger(verbose)
+
+    LOG.info("Starting tests ...")
+
+    suite = unittest.TestSuite()
+
+    suite.addTest(TestInventorySnapshot("test_import", verbose))
+    suite.addTest(TestInventorySnapshot("test_references", verbose))
+    suite.addTest(TestInventorySnapshot("test_invalid_kinds", verbose))
+
+    runner = unittest.TextTestRunner(verbosity=verbose)
+
+    result = runner.run(suite)
+
+# =============================================================================
+
+# vim: tabstop=4 expandtab shiftwidth=4 softtabstop=4
@@ -0,0 +1,193 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+@summary: Test script (and module) for unit tests on module fb_vmware.name_table.
+
+@author: Frank Brehm
+@contact: frank@brehm-online.com
+@copyright: © 2026 Frank Brehm, Berlin
+@license: GPL3
+"""
+
+import logging
+import os
+import sys
+
+try:
+    import unittest2 as unittest
+except ImportError:
+    import unittest
+
+libdir = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "src"))
+sys.path.insert(0, libdir)
+
+from general import FbVMWareTestcase, get_arg_verbose, init_root_logger
+
+LOG = logging.getLogger("test-name-table")
+
+
+# =============================================================================
+class TestNameTable(FbVMWareTestcase):
+    """Testcase for unit tests on a VsphereNameTable object."""
+
+    # -------------------------------------------------------------------------
+    def property_sets(self):
+        """Return the property sets of a small inventory."""
+        from fb_vmware.propset import MoRef
+
+        dc = MoRef("Datacenter", "datacenter-1")
+        vm_folder = MoRef("Folder", "group-v1")
+        app_folder = MoRef("Folder", "group-v2")
+        db_folder = MoRef("Folder", "group-v3")
+        cluster = MoRef("ClusterComputeResource", "domain-c1")
+        pool = MoRef("ResourcePool", "resgroup-1")
+        host = MoRef("HostSystem", "host-1")
+
+        return [
+            (dc, {"name": "dc1"}),
+            (vm_folder, {"name": "vm", "parent": dc}),
+            (app_folder, {"name": "app", "parent": vm_folder}),
+            (db_folder, {"name": "db", "parent": app_folder}),
+            (cluster, {"name": "cluster01"}),
+            (pool, {"name": "Resources", "owner": cluster}),
+            (host, {"name": "esx01.example.com", "parent": cluster}),
+            (MoRef("VirtualMachine", "vm-1"), {"name": "vm01"}),
+        ]
+
+    # -------------------------------------------------------------------------
+    def test_import(self):
+        """Test import of fb_vmware.name_table."""
+        LOG.info(self.get_method_doc())
+
+        import fb_vmware.name_table
+        from fb_vmware import NAME_TABLE_PROPERTIES  # noqa: F401
+        from fb_vmware import VsphereNameTable  # noqa: F401
+
+        LOG.debug(
+            "Version of fb_vmware.name_table: {!r}.".format(fb_vmware.name_table.__version__)
+        )
+
+    # -------------------------------------------------------------------------
+    def test_lookup(self):
+        """Test resolving references by a VsphereNameTable."""
+        LOG.info(self.get_method_doc())
+
+        from pyVmomi import vim
+
+        from fb_vmware.name_table import VsphereNameTable
+        from fb_vmware.propset import MoRef
+
+        table = VsphereNameTable(self.property_sets())
+        LOG.debug("Name table: {!r}".format(table))
+
+        # The VM is not of a type of the table
+        self.assertEqual(len(table), 7)
+        self.assertNotIn(MoRef("VirtualMachine", "vm-1"), table)
+
+        # Managed objects are taken without a round trip
+        self.assertEqual(table.name_of(vim.HostSystem("host-1")), "esx01.example.com")
+        self.assertIn(vim.Datacenter("datacenter-1"), table)
+        self.assertIsNone(table.name_of(None))
+        self.assertIsNone(table.name_of(MoRef("HostSystem", "host-2")))
+
+        self.assertEqual(table.cluster_name_of(MoRef("ResourcePool", "resgroup-1")), "cluster01")
+        self.assertEqual(table.cluster_name_of(MoRef("HostSystem", "host-1")), "cluster01")
+        self.assertIsNone(table.cluster_name_of(MoRef("Folder", "group-v2")))
+        self.assertIsNone(table.cluster_name_of(None))
+
+        self.assertEqual(table.folder_location(MoRef("Folder", "group-v1")), ("dc1", "/"))
+        db_folder = MoRef("Folder", "group-v3")
+        self.assertEqual(table.folder_location(db_folder), ("dc1", "/app/db"))
+        self.assertIsNone(table.folder_location(MoRef("Folder", "group-v9")))
+
+        # Folders deeper than max_depth have no location
+        table = VsphereNameTable(self.property_sets())
+        self.assertIsNone(table.folder_location(db_folder, max_depth=1))
+        self.assertEqual(
+            table.folder_location(MoRef("Folder", "group-v2"), max_depth=1), ("dc1", "/app")
+        )
+
+    # -------------------------------------------------------------------------
+    def test_datacenter_of(self):
+        """Test finding the datacenter of objects by their parents."""
+        LOG.info(self.get_method_doc())
+
+        from fb_vmware.name_table import VsphereNameTable
+        from fb_vmware.propset import MoRef
+
+        dc = MoRef("Datacenter", "datacenter-1")
+        host_folder = MoRef("Folder", "group-h1")
+        ds_folder = MoRef("Folder", "group-s1")
+        pod = MoRef("StoragePod", "group-p1")
+        cluster = MoRef("ClusterComputeResource", "domain-c1")
+        host = MoRef("HostSystem", "host-1")
+
+        table = VsphereNameTable(
+            [
+                (dc, {"name": "dc1"}),
+                (host_folder, {"name": "host", "parent": dc}),
+                (ds_folder, {"name": "datastore", "parent": dc}),
+                (pod, {"name": "pod01", "parent": ds_folder}),
+                (cluster, {"name": "cluster01", "parent": host_folder}),
+                (host, {"name": "esx01.example.com", "parent": cluster}),
+            ]
+        )
+
+        # Storage pods are folders, compute resources have parents
+        self.assertEqual(table.name_of(pod), "pod01")
+        self.assertEqual(table.datacenter_of(pod), "dc1")
+        self.assertEqual(table.datacenter_of(cluster), "dc1")
+        self.assertEqual(table.datacenter_of(host), "dc1")
+        self.assertEqual(table.datacenter_of(dc), "dc1")
+        self.assertEqual(table.cluster_name_of(host), "cluster01")
+        self.assertIsNone(table.datacenter_of(MoRef("Folder", "group-v9")))
+        self.assertIsNone(table.datacenter_of(None))
+
+    # -------------------------------------------------------------------------
+    def test_loader(self):
+        """Test retrieving the property sets on the first lookup."""
+        LOG.info(self.get_method_doc())
+
+        from fb_vmware.name_table import VsphereNameTable
+        from fb_vmware.propset import MoRef
+
+        calls = []
+
+        def loader():
+            calls.append(True)
+            return self.property_sets()
+
+        table = VsphereNameTable(loader=loader)
+        self.assertFalse(table.loaded)
+        self.assertEqual(calls, [])
+
+        self.assertEqual(table.name_of(MoRef("Datacenter", "datacenter-1")), "dc1")
+        self.assertTrue(table.loaded)
+        self.assertEqual(table.name_of(MoRef("HostSystem", "host-1")), "esx01.example.com")
+        self.assertEqual(len(calls), 1)
+
+
+# =============================================================================
+if __name__ == "__main__":
+
+    verbose = get_arg_verbose()
+    if verbose is None:
+        verbose = 0
+    init_root_logger(verbose)
+
+    LOG.info("Starting tests ...")
+
+    suite = unittest.TestSuite()
+
+    suite.addTest(TestNameTable("test_import", verbose))
+    suite.addTest(TestNameTable("test_lookup", verbose))
+    suite.addTest(TestNameTable("test_datacenter_of", verbose))
+    suite.addTest(TestNameTable("test_loader", verbose))
+
+    runner = unittest.TextTestRunner(verbosity=verbose)
+
+    result = runner.run(suite)
+
+# =============================================================================
+
+# vim: tabstop=4 expandtab shiftwidth=4 softtabstop=4
@@ -9,6 +9,7 @@
 @license: GPL3
 """
 
+import copy
 import logging
 import os
 import sys
@@ -101,6 +102,85 @@ class TestVsphereConfig(FbVMWareTestcase):
         cfg.eval()
         LOG.debug("VmwareConfiguration %%s: %s", str(cfg))
 
+    # -------------------------------------------------------------------------
+    def test_pool_options(self):
+        """Test the connection pool options of a vSphere configuration."""
+        LOG.info(self.get_method_doc())
+
+        from fb_vmware.config import VSPhereConfigInfo
+        from fb_vmware.config import VmwareConfigError
+
+        section = {
+            "host": "vcenter.example.com",
+            "pool_size": "20",
+            "keep-alive": "60",
+            "connect_timeout": "5",
+            "read_timeout": "120.5",
+            "tls_session_reuse": "no",
+        }
+        info = VSPhereConfigInfo.from_config(
+            "vsphere:test", "test", section, appname=self.appname
+        )
+        LOG.debug("VSPhereConfigInfo %%r: %r", info)
+        self.assertEqual(info.pool_size, 20)
+        self.assertEqual(info.keep_alive, 60)
+        self.assertEqual(info.connect_timeout, 5.0)
+        self.assertEqual(info.read_timeout, 120.5)
+        self.assertFalse(info.tls_session_reuse)
+        self.assertEqual(info.as_dict()["pool_size"], 20)
+        self.assertTrue(info.compression)
+        self.assertFalse(info.fast_parse)
+        self.assertEqual(info.convert_workers, 0)
+
+        info = VSPhereConfigInfo(host="vcenter.example.com", appname=self.appname)
+        self.assertIsNone(info.read_timeout)
+        self.assertTrue(info.tls_session_reuse)
+        info.read_timeout = ""
+        self.assertIsNone(info.read_timeout)
+
+        info = VSPhereConfigInfo.from_config(
+            "vsphere:test",
+            "test",
+            {"host": "vcenter", "compression": "no", "fast_parse": "yes", "convert_workers": "8"},
+            appname=self.appname,
+        )
+        self.assertFalse(info.compression)
+        self.assertFalse(info.as_dict()["compression"])
+        self.assertTrue(info.fast_parse)
+        self.assertTrue(copy.copy(info).fast_parse)
+        self.assertEqual(copy.copy(info).convert_workers, 8)
+        self.assertIsNone(info.reservation_ledger)
+        self.assertIsNone(info.reservation_ttl)
+
+        info = VSPhereConfigInfo.from_config(
+            "vsphere:test",
+            "test",
+            {
+                "host": "vcenter",
+                "reservation-ledger": "/var/lib/fb-vmware/reservations.db",
+                "reservation_ttl": "600",
+            },
+            appname=self.appname,
+        )
+        self.assertEqual(info.reservation_ledger, "/var/lib/fb-vmware/reservations.db")
+        self.assertEqual(info.reservation_ttl, 600.0)
+        self.assertEqual(copy.copy(info).reservation_ledger, info.reservation_ledger)
+        self.assertEqual(copy.copy(info).reservation_ttl, 600.0)
+
+        for (key, value) in (
+            ("pool_size", "0"),
+            ("keep_alive", "-2"),
+            ("connect_timeout", "0"),
+            ("read_timeout", "soon"),
+            ("convert_workers", "-1"),
+            ("reservation_ttl", "0"),
+        ):
+            with self.assertRaises(VmwareConfigError) as cm:
+                VSPhereConfigInfo.from_config(
+                    "vsphere:test", "test", {"host": "vcenter", key: value}, appname=self.appname
+                )
+            LOG.debug("%s raised: %s", cm.exception.__class__.__qualname__, cm.exception)
+
 
 # =============================================================================
 if __name__ == "__main__":
@@ -117,6 +197,7 @@ if __name__ == "__main__":
     suite.addTest(TestVsphereConfig("test_import", verbose))
     suite.addTest(TestVsphereConfig("test_object", verbose))
     suite.addTest(TestVsphereConfig("test_read_config", verbose))
+    suite.addTest(TestVsphereConfig("test_pool_options", verbose))
 
     runner = unittest.TextTestRunner(verbosity=verbose)
 
@@ -11,8 +11,12 @@
 
 import logging
 import os
+import re
 import sys
+import tempfile
 import textwrap
+import threading
+import time
 
 try:
     import unittest2 as unittest
@@ -85,6 +89,343 @@ class TestVsphereConnection(FbVMWareTestcase):
         self.assertEqual(connect.appname, self.appname)
         self.assertEqual(connect.verbose, 1)
 
+    # -------------------------------------------------------------------------
+    def test_frozen_results(self):
+        """Test the read-only result containers of a VsphereConnection object."""
+        LOG.info(self.get_method_doc())
+
+        from fb_vmware import VsphereConnection
+        from fb_vmware.config import VSPhereConfigInfo
+        from fb_vmware.datastore import VsphereDatastore, VsphereDatastoreDict
+
+        connect_info = VSPhereConfigInfo(
+            host="test-vsphere", appname=self.appname, initialized=True
+        )
+        connect = VsphereConnection(connect_info=connect_info, appname=self.appname)
+
+        self.assertTrue(connect.datastores.frozen)
+        self.assertTrue(connect.networks.frozen)
+        self.assertEqual(connect.clusters, ())
+        with self.assertRaises(TypeError):
+            connect.hosts["esx01"] = None
+        with self.assertRaises(TypeError):
+            connect.datacenters["dc01"] = None
+
+        ds = VsphereDatastore(
+            name="ds01",
+            capacity=(100 * 1024 * 1024 * 1024),
+            free_space=(50 * 1024 * 1024 * 1024),
+            appname=self.appname,
+        )
+        datastores = VsphereDatastoreDict(ds).freeze()
+        self.assertIs(datastores.freeze(), datastores)
+        for func in (
+            lambda: datastores.append(ds),
+            lambda: datastores.pop("ds01"),
+            lambda: datastores.clear(),
+        ):
+            with self.assertRaises(TypeError) as cm:
+                func()
+            LOG.debug("%s raised: %s", cm.exception.__class__.__qualname__, cm.exception)
+        self.assertEqual(len(datastores), 1)
+
+        copied = datastores.copy()
+        self.assertFalse(copied.frozen)
+        self.assertIs(copied.ledger, datastores.ledger)
+        del copied["ds01"]
+        self.assertEqual(len(copied), 0)
+        self.assertIn("ds01", datastores)
+
+    # -------------------------------------------------------------------------
+    def test_ledger(self):
+        """Test enabling the reservation ledger of a VsphereConnection object."""
+        LOG.info(self.get_method_doc())
+
+        from fb_vmware import VsphereConnection
+        from fb_vmware import VsphereReservationLedger
+        from fb_vmware.config import VSPhereConfigInfo
+
+        connect_info = VSPhereConfigInfo(
+            host="test-vsphere", appname=self.appname, initialized=True
+        )
+        connect = VsphereConnection(connect_info=connect_info, appname=self.appname)
+        self.assertIsNone(connect.ledger)
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            ledger_file = os.path.join(tmp_dir, "reservations.db")
+            connect_info.reservation_ledger = ledger_file
+            connect_info.reservation_ttl = 600
+            connect = VsphereConnection(connect_info=connect_info, appname=self.appname)
+            LOG.debug("Ledger of the connection: {!r}".format(connect.ledger))
+            self.assertIsInstance(connect.ledger, VsphereReservationLedger)
+            self.assertEqual(str(connect.ledger.filename), ledger_file)
+            self.assertEqual(connect.ledger.ttl, 600.0)
+            self.assertTrue(os.path.exists(ledger_file))
+
+            ledger = VsphereReservationLedger(ledger_file, owner="other")
+            connect = VsphereConnection(
+                connect_info=connect_info, appname=self.appname, ledger=ledger
+            )
+            self.assertIs(connect.ledger, ledger)
+
+    # -------------------------------------------------------------------------
+    def test_release_dv_ports(self):
+        """Test releasing the reserved DVS ports, if creating a VM failed."""
+        LOG.info(self.get_method_doc())
+
+        from pyVmomi import vim
+
+        from test_44_dvs import FakeDvs
+
+        from general import SimpleTestObject
+
+        from fb_vmware import VsphereConnection, VsphereDVS, VsphereDvPortGroup
+        from fb_vmware.config import VSPhereConfigInfo
+
+        ports = []
+        for key in ("10", "11"):
+            port = SimpleTestObject()
+            port.key = key
+            port.portgroupKey = "pg-1"
+            port.dvsUuid = "dvs-uuid"
+            ports.append(port)
+
+        dvs = VsphereDVS(name="dvs-test", appname=self.appname)
+        dvs._dvs = FakeDvs(ports)
+        portgroup = VsphereDvPortGroup(
+            name="pg-test", appname=self.appname, key="pg-1", dvs_uuid="dvs-uuid"
+        )
+
+        class FailingFolder(object):
+
+            def CreateVM_Task(self, config, pool):  # noqa: N802
+                raise vim.fault.DuplicateName(name=config.name)
+
+        connect_info = VSPhereConfigInfo(
+            host="test-vsphere", appname=self.appname, initialized=True
+        )
+        connect = VsphereConnection(connect_info=connect_info, appname=self.appname)
+        connect.dvs = {"dvs-uuid": dvs}
+
+        def vm_spec():
+            nic_spec = vim.vm.device.VirtualDeviceSpec()
+            nic_spec.device = vim.vm.device.VirtualVmxnet3()
+            nic_spec.device.backing = portgroup.get_if_backing_device(dvs.reserve_port("pg-1"))
+            return vim.vm.ConfigSpec(name="test-vm", deviceChange=[nic_spec])
+
+        spec = vm_spec()
+        self.assertEqual(dvs.search_port_keys("pg-1"), ["11"])
+        with self.assertRaises(vim.fault.DuplicateName):
+            connect.create_vm("test-vm", FailingFolder(), spec, None)
+        self.assertEqual(dvs.search_port_keys("pg-1"), ["10", "11"])
+
+        connect.simulate = True
+        connect.create_vm("test-vm", FailingFolder(), vm_spec(), None)
+        self.assertEqual(dvs.search_port_keys("pg-1"), ["10", "11"])
+
+    # -------------------------------------------------------------------------
+    def test_concurrent_session(self):
+        """Test connecting and custom field names of a VsphereConnection in several threads."""
+        LOG.info(self.get_method_doc())
+
+        from fb_vmware import VsphereConnection
+        from fb_vmware.config import VSPhereConfigInfo
+
+        class FakeField(object):
+
+            def __init__(self, key, name):
+                self.key = key
+                self.name = name
+
+        class FakeContent(object):
+
+            class customFieldsManager(object):  # noqa: N801
+                field = [FakeField(1, "owner"), FakeField(2, "project")]
+
+        class FakeServiceInstance(object):
+
+            retrievals = 0
+
+            def RetrieveContent(self):  # noqa: N802
+                self.retrievals += 1
+                time.sleep(0.1)
+                return FakeContent()
+
+        class FakeConnection(VsphereConnection):
+
+            logins = 0
+
+            def _connect(self):
+                self.logins += 1
+                time.sleep(0.2)
+                self.service_instance = FakeServiceInstance()
+
+        connect_info = VSPhereConfigInfo(
+            host="test-vsphere", appname=self.appname, initialized=True
+        )
+        connect = FakeConnection(
+            connect_info=connect_info, appname=self.appname, auto_close=False
+        )
+
+        count = 20
+        barrier = threading.Barrier(count)
+        results = []
+
+        def worker():
+            barrier.wait()
+            results.append(connect.custom_field_name(2))
+
+        threads = [threading.Thread(target=worker) for i in range(count)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join(10)
+
+        self.assertEqual(results, ["project"] * count)
+        self.assertEqual(connect.logins, 1)
+        self.assertEqual(connect.service_instance.retrievals, 1)
+        self.assertIsNone(connect.custom_field_name(3))
+        with self.assertRaises(TypeError):
+            connect.custom_fields[3] = "other"
+
+        self.assertIs(connect.ensure_connected(), connect.service_instance)
+        self.assertEqual(connect.logins, 1)
+
+    # -------------------------------------------------------------------------
+    def test_get_vms_by_names(self):
+        """Test getting many VMs by their names in one pass."""
+        LOG.info(self.get_method_doc())
+
+        from test_52_propset import vm_content
+
+        from fb_vmware import VsphereConnection, VsphereVm
+        from fb_vmware.config import VSPhereConfigInfo
+        from fb_vmware.name_table import VsphereNameTable
+        from fb_vmware.propset import MoRef, property_set_from_content
+
+        dc = MoRef("Datacenter", "datacenter-1")
+        vm_folder = MoRef("Folder", "group-v1")
+        name_table = VsphereNameTable(
+            [
+                (dc, {"name": "dc1"}),
+                (vm_folder, {"name": "vm", "parent": dc}),
+                (MoRef("Folder", "group-v3"), {"name": "test", "parent": vm_folder}),
+            ]
+        )
+        contents = [
+            vm_content("vm-{}".format(i), "test-vm-{:03d}".format(i)) for i in range(10)
+        ]
+
+        class FakeConnection(VsphereConnection):
+
+            retrievals = []
+
+            def get_name_table(self, lazy=False):
+                return name_table
+
+            def retrieve_properties(self, prop_specs, container=None, objects=None, **kwargs):
+                self.retrievals.append(None if objects is None else len(objects))
+                for content in contents:
+                    (moref, props) = property_set_from_content(content)
+                    if objects is None or moref in objects:
+                        yield (moref, props)
+
+        connect_info = VSPhereConfigInfo(
+            host="test-vsphere", appname=self.appname, initialized=True
+        )
+        connect = FakeConnection(connect_info=connect_info, appname=self.appname)
+
+        names = ["test-vm-007", "test-vm-002", "missing-vm", "test-vm-007"]
+        vms = connect.get_vms_by_names(names, vsphere_name="test")
+        LOG.debug("Found VMs: {!r}".format(vms))
+
+        self.assertEqual(list(vms.keys()), ["test-vm-007", "test-vm-002", "missing-vm"])
+        self.assertIsNone(vms["missing-vm"])
+        for name in ("test-vm-007", "test-vm-002"):
+            vm = vms[name]
+            self.assertIsInstance(vm, VsphereVm)
+            self.assertEqual(vm.name, name)
+            self.assertEqual(vm.vsphere, "test")
+            self.assertEqual(vm.dc_name, "dc1")
+            self.assertEqual(vm.path, "/test")
+
+        # One retrieval of all names, one of the properties of the found VMs
+        self.assertEqual(connect.retrievals, [None, 2])
+
+        self.assertEqual(connect.get_vms_by_names([]), {})
+        self.assertEqual(len(connect.retrievals), 2)
+
+    # -------------------------------------------------------------------------
+    def test_get_vm_list_fast(self):
+        """Test the VM list with fast_parse for VMs without a parent folder."""
+        LOG.info(self.get_method_doc())
+
+        from test_52_propset import vm_content
+
+        from fb_vmware import VsphereConnection
+        from fb_vmware.config import VSPhereConfigInfo
+        from fb_vmware.name_table import VsphereNameTable
+        from fb_vmware.propset import MoRef, property_set_from_content
+
+        dc = MoRef("Datacenter", "datacenter-1")
+        vm_folder = MoRef("Folder", "group-v1")
+        host_folder = MoRef("Folder", "group-h1")
+        cluster = MoRef("ClusterComputeResource", "domain-c1")
+        host = MoRef("HostSystem", "host-1")
+        name_table = VsphereNameTable(
+            [
+                (dc, {"name": "dc1"}),
+                (vm_folder, {"name": "vm", "parent": dc}),
+                (MoRef("Folder", "group-v3"), {"name": "test", "parent": vm_folder}),
+                (host_folder, {"name": "host", "parent": dc}),
+                (cluster, {"name": "cluster1", "parent": host_folder}),
+                (host, {"name": "esx01.example.com", "parent": cluster}),
+            ]
+        )
+
+        property_sets = []
+        for i in range(3):
+            (moref, props) = property_set_from_content(
+                vm_content("vm-{}".format(i), "test-vm-{:03d}".format(i))
+            )
+            props["runtime.host"] = host
+            property_sets.append((moref, props))
+        # A VM in a vApp has no parent folder
+        del property_sets[1][1]["parent"]
+        # A VM in an unknown folder
+        property_sets[2][1]["parent"] = MoRef("Folder", "group-v99")
+
+        class FakeConnection(VsphereConnection):
+
+            def ensure_connected(self):
+                return None
+
+            def get_name_table(self, lazy=False):
+                return name_table
+
+            def retrieve_properties(self, prop_specs, container=None, objects=None, **kwargs):
+                for (moref, props) in property_sets:
+                    if objects is None or moref in objects:
+                        yield (moref, props)
+
+        connect_info = VSPhereConfigInfo(
+            host="test-vsphere", appname=self.appname, initialized=True
+        )
+        connect = FakeConnection(
+            connect_info=connect_info, appname=self.appname, fast_parse=True
+        )
+
+        vm_list = connect.get_vm_list(re.compile(r".*"), vsphere_name="test", name_only=True)
+        LOG.debug("Found VMs: {!r}".format(vm_list))
+        self.assertEqual(vm_list, [("test-vm-000", "dc1", "/test"), ("test-vm-001", "dc1", "/")])
+
+        vm_list = connect.get_vm_list(re.compile(r"test-vm-001"), vsphere_name="test")
+        self.assertEqual(len(vm_list), 1)
+        self.assertEqual(vm_list[0].name, "test-vm-001")
+        self.assertEqual(vm_list[0].dc_name, "dc1")
+        self.assertEqual(vm_list[0].path, "/")
+        self.assertEqual(vm_list[0].host, "esx01.example.com")
+
 
 # =============================================================================
 if __name__ == "__main__":
@@ -100,6 +441,12 @@ if __name__ == "__main__":
 
     suite.addTest(TestVsphereConnection("test_import", verbose))
     suite.addTest(TestVsphereConnection("test_init_object", verbose))
+    suite.addTest(TestVsphereConnection("test_frozen_results", verbose))
+    suite.addTest(TestVsphereConnection("test_ledger", verbose))
+    suite.addTest(TestVsphereConnection("test_release_dv_ports", verbose))
+    suite.addTest(TestVsphereConnection("test_concurrent_session", verbose))
+    suite.addTest(TestVsphereConnection("test_get_vms_by_names", verbose))
+    suite.addTest(TestVsphereConnection("test_get_vm_list_fast", verbose))
     # suite.addTest(TestVsphereConnection('test_init_from_summary', verbose))
 
     runner = unittest.TextTestRunner(verbosity=verbose)
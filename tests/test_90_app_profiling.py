@@ -0,0 +1,179 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+@summary: Test script (and module) for unit tests on module fb_vmware.app.profiling.
+
+@author: Frank Brehm
+@contact: frank@brehm-online.com
+@copyright: © 2026 Frank Brehm, Berlin
+@license: GPL3
+"""
+
+import io
+import logging
+import os
+import shutil
+import sys
+import tempfile
+
+try:
+    import unittest2 as unittest
+except ImportError:
+    import unittest
+
+libdir = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "src"))
+sys.path.insert(0, libdir)
+
+from general import FbVMWareTestcase, get_arg_verbose, init_root_logger
+
+LOG = logging.getLogger("test-app-profiling")
+
+
+# =============================================================================
+def busy_function(count=20000):
+    """Do something consuming CPU time and memory."""
+    return [str(i) * 3 for i in range(count)]
+
+
+# =============================================================================
+class TestAppProfiling(FbVMWareTestcase):
+    """Testcase for unit tests on the profiling of applications."""
+
+    # -------------------------------------------------------------------------
+    def setUp(self):
+        """Execute this on seting up before calling each particular test method."""
+        super(TestAppProfiling, self).setUp()
+        self.tmpdir = tempfile.mkdtemp(prefix="test-profiling-")
+
+    # -------------------------------------------------------------------------
+    def tearDown(self):
+        """Execute this after calling each particular test method."""
+        shutil.rmtree(self.tmpdir, ignore_errors=True)
+        super(TestAppProfiling, self).tearDown()
+
+    # -------------------------------------------------------------------------
+    def test_classify(self):
+        """Test the classification of profiled functions."""
+        LOG.info(self.get_method_doc())
+
+        from fb_vmware.app.profiling import classify_function
+        from fb_vmware.app.profiling import short_path
+
+        test_data = (
+            ("~", "<method 'recv_into' of '_socket.socket' objects>", "network"),
+            ("~", "<method 'read' of '_ssl._SSLSocket' objects>", "network"),
+            ("~", "<method 'ParseFile' of 'pyexpat.xmlparser' objects>", "soap"),
+            ("~", "<built-in method builtins.isinstance>", "other"),
+            ("/usr/lib/python3/site-packages/pyVmomi/SoapAdapter.py", "Deserialize", "soap"),
+            ("/usr/lib/python3/site-packages/rich/console.py", "render", "rich"),
+            ("/usr/lib/python3/site-packages/fb_vmware/vm.py", "from_summary", "construction"),
+            ("/usr/lib/python3/site-packages/fb_vmware/vm.py", "__init__", "construction"),
+            ("/usr/lib/python3/site-packages/fb_vmware/vm.py", "as_dict", "as_dict"),
+            ("/usr/lib/python3/site-packages/fb_vmware/connect.py", "get_vm_list", "fb_vmware"),
+            ("/usr/lib/python3.11/json/encoder.py", "encode", "other"),
+        )
+
+        for (filename, funcname, expected) in test_data:
+            LOG.debug("Classifying {f!r} in {n!r}.".format(f=funcname, n=filename))
+            self.assertEqual(classify_function(filename, funcname), expected)
+
+        self.assertEqual(
+            short_path("/usr/lib/python3/site-packages/pyVmomi/SoapAdapter.py"),
+            "pyVmomi/SoapAdapter.py",
+        )
+        self.assertEqual(short_path("/tmp/other.py"), "/tmp/other.py")
+
+    # -------------------------------------------------------------------------
+    def test_invalid_mode(self):
+        """Test creating a profiler with an invalid mode."""
+        LOG.info(self.get_method_doc())
+
+        from fb_vmware.app import VmwareAppError
+        from fb_vmware.app.profiling import VmwareAppProfiler
+
+        with self.assertRaises(VmwareAppError) as cm:
+            VmwareAppProfiler("wall", directory=self.tmpdir)
+        e = cm.exception
+        LOG.debug("%s raised: %s", e.__class__.__qualname__, e)
+
+    # -------------------------------------------------------------------------
+    def test_cpu_profile(self):
+        """Test profiling the CPU time."""
+        LOG.info(self.get_method_doc())
+
+        import pstats
+
+        from fb_vmware.app.profiling import VmwareAppProfiler
+
+        profiler = VmwareAppProfiler("cpu", directory=self.tmpdir, top=5, name="test")
+        LOG.debug("Profiler: {!r}".format(profiler))
+        profiler.start()
+        busy_function()
+        profiler.stop()
+
+        filename = profiler.write()
+        LOG.debug("Written profile: {!r}".format(filename))
+        self.assertTrue(filename.name.startswith("test-"))
+        self.assertTrue(filename.name.endswith(".pstats"))
+        stats = pstats.Stats(str(filename))
+        self.assertGreater(stats.total_calls, 0)
+
+        (categories, network, local) = profiler.cpu_hot_spots()
+        self.assertIn("other", categories)
+        self.assertLessEqual(len(local), 5)
+
+        output = io.StringIO()
+        profiler.report(file=output)
+        self.assertIn("busy_function", output.getvalue())
+
+    # -------------------------------------------------------------------------
+    def test_alloc_profile(self):
+        """Test profiling the memory allocations."""
+        LOG.info(self.get_method_doc())
+
+        import tracemalloc
+
+        from fb_vmware.app.profiling import VmwareAppProfiler
+
+        profiler = VmwareAppProfiler("alloc", directory=self.tmpdir, top=3, name="test")
+        with self.assertRaises(SystemExit):
+            with profiler:
+                data = busy_function()
+                self.assertTrue(data)
+                sys.exit(0)
+
+        self.assertFalse(tracemalloc.is_tracing())
+        self.assertIsNotNone(profiler.filename)
+        self.assertTrue(profiler.filename.name.endswith(".tracemalloc"))
+        snapshot = tracemalloc.Snapshot.load(str(profiler.filename))
+        self.assertTrue(snapshot.traces)
+        self.assertGreater(profiler.peak, 0)
+
+        (categories, top) = profiler.alloc_hot_spots()
+        self.assertLessEqual(len(top), 3)
+
+
+# =============================================================================
+if __name__ == "__main__":
+
+    verbose = get_arg_verbose()
+    if verbose is None:
+        verbose = 0
+    init_root_logger(verbose)
+
+    LOG.info("Starting tests ...")
+
+    suite = unittest.TestSuite()
+
+    suite.addTest(TestAppProfiling("test_classify", verbose))
+    suite.addTest(TestAppProfiling("test_invalid_mode", verbose))
+    suite.addTest(TestAppProfiling("test_cpu_profile", verbose))
+    suite.addTest(TestAppProfiling("test_alloc_profile", verbose))
+
+    runner = unittest.TextTestRunner(verbosity=verbose)
+
+    result = runner.run(suite)
+
+# =============================================================================
+
+# vim: tabstop=4 expandtab shiftwidth=4 softtabstop=4
@@ -0,0 +1,166 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+@summary: Test script (and module) for unit tests on module fb_vmware.app.columns.
+
+@author: Frank Brehm
+@contact: frank@brehm-online.com
+@copyright: © 2026 Frank Brehm, Berlin
+@license: GPL3
+"""
+
+import argparse
+import logging
+import os
+import sys
+
+try:
+    import unittest2 as unittest
+except ImportError:
+    import unittest
+
+libdir = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "src"))
+sys.path.insert(0, libdir)
+
+from general import FbVMWareTestcase, get_arg_verbose, init_root_logger
+
+LOG = logging.getLogger("test-app-columns")
+
+
+# =============================================================================
+class TestAppColumns(FbVMWareTestcase):
+    """Testcase for unit tests on the output columns of the listing applications."""
+
+    # -------------------------------------------------------------------------
+    def get_columns(self):
+        """Return some test columns."""
+        from fb_vmware.app.columns import ListColumn
+
+        return (
+            ListColumn("name", "Name", ("name",)),
+            ListColumn("vsphere", "vSphere"),
+            ListColumn("dc", "Data Center", ("parent",)),
+            ListColumn("online", "Online", ("config.template", "runtime.powerState")),
+            ListColumn("os", "Operating System", ("summary.config.guestId",), "right"),
+        )
+
+    # -------------------------------------------------------------------------
+    def test_import(self):
+        """Test import of fb_vmware.app.columns."""
+        LOG.info(self.get_method_doc())
+
+        import fb_vmware.app.columns
+        from fb_vmware.app.columns import ColumnsOptionAction  # noqa: F401
+        from fb_vmware.app.columns import ListColumn  # noqa: F401
+
+        LOG.debug(
+            "Version of fb_vmware.app.columns: {!r}.".format(fb_vmware.app.columns.__version__)
+        )
+
+    # -------------------------------------------------------------------------
+    def test_column_paths(self):
+        """Test the property paths and sorting of selected columns."""
+        LOG.info(self.get_method_doc())
+
+        from fb_vmware.app.columns import column_paths
+        from fb_vmware.app.columns import row_sort_key
+
+        columns = self.get_columns()
+        self.assertEqual(columns[1].paths, ())
+        self.assertEqual(columns[1].justify, "left")
+
+        self.assertEqual(column_paths(columns, ["vsphere"]), ())
+        self.assertEqual(
+            column_paths(columns, ["online", "name", "dc", "online"]),
+            ("config.template", "runtime.powerState", "name", "parent"),
+        )
+        self.assertEqual(column_paths(columns, ["unknown"]), ())
+
+        rows = [
+            {"name": "vm02", "os": "debian12_64Guest"},
+            {"name": "vm03", "os": None},
+            {"name": "vm01", "os": "debian12_64Guest"},
+        ]
+        rows.sort(key=row_sort_key(["os", "name"]))
+        self.assertEqual([row["name"] for row in rows], ["vm03", "vm01", "vm02"])
+
+    # -------------------------------------------------------------------------
+    def test_option(self):
+        """Test parsing the --columns option."""
+        LOG.info(self.get_method_doc())
+
+        from fb_vmware.app.columns import add_columns_option
+
+        parser = argparse.ArgumentParser(prog="test", exit_on_error=False)
+        add_columns_option(parser, self.get_columns(), ["name", "vsphere"])
+
+        args = parser.parse_args([])
+        self.assertIsNone(args.columns)
+
+        args = parser.parse_args(["--columns", "name,dc", "os", "name"])
+        self.assertEqual(args.columns, ["name", "dc", "os"])
+
+        args = parser.parse_args(["-o", "os, online"])
+        self.assertEqual(args.columns, ["os", "online"])
+
+        for value in ("name,bogus", ","):
+            LOG.debug("Testing invalid columns {!r}.".format(value))
+            with self.assertRaises(argparse.ArgumentError) as cm:
+                parser.parse_args(["-o", value])
+            LOG.debug("ArgumentError raised: {}".format(cm.exception))
+
+    # -------------------------------------------------------------------------
+    def test_app_columns(self):
+        """Test the declared columns of the listing applications."""
+        LOG.info(self.get_method_doc())
+
+        from fb_vmware.app.get_host_list import GetHostsListApplication
+        from fb_vmware.app.get_network_list import GetNetworkListApp
+        from fb_vmware.app.get_storage_list import GetStorageListApp
+        from fb_vmware.app.get_vm_list import GetVmListApplication
+
+        for app_class in (GetVmListApplication, GetHostsListApplication, GetStorageListApp):
+            keys = tuple(col.key for col in app_class.get_columns())
+            LOG.debug("Columns of {c}: {k!r}".format(c=app_class.__name__, k=keys))
+            self.assertEqual(keys, app_class.avail_columns)
+            for key in app_class.default_columns + list(app_class.avail_sort_keys):
+                self.assertIn(key, keys)
+
+        self.assertEqual(
+            tuple(col.key for col in GetNetworkListApp.get_dvs_columns()),
+            GetNetworkListApp.dvs_columns,
+        )
+        self.assertEqual(
+            tuple(col.key for col in GetNetworkListApp.get_dvpg_columns()),
+            GetNetworkListApp.dvpg_columns,
+        )
+        self.assertEqual(
+            tuple(col.key for col in GetNetworkListApp.get_net_columns()),
+            GetNetworkListApp.net_columns,
+        )
+
+
+# =============================================================================
+if __name__ == "__main__":
+
+    verbose = get_arg_verbose()
+    if verbose is None:
+        verbose = 0
+    init_root_logger(verbose)
+
+    LOG.info("Starting tests ...")
+
+    suite = unittest.TestSuite()
+
+    suite.addTest(TestAppColumns("test_import", verbose))
+    suite.addTest(TestAppColumns("test_column_paths", verbose))
+    suite.addTest(TestAppColumns("test_option", verbose))
+    suite.addTest(TestAppColumns("test_app_columns", verbose))
+
+    runner = unittest.TextTestRunner(verbosity=verbose)
+
+    result = runner.run(suite)
+
+# =============================================================================
+
+# vim: tabstop=4 expandtab shiftwidth=4 softtabstop=4
@@ -0,0 +1,109 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+@summary: Test script (and module) for the inventory benchmark in benchmarks/.
+
+@author: Frank Brehm
+@contact: frank@brehm-online.com
+@copyright: © 2026 Frank Brehm, Berlin
+@license: GPL3
+"""
+
+import json
+import logging
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+
+try:
+    import unittest2 as unittest
+except ImportError:
+    import unittest
+
+libdir = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "src"))
+sys.path.insert(0, libdir)
+benchdir = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "benchmarks"))
+
+from general import FbVMWareTestcase, get_arg_verbose, init_root_logger
+
+LOG = logging.getLogger("test-bench-inventory")
+
+
+# =============================================================================
+class TestBenchInventory(FbVMWareTestcase):
+    """Testcase for running the inventory benchmark."""
+
+    # -------------------------------------------------------------------------
+    def setUp(self):
+        """Execute this on seting up before calling each particular test method."""
+        super(TestBenchInventory, self).setUp()
+        self.tmpdir = tempfile.mkdtemp(prefix="test-bench-inventory-")
+
+    # -------------------------------------------------------------------------
+    def tearDown(self):
+        """Execute this after calling each particular test method."""
+        shutil.rmtree(self.tmpdir, ignore_errors=True)
+        super(TestBenchInventory, self).tearDown()
+
+    # -------------------------------------------------------------------------
+    def test_in_process(self):
+        """Test running all operations of the benchmark against the in-process inventory."""
+        LOG.info(self.get_method_doc())
+
+        json_file = os.path.join(self.tmpdir, "results.json")
+        cmd = [
+            sys.executable,
+            os.path.join(benchdir, "bench_inventory.py"),
+            "-n",
+            "20",
+            "-s",
+            "10",
+            "-j",
+            json_file,
+        ]
+        LOG.debug("Executing: {}".format(" ".join(cmd)))
+        proc = subprocess.run(cmd, capture_output=True, text=True, timeout=300)
+        LOG.debug("Output of the benchmark:\n{}".format(proc.stdout))
+        self.assertEqual(proc.returncode, 0, proc.stderr)
+
+        with open(json_file, "r", encoding="utf-8") as fh:
+            results = json.load(fh)
+        operations = {res["operation"]: res for res in results}
+        for operation in (
+            "get_vm_list",
+            "get_vm_list(name_only)",
+            "get_hosts",
+            "get_datastores(detailled)",
+            "get_networks",
+            "search_space",
+            "VsphereVm.from_summary",
+        ):
+            self.assertIn(operation, operations)
+        self.assertEqual(operations["get_vm_list"]["objects"], 20)
+        self.assertEqual(operations["VsphereVm.from_summary"]["objects"], 20)
+        self.assertGreater(operations["get_hosts"]["objects"], 0)
+
+
+# =============================================================================
+if __name__ == "__main__":
+
+    verbose = get_arg_verbose()
+    if verbose is None:
+        verbose = 0
+    init_root_logger(verbose)
+
+    LOG.info("Starting tests ...")
+
+    suite = unittest.TestSuite()
+
+    suite.addTest(TestBenchInventory("test_in_process", verbose))
+
+    runner = unittest.TextTestRunner(verbosity=verbose)
+
+    result = runner.run(suite)
+
+# =============================================================================
+
+# vim: tabstop=4 expandtab shiftwidth=4 softtabstop=4